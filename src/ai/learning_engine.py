@@ -161,7 +161,7 @@ class LearningEngine:
             (결정, 신뢰도, 사유)
         """
         # 현재 시장 상황 분석
-        market_snapshot = self._create_market_snapshot(df, current_indicators)
+        market_snapshot = self._create_market_snapshot(df, current_indicators, ticker)
         
         # 과거 유사 상황에서의 성과 조회
         similar_experiences = self._find_similar_situations(
@@ -408,8 +408,10 @@ class LearningEngine:
         
         return params.get('params', {})
     
-    def _create_market_snapshot(self, df, indicators: Dict) -> MarketSnapshot:
-        """시장 상황 스냅샷 생성"""
+    def _create_market_snapshot(self, df, indicators: Dict, ticker: Optional[str] = None) -> MarketSnapshot:
+        """시장 상황 스냅샷 생성 (변동성은 전략과 공용인 지표 묶음 사용)"""
+        from src.utils.indicator_bundle import get_indicators
+        
         # 가격 변화율 계산
         price = df['close'].iloc[-1]
         price_1m = df['close'].iloc[-2] if len(df) >= 2 else price
@@ -432,7 +434,7 @@ class LearningEngine:
             trend_strength = 0.3
         
         # 변동성 계산
-        volatility = df['close'].pct_change().std() * 100
+        volatility = get_indicators(df, ticker).volatility()
         
         # 시장 상태
         rsi = indicators.get('rsi', 50)
@@ -97,7 +97,7 @@ class ScenarioIdentifier:
         
         try:
             # 기술적 지표 계산
-            indicators = self._calculate_indicators(df)
+            indicators = self._calculate_indicators(df, ticker)
             
             # 각 카테고리별 시나리오 식별
             trend_scenarios = self._identify_trend(df, indicators)
@@ -144,53 +144,43 @@ class ScenarioIdentifier:
             print(f"❌ 시나리오 식별 오류: {e}")
             return self._default_scenario()
     
-    def _calculate_indicators(self, df: pd.DataFrame) -> Dict:
-        """기술적 지표 계산"""
+    def _calculate_indicators(self, df: pd.DataFrame, ticker: str = None) -> Dict:
+        """기술적 지표 계산 (전략과 같은 캔들이면 공용 지표 묶음 재사용)"""
+        from src.utils.indicator_bundle import get_indicators
+        
         indicators = {}
         
         try:
-            # 가격 변화
-            indicators['price_change_1h'] = (df['close'].iloc[-1] / df['close'].iloc[-12] - 1) * 100
-            indicators['price_change_4h'] = (df['close'].iloc[-1] / df['close'].iloc[-48] - 1) * 100
-            indicators['price_change_24h'] = (df['close'].iloc[-1] / df['close'].iloc[-288] - 1) * 100
+            bundle = get_indicators(df, ticker)
+            close = bundle.close
+            
+            # 가격 변화 (봉이 부족한 구간은 생략)
+            for key, bars in (('price_change_1h', 12), ('price_change_4h', 48), ('price_change_24h', 288)):
+                if len(close) >= bars:
+                    indicators[key] = (close[-1] / close[-bars] - 1) * 100
             
             # 변동성
-            returns = df['close'].pct_change()
-            indicators['volatility'] = returns.std() * 100
+            indicators['volatility'] = bundle.volatility()
             
             # 이동평균
-            indicators['ma5'] = df['close'].rolling(5).mean().iloc[-1]
-            indicators['ma20'] = df['close'].rolling(20).mean().iloc[-1]
-            indicators['ma60'] = df['close'].rolling(60).mean().iloc[-1]
+            indicators['ma5'] = bundle.sma(5)
+            indicators['ma20'] = bundle.sma(20)
+            indicators['ma60'] = bundle.sma(60)
             
             # RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            indicators['rsi'] = 100 - (100 / (1 + rs.iloc[-1]))
+            indicators['rsi'] = bundle.rsi(14)
             
             # MACD
-            exp1 = df['close'].ewm(span=12).mean()
-            exp2 = df['close'].ewm(span=26).mean()
-            macd = exp1 - exp2
-            signal = macd.ewm(span=9).mean()
-            indicators['macd'] = macd.iloc[-1]
-            indicators['macd_signal'] = signal.iloc[-1]
-            indicators['macd_hist'] = macd.iloc[-1] - signal.iloc[-1]
+            indicators['macd'], indicators['macd_signal'], indicators['macd_hist'] = bundle.macd()
             
             # 볼린저 밴드
-            bb_middle = df['close'].rolling(20).mean()
-            bb_std = df['close'].rolling(20).std()
-            indicators['bb_upper'] = (bb_middle + 2 * bb_std).iloc[-1]
-            indicators['bb_middle'] = bb_middle.iloc[-1]
-            indicators['bb_lower'] = (bb_middle - 2 * bb_std).iloc[-1]
+            indicators['bb_upper'], indicators['bb_middle'], indicators['bb_lower'] = bundle.bollinger(20, 2)
             indicators['bb_width'] = (indicators['bb_upper'] - indicators['bb_lower']) / indicators['bb_middle']
             
             # 거래량
-            indicators['volume_avg'] = df['volume'].rolling(20).mean().iloc[-1]
-            indicators['volume_current'] = df['volume'].iloc[-1]
-            indicators['volume_ratio'] = indicators['volume_current'] / indicators['volume_avg']
+            indicators['volume_avg'] = float(bundle.volume[-20:].mean())
+            indicators['volume_current'] = float(bundle.volume[-1])
+            indicators['volume_ratio'] = bundle.volume_ratio(20)
             
         except Exception as e:
             print(f"⚠️ 지표 계산 오류: {e}")
@@ -0,0 +1,189 @@
+"""
+Upbit API asyncio 래퍼
+UpbitAPI와 같은 기능을 코루틴으로 제공하고, 여러 티커를 동시에 조회 (동시 실행 수 제한)
+
+캐시/캔들 저장소/요청 한도/HTTP 연결 풀은 내부 UpbitAPI와 공유하므로
+동기 코드와 섞어 써도 중복 조회나 한도 초과가 생기지 않음
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.upbit_api import UpbitAPI
+from src.utils.rate_limiter import Priority
+
+
+class AsyncUpbitAPI:
+    """Upbit API asyncio 래퍼 클래스"""
+
+    def __init__(self, api: Optional[UpbitAPI] = None, max_concurrency: int = 8):
+        """
+        초기화
+
+        Args:
+            api: 공유할 UpbitAPI (None이면 키 없이 새로 생성)
+            max_concurrency: 동시에 진행할 최대 요청 수
+        """
+        self.api = api if api is not None else UpbitAPI()
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="async-upbit")
+
+    def close(self):
+        """작업 스레드 종료"""
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def _call(self, func: Callable, *args, priority: Optional[Priority] = None, **kwargs):
+        """
+        동기 API 호출을 작업 스레드에서 실행
+
+        우선순위는 스레드별 값이므로 호출한 쪽의 우선순위를 작업 스레드로 전달
+        """
+        limiter = self.api.rate_limiter
+        if priority is None:
+            priority = limiter.current_priority
+
+        def run():
+            with limiter.priority(priority):
+                return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, run)
+
+    # ==================== 시세 ====================
+
+    async def get_current_price(self, ticker: str, bypass_cache: bool = False) -> Optional[float]:
+        """현재가 조회"""
+        return await self._call(self.api.get_current_price, ticker, bypass_cache=bypass_cache)
+
+    async def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        """여러 코인 현재가 조회 (배치 API)"""
+        return await self._call(self.api.get_current_prices, tickers)
+
+    async def get_orderbook(self, ticker: str, bypass_cache: bool = False) -> Optional[Dict]:
+        """호가 정보 조회"""
+        return await self._call(self.api.get_orderbook, ticker, bypass_cache=bypass_cache)
+
+    async def get_orderbooks(self, tickers: List[str]) -> Dict[str, Dict]:
+        """여러 코인 호가 조회 (배치 API)"""
+        return await self._call(self.api.get_orderbooks, tickers)
+
+    async def get_recent_trades(self, ticker: str, count: int = 100) -> List[Dict]:
+        """최근 체결 내역 조회"""
+        return await self._call(self.api.get_recent_trades, ticker, count)
+
+    async def get_ohlcv(self, ticker: str, interval: str = "minute5", count: int = 200,
+                        bypass_cache: bool = False) -> Optional[pd.DataFrame]:
+        """OHLCV 조회"""
+        return await self._call(self.api.get_ohlcv, ticker, interval, count, bypass_cache=bypass_cache)
+
+    # ==================== 계좌 ====================
+
+    async def get_balance(self, ticker: str = "KRW") -> float:
+        """잔고 조회"""
+        return await self._call(self.api.get_balance, ticker)
+
+    async def get_balances(self) -> List[Dict]:
+        """전체 잔고 조회"""
+        return await self._call(self.api.get_balances)
+
+    async def get_amount(self, ticker: str) -> float:
+        """특정 코인 보유량 조회"""
+        return await self._call(self.api.get_amount, ticker)
+
+    async def get_avg_buy_price(self, ticker: str) -> float:
+        """평균 매수가 조회"""
+        return await self._call(self.api.get_avg_buy_price, ticker)
+
+    # ==================== 주문 ====================
+
+    async def buy_market_order(self, ticker: str, price: float) -> Optional[Dict]:
+        """시장가 매수"""
+        return await self._call(self.api.buy_market_order, ticker, price, priority=Priority.ORDER)
+
+    async def sell_market_order(self, ticker: str, volume: float) -> Optional[Dict]:
+        """시장가 매도"""
+        return await self._call(self.api.sell_market_order, ticker, volume, priority=Priority.ORDER)
+
+    async def buy_limit_order(self, ticker: str, price: float, volume: float) -> Optional[Dict]:
+        """지정가 매수"""
+        return await self._call(self.api.buy_limit_order, ticker, price, volume, priority=Priority.ORDER)
+
+    async def sell_limit_order(self, ticker: str, price: float, volume: float) -> Optional[Dict]:
+        """지정가 매도"""
+        return await self._call(self.api.sell_limit_order, ticker, price, volume, priority=Priority.ORDER)
+
+    async def cancel_order(self, uuid: str) -> Optional[Dict]:
+        """주문 취소"""
+        return await self._call(self.api.cancel_order, uuid, priority=Priority.ORDER)
+
+    async def get_order(self, uuid: str) -> Optional[Dict]:
+        """주문 조회"""
+        return await self._call(self.api.get_order, uuid, priority=Priority.ORDER)
+
+    # ==================== 동시 조회 ====================
+
+    async def gather(self, method: str, tickers: Iterable[str], *args, **kwargs) -> Dict:
+        """
+        여러 티커에 같은 조회를 동시에 실행
+
+        Args:
+            method: AsyncUpbitAPI 조회 메서드 이름 (예: 'get_ohlcv')
+            tickers: 티커 리스트
+            *args, **kwargs: 메서드 추가 인자
+
+        Returns:
+            {ticker: 결과} (실패한 티커는 제외)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        func = getattr(self, method)
+        results = await asyncio.gather(*(func(t, *args, **kwargs) for t in tickers),
+                                       return_exceptions=True)
+
+        output = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                print(f"❌ {ticker} {method} 동시 조회 실패: {result}")
+                continue
+            if result is not None:
+                output[ticker] = result
+        return output
+
+    async def gather_ohlcv(self, tickers: Iterable[str], interval: str = "minute5",
+                           count: int = 200) -> Dict[str, pd.DataFrame]:
+        """여러 티커 OHLCV 동시 조회"""
+        return await self.gather('get_ohlcv', tickers, interval, count)
+
+    async def gather_recent_trades(self, tickers: Iterable[str], count: int = 100) -> Dict[str, List[Dict]]:
+        """여러 티커 체결 내역 동시 조회"""
+        return await self.gather('get_recent_trades', tickers, count)
+
+    async def gather_orderbooks(self, tickers: Iterable[str], batch_size: int = 5) -> Dict[str, Dict]:
+        """여러 티커 호가 동시 조회 (batch_size개씩 묶어 배치 API 사용)"""
+        tickers = list(dict.fromkeys(tickers))
+        batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+        results = await asyncio.gather(*(self.get_orderbooks(b) for b in batches),
+                                       return_exceptions=True)
+        output = {}
+        for result in results:
+            if isinstance(result, dict):
+                output.update(result)
+        return output
+
+    def run(self, coro):
+        """
+        동기 코드에서 코루틴 실행 (메인 루프 등)
+
+        Example:
+            frames = async_api.run(async_api.gather_ohlcv(tickers))
+        """
+        return asyncio.run(coro)
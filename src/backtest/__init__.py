@@ -0,0 +1,9 @@
+"""
+백테스트 모듈
+"""
+
+from .clock import SimulatedClock
+from .engine import BacktestEngine, BacktestResult
+from .vectorized import VectorBacktestResult, run_vectorized
+
+__all__ = ['SimulatedClock', 'BacktestEngine', 'BacktestResult', 'VectorBacktestResult', 'run_vectorized']
@@ -0,0 +1,91 @@
+"""
+백테스트용 시뮬레이션 시계
+- 전략/리스크 관리 코드는 datetime.now(), date.today()로 보유 시간과 날짜를 판단하므로
+  백테스트 동안 해당 모듈의 datetime/date를 시뮬레이션 시각을 반환하는 클래스로 교체
+- 기존 클래스는 수정하지 않고 그대로 과거 데이터 위에서 실행
+"""
+
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+import pandas as pd
+
+
+# datetime.now()/date.today()를 사용하는 모듈 (보유 시간, 일일 손실 초기화)
+DEFAULT_PATCH_MODULES = (
+    'src.utils.risk_manager',
+    'src.strategies.dynamic_exit_manager',
+    'src.strategies.dynamic_stop_loss',
+    'utils.risk_manager',
+    'strategies.dynamic_exit_manager',
+    'strategies.dynamic_stop_loss',
+)
+
+
+class SimulatedClock:
+    """수동으로 진행하는 시계"""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self.current = start or datetime(2000, 1, 1)
+
+    def now(self) -> datetime:
+        return self.current
+
+    def today(self) -> date:
+        return self.current.date()
+
+    def advance_to(self, when):
+        """시각 이동 (과거로는 이동하지 않음)"""
+        when = pd.Timestamp(when).to_pydatetime()
+        if when > self.current:
+            self.current = when
+
+    def advance(self, seconds: float):
+        self.current += timedelta(seconds=seconds)
+
+    def timestamp(self) -> float:
+        """시뮬레이션 시각의 epoch 초 (KST 기준 tz 없는 시각을 그대로 사용)"""
+        return self.current.timestamp()
+
+    @contextmanager
+    def patch(self, modules: Iterable[str] = DEFAULT_PATCH_MODULES):
+        """
+        블록 안에서 지정 모듈의 datetime/date를 시뮬레이션 시계로 교체
+
+        Example:
+            with clock.patch():
+                engine.run(...)
+        """
+        sim_datetime, sim_date = self._make_classes()
+        replaced = []
+        for name in modules:
+            module = sys.modules.get(name)
+            if module is None:
+                continue
+            for attr, sim in (('datetime', sim_datetime), ('date', sim_date)):
+                original = getattr(module, attr, None)
+                if original in (datetime, date):
+                    setattr(module, attr, sim)
+                    replaced.append((module, attr, original))
+        try:
+            yield self
+        finally:
+            for module, attr, original in replaced:
+                setattr(module, attr, original)
+
+    def _make_classes(self):
+        clock = self
+
+        class SimDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now()
+
+        class SimDate(date):
+            @classmethod
+            def today(cls):
+                return clock.today()
+
+        return SimDatetime, SimDate
@@ -0,0 +1,360 @@
+"""
+이벤트 기반 백테스트 엔진
+- 과거 캔들을 봉 마감 시각 순서로 재생 (시뮬레이션 시계, 실제 대기 없음)
+- 기존 전략 클래스의 generate_signal / should_exit, RiskManager, DynamicExitManager를 그대로 사용
+- 결과: 거래 내역, 자산 곡선, 처리 속도 (초당 봉 수)
+"""
+
+import heapq
+import inspect
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.candle_store import OHLCV_COLUMNS, interval_seconds
+from .clock import SimulatedClock
+
+
+@dataclass
+class BacktestResult:
+    """백테스트 결과"""
+    trades: List[Dict] = field(default_factory=list)
+    equity_curve: pd.Series = field(default_factory=lambda: pd.Series(dtype='float64'))
+    initial_capital: float = 0.0
+    bars: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity_curve.iloc[-1]) if len(self.equity_curve) else self.initial_capital
+
+    @property
+    def max_drawdown(self) -> float:
+        """최대 낙폭 (%)"""
+        if len(self.equity_curve) == 0:
+            return 0.0
+        equity = self.equity_curve.to_numpy()
+        peak = np.maximum.accumulate(equity)
+        return float(((equity - peak) / peak).min() * 100)
+
+    def summary(self) -> Dict:
+        """요약 통계"""
+        closed = [t for t in self.trades if t['side'] == 'SELL']
+        wins = sum(1 for t in closed if t['profit_loss'] > 0)
+        return {
+            'trades': len(closed),
+            'win_rate': (wins / len(closed) * 100) if closed else 0.0,
+            'total_return': ((self.final_equity - self.initial_capital) / self.initial_capital * 100)
+                            if self.initial_capital else 0.0,
+            'final_equity': self.final_equity,
+            'max_drawdown': self.max_drawdown,
+            'bars': self.bars,
+            'elapsed': self.elapsed,
+            'bars_per_second': self.bars_per_second,
+        }
+
+
+class BacktestEngine:
+    """과거 캔들 위에서 전략 + 리스크 관리 실행"""
+
+    def __init__(self, strategies: Dict, risk_manager, exit_manager=None,
+                 strategy_selector: Optional[Callable[[str, pd.Timestamp], str]] = None,
+                 interval: str = 'minute5', window: int = 200, slippage: float = 0.0,
+                 min_trade_interval: float = 0.0, exchange=None, stop_loss_manager=None):
+        """
+        초기화
+
+        Args:
+            strategies: {전략 이름: 전략 객체} (AutoProfitBot.strategies와 같은 형식)
+            risk_manager: RiskManager (수수료 0.05%는 close_position에서 반영)
+            exit_manager: DynamicExitManager (None이면 미사용)
+            strategy_selector: selector(ticker, 봉 시각) → 전략 이름
+                               (None이면 첫 번째 전략 고정)
+            interval: 봉 간격
+            window: 신호 생성에 넘길 최근 봉 개수 (실거래의 get_ohlcv count와 동일)
+            slippage: 체결가 불리 비율 (매수는 높게, 매도는 낮게)
+            min_trade_interval: 같은 코인 재진입 최소 간격 (초, 시뮬레이션 시각 기준)
+            exchange: SimulatedExchange (주면 slippage 대신 호가창 체결가 사용,
+                      거래소 시계는 engine.clock.now로 생성)
+            stop_loss_manager: DynamicStopLoss (주면 실거래와 같이 진입 시 손절가 설정,
+                               트리거/트레일링 스탑 적용)
+        """
+        self.strategies = strategies
+        self.risk_manager = risk_manager
+        self.exit_manager = exit_manager
+        default_name = next(iter(strategies))
+        self.strategy_selector = strategy_selector or (lambda ticker, ts: default_name)
+        self.interval = interval
+        self.window = window
+        self.slippage = slippage
+        self.min_trade_interval = min_trade_interval
+        self.exchange = exchange
+        self.stop_loss_manager = stop_loss_manager
+
+        self.step = pd.Timedelta(seconds=interval_seconds(interval))
+        self.clock = SimulatedClock()
+
+        # 전략별 should_exit 추가 인자 (보유 시간, 가격 이력)
+        self._exit_params = {
+            name: set(inspect.signature(s.should_exit).parameters) for name, s in strategies.items()
+        }
+
+    # ==================== 실행 ====================
+
+    def run(self, data: Dict[str, pd.DataFrame]) -> BacktestResult:
+        """
+        백테스트 실행
+
+        Args:
+            data: {ticker: OHLCV DataFrame (KST 인덱스, 시간순)}
+
+        Returns:
+            BacktestResult
+        """
+        frames = {t: df[OHLCV_COLUMNS] for t, df in data.items() if df is not None and len(df) > 0}
+        result = BacktestResult(initial_capital=self.risk_manager.current_balance)
+        if not frames:
+            return result
+
+        self._entries: Dict[str, Dict] = {}
+        self._price_history: Dict[str, List[float]] = {}
+        self._last_trade: Dict[str, pd.Timestamp] = {}
+        self._last_close: Dict[str, float] = {}
+        self._result = result
+
+        start = time.perf_counter()
+        equity_times, equity_values = [], []
+        first = min(df.index[0] for df in frames.values())
+        self.clock.current = pd.Timestamp(first).to_pydatetime()
+        self.risk_manager.last_reset_date = self.clock.today()
+
+        with self.clock.patch():
+            for ts, bars in self._events(frames):
+                # 봉 마감 시각으로 시계 이동
+                self.clock.advance_to(ts + self.step)
+                self.risk_manager.reset_daily_stats()
+
+                for ticker, i in bars:
+                    self._on_bar(ticker, frames[ticker], i, ts)
+                    result.bars += 1
+
+                equity_times.append(ts)
+                equity_values.append(self._equity())
+
+        result.elapsed = time.perf_counter() - start
+        result.equity_curve = pd.Series(equity_values, index=pd.DatetimeIndex(equity_times), name='equity')
+        return result
+
+    # ==================== 내부 ====================
+
+    @staticmethod
+    def _events(frames: Dict[str, pd.DataFrame]):
+        """(봉 시각, [(ticker, 행 번호), ...])를 시간순으로 생성 (티커별 시계열 병합)"""
+        heap = []
+        for ticker, df in frames.items():
+            heap.append((df.index[0], ticker, 0))
+        heapq.heapify(heap)
+
+        while heap:
+            ts = heap[0][0]
+            bars = []
+            while heap and heap[0][0] == ts:
+                _, ticker, i = heapq.heappop(heap)
+                bars.append((ticker, i))
+                df = frames[ticker]
+                if i + 1 < len(df):
+                    heapq.heappush(heap, (df.index[i + 1], ticker, i + 1))
+            yield ts, bars
+
+    def _on_bar(self, ticker: str, df: pd.DataFrame, i: int, ts: pd.Timestamp):
+        price = float(df['close'].iat[i])
+        self._last_close[ticker] = price
+        history = self._price_history.setdefault(ticker, [])
+        history.append(price)
+        del history[:-20]
+
+        if i + 1 < min(self.window, 50):
+            return  # 지표 계산용 봉 부족
+        window = df.iloc[max(0, i + 1 - self.window):i + 1]
+
+        if ticker in self.risk_manager.positions:
+            strategy_name = self._entries[ticker]['strategy']
+            strategy = self.strategies[strategy_name]
+            signal, reason, _ = strategy.generate_signal(window, ticker)
+            if signal == 'SELL':
+                self._sell(ticker, price, ts, f"매도 신호: {reason}")
+                return
+            self._check_exit(ticker, strategy_name, strategy, price, ts)
+            return
+
+        last = self._last_trade.get(ticker)
+        if last is not None and (ts - last).total_seconds() < self.min_trade_interval:
+            return
+
+        strategy_name = self.strategy_selector(ticker, ts)
+        strategy = self.strategies.get(strategy_name)
+        if strategy is None or not strategy.enabled:
+            return
+        signal, reason, _ = strategy.generate_signal(window, ticker)
+        if signal == 'BUY':
+            trend = 'up' if len(history) > 1 and history[-1] > history[-2] else 'down'
+            self._buy(ticker, strategy_name, price, ts, reason, {'trend': trend})
+
+    def _check_exit(self, ticker: str, strategy_name: str, strategy, price: float, ts: pd.Timestamp):
+        entry = self._entries[ticker]
+        position = self.risk_manager.positions[ticker]
+        hold_time = (self.clock.now() - entry['time']).total_seconds()
+
+        kwargs = {}
+        params = self._exit_params[strategy_name]
+        if 'hold_time' in params:
+            kwargs['hold_time'] = hold_time
+        if 'holding_duration' in params:
+            kwargs['holding_duration'] = hold_time
+        if 'price_history' in params:
+            kwargs['price_history'] = self._price_history[ticker][-entry['bars'] - 1:]
+        entry['bars'] += 1
+
+        if self.stop_loss_manager is not None and 'stop_loss_price' in entry:
+            # 실거래 조건 9와 같은 순서: 손절가 도달 → 트레일링 상향 (수익 1% 초과)
+            profit_ratio = (price - position.avg_buy_price) / position.avg_buy_price * 100
+            if self.stop_loss_manager.should_trigger_stop_loss(price, entry['stop_loss_price']):
+                reason = self.stop_loss_manager.get_stop_loss_reason(
+                    price, position.avg_buy_price, entry['stop_loss_price'], profit_ratio
+                )
+                self._sell(ticker, price, ts, reason)
+                return
+            if profit_ratio > 1.0:
+                entry['stop_loss_price'] = self.stop_loss_manager.update_stop_loss_trailing(
+                    price, position.avg_buy_price, entry['stop_loss_price'], strategy_name, profit_ratio
+                )
+
+        should_exit, reason = strategy.should_exit(position.avg_buy_price, price, **kwargs)
+        if should_exit:
+            self._sell(ticker, price, ts, reason)
+            return
+
+        if self.exit_manager is not None:
+            self.exit_manager.update_position(ticker, price)
+            should_exit, reason, ratio = self.exit_manager.should_exit(ticker, price, {}, {})
+            if should_exit:
+                self._sell(ticker, price, ts, reason, ratio)
+
+    def _buy(self, ticker: str, strategy_name: str, price: float, ts: pd.Timestamp, reason: str,
+             market_condition: Optional[Dict] = None):
+        can_open, _ = self.risk_manager.can_open_position(ticker)
+        if not can_open:
+            return
+        budget = self.risk_manager.calculate_position_size(price)
+        if budget <= 0:
+            return
+
+        if self.exchange is not None:
+            fill, amount = self._exchange_fill(self.exchange.buy_market_order(ticker, budget))
+            if not amount:
+                return
+        else:
+            fill = price * (1 + self.slippage)
+            amount = budget / fill
+        if not self.risk_manager.add_position(ticker, amount, fill, strategy_name):
+            return
+
+        # Position.entry_time 기본값은 실제 시각이므로 시뮬레이션 시각으로 교체
+        now = self.clock.now()
+        self.risk_manager.positions[ticker].entry_time = now
+        self._entries[ticker] = {'strategy': strategy_name, 'time': now, 'bars': 0}
+        if self.stop_loss_manager is not None:
+            self._entries[ticker]['stop_loss_price'] = self.stop_loss_manager.calculate_optimal_stop_loss(
+                ticker, strategy_name, fill, market_condition or {}
+            )
+        self._last_trade[ticker] = ts
+        if self.exit_manager is not None:
+            self.exit_manager.register_position(ticker, fill, now, self.strategies[strategy_name].name, 0)
+
+        self._result.trades.append({
+            'time': now, 'ticker': ticker, 'side': 'BUY', 'strategy': strategy_name,
+            'price': fill, 'amount': amount, 'reason': reason,
+        })
+
+    def _sell(self, ticker: str, price: float, ts: pd.Timestamp, reason: str, ratio: float = 1.0):
+        position = self.risk_manager.positions[ticker]
+        entry = self._entries[ticker]
+        if self.exchange is not None:
+            fill, executed = self._exchange_fill(self.exchange.sell_market_order(ticker, position.amount * ratio))
+            if not executed:
+                return
+            # 호가 잔량 부족으로 일부만 체결되면 체결분만 부분 매도
+            ratio = min(ratio, executed / position.amount)
+        else:
+            fill = price * (1 - self.slippage)
+
+        if ratio < 1.0:
+            # 부분 매도: 매도 수량만큼 포지션 축소
+            amount = position.amount * ratio
+            sell_value = fill * amount
+            profit_loss = (fill - position.avg_buy_price) * amount - \
+                self._fee(position.avg_buy_price * amount, sell_value)
+            position.amount -= amount
+            self.risk_manager.current_balance += sell_value - self._fee(position.avg_buy_price * amount, sell_value)
+            self.risk_manager.daily_profit_loss += profit_loss
+            self.risk_manager.cumulative_profit_loss += profit_loss
+        else:
+            amount = position.amount
+            buy_value = position.avg_buy_price * amount
+            profit_loss = self.risk_manager.close_position(ticker, fill)
+            # RiskManager는 수수료를 손익 통계에만 반영하므로 잔고에서도 차감
+            self.risk_manager.current_balance -= self._fee(buy_value, fill * amount)
+            self._entries.pop(ticker, None)
+            if self.exit_manager is not None:
+                self.exit_manager.remove_position(ticker)
+
+        self._last_trade[ticker] = ts
+        self._result.trades.append({
+            'time': self.clock.now(), 'ticker': ticker, 'side': 'SELL', 'strategy': entry['strategy'],
+            'price': fill, 'amount': amount, 'reason': reason, 'profit_loss': profit_loss,
+            'hold_seconds': (self.clock.now() - entry['time']).total_seconds(),
+        })
+
+    @staticmethod
+    def _exchange_fill(order: Optional[Dict]):
+        """모의 거래소 주문 결과 → (평균 체결가, 체결 수량)"""
+        if not order or not order['trades']:
+            return 0.0, 0.0
+        volume = sum(float(t['volume']) for t in order['trades'])
+        funds = sum(float(t['funds']) for t in order['trades'])
+        return funds / volume, volume
+
+    @staticmethod
+    def _fee(buy_value: float, sell_value: float) -> float:
+        return (buy_value + sell_value) * 0.0005
+
+    def _equity(self) -> float:
+        value = self.risk_manager.current_balance
+        for ticker, position in self.risk_manager.positions.items():
+            value += position.amount * self._last_close.get(ticker, position.avg_buy_price)
+        return value
+
+
+def weighted_strategy_selector(weights_for_hour: Callable[[int], Dict[str, float]], seed: int = 0):
+    """
+    시간대별 가중치로 전략 선택 (AutoProfitBot.select_strategy와 같은 방식, 재현 가능한 난수)
+
+    Args:
+        weights_for_hour: hour → {전략 이름: 가중치} (예: Config.get_time_weights)
+        seed: 난수 시드
+    """
+    rng = random.Random(seed)
+
+    def select(ticker: str, ts: pd.Timestamp) -> str:
+        weights = weights_for_hour(ts.hour)
+        return rng.choices(list(weights), weights=list(weights.values()), k=1)[0]
+
+    return select
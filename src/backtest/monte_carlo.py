@@ -0,0 +1,405 @@
+"""
+몬테카를로 강건성 검증
+- 과거 캔들에서 가상 가격 경로 생성: 블록 부트스트랩 + 경로별 변동성 배율 + 거래별 슬리피지 잡음
+- 경로마다 전략 + 리스크 관리 실행 (프로세스 풀, 경로 번호별 난수 → 워커 수와 무관하게 재현)
+- 결과: 손익 / 최대 낙폭 분포 (분위수, VaR / CVaR, 손실 확률)
+
+평가 방식:
+- vector: generate_signals_vectorized + 손절/익절, 봉 단위 평가 자산 (경로당 수 ms, 1만 경로 수 분)
+- engine: BacktestEngine + RiskManager + DynamicExitManager + DynamicStopLoss (실거래 청산 순서, 느림)
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import Config
+from src.strategies.dynamic_exit_manager import DynamicExitManager
+from src.strategies.dynamic_stop_loss import DynamicStopLoss
+from .engine import BacktestEngine
+from .runner import STRATEGY_CLASSES, build_risk_manager, load_history
+from .vectorized import simulate
+
+
+EVALUATORS = ('vector', 'engine')
+
+
+# ==================== 경로 생성 ====================
+
+class PathGenerator:
+    """
+    원본 봉의 (종가 수익률, 시가 갭, 고가/저가 꼬리, 거래량)을 블록 단위로 재표본
+
+    같은 블록 안에서는 봉 특징이 함께 이동하므로 변동성 군집과 거래량 급증-가격 급등 관계가 유지됨
+    """
+
+    def __init__(self, df: pd.DataFrame, block: int = 60, length: Optional[int] = None,
+                 vol_range: Tuple[float, float] = (0.8, 1.5)):
+        """
+        초기화
+
+        Args:
+            df: 원본 OHLCV DataFrame (시간순)
+            block: 블록 길이 (봉)
+            length: 생성 경로 길이 (None이면 원본 길이)
+            vol_range: 경로별 변동성 배율 범위 (균등 분포, (1, 1)이면 미사용)
+        """
+        df = df[['open', 'high', 'low', 'close', 'volume']].dropna()
+        if len(df) < 3:
+            raise ValueError("경로 생성에 필요한 봉이 부족합니다")
+
+        o, h, l, c = (df[col].to_numpy(dtype='float64') for col in ('open', 'high', 'low', 'close'))
+        prev = c[:-1]
+        o, h, l, c = o[1:], h[1:], l[1:], c[1:]
+        body_top = np.maximum(o, c)
+        body_bottom = np.minimum(o, c)
+
+        self.returns = np.log(c / prev)
+        self.gaps = np.log(o / prev)
+        self.upper = np.log(np.maximum(h, body_top) / body_top)
+        self.lower = np.log(body_bottom / np.minimum(l, body_bottom))
+        self.volume = df['volume'].to_numpy(dtype='float64')[1:]
+        self.drift = float(self.returns.mean())
+
+        self.start_price = float(df['close'].iat[0])
+        self.block = max(1, min(block, len(self.returns)))
+        self.length = length or len(df)
+        self.vol_range = vol_range
+
+        step = pd.Series(df.index).diff().median()
+        self.index = pd.date_range(df.index[0], periods=self.length, freq=step)
+
+    def sample(self, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """
+        경로 1개 생성 (원형 블록 부트스트랩)
+
+        Returns:
+            {'open', 'high', 'low', 'close', 'volume': 길이 length 배열}
+        """
+        n = len(self.returns)
+        blocks = -(-self.length // self.block)
+        starts = rng.integers(0, n, size=blocks)
+        idx = ((starts[:, None] + np.arange(self.block)) % n).ravel()[:self.length]
+
+        # 평균 수익률(추세)은 유지하고 변동 폭만 배율 적용
+        scale = rng.uniform(*self.vol_range)
+        returns = (self.returns[idx] - self.drift) * scale + self.drift
+        close = self.start_price * np.exp(np.cumsum(returns))
+        prev = np.concatenate(([self.start_price], close[:-1]))
+        opened = prev * np.exp((self.gaps[idx] - self.drift) * scale + self.drift)
+
+        return {
+            'open': opened,
+            'high': np.maximum(opened, close) * np.exp(self.upper[idx] * scale),
+            'low': np.minimum(opened, close) * np.exp(-self.lower[idx] * scale),
+            'close': close,
+            'volume': self.volume[idx],
+        }
+
+    def frame(self, path: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """경로 배열 → OHLCV DataFrame (원본 봉 간격 인덱스)"""
+        df = pd.DataFrame(path, index=self.index)
+        df['value'] = df['close'] * df['volume']
+        return df
+
+
+def max_drawdown(equity: np.ndarray) -> float:
+    """최대 낙폭 (%)"""
+    if len(equity) == 0:
+        return 0.0
+    peak = np.maximum.accumulate(equity)
+    return float(((equity - peak) / peak).min() * 100)
+
+
+# ==================== 경로 평가 ====================
+
+def evaluate_vector(strategy, path: Dict[str, np.ndarray], rng: np.random.Generator,
+                    slippage: Tuple[float, float] = (0.0005, 0.0005),
+                    position_ratio: float = 1.0) -> Dict:
+    """
+    벡터 신호로 경로 1개 평가
+
+    Args:
+        strategy: generate_signals_vectorized를 구현한 전략 객체
+        path: PathGenerator.sample 결과
+        rng: 슬리피지 잡음 난수
+        slippage: (평균, 표준편차) 체결가 불리 비율 (거래마다 진입/청산 따로 추출, 음수는 0)
+        position_ratio: 거래당 자산 투입 비율 (Config.MAX_POSITION_RATIO)
+
+    Returns:
+        {'pnl', 'max_drawdown', 'trades', 'win_rate'} (%, 회)
+    """
+    close = path['close']
+    signals = strategy.generate_signals_vectorized(path)
+    if signals is None:
+        raise NotImplementedError(f"{strategy.name}은 벡터 신호를 지원하지 않습니다")
+    entries, exits = signals
+    trades = simulate(close, entries, exits,
+                      stop_loss=getattr(strategy, 'stop_loss', None),
+                      take_profit=getattr(strategy, 'take_profit', None))
+
+    # 거래별 슬리피지 잡음: 진입가는 높게, 청산가는 낮게
+    noise = np.abs(rng.normal(slippage[0], slippage[1], size=(len(trades), 2)))
+    returns = (1 + trades['ret']) * (1 - noise[:, 1]) / (1 + noise[:, 0]) - 1
+
+    # 봉 단위 평가 자산 (보유 구간은 종가 평가)
+    equity = np.ones(len(close))
+    level = 1.0
+    done = 0
+    for (entry, exit_at, buy), ret in zip(trades[['entry', 'exit', 'entry_price']], returns):
+        equity[done:entry + 1] = level
+        equity[entry + 1:exit_at] = level * (1 + position_ratio * (close[entry + 1:exit_at] / buy - 1))
+        level *= 1 + position_ratio * ret
+        equity[exit_at] = level
+        done = exit_at + 1
+    equity[done:] = level
+
+    return {
+        'pnl': (level - 1) * 100,
+        'max_drawdown': max_drawdown(equity),
+        'trades': len(returns),
+        'win_rate': float((returns > 0).mean() * 100) if len(returns) else 0.0,
+    }
+
+
+def evaluate_engine(strategy_name: str, params: Dict, df: pd.DataFrame, rng: np.random.Generator,
+                    slippage: Tuple[float, float] = (0.0005, 0.0005), interval: str = 'minute1') -> Dict:
+    """
+    이벤트 엔진으로 경로 1개 평가 (RiskManager, DynamicExitManager, DynamicStopLoss 포함)
+
+    슬리피지는 경로마다 1회 추출해 전체 거래에 적용
+
+    Returns:
+        {'pnl', 'max_drawdown', 'trades', 'win_rate'} (%, 회)
+    """
+    strategies = {strategy_name: _build_strategy(strategy_name, params)}
+    engine = BacktestEngine(
+        strategies,
+        build_risk_manager(),
+        exit_manager=DynamicExitManager(mode=Config.EXIT_MODE) if Config.ENABLE_DYNAMIC_EXIT else None,
+        interval=interval,
+        slippage=float(abs(rng.normal(*slippage))),
+        # 학습 이력 없음 → 전략별 기본 손절 + 변동성/추세 조정만 적용
+        stop_loss_manager=DynamicStopLoss(SimpleNamespace(experiences=[]), Config),
+    )
+    summary = engine.run({'KRW-MC': df}).summary()
+    return {
+        'pnl': summary['total_return'],
+        'max_drawdown': summary['max_drawdown'],
+        'trades': summary['trades'],
+        'win_rate': summary['win_rate'],
+    }
+
+
+def _build_strategy(name: str, params: Optional[Dict] = None):
+    return STRATEGY_CLASSES[name]({**Config.get_strategy_config(name), **(params or {})})
+
+
+# ==================== 워커 ====================
+
+_WORKER: Dict = {}
+
+
+def _init_worker(settings: Dict):
+    global _WORKER
+    _WORKER = dict(settings)
+    _WORKER['strategy'] = _build_strategy(settings['strategy_name'], settings['params'])
+
+
+def _run_paths(indices: List[int]) -> List[Dict]:
+    """경로 묶음 평가 (경로 i의 난수는 (seed, i)로 고정)"""
+    w = _WORKER
+    results = []
+    for i in indices:
+        rng = np.random.default_rng([w['seed'], i])
+        path = w['generator'].sample(rng)
+        if w['evaluator'] == 'engine':
+            results.append(evaluate_engine(w['strategy_name'], w['params'], w['generator'].frame(path),
+                                           rng, w['slippage'], w['interval']))
+        else:
+            results.append(evaluate_vector(w['strategy'], path, rng, w['slippage'], w['position_ratio']))
+    return results
+
+
+# ==================== 검증 ====================
+
+@dataclass
+class MonteCarloResult:
+    """경로별 결과 배열"""
+    pnl: np.ndarray
+    max_drawdown: np.ndarray
+    trades: np.ndarray
+    win_rate: np.ndarray
+    elapsed: float = 0.0
+    settings: Dict = field(default_factory=dict)
+
+    @property
+    def paths(self) -> int:
+        return len(self.pnl)
+
+    def summary(self, percentiles=(1, 5, 25, 50, 75, 95, 99), alpha: float = 0.05) -> Dict:
+        """
+        분포 요약
+
+        Args:
+            percentiles: 분위수 목록 (%)
+            alpha: VaR / CVaR 꼬리 확률
+
+        Returns:
+            {'paths', 'pnl': {...}, 'max_drawdown': {...}, 'var', 'cvar', 'loss_probability', ...}
+        """
+        if self.paths == 0:
+            return {'paths': 0}
+        var = float(np.percentile(self.pnl, alpha * 100))
+        tail = self.pnl[self.pnl <= var]
+        return {
+            'paths': self.paths,
+            'pnl': {p: float(np.percentile(self.pnl, p)) for p in percentiles},
+            'max_drawdown': {p: float(np.percentile(self.max_drawdown, p)) for p in percentiles},
+            'mean_pnl': float(self.pnl.mean()),
+            'var': var,
+            'cvar': float(tail.mean()) if len(tail) else var,
+            'loss_probability': float((self.pnl < 0).mean() * 100),
+            'avg_trades': float(self.trades.mean()),
+            'avg_win_rate': float(self.win_rate.mean()),
+            'elapsed': self.elapsed,
+            'paths_per_second': self.paths / self.elapsed if self.elapsed > 0 else 0.0,
+        }
+
+
+class MonteCarloStudy:
+    """전략 1개에 대한 몬테카를로 경로 검증"""
+
+    def __init__(self, df: pd.DataFrame, strategy: str = 'ultra_scalping', params: Optional[Dict] = None,
+                 evaluator: str = 'vector', block: int = 60, length: Optional[int] = None,
+                 vol_range: Tuple[float, float] = (0.8, 1.5), slippage: Tuple[float, float] = (0.0005, 0.0005),
+                 interval: str = 'minute1', workers: Optional[int] = None, seed: int = 0):
+        """
+        초기화
+
+        Args:
+            df: 원본 OHLCV DataFrame
+            strategy: 전략 이름 (STRATEGY_CLASSES 키)
+            params: 설정 덮어쓸 파라미터
+            evaluator: 'vector' (빠름) 또는 'engine' (전체 리스크 스택)
+            block: 부트스트랩 블록 길이 (봉)
+            length: 경로 길이 (None이면 원본 길이)
+            vol_range: 경로별 변동성 배율 범위
+            slippage: (평균, 표준편차) 체결가 불리 비율
+            interval: 봉 간격 (engine 평가용)
+            workers: 프로세스 수 (None: CPU 수, 1: 단일 프로세스)
+            seed: 난수 시드
+        """
+        if evaluator not in EVALUATORS:
+            raise ValueError(f"지원하지 않는 평가 방식: {evaluator}")
+        if strategy not in STRATEGY_CLASSES:
+            raise ValueError(f"알 수 없는 전략: {strategy}")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.settings = {
+            'generator': PathGenerator(df, block=block, length=length, vol_range=vol_range),
+            'strategy_name': strategy,
+            'params': params or {},
+            'evaluator': evaluator,
+            'slippage': slippage,
+            'interval': interval,
+            'position_ratio': Config.MAX_POSITION_RATIO,
+            'seed': seed,
+        }
+
+    def run(self, paths: int = 10000) -> MonteCarloResult:
+        """
+        경로 paths개 평가
+
+        Returns:
+            MonteCarloResult
+        """
+        start = time.perf_counter()
+        # 워커당 여러 묶음 → 느린 경로가 몰려도 부하 분산
+        size = max(1, min(500, paths // (self.workers * 8) or 1))
+        chunks = [list(range(i, min(i + size, paths))) for i in range(0, paths, size)]
+
+        if self.workers <= 1:
+            _init_worker(self.settings)
+            outputs = [_run_paths(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.settings,)) as pool:
+                outputs = list(pool.map(_run_paths, chunks))
+
+        rows = [row for chunk in outputs for row in chunk]
+        settings = {k: v for k, v in self.settings.items() if k != 'generator'}
+        return MonteCarloResult(
+            pnl=np.array([r['pnl'] for r in rows], dtype='float64'),
+            max_drawdown=np.array([r['max_drawdown'] for r in rows], dtype='float64'),
+            trades=np.array([r['trades'] for r in rows], dtype='int64'),
+            win_rate=np.array([r['win_rate'] for r in rows], dtype='float64'),
+            elapsed=time.perf_counter() - start,
+            settings=settings,
+        )
+
+
+def print_report(result: MonteCarloResult):
+    """분포 요약 출력"""
+    summary = result.summary()
+    if not summary['paths']:
+        print("⚠️ 평가된 경로가 없습니다")
+        return
+    pnl, mdd = summary['pnl'], summary['max_drawdown']
+    print("=" * 60)
+    print(f"🎲 몬테카를로 검증 ({result.settings.get('strategy_name')}, {result.settings.get('evaluator')})")
+    print(f"   경로: {summary['paths']:,}개 / {summary['elapsed']:.1f}초 ({summary['paths_per_second']:,.0f}경로/초)")
+    print(f"   수익률 분위 (1/5/50/95/99%): {pnl[1]:+.2f} / {pnl[5]:+.2f} / {pnl[50]:+.2f} / "
+          f"{pnl[95]:+.2f} / {pnl[99]:+.2f}%")
+    print(f"   VaR 5%: {summary['var']:+.2f}% | CVaR 5%: {summary['cvar']:+.2f}% | "
+          f"손실 확률: {summary['loss_probability']:.1f}%")
+    print(f"   최대 낙폭 (중앙/5%/1%): {mdd[50]:.2f} / {mdd[5]:.2f} / {mdd[1]:.2f}%")
+    print(f"   평균 거래: {summary['avg_trades']:.1f}회 | 평균 승률: {summary['avg_win_rate']:.1f}%")
+    print("=" * 60)
+
+
+def _pair(text: str) -> Tuple[float, float]:
+    low, high = (float(v) for v in text.split(','))
+    return low, high
+
+
+def main():
+    """몬테카를로 검증 명령"""
+    parser = argparse.ArgumentParser(description='전략 몬테카를로 강건성 검증')
+    parser.add_argument('--strategy', default='ultra_scalping', choices=list(STRATEGY_CLASSES), help='전략 이름')
+    parser.add_argument('--ticker', default='KRW-BTC', help='원본 티커')
+    parser.add_argument('--interval', default='minute1', help='봉 간격')
+    parser.add_argument('--days', type=float, default=7, help='원본 기간 (일)')
+    parser.add_argument('--paths', type=int, default=10000, help='경로 수')
+    parser.add_argument('--evaluator', default='vector', choices=EVALUATORS, help='평가 방식')
+    parser.add_argument('--block', type=int, default=60, help='부트스트랩 블록 길이 (봉)')
+    parser.add_argument('--length', type=int, default=None, help='경로 길이 (봉, 기본: 원본 길이)')
+    parser.add_argument('--vol', type=_pair, default=(0.8, 1.5), help='변동성 배율 범위 (예: 0.8,1.5)')
+    parser.add_argument('--slippage', type=_pair, default=(0.0005, 0.0005), help='슬리피지 평균,표준편차')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+
+    from src.utils.candle_archive import CandleArchive
+
+    frames = load_history([args.ticker], args.interval, args.days, CandleArchive(Config.CANDLE_ARCHIVE_DIR))
+    df = frames.get(args.ticker)
+    if df is None or len(df) < 100:
+        print(f"❌ {args.ticker} 캔들 데이터 부족")
+        return
+
+    study = MonteCarloStudy(df, args.strategy, evaluator=args.evaluator, block=args.block, length=args.length,
+                            vol_range=args.vol, slippage=args.slippage, interval=args.interval,
+                            workers=args.workers, seed=args.seed)
+    print_report(study.run(args.paths))
+
+
+if __name__ == "__main__":
+    main()
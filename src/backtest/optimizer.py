@@ -0,0 +1,461 @@
+"""
+전략 파라미터 최적화 (오프라인)
+- Config.get_strategy_config 값 주변으로 탐색 공간 생성 (grid / random / bayes)
+- 워크 포워드: 학습 구간에서 최적 파라미터 선택 → 다음 검증 구간에서 평가
+- 후보 평가는 프로세스 풀에서 벡터 백테스트로 병렬 실행
+- 평가 결과는 (데이터 해시, 구간, 파라미터) 키로 캐시
+- 결과는 LearningEngine이 로드하는 optimized_params.json 형식으로 저장
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import Config
+from src.utils.vector_indicators import stack_ohlcv
+from .runner import STRATEGY_CLASSES, load_history
+from .vectorized import simulate
+
+
+# 탐색에서 제외할 설정 (신호/손익절에 영향 없음)
+EXCLUDED_PARAMS = {'enabled', 'max_hold_time', 'smart_exit', 'profit_recheck_threshold', 'momentum_threshold'}
+
+# 기본 탐색 배율 (설정값 × 배율)
+DEFAULT_SCALES = (0.5, 0.75, 1.0, 1.25, 1.5)
+
+# LearningEngine이 읽는 RSI 파라미터 이름 (전략 설정 이름 → rsi_low / rsi_high)
+RSI_ALIASES = {
+    'rsi_oversold': 'rsi_low',
+    'rsi_overbought': 'rsi_high',
+    'rsi_min': 'rsi_low',
+    'rsi_max': 'rsi_high',
+}
+
+# 검증 구간 거래가 이보다 적으면 점수 0 (과적합 방지)
+MIN_TRADES = 3
+
+
+def default_space(strategy: str, scales=DEFAULT_SCALES) -> Dict[str, List]:
+    """
+    설정값 기반 탐색 공간
+
+    Args:
+        strategy: 전략 이름 (Config.STRATEGIES 키)
+        scales: 설정값에 곱할 배율
+
+    Returns:
+        {파라미터: 후보 값 리스트}
+    """
+    space = {}
+    for key, value in Config.get_strategy_config(strategy).items():
+        if key in EXCLUDED_PARAMS or isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if isinstance(value, int):
+            values = sorted({max(1, int(round(value * s))) for s in scales})
+        else:
+            values = sorted({round(value * s, 6) for s in scales})
+        space[key] = values
+    return space
+
+
+def walk_forward_splits(length: int, folds: int = 4, train_ratio: float = 0.7) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """
+    워크 포워드 구간 (연속 창을 앞으로 이동)
+
+    Args:
+        length: 전체 봉 수
+        folds: 구간 수
+        train_ratio: 각 창에서 학습 구간 비율
+
+    Returns:
+        [((학습 시작, 학습 끝), (검증 시작, 검증 끝)), ...] (끝은 미포함)
+    """
+    if folds < 1 or length < 2:
+        return []
+    # 창 크기 W, 검증 크기 T: W + (folds - 1) * T = length
+    window = int(length / (1 + (folds - 1) * (1 - train_ratio)))
+    test = max(1, int(window * (1 - train_ratio)))
+    train = window - test
+
+    splits = []
+    for k in range(folds):
+        start = k * test
+        end = start + window
+        if end > length:
+            break
+        splits.append(((start, start + train), (start + train, end)))
+    return splits
+
+
+def data_hash(tickers: List[str], index: pd.DatetimeIndex, data: Dict[str, np.ndarray]) -> str:
+    """캔들 데이터 해시 (캐시 키)"""
+    digest = hashlib.sha1()
+    digest.update(','.join(tickers).encode())
+    digest.update(index.asi8.tobytes())
+    for column in ('close', 'volume'):
+        digest.update(np.ascontiguousarray(data[column]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """평가 결과 캐시 (JSON 파일)"""
+
+    def __init__(self, path: Optional[str] = 'learning_data/optimization/sweep_cache.json'):
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"⚠️  최적화 캐시 로드 실패: {e}")
+
+    @staticmethod
+    def key(data_id: str, strategy: str, span: Tuple[int, int], params: Dict) -> str:
+        raw = json.dumps([data_id, strategy, list(span), params], sort_keys=True)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict):
+        self.entries[key] = result
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+
+# ==================== 워커 ====================
+
+_WORKER_DATA: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(data: Dict[str, np.ndarray]):
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def evaluate(strategy: str, params: Dict, span: Tuple[int, int],
+             data: Optional[Dict[str, np.ndarray]] = None, slippage: float = 0.0) -> Dict:
+    """
+    파라미터 1세트 평가 (구간 [start, end) 벡터 백테스트)
+
+    Args:
+        strategy: 전략 이름
+        params: 설정 덮어쓸 파라미터
+        span: (시작, 끝) 봉 위치
+        data: 티커 × 시간 행렬 (None이면 워커 전역 데이터)
+        slippage: 체결가 불리 비율
+
+    Returns:
+        {'score', 'trades', 'win_rate', 'avg_return'} (score: 티커별 누적 수익률 평균, %)
+    """
+    data = _WORKER_DATA if data is None else data
+    start, end = span
+    window = {column: matrix[:, start:end] for column, matrix in data.items()}
+
+    instance = STRATEGY_CLASSES[strategy]({**Config.get_strategy_config(strategy), **params})
+    signals = instance.generate_signals_vectorized(window)
+    if signals is None:
+        raise NotImplementedError(f"{instance.name}은 벡터 신호를 지원하지 않습니다")
+    entries, exits = signals
+    trades = simulate(window['close'], entries, exits,
+                      stop_loss=getattr(instance, 'stop_loss', None),
+                      take_profit=getattr(instance, 'take_profit', None),
+                      slippage=slippage)
+
+    returns = trades['ret']
+    rows = window['close'].shape[0]
+    totals = [np.prod(1 + returns[trades['ticker'] == row]) - 1 for row in range(rows)]
+    score = float(np.mean(totals) * 100) if rows else 0.0
+    if len(returns) < MIN_TRADES:
+        score = min(score, 0.0)
+    return {
+        'score': score,
+        'trades': int(len(returns)),
+        'win_rate': float((returns > 0).mean() * 100) if len(returns) else 0.0,
+        'avg_return': float(returns.mean() * 100) if len(returns) else 0.0,
+    }
+
+
+def _evaluate_task(task):
+    strategy, params, span, slippage = task
+    return evaluate(strategy, params, span, slippage=slippage)
+
+
+# ==================== 탐색 ====================
+
+class ParameterOptimizer:
+    """워크 포워드 파라미터 탐색"""
+
+    METHODS = ('grid', 'random', 'bayes')
+
+    def __init__(self, strategy: str, frames: Dict[str, pd.DataFrame], space: Optional[Dict[str, List]] = None,
+                 workers: Optional[int] = None, cache: Optional[ResultCache] = None,
+                 slippage: float = 0.0, seed: int = 0):
+        """
+        초기화
+
+        Args:
+            strategy: 전략 이름 (벡터 신호 지원 전략)
+            frames: {ticker: OHLCV DataFrame}
+            space: 탐색 공간 (None이면 default_space)
+            workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+            cache: 결과 캐시 (None이면 캐시 파일 없이 메모리만 사용)
+            slippage: 체결가 불리 비율
+            seed: random / bayes 난수 시드
+        """
+        self.strategy = strategy
+        self.space = space or default_space(strategy)
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache or ResultCache(path=None)
+        self.slippage = slippage
+        self.rng = random.Random(seed)
+
+        self.tickers, self.index, self.data = stack_ohlcv(frames)
+        self.data_id = data_hash(self.tickers, self.index, self.data)
+        self.evaluations = 0
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.cache.save()
+
+    # ==================== 평가 ====================
+
+    def evaluate_many(self, candidates: List[Dict], span: Tuple[int, int]) -> List[Dict]:
+        """후보 일괄 평가 (캐시 우선, 나머지는 병렬)"""
+        results: List[Optional[Dict]] = []
+        pending = []
+        for i, params in enumerate(candidates):
+            key = ResultCache.key(self.data_id, self.strategy, span, params)
+            cached = self.cache.get(key)
+            results.append(cached)
+            if cached is None:
+                pending.append((i, key))
+
+        if pending:
+            tasks = [(self.strategy, candidates[i], span, self.slippage) for i, _ in pending]
+            if self.workers > 1 and len(tasks) > 1:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                     initargs=(self.data,))
+                chunksize = max(1, len(tasks) // (self.workers * 4))
+                outputs = list(self._pool.map(_evaluate_task, tasks, chunksize=chunksize))
+            else:
+                outputs = [evaluate(s, p, sp, self.data, sl) for s, p, sp, sl in tasks]
+            for (i, key), output in zip(pending, outputs):
+                self.cache.put(key, output)
+                results[i] = output
+            self.evaluations += len(tasks)
+        return results
+
+    def search(self, span: Tuple[int, int], method: str = 'grid', trials: int = 50) -> Tuple[Dict, Dict]:
+        """
+        구간 [start, end)에서 최적 파라미터 탐색
+
+        Args:
+            span: (시작, 끝) 봉 위치
+            method: 'grid' (전체 조합) / 'random' / 'bayes' (상위 결과 분포로 다음 후보 샘플링)
+            trials: random / bayes 평가 횟수
+
+        Returns:
+            (최적 파라미터, 평가 결과)
+        """
+        if method == 'grid':
+            candidates = self._grid()
+            results = self.evaluate_many(candidates, span)
+        elif method == 'random':
+            candidates = self._sample(trials)
+            results = self.evaluate_many(candidates, span)
+        elif method == 'bayes':
+            candidates, results = self._bayes(span, trials)
+        else:
+            raise ValueError(f"지원하지 않는 탐색 방식: {method}")
+
+        best = max(range(len(candidates)), key=lambda i: results[i]['score'])
+        return candidates[best], results[best]
+
+    def _grid(self) -> List[Dict]:
+        keys = list(self.space)
+        return [dict(zip(keys, values)) for values in itertools.product(*self.space.values())]
+
+    def _sample(self, n: int, weights: Optional[Dict[str, List[float]]] = None) -> List[Dict]:
+        candidates = []
+        for _ in range(n):
+            candidates.append({
+                key: self.rng.choices(values, weights=weights[key] if weights else None, k=1)[0]
+                for key, values in self.space.items()
+            })
+        return candidates
+
+    def _bayes(self, span: Tuple[int, int], trials: int) -> Tuple[List[Dict], List[Dict]]:
+        """
+        이산 TPE 방식: 상위 25% 후보에서 자주 나온 값의 선택 확률을 높여 다음 배치 샘플링
+        (배치 크기 = 워커 수 → 라운드마다 모든 코어 사용)
+        """
+        batch = max(self.workers, 4)
+        candidates = self._sample(min(trials, batch * 2))
+        results = self.evaluate_many(candidates, span)
+
+        while len(candidates) < trials:
+            order = sorted(range(len(candidates)), key=lambda i: results[i]['score'], reverse=True)
+            cut = max(1, len(order) // 4)
+            good = [candidates[i] for i in order[:cut]]
+            bad = [candidates[i] for i in order[cut:]]
+
+            weights = {}
+            for key, values in self.space.items():
+                weights[key] = [
+                    (sum(1 for c in good if c[key] == v) + 1) / (sum(1 for c in bad if c[key] == v) + 1)
+                    for v in values
+                ]
+            batch_candidates = self._sample(min(batch, trials - len(candidates)), weights)
+            candidates += batch_candidates
+            results += self.evaluate_many(batch_candidates, span)
+        return candidates, results
+
+    # ==================== 워크 포워드 ====================
+
+    def walk_forward(self, method: str = 'grid', trials: int = 50, folds: int = 4,
+                     train_ratio: float = 0.7) -> Dict:
+        """
+        워크 포워드 최적화
+
+        Args:
+            method: 탐색 방식
+            trials: random / bayes 평가 횟수 (구간별)
+            folds: 구간 수
+            train_ratio: 학습 구간 비율
+
+        Returns:
+            {'params': 마지막 구간 최적 파라미터, 'folds': 구간별 결과,
+             'test_trades', 'test_win_rate', 'positive_folds'}
+        """
+        splits = walk_forward_splits(len(self.index), folds, train_ratio)
+        if not splits:
+            raise ValueError("워크 포워드 구간을 만들 데이터가 부족합니다")
+
+        fold_results = []
+        for train_span, test_span in splits:
+            params, train_result = self.search(train_span, method, trials)
+            test_result = self.evaluate_many([params], test_span)[0]
+            fold_results.append({
+                'train': list(train_span), 'test': list(test_span), 'params': params,
+                'train_score': train_result['score'], 'test_score': test_result['score'],
+                'test_trades': test_result['trades'], 'test_win_rate': test_result['win_rate'],
+            })
+
+        test_trades = sum(f['test_trades'] for f in fold_results)
+        wins = sum(f['test_trades'] * f['test_win_rate'] / 100 for f in fold_results)
+        return {
+            'params': fold_results[-1]['params'],
+            'folds': fold_results,
+            'test_trades': test_trades,
+            'test_win_rate': (wins / test_trades * 100) if test_trades else 0.0,
+            'positive_folds': sum(1 for f in fold_results if f['test_score'] > 0) / len(fold_results),
+        }
+
+
+def write_optimized_params(strategy: str, result: Dict, path: str = 'trading_logs/learning/optimized_params.json'):
+    """
+    워크 포워드 결과를 LearningEngine.optimized_params 형식으로 저장 (다른 전략 항목은 유지)
+
+    신뢰도는 검증 구간 수익 비율 → LearningEngine은 0.6 미만이면 적용하지 않음
+    """
+    file_path = Path(path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    existing = {}
+    if file_path.exists():
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        except Exception as e:
+            print(f"⚠️  최적 파라미터 로드 실패: {e}")
+
+    params = dict(result['params'])
+    for key, alias in RSI_ALIASES.items():
+        if key in params:
+            params[alias] = params[key]
+
+    name = STRATEGY_CLASSES[strategy]({**Config.get_strategy_config(strategy)}).name
+    existing[name] = {
+        'params': params,
+        'confidence': min(result['positive_folds'], 0.95),
+        'based_on_trades': result['test_trades'],
+        'success_rate': result['test_win_rate'],
+        'last_updated': datetime.now().isoformat(),
+        'source': 'walk_forward',
+    }
+
+    tmp = file_path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(existing, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, file_path)
+
+
+def main():
+    """최적화 명령"""
+    parser = argparse.ArgumentParser(description='전략 파라미터 워크 포워드 최적화')
+    parser.add_argument('--strategy', default='aggressive_scalping', help='전략 이름 (쉼표로 여러 개)')
+    parser.add_argument('--tickers', default='KRW-BTC,KRW-ETH,KRW-XRP', help='쉼표로 구분한 티커')
+    parser.add_argument('--interval', default='minute5', help='봉 간격')
+    parser.add_argument('--days', type=float, default=30, help='기간 (일)')
+    parser.add_argument('--method', default='grid', choices=ParameterOptimizer.METHODS, help='탐색 방식')
+    parser.add_argument('--trials', type=int, default=60, help='random / bayes 평가 횟수')
+    parser.add_argument('--folds', type=int, default=4, help='워크 포워드 구간 수')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--output', default='trading_logs/learning/optimized_params.json', help='결과 파일')
+    args = parser.parse_args()
+
+    from src.utils.candle_archive import CandleArchive
+
+    tickers = [t.strip() for t in args.tickers.split(',') if t.strip()]
+    frames = load_history(tickers, args.interval, args.days, CandleArchive(Config.CANDLE_ARCHIVE_DIR))
+    cache = ResultCache()
+
+    for strategy in [s.strip() for s in args.strategy.split(',') if s.strip()]:
+        start = time.time()
+        with ParameterOptimizer(strategy, frames, workers=args.workers, cache=cache) as optimizer:
+            result = optimizer.walk_forward(args.method, args.trials, args.folds)
+            evaluations = optimizer.evaluations
+
+        write_optimized_params(strategy, result, args.output)
+        print(f"✅ {strategy} 최적화 완료 ({evaluations}회 평가, 캐시 {cache.hits}회, {time.time() - start:.1f}초)")
+        for fold in result['folds']:
+            print(f"   학습 {fold['train_score']:+.2f}% → 검증 {fold['test_score']:+.2f}% "
+                  f"({fold['test_trades']}회) {fold['params']}")
+        print(f"   검증 수익 구간 비율: {result['positive_folds'] * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+백테스트 실행기 (--mode backtest)
+- 과거 캔들: 캔들 아카이브 우선, 없으면 1회 일괄 조회
+- 전략/리스크 관리 설정은 실거래와 같은 Config 사용
+"""
+
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.config import Config
+from src.strategies.aggressive_scalping import AggressiveScalping
+from src.strategies.conservative_scalping import ConservativeScalping
+from src.strategies.dynamic_exit_manager import DynamicExitManager
+from src.strategies.grid_trading import GridTrading
+from src.strategies.mean_reversion import MeanReversion
+from src.strategies.ultra_scalping import UltraScalping
+from src.utils.candle_archive import CandleArchive, now_kst_ns
+from src.utils.candle_store import interval_seconds
+from src.utils.rate_limiter import Priority, rate_limiter
+from src.utils.risk_manager import RiskManager
+from src.utils.sim_exchange import FEE_RATE, SimulatedExchange, SyntheticOrderbookFeed
+from .engine import BacktestEngine, BacktestResult, weighted_strategy_selector
+
+
+STRATEGY_CLASSES = {
+    'aggressive_scalping': AggressiveScalping,
+    'conservative_scalping': ConservativeScalping,
+    'mean_reversion': MeanReversion,
+    'grid_trading': GridTrading,
+    'ultra_scalping': UltraScalping,
+}
+
+
+def build_strategies(names: Optional[List[str]] = None) -> Dict:
+    """Config 설정으로 전략 생성 (AI 학습 엔진 미사용 → 같은 데이터면 같은 결과)"""
+    names = names or list(STRATEGY_CLASSES)
+    return {name: STRATEGY_CLASSES[name](Config.get_strategy_config(name)) for name in names}
+
+
+def build_risk_manager() -> RiskManager:
+    """Config 설정으로 리스크 관리자 생성 (거래소 동기화 없음)"""
+    return RiskManager(
+        initial_capital=Config.INITIAL_CAPITAL,
+        max_daily_loss=Config.MAX_DAILY_LOSS,
+        max_cumulative_loss=Config.MAX_CUMULATIVE_LOSS,
+        max_positions=Config.MAX_POSITIONS,
+        max_position_ratio=Config.MAX_POSITION_RATIO,
+    )
+
+
+def load_history(tickers: List[str], interval: str = 'minute5', days: float = 30,
+                 archive: Optional[CandleArchive] = None) -> Dict[str, pd.DataFrame]:
+    """
+    과거 캔들 로드
+
+    Args:
+        tickers: 티커 리스트
+        interval: 봉 간격
+        days: 기간 (일)
+        archive: 캔들 아카이브 (없거나 해당 티커가 없으면 거래소에서 조회)
+
+    Returns:
+        {ticker: OHLCV DataFrame}
+    """
+    start = pd.Timestamp(now_kst_ns()) - timedelta(days=days)
+    count = int(days * 86400 // interval_seconds(interval))
+
+    data = {}
+    for ticker in tickers:
+        df = archive.read(ticker, interval, start=start) if archive is not None else None
+        if df is None or df.empty:
+            import pyupbit
+            # get_ohlcv는 200개씩 나눠 조회
+            for _ in range(0, count, 200):
+                rate_limiter.acquire('candles', Priority.BACKGROUND)
+            df = pyupbit.get_ohlcv(ticker, interval=interval, count=count, period=0)
+        if df is not None and not df.empty:
+            data[ticker] = df
+        else:
+            print(f"❌ {ticker} 과거 캔들 로드 실패")
+    return data
+
+
+def run_backtest(tickers: List[str], interval: str = 'minute5', days: float = 30,
+                 strategy: str = 'weighted', seed: int = 0, slippage: float = 0.0,
+                 sim_exchange: bool = False) -> BacktestResult:
+    """
+    백테스트 실행 후 결과 출력
+
+    Args:
+        tickers: 티커 리스트
+        interval: 봉 간격
+        days: 기간 (일)
+        strategy: 전략 이름 또는 'weighted' (시간대별 가중치로 선택, 실거래와 동일)
+        seed: 전략 선택 난수 시드
+        slippage: 체결가 불리 비율
+        sim_exchange: 캔들 기반 합성 호가창에서 체결 (slippage 대신 호가 잔량/스프레드 반영)
+    """
+    archive = CandleArchive(Config.CANDLE_ARCHIVE_DIR)
+    data = load_history(tickers, interval, days, archive)
+
+    if strategy == 'weighted':
+        strategies = build_strategies()
+        selector = weighted_strategy_selector(Config.get_time_weights, seed=seed)
+    else:
+        strategies = build_strategies([strategy])
+        selector = None
+
+    risk_manager = build_risk_manager()
+    engine = BacktestEngine(
+        strategies,
+        risk_manager,
+        exit_manager=DynamicExitManager(mode=Config.EXIT_MODE) if Config.ENABLE_DYNAMIC_EXIT else None,
+        strategy_selector=selector,
+        interval=interval,
+        slippage=slippage,
+    )
+    if sim_exchange:
+        # 봉 마감 시각(엔진 시계)의 호가에 체결
+        engine.exchange = SimulatedExchange(
+            SyntheticOrderbookFeed(data, candle_interval=interval),
+            # 수수료 예약분까지 주문 가능하도록 수수료만큼 여유
+            balance=risk_manager.current_balance * (1 + FEE_RATE), latency=Config.SIM_LATENCY_MS / 1000,
+            clock=engine.clock.now, sleep=None,
+        )
+    result = engine.run(data)
+    print_report(result)
+    if engine.exchange is not None:
+        stats = engine.exchange.get_execution_stats()
+        print(f"   모의 체결: 주문 {stats['orders']}회 (부분 {stats['partial']}) | "
+              f"수수료 {stats['fees']:,.0f}원 | 실행 비용 {stats['avg_cost_bps']:.1f}bp")
+    return result
+
+
+def print_report(result: BacktestResult):
+    """결과 요약 출력"""
+    summary = result.summary()
+    print("=" * 60)
+    print("📊 백테스트 결과")
+    print(f"   거래: {summary['trades']}회 | 승률: {summary['win_rate']:.1f}%")
+    print(f"   수익률: {summary['total_return']:+.2f}% | 최종 자산: {summary['final_equity']:,.0f}원")
+    print(f"   최대 낙폭: {summary['max_drawdown']:.2f}%")
+    print(f"   처리: {summary['bars']:,}봉 / {summary['elapsed']:.1f}초 "
+          f"({summary['bars_per_second']:,.0f}봉/초)")
+    print("=" * 60)
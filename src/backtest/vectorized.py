@@ -0,0 +1,178 @@
+"""
+벡터화 신호 백테스터
+- 전략의 generate_signals_vectorized로 전체 이력 신호를 한 번에 계산
+- 포지션 진입/청산은 신호 배열에서 다음 이벤트 위치만 찾아 이동 (봉 단위 반복 없음)
+- 파라미터 탐색/다수 마켓 비교용 (수수료/손절/익절 반영, 포지션 크기와 리스크 한도는 미반영)
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.vector_indicators import stack_ohlcv
+
+
+# 수수료 (편도, RiskManager.close_position과 동일)
+FEE_RATE = 0.0005
+
+
+@dataclass
+class VectorBacktestResult:
+    """벡터 백테스트 결과"""
+    tickers: List[str]
+    trades: np.ndarray  # 구조화 배열 (ticker, entry, exit, entry_price, exit_price, ret)
+    elapsed: float = 0.0
+    bars: int = 0
+    index: Optional[pd.DatetimeIndex] = field(default=None, repr=False)
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.elapsed if self.elapsed > 0 else 0.0
+
+    def per_ticker(self) -> pd.DataFrame:
+        """티커별 거래 수, 승률, 누적 수익률 (%)"""
+        rows = []
+        for row, ticker in enumerate(self.tickers):
+            returns = self.trades['ret'][self.trades['ticker'] == row]
+            rows.append({
+                'ticker': ticker,
+                'trades': len(returns),
+                'win_rate': float((returns > 0).mean() * 100) if len(returns) else 0.0,
+                'total_return': float((np.prod(1 + returns) - 1) * 100) if len(returns) else 0.0,
+            })
+        return pd.DataFrame(rows).set_index('ticker')
+
+    def summary(self) -> Dict:
+        """전체 요약 (거래 수익률은 티커별 독립 운용 기준)"""
+        returns = self.trades['ret']
+        return {
+            'trades': len(returns),
+            'win_rate': float((returns > 0).mean() * 100) if len(returns) else 0.0,
+            'avg_return': float(returns.mean() * 100) if len(returns) else 0.0,
+            'bars': self.bars,
+            'elapsed': self.elapsed,
+            'bars_per_second': self.bars_per_second,
+        }
+
+
+_TRADE_DTYPE = [('ticker', 'i4'), ('entry', 'i8'), ('exit', 'i8'),
+                ('entry_price', 'f8'), ('exit_price', 'f8'), ('ret', 'f8')]
+
+
+def simulate(close: np.ndarray, entries: np.ndarray, exits: np.ndarray,
+             stop_loss: Optional[float] = None, take_profit: Optional[float] = None,
+             slippage: float = 0.0, fee: float = FEE_RATE) -> np.ndarray:
+    """
+    신호 배열로 거래 시뮬레이션 (티커당 동시 포지션 1개, 봉 종가 체결)
+
+    Args:
+        close: 종가 (시간) 또는 (티커 × 시간)
+        entries: 매수 신호
+        exits: 매도 신호
+        stop_loss: 손절 비율 (예: 0.01, None이면 미사용)
+        take_profit: 익절 비율
+        slippage: 체결가 불리 비율
+        fee: 편도 수수료
+
+    Returns:
+        거래 구조화 배열 (청산되지 않은 마지막 포지션은 제외)
+    """
+    close = np.atleast_2d(np.asarray(close, dtype='float64'))
+    entries = np.atleast_2d(entries)
+    exits = np.atleast_2d(exits)
+
+    trades = []
+    for row in range(close.shape[0]):
+        trades.extend(_simulate_row(row, close[row], entries[row], exits[row],
+                                    stop_loss, take_profit, slippage, fee))
+    return np.array(trades, dtype=_TRADE_DTYPE)
+
+
+def _simulate_row(row, close, entries, exits, stop_loss, take_profit, slippage, fee):
+    entry_points = np.flatnonzero(entries)
+    n = len(close)
+    trades = []
+    t = 0
+    while True:
+        # 다음 진입 (이전 청산 이후)
+        k = np.searchsorted(entry_points, t)
+        if k >= len(entry_points):
+            break
+        entry = int(entry_points[k])
+        entry_price = close[entry]
+
+        # 청산: 매도 신호 또는 손절/익절 가격 도달 중 가장 먼저 발생
+        exit_at = _first_exit(close, exits, entry, entry_price, stop_loss, take_profit)
+        if exit_at is None:
+            break
+
+        buy = entry_price * (1 + slippage)
+        sell = close[exit_at] * (1 - slippage)
+        ret = sell * (1 - fee) / (buy * (1 + fee)) - 1
+        trades.append((row, entry, exit_at, buy, sell, ret))
+        t = exit_at + 1
+        if t >= n:
+            break
+    return trades
+
+
+def _first_exit(close, exits, entry, entry_price, stop_loss, take_profit, chunk: int = 256):
+    """entry 이후 첫 청산 위치 (구간을 늘려가며 탐색해 전체 스캔 방지)"""
+    n = len(close)
+    lo = entry + 1
+    while lo < n:
+        hi = min(n, lo + chunk)
+        hit = exits[lo:hi].copy()
+        prices = close[lo:hi]
+        if stop_loss is not None:
+            hit |= prices <= entry_price * (1 - stop_loss)
+        if take_profit is not None:
+            hit |= prices >= entry_price * (1 + take_profit)
+        if hit.any():
+            return lo + int(np.argmax(hit))
+        lo = hi
+        chunk *= 2
+    return None
+
+
+def run_vectorized(strategy, frames: Dict[str, pd.DataFrame], slippage: float = 0.0,
+                   use_stops: bool = True) -> VectorBacktestResult:
+    """
+    전략 벡터 백테스트
+
+    Args:
+        strategy: generate_signals_vectorized를 구현한 BaseStrategy
+        frames: {ticker: OHLCV DataFrame}
+        slippage: 체결가 불리 비율
+        use_stops: 전략의 stop_loss/take_profit 적용
+
+    Returns:
+        VectorBacktestResult
+
+    Raises:
+        NotImplementedError: 전략이 벡터 신호를 지원하지 않음
+    """
+    start = time.perf_counter()
+    tickers, index, data = stack_ohlcv(frames)
+
+    signals = strategy.generate_signals_vectorized(data)
+    if signals is None:
+        raise NotImplementedError(f"{strategy.name}은 벡터 신호를 지원하지 않습니다")
+    entries, exits = signals
+
+    trades = simulate(
+        data['close'], entries, exits,
+        stop_loss=getattr(strategy, 'stop_loss', None) if use_stops else None,
+        take_profit=getattr(strategy, 'take_profit', None) if use_stops else None,
+        slippage=slippage,
+    )
+    return VectorBacktestResult(
+        tickers=tickers,
+        trades=trades,
+        elapsed=time.perf_counter() - start,
+        bars=int(np.isfinite(data['close']).sum()),
+        index=index,
+    )
@@ -237,6 +237,48 @@ class Config:
     COIN_SELECTION_INTERVAL = int(os.getenv('COIN_SELECTION_INTERVAL', 180))  # 3분 = 180초
     FIXED_COIN_COUNT = int(os.getenv('FIXED_COIN_COUNT', 35))  # 고정 35개 코인
     
+    # ⭐ 실시간 시세 스트림 (WebSocket)
+    ENABLE_WEBSOCKET = os.getenv('ENABLE_WEBSOCKET', 'true').lower() == 'true'
+    WEBSOCKET_MAX_AGE = float(os.getenv('WEBSOCKET_MAX_AGE', 5.0))  # 스트림 데이터 허용 나이 (초)
+    
+    # ⭐ HTTP 전송 계층 (연결 풀 + 타임아웃 + 재시도)
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))  # 연결 타임아웃 (초)
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10.0))  # 읽기 타임아웃 (초)
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 2))  # 일시적 오류 재시도 횟수
+    SCAN_WORKERS = int(os.getenv('SCAN_WORKERS', 8))  # 전체 스캔 분석 워커 수
+    
+    # ⭐ 청산 전용 감시 스레드 (보유 포지션 현재가 배치 조회 → 청산 판단)
+    ENABLE_EXIT_WATCHER = os.getenv('ENABLE_EXIT_WATCHER', 'true').lower() == 'true'
+    EXIT_WATCH_INTERVAL = float(os.getenv('EXIT_WATCH_INTERVAL', 0.25))  # 감시 주기 (초)
+    
+    # ⭐ 체결 테이프 급등 감지 (실시간 체결 스트림 → 1초 안에 급등/급락 신호)
+    ENABLE_TAPE_SURGE = os.getenv('ENABLE_TAPE_SURGE', 'true').lower() == 'true'
+    TAPE_SURGE_INTERVAL = float(os.getenv('TAPE_SURGE_INTERVAL', 0.5))  # 신호 평가 주기 (초)
+    TAPE_MIN_KRW = float(os.getenv('TAPE_MIN_KRW', 10_000_000))  # 1분 창 최소 체결 대금 (원)
+    TAPE_BUY_RATIO = float(os.getenv('TAPE_BUY_RATIO', 0.6))  # 급등 최소 매수 주도 비율
+    
+    # ⭐ 구조화 추적 (카테고리: buy, sell, exit, quick, strategy, loop)
+    TRACE_LEVEL = os.getenv('TRACE_LEVEL', 'WARNING').upper()  # DEBUG, INFO, WARNING, ERROR
+    TRACE_CATEGORIES = os.getenv('TRACE_CATEGORIES', '*')  # 예: "*" 또는 "sell:debug,exit"
+    TRACE_FILE = os.getenv('TRACE_FILE', '')  # JSON Lines 기록 파일 (비우면 메모리 링 버퍼만)
+    TRACE_CONSOLE = os.getenv('TRACE_CONSOLE', 'false').lower() == 'true'  # 콘솔 출력 여부
+    
+    # ⭐ HTTP 기록/재생 (장애 재현, 오프라인 프로파일링)
+    TRANSPORT_MODE = os.getenv('TRANSPORT_MODE', 'live').lower()  # live, record, replay
+    TRANSPORT_LOG_PATH = os.getenv('TRANSPORT_LOG_PATH', 'sessions/transport.jsonl.gz')  # 기록 파일 경로
+    REPLAY_SPEED = float(os.getenv('REPLAY_SPEED', 1.0))  # 재생 응답 지연 배율 (0이면 대기 없음)
+    
+    # ⭐ 캔들 아카이브 (디스크 저장, python -m src.utils.candle_archive로 백필)
+    ENABLE_CANDLE_ARCHIVE = os.getenv('ENABLE_CANDLE_ARCHIVE', 'false').lower() == 'true'
+    CANDLE_ARCHIVE_DIR = os.getenv('CANDLE_ARCHIVE_DIR', 'data/candles')  # 아카이브 디렉터리
+    
+    # ⭐ 시뮬레이션 거래소 (paper 모드 주문을 호가창 기반 체결 엔진에서 처리)
+    SIM_EXCHANGE = os.getenv('SIM_EXCHANGE', 'false').lower() == 'true'
+    SIM_ORDERBOOK_PATH = os.getenv('SIM_ORDERBOOK_PATH', '')  # 기록된 호가 JSONL (비우면 1분봉 기반 합성 호가)
+    SIM_LATENCY_MS = float(os.getenv('SIM_LATENCY_MS', 50))  # 주문 지연 (ms)
+    SIM_REPLAY_DAYS = float(os.getenv('SIM_REPLAY_DAYS', 1))  # 재생 시작 시점 (며칠 전, 캔들 아카이브 필요)
+    SIM_REPLAY_SPEED = float(os.getenv('SIM_REPLAY_SPEED', 1.0))  # 재생 속도 배율
+    
     # ⭐ 실시간 잔고 감지 (Upbit 실제 KRW 잔고 사용)
     USE_REAL_BALANCE = os.getenv('USE_REAL_BALANCE', 'true').lower() == 'true'
     
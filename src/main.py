@@ -48,14 +48,17 @@ else:
     # DEBUG 모드에서는 print() 출력 허용
     builtins.print = _original_print
 
+import math
 import time
+import threading
 import argparse
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List
 import random
 
 from src.config import Config
-from src.upbit_api import UpbitAPI
+from src.upbit_api import UpbitAPI, SimulatedUpbitAPI
 from src.utils.logger import TradingLogger
 from src.utils.risk_manager import RiskManager
 from src.utils.sentiment_analyzer import SentimentAnalyzer
@@ -66,6 +69,19 @@ from src.utils.surge_detector import SurgeDetector
 from src.utils.dynamic_coin_selector import DynamicCoinSelector
 from src.utils.fixed_screen_display import FixedScreenDisplay
 from src.utils.market_condition_analyzer import market_condition_analyzer
+from src.utils.indicator_bundle import get_indicators
+from src.utils.websocket_client import UpbitWebSocketClient
+from src.utils.rate_limiter import Priority, rate_limiter
+from src.utils.http_session import http_transport
+from src.utils.record_replay import create_interceptor
+from src.utils.candle_archive import CandleArchive
+from src.utils.sim_exchange import build_replay_exchange
+from src.utils.task_scheduler import TaskScheduler, JobPriority
+from src.utils.scan_pool import ScanPool
+from src.utils.exit_watcher import ExitWatcher
+from src.utils.price_triggers import PriceTriggerIndex, BELOW, ABOVE
+from src.utils.tape_surge_detector import TapeSurgeDetector
+from src.utils.tracing import tracer
 # Phase 1: 알림 시스템
 from src.utils.telegram_notifier import TelegramNotifier
 from src.utils.email_reporter import EmailReporter
@@ -96,6 +112,14 @@ from src.strategies.ultra_scalping import UltraScalping
 from src.strategies.split_strategies import SplitStrategies
 from src.strategies.dynamic_exit_manager import DynamicExitManager
 
+# 핫 패스 추적 카테고리 (꺼진 카테고리는 `if trace_x.debug_on:` 속성 확인만 하고 건너뜀)
+trace_buy = tracer.category('buy')
+trace_sell = tracer.category('sell')
+trace_exit = tracer.category('exit')
+trace_quick = tracer.category('quick')
+trace_strategy = tracer.category('strategy')
+trace_loop = tracer.category('loop')
+
 
 class AutoProfitBot:
     """자동매매 봇 (Phase 1 + Phase 2 완전 통합)"""
@@ -112,17 +136,55 @@ class AutoProfitBot:
         # 설정 로드
         Config.TRADING_MODE = mode
         Config.validate()
+        tracer.configure(
+            level=Config.TRACE_LEVEL,
+            categories=Config.TRACE_CATEGORIES,
+            path=Config.TRACE_FILE,
+            console=Config.TRACE_CONSOLE
+        )
         
         # 로거 초기화
         self.logger = TradingLogger()
         self.logger.log_info(f"🚀 AutoProfit Bot v5.0 시작 (Phase 1+2 통합)")
         self.logger.log_info(f"   모드: {mode}")
         
+        # HTTP 전송 계층 설정 (모든 REST 호출 공유)
+        http_transport.configure(
+            connect_timeout=Config.HTTP_CONNECT_TIMEOUT,
+            read_timeout=Config.HTTP_READ_TIMEOUT,
+            max_retries=Config.HTTP_MAX_RETRIES
+        )
+        
+        # HTTP 기록/재생 (재생 모드는 네트워크/API 키 없이 기록된 응답 사용)
+        self.transport_interceptor = create_interceptor(
+            Config.TRANSPORT_MODE, Config.TRANSPORT_LOG_PATH, Config.REPLAY_SPEED
+        )
+        if self.transport_interceptor:
+            http_transport.set_interceptor(self.transport_interceptor)
+            self.logger.log_info(f"📼 HTTP {Config.TRANSPORT_MODE} 모드: {Config.TRANSPORT_LOG_PATH}")
+        
+        # 캔들 아카이브 (디스크에서 최초 조회, 마감된 봉 저장)
+        self.candle_archive = CandleArchive(Config.CANDLE_ARCHIVE_DIR) if Config.ENABLE_CANDLE_ARCHIVE else None
+        
         # API 초기화
+        self.sim_exchange = None
         if mode == 'live':
-            self.api = UpbitAPI(Config.UPBIT_ACCESS_KEY, Config.UPBIT_SECRET_KEY)
+            self.api = UpbitAPI(Config.UPBIT_ACCESS_KEY, Config.UPBIT_SECRET_KEY,
+                                candle_archive=self.candle_archive)
+        elif mode == 'paper' and Config.SIM_EXCHANGE:
+            # 모의 거래소: 주문은 호가창 기반 체결 엔진, 시세는 캔들 아카이브/기록된 호가 재생
+            self.sim_exchange = build_replay_exchange(
+                Config.CANDLE_ARCHIVE_DIR, Config.SIM_ORDERBOOK_PATH,
+                days=Config.SIM_REPLAY_DAYS, speed=Config.SIM_REPLAY_SPEED,
+                balance=Config.INITIAL_CAPITAL, latency=Config.SIM_LATENCY_MS / 1000
+            )
+            self.api = SimulatedUpbitAPI(self.sim_exchange)
+            self.logger.log_info(f"🧪 시뮬레이션 거래소: {len(self.api.get_valid_tickers())}개 코인 재생")
         else:
-            self.api = UpbitAPI()
+            self.api = UpbitAPI(candle_archive=self.candle_archive)
+        
+        # 전체 스캔 분석용 제한 워커 풀 (요청 한도는 rate_limiter가 관리)
+        self.scan_pool = ScanPool(max_workers=Config.SCAN_WORKERS)
         
         # === Phase 1: 알림 시스템 초기화 ===
         self.telegram = TelegramNotifier(
@@ -303,9 +365,11 @@ class AutoProfitBot:
         
         # ⭐ 동적 코인 선정 시스템
         self.dynamic_coin_selector = None
-        if Config.ENABLE_DYNAMIC_COIN_SELECTION:
+        if Config.ENABLE_DYNAMIC_COIN_SELECTION and self.sim_exchange is None:
             print("🔄 동적 코인 선정 시스템 활성화")
-            self.dynamic_coin_selector = DynamicCoinSelector(coin_count=Config.FIXED_COIN_COUNT)
+            self.dynamic_coin_selector = DynamicCoinSelector(
+                coin_count=Config.FIXED_COIN_COUNT, archive=self.candle_archive
+            )
             print(f"📈 코인 개수: {Config.FIXED_COIN_COUNT}개 (고정)")
             print(f"⏱️ 선정 간격: {Config.COIN_SELECTION_INTERVAL}초 ({Config.COIN_SELECTION_INTERVAL//60}분)")
             print(f"🎯 선정 방법: {Config.COIN_SELECTION_METHOD}")
@@ -327,6 +391,24 @@ class AutoProfitBot:
         if not self.tickers:
             raise ValueError("거래 가능한 코인이 없습니다!")
         
+        # ⭐ 실시간 시세 스트림 (REST 폴링 대체)
+        self.ws_client = None
+        self.tape_surge = None
+        if Config.ENABLE_WEBSOCKET and Config.TRANSPORT_MODE != 'replay' and self.sim_exchange is None:
+            self.ws_client = UpbitWebSocketClient()
+            self.ws_client.subscribe(self.tickers)
+            if Config.ENABLE_TAPE_SURGE:
+                # 체결 테이프 급등 감지 (수신 스레드에서 체결마다 갱신)
+                self.tape_surge = TapeSurgeDetector(
+                    self.surge_detector,
+                    min_krw=Config.TAPE_MIN_KRW,
+                    buy_ratio=Config.TAPE_BUY_RATIO
+                )
+                self.ws_client.add_trade_listener(self.tape_surge.on_trade)
+            self.ws_client.start()
+            self.api.attach_websocket(self.ws_client, max_age=Config.WEBSOCKET_MAX_AGE)
+            self.logger.log_info(f"📡 실시간 시세 스트림 활성화 ({len(self.tickers)}개 코인)")
+        
         # ⭐ 실시간 잔고 감지 (Upbit 실제 KRW 사용)
         self.use_real_balance = Config.USE_REAL_BALANCE and mode == 'live'
         if self.use_real_balance:
@@ -361,6 +443,23 @@ class AutoProfitBot:
         self.max_ultra_positions = Config.ULTRA_SCALPING_CONFIG.get('max_positions', 5)
         self.high_confidence_threshold = Config.ULTRA_SCALPING_CONFIG.get('high_confidence_threshold', 0.8)
         
+        # 청산 전용 감시 스레드 (진입 스캔과 분리)
+        # 거래 잠금은 포지션 상태 변경 순간에만, 같은 티커 주문 직렬화는 _ticker_order 표시로
+        self.trade_lock = threading.RLock()
+        self._orders_in_flight = set()
+        self._exit_strategies = {}
+        self._last_full_exit_check = {}
+        self.price_triggers = PriceTriggerIndex()  # 포지션별 청산 가격 레벨
+        self.exit_watcher = None
+        if Config.ENABLE_EXIT_WATCHER:
+            self.exit_watcher = ExitWatcher(
+                get_tickers=self._watched_tickers,
+                get_prices=self.api.get_current_prices,
+                evaluate=self._evaluate_exit,
+                interval=Config.EXIT_WATCH_INTERVAL,
+                on_error=lambda name, e: self.logger.log_error("EXIT_WATCH_ERROR", f"청산 감시 실패 ({name})", e)
+            )
+        
         # === 알림 스케줄러 시작 ===
         self.notification_scheduler = NotificationScheduler(
             telegram_notifier=self.telegram,
@@ -444,11 +543,26 @@ class AutoProfitBot:
             ticker: 코인 티커
             strategy_name: 사용할 전략 이름
         """
+        decision = self._evaluate_ticker(ticker, strategy_name)
+        if decision:
+            self._apply_ticker_signal(ticker, decision)
+    
+    def _evaluate_ticker(self, ticker: str, strategy_name: str) -> Dict:
+        """
+        티커 신호 계산 (시세 조회 + 전략 신호, 주문 없음 → 스캔 워커 스레드에서 실행)
+        
+        Args:
+            ticker: 코인 티커
+            strategy_name: 사용할 전략 이름
+        
+        Returns:
+            판단 결과 (signal, reason, indicators, strategy_name, 호가창/체결 신호) 또는 None
+        """
         try:
             # 최소 거래 간격 확인
             last_time = self.last_trade_time.get(ticker, 0)
             if time.time() - last_time < self.min_trade_interval:
-                return
+                return None
             
             # 🆕 1. 실시간 호가창 모니터링
             orderbook_signal = None
@@ -487,12 +601,12 @@ class AutoProfitBot:
             # OHLCV 데이터 가져오기
             df = self.api.get_ohlcv(ticker, interval="minute5", count=200)
             if df is None or df.empty:
-                return
+                return None
             
             # 전략 선택
             strategy = self.strategies.get(strategy_name)
             if not strategy or not strategy.enabled:
-                return
+                return None
             
             # 신호 생성
             signal, reason, indicators = strategy.generate_signal(df, ticker)
@@ -504,25 +618,55 @@ class AutoProfitBot:
                     signal = 'BUY'
                     reason += f" + 체결 신호: {trade_signal['signal']} (신뢰도 {trade_signal['confidence']}%)"
             
+            return {
+                'strategy_name': strategy_name,
+                'signal': signal,
+                'reason': reason,
+                'indicators': indicators,
+                'orderbook_signal': orderbook_signal,
+                'trade_signal': trade_signal
+            }
+            
+        except Exception as e:
+            self.logger.log_error("ANALYZE_ERROR", f"{ticker} 분석 실패", e)
+            return None
+    
+    def _apply_ticker_signal(self, ticker: str, decision: Dict):
+        """
+        티커 판단 결과 실행 (같은 티커를 청산 감시 스레드가 주문 중이면 이번 신호는 건너뜀)
+        
+        Args:
+            ticker: 코인 티커
+            decision: _evaluate_ticker 결과
+        """
+        try:
+            strategy_name = decision['strategy_name']
+            signal = decision['signal']
+            reason = decision['reason']
+            
             # 신호 로그는 BUY/SELL만 (HOLD는 제외)
             # if signal != 'HOLD':
-            #     self.logger.log_signal(ticker, signal, strategy_name, indicators)
-            
-            # 매수 신호 처리
-            if signal == 'BUY':
-                # 호가창/체결 신호 전달
-                self.execute_buy(
-                    ticker, strategy_name, reason, indicators,
-                    orderbook_signal=orderbook_signal,
-                    trade_signal=trade_signal
-                )
-            
-            # 매도 신호 처리 (포지션 보유 중일 때)
-            elif signal == 'SELL' and ticker in self.risk_manager.positions:
-                self.execute_sell(ticker, reason)
+            #     self.logger.log_signal(ticker, signal, strategy_name, decision['indicators'])
             
-            # 기존 포지션 손익 체크
-            self.check_positions(ticker, strategy)
+            with self._ticker_order(ticker) as acquired:
+                if not acquired:
+                    return
+                
+                # 매수 신호 처리
+                if signal == 'BUY':
+                    # 호가창/체결 신호 전달
+                    self.execute_buy(
+                        ticker, strategy_name, reason, decision['indicators'],
+                        orderbook_signal=decision['orderbook_signal'],
+                        trade_signal=decision['trade_signal']
+                    )
+                
+                # 매도 신호 처리 (포지션 보유 중일 때)
+                elif signal == 'SELL' and ticker in self.risk_manager.positions:
+                    self.execute_sell(ticker, reason)
+                
+                # 기존 포지션 손익 체크
+                self.check_positions(ticker, self.strategies.get(strategy_name))
             
         except Exception as e:
             self.logger.log_error("ANALYZE_ERROR", f"{ticker} 분석 실패", e)
@@ -549,8 +693,8 @@ class AutoProfitBot:
                 self.logger.log_warning(f"매수 불가: {ticker} - {msg}")
                 return
             
-            # 현재가 조회
-            current_price = self.api.get_current_price(ticker)
+            # 현재가 조회 (주문 직전이므로 캐시 미사용)
+            current_price = self.api.get_current_price(ticker, bypass_cache=True)
             if not current_price:
                 return
             
@@ -582,7 +726,7 @@ class AutoProfitBot:
             
             # 실거래 모드에서만 실제 주문
             order_result = None
-            if self.mode == 'live' and self.api.upbit:
+            if (self.mode == 'live' or self.sim_exchange) and self.api.upbit:
                 order_result = self.smart_order_executor.execute_buy(
                     ticker=ticker,
                     investment=investment,
@@ -595,26 +739,28 @@ class AutoProfitBot:
             else:
                 self.logger.log_info(f"[모의거래] 매수: {ticker}, {investment:,.0f}원")
             
-            # 포지션 추가
-            success = self.risk_manager.add_position(
-                ticker=ticker,
-                amount=amount,
-                price=current_price,
-                strategy=strategy
-            )
-            
-            _original_print(f"[DEBUG-BUY] {ticker} 포지션 추가 결과: {success}")
-            _original_print(f"[DEBUG-BUY] 현재 포지션 목록: {list(self.risk_manager.positions.keys())}")
-            
-            if success:
-                # 기존 보유 보호 시스템에도 봇 포지션 추가
-                self.holding_protector.add_bot_position(
+            # 포지션 추가 (청산 감시 스레드와 포지션 상태 변경 직렬화)
+            with self.trade_lock:
+                success = self.risk_manager.add_position(
                     ticker=ticker,
                     amount=amount,
                     price=current_price,
                     strategy=strategy
                 )
-                
+                if success:
+                    # 기존 보유 보호 시스템에도 봇 포지션 추가
+                    self.holding_protector.add_bot_position(
+                        ticker=ticker,
+                        amount=amount,
+                        price=current_price,
+                        strategy=strategy
+                    )
+            
+            if trace_buy.debug_on:
+                trace_buy.debug(f"{ticker} 포지션 추가 결과: {success}")
+                trace_buy.debug(f"현재 포지션 목록: {list(self.risk_manager.positions.keys())}")
+            
+            if success:
                 # 🎓 AI 학습: 매수 경험 기록
                 try:
                     market_condition = indicators.copy()
@@ -688,9 +834,9 @@ class AutoProfitBot:
                         f"전략: {strategy}"
                     )
                     self.display.render()
-                    time.sleep(1)  # 1초간 표시
                 
                 self.last_trade_time[ticker] = time.time()
+                self._sync_stream_subscriptions()
             
         except Exception as e:
             self.logger.log_error("BUY_ERROR", f"{ticker} 매수 실패", e)
@@ -703,44 +849,57 @@ class AutoProfitBot:
             ticker: 코인 티커
             reason: 매도 사유
         """
-        _original_print(f"[EXECUTE-SELL] execute_sell() 호출됨 - ticker: {ticker}, reason: {reason}")
+        if trace_sell.debug_on:
+            trace_sell.debug(f"execute_sell() 호출됨 - ticker: {ticker}, reason: {reason}")
         try:
-            _original_print(f"[EXECUTE-SELL] 포지션 존재 여부 체크: {ticker in self.risk_manager.positions}")
+            if trace_sell.debug_on:
+                trace_sell.debug(f"포지션 존재 여부 체크: {ticker in self.risk_manager.positions}")
             if ticker not in self.risk_manager.positions:
-                _original_print(f"[EXECUTE-SELL] ❌ 포지션 없음! ticker={ticker}")
-                _original_print(f"[EXECUTE-SELL] 현재 보유 포지션 목록: {list(self.risk_manager.positions.keys())}")
+                if trace_sell.error_on:
+                    trace_sell.error(f"❌ 포지션 없음! ticker={ticker}")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"현재 보유 포지션 목록: {list(self.risk_manager.positions.keys())}")
                 return
             
             position = self.risk_manager.positions[ticker]
-            _original_print(f"[EXECUTE-SELL] ✅ 포지션 찾음: {ticker}, amount={position.amount}, avg_price={position.avg_buy_price}")
+            if trace_sell.debug_on:
+                trace_sell.debug(f"✅ 포지션 찾음: {ticker}, amount={position.amount}, avg_price={position.avg_buy_price}")
             
             # 현재가 조회 (⭐ v6.30.13: 재시도 로직 추가)
-            _original_print(f"[EXECUTE-SELL] 현재가 조회 시작...")
+            if trace_sell.debug_on:
+                trace_sell.debug("현재가 조회 시작...")
             current_price = None
             for attempt in range(3):  # 최대 3회 재시도
-                _original_print(f"[EXECUTE-SELL] 가격 조회 시도 {attempt+1}/3...")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"가격 조회 시도 {attempt+1}/3...")
                 try:
-                    current_price = self.api.get_current_price(ticker)
-                    _original_print(f"[EXECUTE-SELL] 가격 조회 결과: {current_price}")
+                    current_price = self.api.get_current_price(ticker, bypass_cache=True)
+                    if trace_sell.debug_on:
+                        trace_sell.debug(f"가격 조회 결과: {current_price}")
                     if current_price:
                         break
                 except Exception as e:
-                    _original_print(f"[EXECUTE-SELL] 가격 조회 예외: {e}")
+                    if trace_sell.debug_on:
+                        trace_sell.debug(f"가격 조회 예외: {e}")
                 if attempt < 2:
                     time.sleep(0.5)  # 0.5초 대기 후 재시도
             
             if not current_price:
                 self.logger.log_error("PRICE_FETCH_FAILED", f"{ticker} 가격 조회 3회 실패", None)
-                _original_print(f"[EXECUTE-SELL] ❌ 가격 조회 실패 - 평균 매수가로 대체")
+                if trace_sell.error_on:
+                    trace_sell.error("❌ 가격 조회 실패 - 평균 매수가로 대체")
                 current_price = position.avg_buy_price  # ⭐ v6.30.67: 가격 실패 시에도 청산 진행
             
             # 손익률 계산
-            _original_print(f"[EXECUTE-SELL] 손익률 계산 중...")
+            if trace_sell.debug_on:
+                trace_sell.debug("손익률 계산 중...")
             profit_ratio = ((current_price - position.avg_buy_price) / position.avg_buy_price) * 100
-            _original_print(f"[EXECUTE-SELL] 손익률: {profit_ratio:+.2f}%")
+            if trace_sell.debug_on:
+                trace_sell.debug(f"손익률: {profit_ratio:+.2f}%")
             
             # ⭐ ExitReason 파싱 (매도 사유 분석)
-            _original_print(f"[EXECUTE-SELL] ExitReason 파싱 중...")
+            if trace_sell.debug_on:
+                trace_sell.debug("ExitReason 파싱 중...")
             from src.utils.order_method_selector import ExitReason
             
             exit_reason = ExitReason.TAKE_PROFIT  # 기본값
@@ -757,19 +916,24 @@ class AutoProfitBot:
             elif "거래량" in reason or "volume" in reason.lower():
                 exit_reason = ExitReason.VOLUME_DROP
             
-            _original_print(f"[EXECUTE-SELL] ExitReason: {exit_reason}")
+            if trace_sell.debug_on:
+                trace_sell.debug(f"ExitReason: {exit_reason}")
             
             # ⭐ 스프레드 분석
-            _original_print(f"[EXECUTE-SELL] 스프레드 분석 중...")
+            if trace_sell.debug_on:
+                trace_sell.debug("스프레드 분석 중...")
             try:
-                spread_pct = self.api.calculate_spread_percentage(ticker)
-                _original_print(f"[EXECUTE-SELL] 스프레드: {spread_pct:.2f}%")
+                spread_pct = self.api.calculate_spread_percentage(ticker, bypass_cache=True)
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"스프레드: {spread_pct:.2f}%")
             except Exception as e:
-                _original_print(f"[EXECUTE-SELL] 스프레드 계산 실패: {e}, 기본값 0.1 사용")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"스프레드 계산 실패: {e}, 기본값 0.1 사용")
                 spread_pct = 0.1
             
             # ⭐ 시장 조건 분석
-            _original_print(f"[EXECUTE-SELL] 시장 조건 분석 중...")
+            if trace_sell.debug_on:
+                trace_sell.debug("시장 조건 분석 중...")
             market_condition = {}
             try:
                 df = self.api.get_ohlcv(ticker, interval="minute5", count=50)
@@ -785,13 +949,16 @@ class AutoProfitBot:
                         'volatility': 'high' if volatility > 2.0 else 'medium' if volatility > 1.0 else 'low',
                         'trend': 'bullish' if price_change > 1.0 else 'bearish' if price_change < -1.0 else 'neutral'
                     }
-                    _original_print(f"[EXECUTE-SELL] 시장 조건: {market_condition}")
+                    if trace_sell.debug_on:
+                        trace_sell.debug(f"시장 조건: {market_condition}")
             except Exception as e:
-                _original_print(f"[EXECUTE-SELL] 시장 조건 분석 실패: {e}, 기본값 사용")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"시장 조건 분석 실패: {e}, 기본값 사용")
                 market_condition = {'volatility': 'medium', 'trend': 'neutral'}
             
             # ⭐ SmartOrderExecutor로 주문 방법 자동 선택
-            _original_print(f"[EXECUTE-SELL] 주문 방법 선택 중...")
+            if trace_sell.debug_on:
+                trace_sell.debug("주문 방법 선택 중...")
             try:
                 order_method, method_reason = self.order_method_selector.select_sell_method(
                     ticker=ticker,
@@ -801,9 +968,11 @@ class AutoProfitBot:
                     spread_pct=spread_pct,
                     profit_ratio=profit_ratio
                 )
-                _original_print(f"[EXECUTE-SELL] 주문 방법: {order_method}, 이유: {method_reason}")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"주문 방법: {order_method}, 이유: {method_reason}")
             except Exception as e:
-                _original_print(f"[EXECUTE-SELL] 주문 방법 선택 실패: {e}, 시장가 주문 사용")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"주문 방법 선택 실패: {e}, 시장가 주문 사용")
                 order_method = "market"
                 method_reason = "fallback"
             
@@ -825,7 +994,8 @@ class AutoProfitBot:
                         self.logger.log_warning(
                             f"🛡️  {ticker} 매도 불가: 기존 보유 보호 중 ({sell_msg})"
                         )
-                        _original_print(f"[EXECUTE-SELL] ❌ 실거래 모드: 기존 보유 보호로 매도 차단")
+                        if trace_sell.error_on:
+                            trace_sell.error("❌ 실거래 모드: 기존 보유 보호로 매도 차단")
                         return
                     
                     sell_amount = min(sell_amount, sellable_amount)
@@ -834,19 +1004,22 @@ class AutoProfitBot:
                     )
             else:
                 # 모의거래 모드: 포지션 전체 매도
-                _original_print(f"[EXECUTE-SELL] 모의거래 모드: 포지션 전체 매도 허용 (holding_protector 우회)")
+                if trace_sell.debug_on:
+                    trace_sell.debug("모의거래 모드: 포지션 전체 매도 허용 (holding_protector 우회)")
             
             # ⭐ SmartOrderExecutor로 매도 주문 실행 (⭐ v6.30.13: 재시도 + 추적)
             # ⭐ v6.30.64: 모의거래 모드에서도 포지션 청산 진행하도록 수정
             order_result = None
             order_success = False
             
-            if self.mode == 'live' and self.api.upbit:
-                _original_print(f"[EXECUTE-SELL] 실거래 모드: 실제 매도 주문 실행")
+            if (self.mode == 'live' or self.sim_exchange) and self.api.upbit:
+                if trace_sell.debug_on:
+                    trace_sell.debug("실거래 모드: 실제 매도 주문 실행")
                 # 최대 3회 재시도
                 max_attempts = 3
                 for attempt in range(max_attempts):
-                    _original_print(f"[EXECUTE-SELL] 매도 시도 {attempt+1}/{max_attempts}...")
+                    if trace_sell.debug_on:
+                        trace_sell.debug(f"매도 시도 {attempt+1}/{max_attempts}...")
                     order_result = self.smart_order_executor.execute_sell(
                         ticker=ticker,
                         volume=sell_amount,
@@ -856,16 +1029,18 @@ class AutoProfitBot:
                         market_condition=market_condition
                     )
                     
-                    if order_result and order_result.get('success'):
+                    if order_result and (order_result.get('success') or order_result.get('uuid')):
                         # 성공 시 실패 추적 리셋
                         if ticker in self.failed_sell_tracker:
                             del self.failed_sell_tracker[ticker]
                         order_success = True
-                        _original_print(f"[EXECUTE-SELL] ✅ 실거래 매도 주문 성공")
+                        if trace_sell.debug_on:
+                            trace_sell.debug("✅ 실거래 매도 주문 성공")
                         break
                     
                     self.logger.log_warning(f"{ticker} 매도 시도 {attempt+1}/{max_attempts} 실패")
-                    _original_print(f"[EXECUTE-SELL] ⚠️ 매도 시도 {attempt+1}/{max_attempts} 실패")
+                    if trace_sell.warning_on:
+                        trace_sell.warning(f"⚠️ 매도 시도 {attempt+1}/{max_attempts} 실패")
                     
                     if attempt < max_attempts - 1:
                         time.sleep(1)  # 1초 대기 후 재시도
@@ -888,46 +1063,55 @@ class AutoProfitBot:
                         )
                     
                     self.logger.log_error("SELL_ORDER_FAILED", f"{ticker} 매도 주문 {max_attempts}회 실패", None)
-                    _original_print(f"[EXECUTE-SELL] ❌ 실거래 매도 주문 실패 - 하지만 포지션 청산은 계속 진행")
+                    if trace_sell.error_on:
+                        trace_sell.error("❌ 실거래 매도 주문 실패 - 하지만 포지션 청산은 계속 진행")
                     # ⭐ 중요: return 하지 않고 포지션 청산 계속 진행
             else:
-                _original_print(f"[EXECUTE-SELL] 모의거래 모드: 매도 주문 시뮬레이션")
+                if trace_sell.debug_on:
+                    trace_sell.debug("모의거래 모드: 매도 주문 시뮬레이션")
                 self.logger.log_info(f"[모의거래] 매도: {ticker}, {sell_amount:.8f}")
-                _original_print(f"[EXECUTE-SELL] 모의거래 매도 완료: {ticker}, amount={sell_amount:.8f}")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"모의거래 매도 완료: {ticker}, amount={sell_amount:.8f}")
                 order_success = True
             
             # 기존 보유 보호 시스템에서 봇 포지션 청산
-            _original_print(f"[EXECUTE-SELL] ========== 포지션 청산 시작 ==========")
-            _original_print(f"[EXECUTE-SELL] holding_protector.close_bot_position() 호출...")
-            bot_profit_loss = None
-            try:
-                bot_profit_loss = self.holding_protector.close_bot_position(
-                    ticker, sell_amount, current_price
-                )
-                _original_print(f"[EXECUTE-SELL] ✅ holding_protector 청산 완료, P/L: {bot_profit_loss}")
-            except Exception as e:
-                _original_print(f"[EXECUTE-SELL] ❌ holding_protector 청산 실패: {e}")
-                import traceback
-                _original_print(f"[EXECUTE-SELL] 스택 트레이스:\n{traceback.format_exc()}")
-            
-            # 리스크 관리자에서도 포지션 청산
-            _original_print(f"[EXECUTE-SELL] risk_manager.close_position() 호출...")
-            profit_loss = None
-            try:
-                profit_loss = self.risk_manager.close_position(ticker, current_price)
-                _original_print(f"[EXECUTE-SELL] ✅ risk_manager 청산 완료, P/L: {profit_loss}")
-                _original_print(f"[EXECUTE-SELL] 포지션 제거 후 남은 포지션: {list(self.risk_manager.positions.keys())}")
-            except Exception as e:
-                _original_print(f"[EXECUTE-SELL] ❌ risk_manager 청산 실패: {e}")
-                import traceback
-                _original_print(f"[EXECUTE-SELL] 스택 트레이스:\n{traceback.format_exc()}")
+            if trace_sell.debug_on:
+                trace_sell.debug("========== 포지션 청산 시작 ==========")
+                trace_sell.debug("holding_protector.close_bot_position() 호출...")
+            # 포지션 상태 변경은 거래 잠금 안에서 (주문 대기는 잠금 밖)
+            with self.trade_lock:
+                bot_profit_loss = None
+                try:
+                    bot_profit_loss = self.holding_protector.close_bot_position(
+                        ticker, sell_amount, current_price
+                    )
+                    if trace_sell.debug_on:
+                        trace_sell.debug(f"✅ holding_protector 청산 완료, P/L: {bot_profit_loss}")
+                except Exception as e:
+                    if trace_sell.error_on:
+                        trace_sell.error(f"❌ holding_protector 청산 실패: {e}", exc_info=True)
+                
+                # 리스크 관리자에서도 포지션 청산
+                if trace_sell.debug_on:
+                    trace_sell.debug("risk_manager.close_position() 호출...")
+                profit_loss = None
+                try:
+                    profit_loss = self.risk_manager.close_position(ticker, current_price)
+                    if trace_sell.debug_on:
+                        trace_sell.debug(f"✅ risk_manager 청산 완료, P/L: {profit_loss}")
+                        trace_sell.debug(f"포지션 제거 후 남은 포지션: {list(self.risk_manager.positions.keys())}")
+                except Exception as e:
+                    if trace_sell.error_on:
+                        trace_sell.error(f"❌ risk_manager 청산 실패: {e}", exc_info=True)
             
             # ⭐ 화면에서 포지션 제거
-            _original_print(f"[EXECUTE-SELL] ========== 화면 업데이트 시작 ==========")
-            _original_print(f"[EXECUTE-SELL] 화면에서 포지션 제거 시작...")
+            if trace_sell.debug_on:
+                trace_sell.debug("========== 화면 업데이트 시작 ==========")
+                trace_sell.debug("화면에서 포지션 제거 시작...")
             try:
                 slot = self.display.get_slot_by_ticker(ticker)
-                _original_print(f"[EXECUTE-SELL] 화면 슬롯: {slot}")
+                if trace_sell.debug_on:
+                    trace_sell.debug(f"화면 슬롯: {slot}")
                 if slot:
                     # ⭐ 수정: avg_buy_price 사용
                     if profit_loss is not None:
@@ -935,9 +1119,11 @@ class AutoProfitBot:
                     else:
                         profit_ratio = 0
                     
-                    _original_print(f"[EXECUTE-SELL] display.remove_position() 호출...")
+                    if trace_sell.debug_on:
+                        trace_sell.debug("display.remove_position() 호출...")
                     self.display.remove_position(slot, current_price, profit_loss if profit_loss else 0, profit_ratio)
-                    _original_print(f"[EXECUTE-SELL] ✅ 화면에서 포지션 제거 완료")
+                    if trace_sell.debug_on:
+                        trace_sell.debug("✅ 화면에서 포지션 제거 완료")
                     
                     # 작업 상태에 로그 기록 완료 표시
                     result = "수익" if (profit_loss and profit_loss > 0) else "손실"
@@ -948,14 +1134,14 @@ class AutoProfitBot:
                         f"로그 기록 완료"
                     )
                     self.display.render()
-                    _original_print(f"[EXECUTE-SELL] ✅ 화면 렌더링 완료")
-                    time.sleep(1)  # 1초간 표시
+                    if trace_sell.debug_on:
+                        trace_sell.debug("✅ 화면 렌더링 완료")
                 else:
-                    _original_print(f"[EXECUTE-SELL] ⚠️ 화면 슬롯을 찾을 수 없음: {ticker}")
+                    if trace_sell.warning_on:
+                        trace_sell.warning(f"⚠️ 화면 슬롯을 찾을 수 없음: {ticker}")
             except Exception as e:
-                _original_print(f"[EXECUTE-SELL] ❌ 화면 업데이트 실패: {e}")
-                import traceback
-                _original_print(f"[EXECUTE-SELL] 스택 트레이스:\n{traceback.format_exc()}")
+                if trace_sell.error_on:
+                    trace_sell.error(f"❌ 화면 업데이트 실패: {e}", exc_info=True)
             
             if profit_loss is not None:
                 # 거래 로그
@@ -1080,12 +1266,12 @@ class AutoProfitBot:
             
         except Exception as e:
             self.logger.log_error("SELL_ERROR", f"{ticker} 매도 중 예외 발생 - 포지션 강제 청산 진행", e)
-            _original_print(f"[EXECUTE-SELL] ⚠️ 예외 발생: {e}")
-            import traceback
-            _original_print(f"[EXECUTE-SELL] 스택 트레이스:\n{traceback.format_exc()}")
+            if trace_sell.error_on:
+                trace_sell.error(f"⚠️ 예외 발생: {e}", exc_info=True)
             
             # ⭐ v6.30.66: 예외 발생 시에도 포지션 강제 청산
-            _original_print(f"[EXECUTE-SELL] ========== 예외 발생 - 포지션 강제 청산 시작 ==========")
+            if trace_sell.debug_on:
+                trace_sell.debug("========== 예외 발생 - 포지션 강제 청산 시작 ==========")
             try:
                 if ticker in self.risk_manager.positions:
                     position = self.risk_manager.positions[ticker]
@@ -1094,44 +1280,56 @@ class AutoProfitBot:
                     if not current_price:
                         # 가격 조회 실패 시 평균 매수가로 청산
                         current_price = position.avg_buy_price
-                        _original_print(f"[EXECUTE-SELL] ⚠️ 가격 조회 실패, 평균 매수가로 청산: {current_price}")
+                        if trace_sell.warning_on:
+                            trace_sell.warning(f"⚠️ 가격 조회 실패, 평균 매수가로 청산: {current_price}")
                     
-                    # holding_protector 청산
-                    _original_print(f"[EXECUTE-SELL] holding_protector.close_bot_position() 호출...")
-                    try:
-                        bot_profit_loss = self.holding_protector.close_bot_position(
-                            ticker, position.amount, current_price
-                        )
-                        _original_print(f"[EXECUTE-SELL] ✅ holding_protector 청산 완료, P/L: {bot_profit_loss}")
-                    except Exception as e2:
-                        _original_print(f"[EXECUTE-SELL] ❌ holding_protector 청산 실패: {e2}")
-                    
-                    # risk_manager 청산
-                    _original_print(f"[EXECUTE-SELL] risk_manager.close_position() 호출...")
-                    try:
-                        profit_loss = self.risk_manager.close_position(ticker, current_price)
-                        _original_print(f"[EXECUTE-SELL] ✅ risk_manager 청산 완료, P/L: {profit_loss}")
-                        _original_print(f"[EXECUTE-SELL] 포지션 제거 후 남은 포지션: {list(self.risk_manager.positions.keys())}")
-                    except Exception as e3:
-                        _original_print(f"[EXECUTE-SELL] ❌ risk_manager 청산 실패: {e3}")
+                    with self.trade_lock:
+                        # holding_protector 청산
+                        if trace_sell.debug_on:
+                            trace_sell.debug("holding_protector.close_bot_position() 호출...")
+                        try:
+                            bot_profit_loss = self.holding_protector.close_bot_position(
+                                ticker, position.amount, current_price
+                            )
+                            if trace_sell.debug_on:
+                                trace_sell.debug(f"✅ holding_protector 청산 완료, P/L: {bot_profit_loss}")
+                        except Exception as e2:
+                            if trace_sell.error_on:
+                                trace_sell.error(f"❌ holding_protector 청산 실패: {e2}")
+                        
+                        # risk_manager 청산
+                        if trace_sell.debug_on:
+                            trace_sell.debug("risk_manager.close_position() 호출...")
+                        try:
+                            profit_loss = self.risk_manager.close_position(ticker, current_price)
+                            if trace_sell.debug_on:
+                                trace_sell.debug(f"✅ risk_manager 청산 완료, P/L: {profit_loss}")
+                                trace_sell.debug(f"포지션 제거 후 남은 포지션: {list(self.risk_manager.positions.keys())}")
+                        except Exception as e3:
+                            if trace_sell.error_on:
+                                trace_sell.error(f"❌ risk_manager 청산 실패: {e3}")
                     
                     # UI 업데이트
-                    _original_print(f"[EXECUTE-SELL] display.remove_position() 호출...")
+                    if trace_sell.debug_on:
+                        trace_sell.debug("display.remove_position() 호출...")
                     try:
                         slot = self.display.get_slot_by_ticker(ticker)
                         if slot:
                             self.display.remove_position(slot, current_price, 0, 0)
-                            _original_print(f"[EXECUTE-SELL] ✅ UI에서 포지션 제거 완료")
+                            if trace_sell.debug_on:
+                                trace_sell.debug("✅ UI에서 포지션 제거 완료")
                     except Exception as e4:
-                        _original_print(f"[EXECUTE-SELL] ❌ UI 업데이트 실패: {e4}")
+                        if trace_sell.error_on:
+                            trace_sell.error(f"❌ UI 업데이트 실패: {e4}")
                     
-                    _original_print(f"[EXECUTE-SELL] ✅ 예외 발생했지만 포지션 강제 청산 완료")
+                    if trace_sell.debug_on:
+                        trace_sell.debug("✅ 예외 발생했지만 포지션 강제 청산 완료")
                 else:
-                    _original_print(f"[EXECUTE-SELL] ⚠️ 포지션이 이미 없음: {ticker}")
+                    if trace_sell.warning_on:
+                        trace_sell.warning(f"⚠️ 포지션이 이미 없음: {ticker}")
             except Exception as cleanup_error:
-                _original_print(f"[EXECUTE-SELL] ❌ 강제 청산 중 오류: {cleanup_error}")
-                import traceback
-                _original_print(f"[EXECUTE-SELL] 청산 오류 스택:\n{traceback.format_exc()}")
+                if trace_sell.error_on:
+                    trace_sell.error(f"❌ 강제 청산 중 오류: {cleanup_error}", exc_info=True)
     
     def check_positions(self, ticker: str, strategy, position=None):
         """
@@ -1155,7 +1353,8 @@ class AutoProfitBot:
             position: 포지션 객체 (optional, 동시성 문제 방지용)
         """
         # ⭐ v6.30.48: check_positions 진입 로그 (콘솔)
-        _original_print(f"\n[DEBUG-CHECK] ========== check_positions({ticker}) 시작 ==========")
+        if trace_exit.debug_on:
+            trace_exit.debug(f"========== check_positions({ticker}) 시작 ==========")
         
         # ⭐ v6.30.18: check_positions 진입 로그
         self.logger.log_info(f"✅ check_positions({ticker}) 진입 - 10가지 청산 조건 검사 시작")
@@ -1163,15 +1362,18 @@ class AutoProfitBot:
         # ⭐ v6.30.50: 포지션이 전달되지 않은 경우에만 조회
         if position is None:
             if ticker not in self.risk_manager.positions:
-                _original_print(f"[DEBUG-CHECK] ⚠️ {ticker} 포지션 없음!")
+                if trace_exit.warning_on:
+                    trace_exit.warning(f"⚠️ {ticker} 포지션 없음!")
                 self.logger.log_warning(f"⚠️ {ticker} 포지션 없음 (이미 청산됨?)")
                 return
             position = self.risk_manager.positions[ticker]
         else:
-            _original_print(f"[DEBUG-CHECK] ✅ 포지션 객체 직접 전달됨 (동시성 보호)")
+            if trace_exit.debug_on:
+                trace_exit.debug("✅ 포지션 객체 직접 전달됨 (동시성 보호)")
             # 포지션이 여전히 존재하는지 재확인
             if ticker not in self.risk_manager.positions:
-                _original_print(f"[DEBUG-CHECK] ⚠️ {ticker} 포지션이 이미 삭제됨! (다른 스레드에서 청산됨)")
+                if trace_exit.warning_on:
+                    trace_exit.warning(f"⚠️ {ticker} 포지션이 이미 삭제됨! (다른 스레드에서 청산됨)")
                 return
         current_price = self.api.get_current_price(ticker)
         
@@ -1189,14 +1391,16 @@ class AutoProfitBot:
         )
         
         # ⭐ 조건 0: 통합 리스크 평가 (새로 추가)
-        _original_print(f"[DEBUG-CHECK] 조건 0: 리스크 평가 시작...")
+        if trace_exit.debug_on:
+            trace_exit.debug("조건 0: 리스크 평가 시작...")
         try:
             # 시장 상황 분석
             market_condition = {'volatility': 'medium', 'trend': 'neutral'}
             
             # 최근 가격 데이터로 변동성 추정
             ohlcv = self.api.get_ohlcv(ticker, interval='minute1', count=10)
-            _original_print(f"[DEBUG-CHECK] OHLCV 데이터 조회 완료: {len(ohlcv) if ohlcv is not None else 0}개")
+            if trace_exit.debug_on:
+                trace_exit.debug(f"OHLCV 데이터 조회 완료: {len(ohlcv) if ohlcv is not None else 0}개")
             if ohlcv is not None and len(ohlcv) >= 2:
                 recent_changes = []
                 # DataFrame인 경우 .iloc 사용
@@ -1229,7 +1433,8 @@ class AutoProfitBot:
             
             # 리스크 평가 실행
             risk_eval = self.risk_manager.evaluate_holding_risk(ticker, market_condition)
-            _original_print(f"[DEBUG-CHECK] 리스크 평가 완료: {risk_eval['risk_level']}")
+            if trace_exit.debug_on:
+                trace_exit.debug(f"리스크 평가 완료: {risk_eval['risk_level']}")
             
             # 로그 출력
             if risk_eval['risk_level'] in ['HIGH', 'CRITICAL']:
@@ -1241,34 +1446,36 @@ class AutoProfitBot:
             
             # CRITICAL 리스크 시 즉시 청산
             if risk_eval['risk_level'] == 'CRITICAL':
-                _original_print(f"[FORCE-SELL] 🚨 CRITICAL 리스크 강제 매도 시작!")
+                if trace_exit.info_on:
+                    trace_exit.info("🚨 CRITICAL 리스크 강제 매도 시작!")
                 try:
                     self.execute_sell(ticker, f"위험도 CRITICAL 청산 ({risk_eval['recommended_action']})")
-                    _original_print(f"[FORCE-SELL] ✅ CRITICAL 리스크 매도 완료!")
+                    if trace_exit.info_on:
+                        trace_exit.info("✅ CRITICAL 리스크 매도 완료!")
                 except Exception as e:
-                    _original_print(f"[FORCE-SELL] ❌ 매도 실패: {e}")
-                    import traceback
-                    _original_print(f"[FORCE-SELL] ❌ 스택 트레이스:\n{traceback.format_exc()}")
+                    if trace_exit.error_on:
+                        trace_exit.error(f"❌ 매도 실패: {e}", exc_info=True)
                 return
             
             # HIGH 리스크 + 손실 중이면 청산
             if risk_eval['risk_level'] == 'HIGH' and position.profit_loss_ratio < -2.0:
-                _original_print(f"[FORCE-SELL] 🚨 HIGH 리스크 강제 매도 시작!")
+                if trace_exit.info_on:
+                    trace_exit.info("🚨 HIGH 리스크 강제 매도 시작!")
                 try:
                     self.execute_sell(ticker, f"고위험 + 손실 청산 ({risk_eval['recommended_action']})")
-                    _original_print(f"[FORCE-SELL] ✅ HIGH 리스크 매도 완료!")
+                    if trace_exit.info_on:
+                        trace_exit.info("✅ HIGH 리스크 매도 완료!")
                 except Exception as e:
-                    _original_print(f"[FORCE-SELL] ❌ 매도 실패: {e}")
-                    import traceback
-                    _original_print(f"[FORCE-SELL] ❌ 스택 트레이스:\n{traceback.format_exc()}")
+                    if trace_exit.error_on:
+                        trace_exit.error(f"❌ 매도 실패: {e}", exc_info=True)
                 return
             
-            _original_print(f"[DEBUG-CHECK] 조건 0 완료: 리스크 레벨 {risk_eval['risk_level']} - 계속 진행")
+            if trace_exit.debug_on:
+                trace_exit.debug(f"조건 0 완료: 리스크 레벨 {risk_eval['risk_level']} - 계속 진행")
                 
         except Exception as e:
-            _original_print(f"[DEBUG-CHECK] ⚠️ 조건 0 예외 발생: {e}")
-            import traceback
-            _original_print(f"[DEBUG-CHECK] 스택 트레이스:\n{traceback.format_exc()}")
+            if trace_exit.error_on:
+                trace_exit.error(f"⚠️ 조건 0 예외 발생: {e}", exc_info=True)
             self.logger.log_warning(f"{ticker} 리스크 평가 실패: {e}")
         
         # 보유 시간 계산
@@ -1300,37 +1507,43 @@ class AutoProfitBot:
         elif 'GRID' in strategy_upper:
             max_hold_time = 3600  # 1시간
         
-        _original_print(f"[DEBUG-CHECK] 조건 1: 시간 초과 체크")
-        _original_print(f"[DEBUG-CHECK] - 전략: {position.strategy} (정규화: {strategy_upper})")
-        _original_print(f"[DEBUG-CHECK] - 최대 보유 시간: {max_hold_time}초 ({max_hold_time//60}분)")
-        _original_print(f"[DEBUG-CHECK] - 현재 보유 시간: {hold_time:.0f}초 ({hold_time//60:.0f}분 {hold_time%60:.0f}초)")
-        _original_print(f"[DEBUG-CHECK] - 시간 초과? {hold_time} > {max_hold_time} = {hold_time > max_hold_time}")
+        if trace_exit.debug_on:
+            trace_exit.debug("조건 1: 시간 초과 체크")
+            trace_exit.debug(f"- 전략: {position.strategy} (정규화: {strategy_upper})")
+            trace_exit.debug(f"- 최대 보유 시간: {max_hold_time}초 ({max_hold_time//60}분)")
+            trace_exit.debug(f"- 현재 보유 시간: {hold_time:.0f}초 ({hold_time//60:.0f}분 {hold_time%60:.0f}초)")
+            trace_exit.debug(f"- 시간 초과? {hold_time} > {max_hold_time} = {hold_time > max_hold_time}")
         
         # ⭐ v6.30.52: 강제 매도 로직 - 시간 초과 조건 완화
         # 보유 시간이 최대의 80%만 넘어도 매도 (예: 10분 기준 8분 이상)
         force_sell_threshold = max_hold_time * 0.8
         
-        _original_print(f"[DEBUG-CHECK] - 강제 매도 기준: {force_sell_threshold:.0f}초 ({force_sell_threshold//60:.0f}분)")
-        _original_print(f"[DEBUG-CHECK] - 강제 매도 조건? {hold_time} > {force_sell_threshold:.0f} = {hold_time > force_sell_threshold}")
+        if trace_exit.debug_on:
+            trace_exit.debug(f"- 강제 매도 기준: {force_sell_threshold:.0f}초 ({force_sell_threshold//60:.0f}분)")
+            trace_exit.debug(f"- 강제 매도 조건? {hold_time} > {force_sell_threshold:.0f} = {hold_time > force_sell_threshold}")
         
         # ⭐ 조건 1: 시간 초과 청산 (80% 기준 완화)
         if hold_time > force_sell_threshold:
             profit_ratio = ((current_price - position.avg_buy_price) / position.avg_buy_price) * 100
-            _original_print(f"[DEBUG-CHECK] ⚠️ 시간 초과 청산 조건 충족!")
-            _original_print(f"[DEBUG-CHECK] - 보유: {hold_time/60:.0f}분, 손익: {profit_ratio:+.2f}%")
-            _original_print(f"[FORCE-SELL] 🚨 강제 매도 실행 시작!")
+            if trace_exit.warning_on:
+                trace_exit.warning("⚠️ 시간 초과 청산 조건 충족!")
+            if trace_exit.debug_on:
+                trace_exit.debug(f"- 보유: {hold_time/60:.0f}분, 손익: {profit_ratio:+.2f}%")
+            if trace_exit.info_on:
+                trace_exit.info("🚨 강제 매도 실행 시작!")
             
             try:
                 self.execute_sell(ticker, f"시간초과청산 (보유:{hold_time/60:.0f}분, 손익:{profit_ratio:+.2f}%)")
-                _original_print(f"[FORCE-SELL] ✅ 매도 주문 완료!")
+                if trace_exit.info_on:
+                    trace_exit.info("✅ 매도 주문 완료!")
             except Exception as e:
-                _original_print(f"[FORCE-SELL] ❌ 매도 실패: {e}")
-                import traceback
-                _original_print(f"[FORCE-SELL] ❌ 스택 트레이스:\n{traceback.format_exc()}")
+                if trace_exit.error_on:
+                    trace_exit.error(f"❌ 매도 실패: {e}", exc_info=True)
             
             return
         else:
-            _original_print(f"[DEBUG-CHECK] ✅ 시간 초과 조건 미충족 - 계속 보유")
+            if trace_exit.debug_on:
+                trace_exit.debug("✅ 시간 초과 조건 미충족 - 계속 보유")
         
         # ⭐ 조건 2-6: 차트 지표 및 급락/거래량 분석
         try:
@@ -1338,21 +1551,10 @@ class AutoProfitBot:
             df_1m = self.api.get_ohlcv(ticker, interval="minute1", count=5)  # 급락 감지용
             
             if df is not None and not df.empty:
-                # RSI 계산
-                delta = df['close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                rsi = 100 - (100 / (1 + rs))
-                current_rsi = rsi.iloc[-1] if not rsi.empty else 50
-                
-                # MACD 계산
-                exp1 = df['close'].ewm(span=12).mean()
-                exp2 = df['close'].ewm(span=26).mean()
-                macd = exp1 - exp2
-                signal = macd.ewm(span=9).mean()
-                macd_val = macd.iloc[-1]
-                signal_val = signal.iloc[-1]
+                # RSI / MACD (같은 캔들이면 전략/AI 모듈과 지표 묶음 공유)
+                bundle = get_indicators(df, ticker)
+                current_rsi = bundle.rsi(14)
+                macd_val, signal_val, _ = bundle.macd()
                 macd_direction = "상승" if macd_val > signal_val else "하락"
                 
                 # 거래량 변화 분석
@@ -1367,27 +1569,29 @@ class AutoProfitBot:
                     sudden_drop_threshold = getattr(Config, 'SUDDEN_DROP_THRESHOLD', -1.5)
                     
                     if price_change_1m <= sudden_drop_threshold:
-                        _original_print(f"[FORCE-SELL] 🚨 급락 감지 강제 매도 시작!")
+                        if trace_exit.info_on:
+                            trace_exit.info("🚨 급락 감지 강제 매도 시작!")
                         try:
                             self.execute_sell(ticker, f"급락감지 (1분:{price_change_1m:.2f}%)")
-                            _original_print(f"[FORCE-SELL] ✅ 급락 감지 매도 완료!")
+                            if trace_exit.info_on:
+                                trace_exit.info("✅ 급락 감지 매도 완료!")
                         except Exception as e:
-                            _original_print(f"[FORCE-SELL] ❌ 매도 실패: {e}")
-                            import traceback
-                            _original_print(f"[FORCE-SELL] ❌ 스택 트레이스:\n{traceback.format_exc()}")
+                            if trace_exit.error_on:
+                                trace_exit.error(f"❌ 매도 실패: {e}", exc_info=True)
                         return
                 
                 # ⭐ 조건 6: 거래량 급감 (평균 대비 0.5배 이하)
                 volume_drop_threshold = getattr(Config, 'VOLUME_DROP_THRESHOLD', 0.5)
                 if volume_ratio < volume_drop_threshold:
-                    _original_print(f"[FORCE-SELL] 🚨 거래량 급감 강제 매도 시작!")
+                    if trace_exit.info_on:
+                        trace_exit.info("🚨 거래량 급감 강제 매도 시작!")
                     try:
                         self.execute_sell(ticker, f"거래량급감 (평균 대비 {volume_ratio:.2f}배)")
-                        _original_print(f"[FORCE-SELL] ✅ 거래량 급감 매도 완료!")
+                        if trace_exit.info_on:
+                            trace_exit.info("✅ 거래량 급감 매도 완료!")
                     except Exception as e:
-                        _original_print(f"[FORCE-SELL] ❌ 매도 실패: {e}")
-                        import traceback
-                        _original_print(f"[FORCE-SELL] ❌ 스택 트레이스:\n{traceback.format_exc()}")
+                        if trace_exit.error_on:
+                            trace_exit.error(f"❌ 매도 실패: {e}", exc_info=True)
                     return
                 
                 # ⭐ 조건 3: 차트 신호 청산
@@ -1555,11 +1759,13 @@ class AutoProfitBot:
             sell_type = "💸 익절" if profit_ratio > 0 else "🚨 손절"
             
             # ⭐ v6.30.45: 콘솔에 익절/손절 실행 메시지 출력
-            _original_print(f"   ✅ {sell_type} 조건 충족! ({profit_ratio:+.2f}% {'≥ +1.5%' if profit_ratio > 0 else '≤ -1.0%'})")
-            _original_print(f"   💰 {sell_type} 매도 주문 실행 중...")
+            if trace_exit.info_on:
+                trace_exit.info(f"✅ {sell_type} 조건 충족! ({profit_ratio:+.2f}% {'≥ +1.5%' if profit_ratio > 0 else '≤ -1.0%'})")
+                trace_exit.info(f"💰 {sell_type} 매도 주문 실행 중...")
             
             # ⭐ v6.30.53: 강제 매도 로그 추가
-            _original_print(f"[FORCE-SELL] 🚨 {sell_type} 강제 매도 실행 시작!")
+            if trace_exit.info_on:
+                trace_exit.info(f"🚨 {sell_type} 강제 매도 실행 시작!")
             
             self.display.update_monitoring(
                 f"{sell_type} 트리거 발생!",
@@ -1571,11 +1777,11 @@ class AutoProfitBot:
             # ⭐ v6.30.53: 강제 매도 실행 (예외 캡처)
             try:
                 self.execute_sell(ticker, exit_reason)
-                _original_print(f"[FORCE-SELL] ✅ {sell_type} 매도 주문 완료!")
+                if trace_exit.info_on:
+                    trace_exit.info(f"✅ {sell_type} 매도 주문 완료!")
             except Exception as e:
-                _original_print(f"[FORCE-SELL] ❌ {sell_type} 매도 실패: {e}")
-                import traceback
-                _original_print(f"[FORCE-SELL] ❌ 스택 트레이스:\n{traceback.format_exc()}")
+                if trace_exit.error_on:
+                    trace_exit.error(f"❌ {sell_type} 매도 실패: {e}", exc_info=True)
             
             return
         else:
@@ -1602,7 +1808,7 @@ class AutoProfitBot:
                 return
             
             prices = {}
-            for ticker in self.risk_manager.positions.keys():
+            for ticker in list(self.risk_manager.positions):
                 try:
                     price = self.api.get_current_price(ticker)
                     if price:
@@ -1612,7 +1818,8 @@ class AutoProfitBot:
                     continue
             
             if prices:
-                self.risk_manager.update_positions(prices)
+                with self.trade_lock:
+                    self.risk_manager.update_positions(prices)
         
         except Exception as e:
             self.logger.log_error("UPDATE_POSITIONS_ERROR", "포지션 업데이트 실패", e)
@@ -1627,17 +1834,21 @@ class AutoProfitBot:
             has_positions = bool(self.risk_manager.positions)
             position_count = len(self.risk_manager.positions) if has_positions else 0
             
-            _original_print(f"[DEBUG-QUICK] quick_check_positions 진입 - has_positions: {has_positions}, count: {position_count}")
+            if trace_quick.debug_on:
+                trace_quick.debug(f"quick_check_positions 진입 - has_positions: {has_positions}, count: {position_count}")
             
             if not has_positions or position_count == 0:
-                _original_print(f"[DEBUG-QUICK] ⚠️ 포지션 없음! 즉시 return")
+                if trace_quick.warning_on:
+                    trace_quick.warning("⚠️ 포지션 없음! 즉시 return")
                 return
             
             # ⭐ v6.30.46: 청산 체크 헤더를 먼저 출력 (display.update_monitoring 전에)
             from datetime import datetime
             check_time = datetime.now().strftime('%H:%M:%S')
-            _original_print(f"\n--- ⚡ 포지션 청산 체크 #{getattr(self, 'quick_check_count', 0)} - {check_time} ---")
-            _original_print(f"[DEBUG-QUICK] 포지션 {position_count}개 청산 조건 검사 시작...")
+            if trace_quick.info_on:
+                trace_quick.info(f"--- ⚡ 포지션 청산 체크 #{getattr(self, 'quick_check_count', 0)} - {check_time} ---")
+            if trace_quick.debug_on:
+                trace_quick.debug(f"포지션 {position_count}개 청산 조건 검사 시작...")
             
             # ⭐ v6.30.26: 화면 업데이트 (예외 발생 시에도 계속 진행)
             try:
@@ -1647,18 +1858,21 @@ class AutoProfitBot:
                     datetime.now().strftime('%H:%M:%S')
                 )
             except Exception as e:
-                _original_print(f"[DEBUG-QUICK] ⚠️ display.update_monitoring 실패: {e}")
+                if trace_quick.warning_on:
+                    trace_quick.warning(f"⚠️ display.update_monitoring 실패: {e}")
             
             # ⭐ v6.30.18: 디버그 로그 추가
             self.logger.log_info(f"🔍 quick_check_positions 실행 - 포지션 {position_count}개")
             
             # 포지션 목록 복사 (iteration 중 변경 방지)
             positions_to_check = list(self.risk_manager.positions.items())
-            _original_print(f"[DEBUG-QUICK] positions_to_check 생성 완료: {len(positions_to_check)}개")
-            _original_print(f"[DEBUG-QUICK] 티커 목록: {[ticker for ticker, _ in positions_to_check]}")
+            if trace_quick.debug_on:
+                trace_quick.debug(f"positions_to_check 생성 완료: {len(positions_to_check)}개")
+                trace_quick.debug(f"티커 목록: {[ticker for ticker, _ in positions_to_check]}")
             
             for idx, (ticker, position) in enumerate(positions_to_check, 1):
-                _original_print(f"\n[DEBUG-QUICK] [{idx}/{position_count}] {ticker} 체크 시작...")
+                if trace_quick.debug_on:
+                    trace_quick.debug(f"[{idx}/{position_count}] {ticker} 체크 시작...")
                 try:
                     # ⭐ v6.30.26: 진행 상황 표시
                     self.display.update_monitoring(
@@ -1687,8 +1901,9 @@ class AutoProfitBot:
                     hold_seconds = int(time.time() - position.entry_time.timestamp())
                     hold_time_str = f"{hold_seconds//60}분 {hold_seconds%60}초" if hold_seconds >= 60 else f"{hold_seconds}초"
                     
-                    _original_print(f"📊 {ticker} 손익률: {profit_str} (보유 {hold_time_str})")
-                    _original_print(f"   익절 목표: +1.5% | 손절 목표: -1.0%")
+                    if trace_quick.info_on:
+                        trace_quick.info(f"📊 {ticker} 손익률: {profit_str} (보유 {hold_time_str})")
+                        trace_quick.info("익절 목표: +1.5% | 손절 목표: -1.0%")
                     
                     # ⭐ v6.30.26: 손익률 화면 표시
                     self.display.update_monitoring(
@@ -1699,29 +1914,30 @@ class AutoProfitBot:
                     
                     # 전략 객체 가져오기
                     strategy_name = position.strategy
-                    _original_print(f"[DEBUG-QUICK] 포지션 전략 이름: '{strategy_name}' (타입: {type(strategy_name)})")
+                    if trace_quick.debug_on:
+                        trace_quick.debug(f"포지션 전략 이름: '{strategy_name}' (타입: {type(strategy_name)})")
                     
                     try:
                         strategy = self._get_strategy_by_name(strategy_name)
-                        _original_print(f"[DEBUG-QUICK] 전략 객체 결과: {strategy} (타입: {type(strategy)})")
-                        _original_print(f"[DEBUG-QUICK] strategy is None? {strategy is None}")
-                        _original_print(f"[DEBUG-QUICK] bool(strategy)? {bool(strategy)}")
+                        if trace_quick.debug_on:
+                            trace_quick.debug(f"전략 객체 결과: {strategy} (타입: {type(strategy)})")
                     except Exception as e:
-                        _original_print(f"[DEBUG-QUICK] ❌ 전략 객체 가져오기 실패: {e}")
-                        _original_print(f"[DEBUG-QUICK] ❌ 예외 타입: {type(e)}")
-                        import traceback
-                        _original_print(f"[DEBUG-QUICK] ❌ 스택 트레이스:\n{traceback.format_exc()}")
+                        if trace_quick.error_on:
+                            trace_quick.error(f"❌ 전략 객체 가져오기 실패: {e}", exc_info=True)
                         strategy = None
                     
                     if strategy:
                         # check_positions 호출 (10가지 청산 조건 체크)
                         # ⭐ v6.30.50: 포지션 객체를 직접 전달 (동시성 문제 방지)
-                        _original_print(f"[DEBUG-QUICK] ✅ check_positions() 호출 시작...")
+                        if trace_quick.debug_on:
+                            trace_quick.debug("✅ check_positions() 호출 시작...")
                         self.logger.log_info(f"🎯 {ticker} → check_positions() 호출 (전략: {strategy_name})")
                         self.check_positions(ticker, strategy, position=position)  # ← 포지션 직접 전달!
-                        _original_print(f"[DEBUG-QUICK] ✅ check_positions() 호출 완료")
+                        if trace_quick.debug_on:
+                            trace_quick.debug("✅ check_positions() 호출 완료")
                     else:
-                        _original_print(f"[DEBUG-QUICK] ⚠️ 전략 객체 없음: {strategy_name}")
+                        if trace_quick.warning_on:
+                            trace_quick.warning(f"⚠️ 전략 객체 없음: {strategy_name}")
                         self.logger.log_warning(f"⚠️ {ticker} 전략 객체 없음: {strategy_name}")
                 
                 except Exception as e:
@@ -1737,8 +1953,9 @@ class AutoProfitBot:
         ⭐ v6.30.49: 대소문자 및 다양한 형식 지원 강화
         ⭐ v6.30.54: self.strategies 딕셔너리 사용 (AttributeError 수정)
         """
-        _original_print(f"[DEBUG-STRATEGY-MAP] _get_strategy_by_name 호출됨")
-        _original_print(f"[DEBUG-STRATEGY-MAP] 입력 strategy_name: '{strategy_name}' (타입: {type(strategy_name)})")
+        if trace_strategy.debug_on:
+            trace_strategy.debug("_get_strategy_by_name 호출됨")
+            trace_strategy.debug(f"입력 strategy_name: '{strategy_name}' (타입: {type(strategy_name)})")
         
         # ⭐ v6.30.54: self.strategies 딕셔너리에서 직접 가져오기
         strategy_map = {
@@ -1798,28 +2015,34 @@ class AutoProfitBot:
             'chase_buy': self.strategies.get('ultra_scalping'),
         }
         
-        _original_print(f"[DEBUG-STRATEGY-MAP] '{strategy_name}' in strategy_map? {strategy_name in strategy_map}")
+        if trace_strategy.debug_on:
+            trace_strategy.debug(f"'{strategy_name}' in strategy_map? {strategy_name in strategy_map}")
         
         # 먼저 정확히 매칭되는지 확인
         if strategy_name in strategy_map and strategy_map[strategy_name]:
             result = strategy_map[strategy_name]
-            _original_print(f"[DEBUG-STRATEGY-MAP] ✅ 정확히 매칭됨!")
-            _original_print(f"[DEBUG-STRATEGY-MAP] 반환 결과: {result} (타입: {type(result)})")
+            if trace_strategy.debug_on:
+                trace_strategy.debug("✅ 정확히 매칭됨!")
+                trace_strategy.debug(f"반환 결과: {result} (타입: {type(result)})")
             return result
         
         # 매칭 실패 시 대소문자 무시하고 재시도
-        _original_print(f"[DEBUG-STRATEGY-MAP] ⚠️ 정확히 매칭 실패, 대소문자 무시하고 재시도...")
+        if trace_strategy.warning_on:
+            trace_strategy.warning("⚠️ 정확히 매칭 실패, 대소문자 무시하고 재시도...")
         strategy_name_upper = strategy_name.upper()
         for key, value in strategy_map.items():
             if value and key.upper() == strategy_name_upper:
-                _original_print(f"[DEBUG-STRATEGY-MAP] ✅ 대소문자 무시 매칭 성공: '{key}'")
-                _original_print(f"[DEBUG-STRATEGY-MAP] 반환 결과: {value} (타입: {type(value)})")
+                if trace_strategy.debug_on:
+                    trace_strategy.debug(f"✅ 대소문자 무시 매칭 성공: '{key}'")
+                    trace_strategy.debug(f"반환 결과: {value} (타입: {type(value)})")
                 return value
         
         # 그래도 실패 시 기본값 (aggressive_scalping)
-        _original_print(f"[DEBUG-STRATEGY-MAP] ❌ 매칭 실패! 기본값(aggressive_scalping) 반환")
+        if trace_strategy.error_on:
+            trace_strategy.error("❌ 매칭 실패! 기본값(aggressive_scalping) 반환")
         result = self.strategies.get('aggressive_scalping')
-        _original_print(f"[DEBUG-STRATEGY-MAP] 반환 결과: {result} (타입: {type(result)})")
+        if trace_strategy.debug_on:
+            trace_strategy.debug(f"반환 결과: {result} (타입: {type(result)})")
         return result
     
     def check_profit_withdrawal(self):
@@ -1964,28 +2187,28 @@ class AutoProfitBot:
         if not prices_dict:
             return
         
-        # 급등/급락 코인 탐지 (각 티커별로 검사)
-        detected_coins = []
-        for ticker in tickers_snapshot:
-            if ticker not in prices_dict:
-                continue
-            
-            # 급등 감지
-            try:
-                surge_info = self.surge_detector.detect_surge(ticker, self.api)
-                if surge_info and surge_info.get('surge_score', 0) >= self.surge_detector.min_surge_score:
-                    detected_coins.append({
-                        'ticker': ticker,
-                        **surge_info
-                    })
-            except Exception as e:
-                # 개별 코인 에러는 무시하고 계속 진행
-                pass
+        # 급등/급락 코인 탐지 (배치 현재가 + 스트림 거래량으로 롤링 상태 갱신 후 한 번에 벡터 계산)
+        try:
+            detected_coins = self.surge_detector.scan_market_batch(
+                tickers_snapshot, prices_dict, self.api,
+                ws_client=self.ws_client, ws_max_age=Config.WEBSOCKET_MAX_AGE
+            )
+        except Exception as e:
+            self.logger.log_warning(f"급등 일괄 스캔 실패: {e}")
+            detected_coins = []
         
         if not detected_coins:
             return
         
-        # 감지된 코인 중 진입 가능한 것 선택
+        self._enter_surges(detected_coins)
+    
+    def _enter_surges(self, detected_coins: List[Dict]):
+        """
+        감지된 급등 코인 초단타 진입 (캔들 스캔/체결 테이프 공통)
+        
+        Args:
+            detected_coins: 급등 정보 리스트 (ticker 포함)
+        """
         for coin_info in detected_coins:
             if len(self.ultra_positions) >= self.max_ultra_positions:
                 break
@@ -2023,8 +2246,10 @@ class AutoProfitBot:
                 f"신뢰도: {surge_info.get('confidence', 0):.2f})"
             )
             
-            # 초단타 진입
-            self.execute_ultra_buy(ticker, coin_info)
+            # 초단타 진입 (같은 티커 주문 중이면 건너뜀)
+            with self._ticker_order(ticker) as acquired:
+                if acquired:
+                    self.execute_ultra_buy(ticker, coin_info)
     
     def execute_ultra_buy(self, ticker: str, surge_info: Dict):
         """
@@ -2039,8 +2264,8 @@ class AutoProfitBot:
             if self.risk_manager.is_trading_stopped:
                 return
             
-            # 현재가 조회
-            current_price = self.api.get_current_price(ticker)
+            # 현재가 조회 (주문 직전이므로 캐시 미사용)
+            current_price = self.api.get_current_price(ticker, bypass_cache=True)
             if not current_price:
                 return
             
@@ -2058,7 +2283,7 @@ class AutoProfitBot:
             amount = investment / current_price
             
             # 실거래 모드에서만 실제 주문
-            if self.mode == 'live' and self.api.upbit:
+            if (self.mode == 'live' or self.sim_exchange) and self.api.upbit:
                 order = self.api.buy_market_order(ticker, investment)
                 if not order:
                     return
@@ -2066,7 +2291,7 @@ class AutoProfitBot:
                 self.logger.log_info(f"[모의거래] 초단타 매수: {ticker}, {investment:,.0f}원")
             
             # 초단타 포지션 등록 (⭐ 가격 이력 추가)
-            self.ultra_positions[ticker] = {
+            position = {
                 'entry_time': datetime.now(),
                 'entry_price': current_price,
                 'amount': amount,
@@ -2077,6 +2302,9 @@ class AutoProfitBot:
                 'max_price': current_price,  # 최고가 추적
                 'last_update': time.time()  # 마지막 업데이트 시간
             }
+            with self.trade_lock:
+                self.ultra_positions[ticker] = position
+            self._sync_stream_subscriptions()
             
             # 거래 로그
             self.logger.log_trade(
@@ -2109,7 +2337,7 @@ class AutoProfitBot:
                     }
                 )
                 # entry_time_id를 포지션에 저장
-                self.ultra_positions[ticker]['entry_time_id'] = entry_time_id
+                position['entry_time_id'] = entry_time_id
             except Exception as e:
                 self.logger.log_warning(f"⚠️  초단타 학습 진입 기록 실패: {e}")
             
@@ -2129,7 +2357,7 @@ class AutoProfitBot:
                     current_price=current_price,
                     amount=amount,
                     strategy='⚡초단타',
-                    entry_time=self.ultra_positions[ticker]['entry_time']
+                    entry_time=position['entry_time']
                 )
                 self.display.render()  # 즉시 화면 갱신
                 
@@ -2141,7 +2369,6 @@ class AutoProfitBot:
                     f"{investment:,.0f}원"
                 )
                 self.display.render()
-                time.sleep(1)  # 1초간 표시
             
         except Exception as e:
             self.logger.log_error("ULTRA_BUY_ERROR", f"{ticker} 초단타 매수 실패", e)
@@ -2163,56 +2390,254 @@ class AutoProfitBot:
         if not ultra_strategy:
             return
         
-        current_time = time.time()
-        
         for ticker in list(self.ultra_positions.keys()):
             try:
-                position = self.ultra_positions[ticker]
-                
                 # 현재가 조회
                 current_price = self.api.get_current_price(ticker)
                 if not current_price:
                     continue
                 
-                # ⭐ 가격 이력 업데이트 (1초마다)
-                position['price_history'].append(current_price)
-                
-                # 최고가 갱신
-                if current_price > position['max_price']:
-                    position['max_price'] = current_price
-                
-                # 이력은 최근 30개만 유지 (30초)
-                if len(position['price_history']) > 30:
-                    position['price_history'] = position['price_history'][-30:]
-                
-                position['last_update'] = current_time
-                
-                # 보유 시간 계산
-                hold_time = (datetime.now() - position['entry_time']).total_seconds()
-                
-                # ⭐ 청산 조건 확인 (가격 이력 포함)
-                should_exit, exit_reason = ultra_strategy.should_exit(
-                    position['entry_price'], 
-                    current_price,
-                    hold_time,
-                    price_history=position['price_history']  # ⭐ 가격 이력 전달
-                )
-                
-                if should_exit:
-                    self.execute_ultra_sell(ticker, current_price, exit_reason)
-                else:
-                    # 손익 로그 (0.3% 이상만, 3초마다만 출력)
-                    profit_ratio = (current_price - position['entry_price']) / position['entry_price']
-                    if abs(profit_ratio) > 0.003 and int(hold_time) % 3 == 0:
-                        max_gain = (position['max_price'] - position['entry_price']) / position['entry_price']
-                        self.logger.log_info(
-                            f"  ⚡ {ticker}: {profit_ratio*100:+.2f}% "
-                            f"(최고 {max_gain*100:+.2f}%, 보유: {hold_time:.0f}초)"
-                        )
+                with self._ticker_order(ticker) as acquired:
+                    if acquired:
+                        self._check_ultra_position(ticker, current_price, ultra_strategy)
                 
             except Exception as e:
                 self.logger.log_error("ULTRA_CHECK", f"{ticker} 초단타 체크 실패", e)
     
+    def _check_ultra_position(self, ticker: str, current_price: float, ultra_strategy):
+        """
+        초단타 포지션 1개 청산 조건 확인
+        
+        Args:
+            ticker: 코인 티커
+            current_price: 현재가
+            ultra_strategy: 초단타 전략 객체
+        """
+        position = self.ultra_positions.get(ticker)
+        if position is None:
+            return
+        current_time = time.time()
+        
+        # ⭐ 가격 이력 업데이트 (1초마다 - 감시 주기가 더 짧아도 30개 = 30초 유지)
+        if current_time - position.get('last_history_time', 0) >= 1.0:
+            position['price_history'].append(current_price)
+            position['last_history_time'] = current_time
+        
+        # 최고가 갱신
+        if current_price > position['max_price']:
+            position['max_price'] = current_price
+        
+        # 이력은 최근 30개만 유지 (30초)
+        if len(position['price_history']) > 30:
+            position['price_history'] = position['price_history'][-30:]
+        
+        position['last_update'] = current_time
+        
+        # 보유 시간 계산
+        hold_time = (datetime.now() - position['entry_time']).total_seconds()
+        
+        # ⭐ 청산 조건 확인 (가격 이력 포함)
+        should_exit, exit_reason = ultra_strategy.should_exit(
+            position['entry_price'], 
+            current_price,
+            hold_time,
+            price_history=position['price_history']  # ⭐ 가격 이력 전달
+        )
+        
+        if should_exit:
+            self.execute_ultra_sell(ticker, current_price, exit_reason)
+        else:
+            # 손익 로그 (0.3% 이상만, 3초마다만 출력)
+            profit_ratio = (current_price - position['entry_price']) / position['entry_price']
+            if abs(profit_ratio) > 0.003 and int(hold_time) % 3 == 0 and current_time - position.get('last_log_time', 0) >= 1.0:
+                position['last_log_time'] = current_time
+                max_gain = (position['max_price'] - position['entry_price']) / position['entry_price']
+                self.logger.log_info(
+                    f"  ⚡ {ticker}: {profit_ratio*100:+.2f}% "
+                    f"(최고 {max_gain*100:+.2f}%, 보유: {hold_time:.0f}초)"
+                )
+    
+    @contextmanager
+    def _ticker_order(self, ticker: str):
+        """
+        티커 주문 진행 표시 (같은 티커의 매수/매도/청산 판단이 스레드 간에 겹치지 않게)
+        
+        거래 잠금은 표시를 붙이고 뗄 때만 잡으므로 주문/시세 조회 대기 중에도 다른 티커 청산은 진행
+        
+        Yields:
+            표시를 얻었으면 True (다른 스레드가 같은 티커를 처리 중이면 False)
+        """
+        with self.trade_lock:
+            acquired = ticker not in self._orders_in_flight
+            if acquired:
+                self._orders_in_flight.add(ticker)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with self.trade_lock:
+                    self._orders_in_flight.discard(ticker)
+    
+    def _watched_tickers(self) -> List[str]:
+        """청산 감시 대상 (일반 + 초단타 포지션, 청산된 포지션의 가격 레벨은 정리)"""
+        tickers = list(self.risk_manager.positions.keys())
+        self.price_triggers.retain(tickers)
+        return tickers + list(self.ultra_positions.keys())
+    
+    def _exit_strategy(self, strategy_name: str):
+        """청산 감시용 전략 객체 (이름별 1회만 조회)"""
+        if strategy_name not in self._exit_strategies:
+            self._exit_strategies[strategy_name] = self._get_strategy_by_name(strategy_name)
+        return self._exit_strategies[strategy_name]
+    
+    def _evaluate_exit(self, ticker: str, current_price: float) -> bool:
+        """
+        청산 감시 스레드의 코인별 판단 (티커 주문 표시 안에서 실행, 같은 티커를 처리 중이면 다음 감시로 미룸)
+        
+        - 초단타: 감시마다 전체 청산 조건 (가격 이력 기반)
+        - 일반: 가격 트리거 인덱스로 넘은 레벨만 확인 (O(log n)),
+          레벨을 넘었을 때만 청산/레벨 갱신, 10가지 청산 조건 전체는 position_check_interval마다
+        
+        Args:
+            ticker: 코인 티커
+            current_price: 배치 조회한 현재가
+        
+        Returns:
+            청산했으면 True
+        """
+        with self._ticker_order(ticker) as acquired:
+            if not acquired:
+                return False
+            return self._check_exit(ticker, current_price)
+    
+    def _check_exit(self, ticker: str, current_price: float) -> bool:
+        """_evaluate_exit 본문 (호출 측이 티커 주문 표시를 잡은 상태)"""
+        if ticker in self.ultra_positions:
+            ultra_strategy = self.strategies.get('ultra_scalping')
+            if ultra_strategy:
+                self._check_ultra_position(ticker, current_price, ultra_strategy)
+            return ticker not in self.ultra_positions
+        
+        position = self.risk_manager.positions.get(ticker)
+        if position is None:
+            self.price_triggers.clear(ticker)
+            return False
+        position.current_price = current_price
+        strategy = self._exit_strategy(position.strategy)
+        
+        if not self.price_triggers.has(ticker):
+            self._refresh_exit_levels(ticker, position, strategy)
+        triggers = self.price_triggers.check(ticker, current_price)
+        now = time.time()
+        full_check_due = now - self._last_full_exit_check.get(ticker, 0) >= self.position_check_interval
+        if not triggers and not full_check_due:
+            return False
+        
+        keys = {trigger.key for trigger in triggers}
+        
+        # 최고가 갱신 → 트레일링 레벨 상향 (분석 없음)
+        if 'high_water' in keys:
+            self._raise_high_water(ticker, position, current_price)
+        
+        # 가격 레벨 청산
+        reason = self._price_exit_reason(ticker, position, strategy, current_price, keys)
+        if reason:
+            self.execute_sell(ticker, reason)
+            if ticker not in self.risk_manager.positions:
+                self.price_triggers.clear(ticker)
+                return True
+        
+        # 10가지 청산 조건 전체 (주기 도래 또는 분할 매도 레벨 도달 시)
+        if strategy and (full_check_due or 'scaled_sell' in keys):
+            self._last_full_exit_check[ticker] = now
+            self.check_positions(ticker, strategy, position=position)
+        
+        if ticker not in self.risk_manager.positions:
+            self.price_triggers.clear(ticker)
+            return True
+        self._refresh_exit_levels(ticker, position, strategy)
+        return False
+    
+    def _price_exit_reason(self, ticker: str, position, strategy, current_price: float, keys) -> str:
+        """발동한 가격 레벨의 청산 사유 (청산 대상 아니면 None)"""
+        profit_ratio = ((current_price - position.avg_buy_price) / position.avg_buy_price) * 100
+        
+        if 'dynamic_stop' in keys and self.dynamic_stop_loss:
+            return self.dynamic_stop_loss.get_stop_loss_reason(
+                current_price, position.avg_buy_price, position.stop_loss_price, profit_ratio
+            )
+        if 'trailing' in keys:
+            drop_from_peak = ((current_price - position.highest_price) / position.highest_price) * 100
+            return f"트레일링스탑 (최고가 대비 {drop_from_peak:.2f}%, 수익:{profit_ratio:+.2f}%)"
+        if 'exit_manager_trailing' in keys or 'exit_manager_stop' in keys:
+            should_exit, exit_reason, _ = self.exit_manager.should_exit(ticker, current_price, {}, {})
+            if should_exit:
+                return exit_reason
+        if ('stop' in keys or 'take_profit' in keys) and strategy:
+            # 레벨은 진입가 기준 근사 → 전략 판단으로 확인
+            should_exit, exit_reason = strategy.should_exit(position.avg_buy_price, current_price)
+            if should_exit:
+                return exit_reason
+        return None
+    
+    def _raise_high_water(self, ticker: str, position, current_price: float):
+        """최고가 갱신 시 트레일링 기준 상향 (포지션 최고가, 동적 손절가, DynamicExitManager)"""
+        position.highest_price = max(getattr(position, 'highest_price', current_price), current_price)
+        
+        if self.exit_manager and ticker in self.exit_manager.position_data:
+            self.exit_manager.update_position(ticker, current_price)
+        
+        stop_loss_price = getattr(position, 'stop_loss_price', None)
+        if self.dynamic_stop_loss and stop_loss_price:
+            profit_ratio = ((current_price - position.avg_buy_price) / position.avg_buy_price) * 100
+            if profit_ratio > 1.0:
+                position.stop_loss_price = self.dynamic_stop_loss.update_stop_loss_trailing(
+                    current_price, position.avg_buy_price, stop_loss_price, position.strategy, profit_ratio
+                )
+    
+    def _refresh_exit_levels(self, ticker: str, position, strategy):
+        """
+        포지션 청산 조건을 절대 가격 레벨로 계산해 트리거 인덱스에 등록
+        
+        - dynamic_stop: DynamicStopLoss 손절가 (트레일링으로 상향)
+        - stop / take_profit: 전략 손절/익절선
+        - trailing / high_water: 트레일링 스탑 (최소 수익 도달 후 최고가 - 오프셋), 최고가 갱신 감지
+        - exit_manager_*: DynamicExitManager 손절/트레일링 (등록된 포지션만)
+        - scaled_sell: ScaledSellManager 다음 분할 매도 레벨
+        """
+        avg_price = position.avg_buy_price
+        high = getattr(position, 'highest_price', None) or max(position.current_price, avg_price)
+        levels = {
+            'high_water': (math.nextafter(high, math.inf), ABOVE),
+        }
+        
+        if self.dynamic_stop_loss:
+            levels['dynamic_stop'] = (getattr(position, 'stop_loss_price', None), BELOW)
+        
+        if strategy is not None:
+            if hasattr(strategy, 'stop_loss'):
+                levels['stop'] = (avg_price * (1 - strategy.stop_loss), BELOW)
+            if hasattr(strategy, 'take_profit'):
+                levels['take_profit'] = (avg_price * (1 + strategy.take_profit), ABOVE)
+        
+        if getattr(Config, 'ENABLE_TRAILING_STOP', True):
+            trailing_offset = getattr(Config, 'TRAILING_STOP_OFFSET', 1.0)
+            trailing_min_profit = getattr(Config, 'TRAILING_STOP_MIN_PROFIT', 1.0)
+            if high >= avg_price * (1 + trailing_min_profit / 100):
+                levels['trailing'] = (high * (1 - trailing_offset / 100), BELOW)
+        
+        if self.exit_manager and ticker in self.exit_manager.position_data:
+            data = self.exit_manager.position_data[ticker]
+            levels['exit_manager_stop'] = (data['entry_price'] * 0.98, BELOW)
+            levels['exit_manager_trailing'] = (data['trailing_stop_price'], BELOW)
+        
+        if self.scaled_sell and self.scaled_sell.enabled:
+            next_threshold = self.scaled_sell.get_progress(ticker)['next_threshold']
+            if next_threshold is not None:
+                levels['scaled_sell'] = (avg_price * (1 + next_threshold / 100), ABOVE)
+        
+        self.price_triggers.set_levels(ticker, levels)
+    
     def execute_ultra_sell(self, ticker: str, current_price: float, reason: str):
         """
         초단타 매도 실행
@@ -2229,7 +2654,7 @@ class AutoProfitBot:
             position = self.ultra_positions[ticker]
             
             # 실거래 모드에서만 실제 주문
-            if self.mode == 'live' and self.api.upbit:
+            if (self.mode == 'live' or self.sim_exchange) and self.api.upbit:
                 order = self.api.sell_market_order(ticker, position['amount'])
                 if not order:
                     return
@@ -2310,7 +2735,8 @@ class AutoProfitBot:
             )
             
             # 포지션 제거
-            del self.ultra_positions[ticker]
+            with self.trade_lock:
+                self.ultra_positions.pop(ticker, None)
             
         except Exception as e:
             self.logger.log_error("ULTRA_SELL_ERROR", f"{ticker} 초단타 매도 실패", e)
@@ -2319,12 +2745,12 @@ class AutoProfitBot:
         """
         봇 실행 (하이브리드 + 초단타 - AI 학습 통합)
         
-        실행 주기 (v6.30.9 최적화):
-        - 60초: 전체 코인 스캔 + 신규 진입
-        - 3초: 일반 포지션 체크 (10가지 청산 조건)
+        실행 주기 (v6.30.9 최적화, 마감 시각 기반 스케줄러):
+        - 3초: 일반 포지션 체크 (10가지 청산 조건) - 최우선
         - 5초: 급등/급락 감지 + 초단타 진입
-        - 3분: 동적 코인 갱신
         - 3초: 화면 자동 갱신
+        - 60초: 전체 코인 스캔 + 신규 진입 (티커 단위로 양보 → 스캔 중에도 청산 체크 제시간 실행)
+        - 3분: 동적 코인 갱신
         """
         self.running = True
         
@@ -2333,259 +2759,30 @@ class AutoProfitBot:
         self.display.update_bot_status("시작 중...")
         self.display.update_scan_status(f"코인 {len(self.tickers)}개 모니터링 준비")
         
-        # 초기 로그는 파일에만 기록
-        # self.logger.log_info("🤖 봇 가동 시작! (AI 학습 통합 모드)")
-        # self.logger.log_info(f"   📅 전체 스캔: {self.full_scan_interval}초 ({self.full_scan_interval//60}분)")
-        # self.logger.log_info(f"   ⚡ 포지션 체크: {self.position_check_interval}초")
-        # self.logger.log_info(f"   🔥 급등 감지: {self.surge_scan_interval}초 (초단타 최대 {self.max_ultra_positions}개)")
-        # self.logger.log_info(f"   🔄 화면 갱신: {self.display_update_interval}초\n")
+        self.scan_cycle = 0
+        self.quick_check_count = 0
+        self.surge_scan_count = 0
         
-        cycle = 0
-        monitor_count = 0  # ⭐ 모니터링 카운터 초기화
+        scheduler = TaskScheduler(
+            on_error=lambda name, e: self.logger.log_error("JOB_ERROR", f"작업 실행 실패 ({name})", e)
+        )
+        if self.exit_watcher:
+            # 청산은 별도 감시 스레드가 담당 (스캔/스케줄러와 무관하게 초당 여러 번)
+            self.exit_watcher.start()
+        else:
+            scheduler.add_job('position_check', self._job_position_check, self.position_check_interval, JobPriority.EXIT)
+        scheduler.add_job('surge_scan', self._job_surge_scan, self.surge_scan_interval, JobPriority.SURGE)
+        if self.tape_surge:
+            scheduler.add_job('tape_surge', self._job_tape_surge, Config.TAPE_SURGE_INTERVAL, JobPriority.SURGE)
+        scheduler.add_job('risk_status', self._job_risk_status, 1, JobPriority.DISPLAY)
+        scheduler.add_job('display', self._job_display, self.display_update_interval, JobPriority.DISPLAY)
+        scheduler.add_job('full_scan', self._job_full_scan, self.full_scan_interval, JobPriority.SCAN)
+        scheduler.add_job('coin_refresh', self._job_coin_refresh, 10, JobPriority.BACKGROUND)
+        scheduler.add_job('realtime_monitor', self._job_realtime_monitor, 30, JobPriority.BACKGROUND, delay=30)
+        self.task_scheduler = scheduler
         
         try:
-            while self.running:
-                current_time = time.time()
-                monitor_count += 1  # ⭐ 모니터링 카운터 증가
-                
-                # 🔍 DEBUG: 루프 시작 확인
-                _original_print(f"\n[DEBUG-LOOP] 메인 루프 #{monitor_count} 시작 - 시간: {current_time:.2f}")
-                
-                # 화면 갱신 (3초마다)
-                if current_time - self.last_display_update_time >= self.display_update_interval:
-                    self._update_display()
-                    self.last_display_update_time = current_time
-                
-                # 일일 통계 리셋
-                self.risk_manager.reset_daily_stats()
-                
-                # 거래 정지 확인
-                if self.risk_manager.is_trading_stopped:
-                    self.display.update_scan_status(f"⛔ 거래 정지: {self.risk_manager.stop_reason}")
-                    time.sleep(self.full_scan_interval)
-                    continue
-                
-                # 🆕 실시간 모니터링 (30초마다)
-                if monitor_count % 30 == 0 and self.risk_manager.positions:
-                    active_tickers = list(self.risk_manager.positions.keys())
-                    
-                    # 호가창 모니터링 (로그 없이)
-                    if self.orderbook_monitor:
-                        self.orderbook_monitor.monitor_orderbook(active_tickers)
-                    
-                    # 체결 모니터링 (선택적, 로그 없이)
-                    if self.trade_monitor and len(active_tickers) <= 3:
-                        for ticker in active_tickers:
-                            self.trade_monitor.monitor_trades(ticker, count=100)
-                
-                # ⭐ PHASE 0: 동적 코인 선정 갱신 (5분마다 또는 설정 주기)
-                if self.dynamic_coin_selector and self.dynamic_coin_selector.should_update():
-                    self.display.update_scan_status("코인 목록 갱신 중...")
-                    
-                    old_count = len(self.tickers)
-                    new_tickers = self.dynamic_coin_selector.get_coins(method=Config.COIN_SELECTION_METHOD)
-                    
-                    # 🔥 개선 2: 급등 추적 중인 코인 보존 (점수 70+ 유지)
-                    tracking_tickers = []
-                    if hasattr(self, 'surge_detector') and self.surge_detector:
-                        try:
-                            for ticker in self.tickers:
-                                # 급등 점수가 70 이상인 코인은 목록에서 제외하지 않음
-                                surge_info = self.surge_detector.detect_surge(ticker, self.api)
-                                if surge_info and surge_info.get('surge_score', 0) >= 70:
-                                    tracking_tickers.append(ticker)
-                        except Exception as e:
-                            pass
-                    
-                    # 새 코인 목록 + 급등 추적 중인 코인 병합 (중복 제거, 최대 40개)
-                    self.tickers = list(set(new_tickers + tracking_tickers))[:40]
-                    
-                    if tracking_tickers:
-                        self.display.update_scan_status(
-                            f"코인 갱신 완료: {old_count}개 → {len(self.tickers)}개 "
-                            f"(급등 추적: {len(tracking_tickers)}개 보존)"
-                        )
-                    else:
-                        self.display.update_scan_status(f"코인 갱신 완료: {old_count}개 → {len(self.tickers)}개")
-                
-                # ⭐ PHASE 1: 전체 스캔 (60초)
-                if current_time - self.last_full_scan_time >= self.full_scan_interval:
-                    cycle += 1
-                    
-                    # ⭐ 스캔 시간 기록
-                    scan_time = datetime.now()
-                    self.display.update_scan_times(full_scan_time=scan_time)
-                    
-                    # 화면 상태만 업데이트 (로그 출력 최소화)
-                    self.display.update_scan_status(f"전체 스캔 #{cycle} 시작...")
-                    
-                    weights = self.get_current_strategy_weights()
-                    self.check_profit_withdrawal()
-                    
-                    # 🆕 전체 코인 호가창 스냅샷 (배치)
-                    if self.orderbook_monitor and cycle % 5 == 0:  # 15분마다
-                        self.orderbook_monitor.monitor_orderbook(self.tickers[:20])  # 상위 20개
-                    
-                    # 🔥 개선 1: 스캔 시 스냅샷 사용 (중간 갱신 방지)
-                    tickers_snapshot = self.tickers.copy()  # 코인 목록 고정
-                    
-                    # ⭐ 병렬 분석 (5개씩 배치 처리)
-                    batch_size = 5
-                    total_tickers = len(tickers_snapshot)
-                    
-                    for batch_start in range(0, total_tickers, batch_size):
-                        batch_end = min(batch_start + batch_size, total_tickers)
-                        batch_tickers = tickers_snapshot[batch_start:batch_end]  # 스냅샷 사용
-                        
-                        # 배치 진행률 표시
-                        batch_num = (batch_start // batch_size) + 1
-                        total_batches = (total_tickers + batch_size - 1) // batch_size
-                        
-                        # 배치 모니터링 업데이트
-                        coin_names = ", ".join([t.split('-')[1] for t in batch_tickers])
-                        self.display.update_monitoring(
-                            f"배치 #{batch_num}/{total_batches}: {coin_names}",
-                            f"진행: {batch_end}/{total_tickers} ({int(batch_end/total_tickers*100)}%)",
-                            f"동시 분석 중..."
-                        )
-                        self.display.render()
-                        
-                        # 배치 내 코인들 순차 분석 (빠른 속도)
-                        for ticker in batch_tickers:
-                            strategy_name = self.select_strategy(weights)
-                            self.analyze_ticker(ticker, strategy_name)
-                            time.sleep(0.2)  # 1초 → 0.2초로 단축
-                        
-                        # 배치 완료 표시
-                        self.display.update_monitoring(
-                            f"✅ 배치 #{batch_num} 완료",
-                            f"진행: {batch_end}/{total_tickers}",
-                            ""
-                        )
-                        self.display.render()
-                        time.sleep(0.5)  # 배치 간 짧은 대기
-                    
-                    self.update_all_positions()
-                    
-                    if cycle % 10 == 0:
-                        # 상태는 화면에만 표시 (로그 파일에만 기록)
-                        risk_status = self.risk_manager.get_risk_status()
-                        # 로그 파일에만 기록
-                        self.logger.log_performance(
-                            total_profit=risk_status['cumulative_profit_loss'],
-                            win_rate=risk_status['win_rate'],
-                            total_trades=risk_status['total_trades'],
-                            current_balance=risk_status['current_balance'],
-                            daily_profit=risk_status['daily_profit_loss']
-                        )
-                    
-                    self.display.update_scan_status(f"전체 스캔 #{cycle} 완료")
-                    self.last_full_scan_time = current_time
-                    quick_check_count = 0
-                    surge_scan_count = 0
-                
-                # ⭐ PHASE 2: 급등/급락 감지 (5초)
-                if current_time - self.last_surge_scan_time >= self.surge_scan_interval:
-                    surge_scan_count += 1
-                    
-                    # ⭐ 스캔 시간 기록
-                    surge_time = datetime.now()
-                    self.display.update_scan_times(surge_scan_time=surge_time)
-                    
-                    # ⭐ 모니터링 정보 업데이트 (간단하게)
-                    self.display.update_monitoring(
-                        f"급등/급락 감지 #{surge_scan_count}",
-                        f"초단타: {len(self.ultra_positions)}/{self.max_ultra_positions}",
-                        ""
-                    )
-                    
-                    # 초단타 포지션 체크 (빠름)
-                    self.check_ultra_positions()
-                    
-                    # 급등/급락 스캔 (신규 진입)
-                    if len(self.ultra_positions) < self.max_ultra_positions:
-                        self.scan_for_surges()
-                    
-                    self.last_surge_scan_time = current_time
-                
-                # ⭐ PHASE 3: 일반 포지션 체크 (3초) - v6.30.29: 시간 간격 체크 추가!
-                # 🔍 DEBUG: 항상 로그 출력
-                positions_count = len(self.risk_manager.positions)
-                positions_list = list(self.risk_manager.positions.keys())
-                positions_bool = bool(self.risk_manager.positions)
-                
-                _original_print(f"\n[DEBUG] Phase 3 체크 - 현재시간: {current_time:.2f}, 마지막체크: {self.last_position_check_time:.2f}, 경과: {current_time - self.last_position_check_time:.2f}초, 포지션: {positions_count}개")
-                _original_print(f"[DEBUG] risk_manager.positions 키 목록: {positions_list}")
-                _original_print(f"[DEBUG] risk_manager.positions 타입: {type(self.risk_manager.positions)}")
-                _original_print(f"[DEBUG] bool(risk_manager.positions): {positions_bool}")
-                
-                if current_time - self.last_position_check_time >= self.position_check_interval:
-                    _original_print(f"[DEBUG] ✅ 시간 조건 충족! (>= {self.position_check_interval}초)")
-                    
-                    # ⭐ 포지션 체크 (positions를 변수에 고정)
-                    has_positions = bool(self.risk_manager.positions)
-                    positions_count = len(self.risk_manager.positions)
-                    
-                    _original_print(f"[DEBUG] 포지션 체크 - has_positions: {has_positions}, count: {positions_count}")
-                    
-                    if has_positions:
-                        _original_print(f"[DEBUG] ✅ 포지션 있음! Phase 3 실행! (count={positions_count})")
-                        quick_check_count += 1
-                        
-                        # ⭐ 스캔 시간 기록
-                        position_time = datetime.now()
-                        self.display.update_scan_times(position_check_time=position_time)
-                        
-                        # ⭐ v6.30.26: 화면에도 매도 체크 상태 표시
-                        check_status = f"⚡ 청산 체크 #{quick_check_count}"
-                        self.display.update_monitoring(
-                            check_status,
-                            f"포지션 {len(self.risk_manager.positions)}개 체크 중",
-                            datetime.now().strftime('%H:%M:%S')
-                        )
-                        
-                        # ⭐ v6.30.19: UI 업데이트 제거, 바로 청산 조건 체크
-                        self.logger.log_info(f"\n--- ⚡ 포지션 청산 체크 #{quick_check_count} - {datetime.now().strftime('%H:%M:%S')} ---")
-                        
-                        # 실제 포지션 청산 조건 체크 (10가지 조건)
-                        if hasattr(self, 'quick_check_positions'):
-                            self.quick_check_positions()
-                        else:
-                            self.update_all_positions()
-                        
-                        # ⭐ v6.30.29: 마지막 체크 시간 업데이트 (중요!)
-                        self.last_position_check_time = current_time
-                        _original_print(f"[DEBUG] ✅ Phase 3 완료! 마지막 체크 시간 업데이트: {current_time:.2f}")
-                    else:
-                        _original_print(f"[DEBUG] ⚠️ 포지션 없음! Phase 3 스킵 (has_positions={has_positions}, count={positions_count})")
-                
-                # ⭐ 대기 중일 때 (간단하게)
-                else:
-                    wait_seconds = int(self.full_scan_interval - (time.time() - self.last_full_scan_time))
-                    self.display.update_monitoring(
-                        "대기 중",
-                        f"다음 스캔: {wait_seconds}초",
-                        ""
-                    )
-                
-                # 대기 시간 최적화 (v6.30.14 개선: 포지션 체크 주기 고려)
-                if self.ultra_positions or self.risk_manager.positions:
-                    # 포지션 있으면 더 자주 체크 (3초와 5초 중 작은 값)
-                    wait_time = min(self.position_check_interval, self.surge_scan_interval)  # 3초
-                    next_action = "포지션체크 OR 급등감지"
-                else:
-                    time_until_next_scan = self.full_scan_interval - (time.time() - self.last_full_scan_time)
-                    wait_time = max(self.surge_scan_interval, min(self.position_check_interval, time_until_next_scan))
-                    next_action = "전체 스캔"
-                
-                # 🔍 DEBUG: 대기 시간 확인
-                _original_print(f"[DEBUG-SLEEP] {wait_time:.2f}초 대기 중... (다음: {next_action})")
-                _original_print(f"[DEBUG-SLEEP] 포지션: {len(self.risk_manager.positions)}개, 초단타: {len(self.ultra_positions)}개")
-                
-                self.logger.log_info(f"⏳ {wait_time:.0f}초 대기 (다음: {next_action})")
-                time.sleep(wait_time)
-                
-                _original_print(f"[DEBUG-SLEEP] 대기 완료! 루프 재시작...")
+            scheduler.run_forever(lambda: self.running)
         
         except KeyboardInterrupt:
             self.logger.log_info("\n⏹️ 사용자에 의해 중지됨")
@@ -2602,10 +2799,292 @@ class AutoProfitBot:
         finally:
             self.stop()
     
+    # ==================== 스케줄러 작업 ====================
+    
+    def _job_display(self):
+        """화면 갱신 (3초)"""
+        self._update_display()
+        self.last_display_update_time = time.time()
+    
+    def _job_risk_status(self):
+        """일일 통계 리셋 + 거래 정지 표시 (1초)"""
+        self.risk_manager.reset_daily_stats()
+        if self.risk_manager.is_trading_stopped:
+            self.display.update_scan_status(f"⛔ 거래 정지: {self.risk_manager.stop_reason}")
+    
+    def _job_realtime_monitor(self):
+        """🆕 실시간 모니터링 (30초, 보유 포지션 호가/체결)"""
+        if not self.risk_manager.positions:
+            return
+        active_tickers = list(self.risk_manager.positions.keys())
+        
+        # 호가창 모니터링 (로그 없이)
+        if self.orderbook_monitor:
+            self.orderbook_monitor.monitor_orderbook(active_tickers)
+        
+        # 체결 모니터링 (선택적, 로그 없이)
+        if self.trade_monitor and len(active_tickers) <= 3:
+            for ticker in active_tickers:
+                self.trade_monitor.monitor_trades(ticker, count=100)
+    
+    def _job_coin_refresh(self):
+        """⭐ PHASE 0: 동적 코인 선정 갱신 (설정 주기마다)"""
+        if not self.dynamic_coin_selector or not self.dynamic_coin_selector.should_update():
+            return
+        if self.risk_manager.is_trading_stopped:
+            return
+        self.display.update_scan_status("코인 목록 갱신 중...")
+        
+        old_count = len(self.tickers)
+        new_tickers = self.dynamic_coin_selector.get_coins(method=Config.COIN_SELECTION_METHOD)
+        
+        # 🔥 개선 2: 급등 추적 중인 코인 보존 (점수 70+ 유지)
+        tracking_tickers = []
+        if hasattr(self, 'surge_detector') and self.surge_detector:
+            try:
+                # 급등 점수가 70 이상인 코인은 목록에서 제외하지 않음 (급등 스캔 롤링 상태로 평가, 조회 없음)
+                surges = self.surge_detector.surges_from_metrics(self.surge_detector.scanner.metrics(self.tickers))
+                tracking_tickers = [t for t, info in surges.items() if info.get('surge_score', 0) >= 70]
+            except Exception as e:
+                pass
+        
+        # 새 코인 목록 + 급등 추적 중인 코인 병합 (중복 제거, 최대 40개)
+        self.tickers = list(set(new_tickers + tracking_tickers))[:40]
+        self._sync_stream_subscriptions()
+        
+        if tracking_tickers:
+            self.display.update_scan_status(
+                f"코인 갱신 완료: {old_count}개 → {len(self.tickers)}개 "
+                f"(급등 추적: {len(tracking_tickers)}개 보존)"
+            )
+        else:
+            self.display.update_scan_status(f"코인 갱신 완료: {old_count}개 → {len(self.tickers)}개")
+    
+    def _job_full_scan(self):
+        """
+        ⭐ PHASE 1: 전체 스캔 (60초)
+        
+        분석 결과 1개마다 yield → 스케줄러가 그 사이에 마감이 지난 청산 체크/급등 감지를 먼저 실행
+        """
+        if self.risk_manager.is_trading_stopped:
+            return
+        self.scan_cycle += 1
+        cycle = self.scan_cycle
+        
+        # ⭐ 스캔 시간 기록
+        scan_time = datetime.now()
+        self.display.update_scan_times(full_scan_time=scan_time)
+        
+        # 화면 상태만 업데이트 (로그 출력 최소화)
+        self.display.update_scan_status(f"전체 스캔 #{cycle} 시작...")
+        
+        weights = self.get_current_strategy_weights()
+        self.check_profit_withdrawal()
+        
+        # 🆕 전체 코인 호가창 스냅샷 (배치)
+        if self.orderbook_monitor and cycle % 5 == 0:  # 15분마다
+            self.orderbook_monitor.monitor_orderbook(self.tickers[:20])  # 상위 20개
+        
+        # 🔥 개선 1: 스캔 시 스냅샷 사용 (중간 갱신 방지)
+        tickers_snapshot = self.tickers.copy()  # 코인 목록 고정
+        
+        yield
+        
+        # ⭐ 제한 워커 풀에서 동시 분석 (시세 조회/신호 계산), 주문은 완료 순서대로 메인 스레드에서 실행
+        # (선조회 없이 워커가 각자 조회 → 스케줄러 스레드는 네트워크 대기로 막히지 않음)
+        # 완료를 기다리는 동안에도 yield → 청산 체크/급등 감지가 제시간 실행
+        total_tickers = len(tickers_snapshot)
+        jobs = [(ticker, self.select_strategy(weights)) for ticker in tickers_snapshot]
+        completed = 0
+        
+        for result in self.scan_pool.map_unordered(self._evaluate_ticker, jobs):
+            if result is None:
+                yield
+                continue
+            if self.risk_manager.is_trading_stopped:
+                return
+            
+            (ticker, _), decision, _ = result
+            completed += 1
+            if decision:
+                self._apply_ticker_signal(ticker, decision)
+            
+            # 진행률 표시 (5개마다 + 마지막)
+            if completed % 5 == 0 or completed == total_tickers:
+                self.display.update_monitoring(
+                    f"전체 스캔 #{cycle}: {ticker.split('-')[1]}",
+                    f"진행: {completed}/{total_tickers} ({int(completed/total_tickers*100)}%)",
+                    f"동시 분석 {self.scan_pool.max_workers}개 워커"
+                )
+                self.display.render()
+            yield
+        
+        self.update_all_positions()
+        
+        if cycle % 10 == 0:
+            # 상태는 화면에만 표시 (로그 파일에만 기록)
+            risk_status = self.risk_manager.get_risk_status()
+            # 로그 파일에만 기록
+            self.logger.log_performance(
+                total_profit=risk_status['cumulative_profit_loss'],
+                win_rate=risk_status['win_rate'],
+                total_trades=risk_status['total_trades'],
+                current_balance=risk_status['current_balance'],
+                daily_profit=risk_status['daily_profit_loss']
+            )
+            self._log_scheduler_stats()
+        
+        self.display.update_scan_status(f"전체 스캔 #{cycle} 완료")
+        self.last_full_scan_time = time.time()
+        self.quick_check_count = 0
+        self.surge_scan_count = 0
+    
+    def _job_surge_scan(self):
+        """⭐ PHASE 2: 급등/급락 감지 (5초)"""
+        self.surge_scan_count += 1
+        
+        # ⭐ 스캔 시간 기록
+        surge_time = datetime.now()
+        self.display.update_scan_times(surge_scan_time=surge_time)
+        
+        # ⭐ 모니터링 정보 업데이트 (간단하게)
+        self.display.update_monitoring(
+            f"급등/급락 감지 #{self.surge_scan_count}",
+            f"초단타: {len(self.ultra_positions)}/{self.max_ultra_positions}",
+            ""
+        )
+        
+        # 초단타 포지션 체크 (청산 감시 스레드가 없을 때만)
+        if not self.exit_watcher:
+            with rate_limiter.priority(Priority.POSITION):
+                self.check_ultra_positions()
+        
+        # 급등/급락 스캔 (신규 진입)
+        if len(self.ultra_positions) < self.max_ultra_positions and not self.risk_manager.is_trading_stopped:
+            with rate_limiter.priority(Priority.SURGE):
+                self.scan_for_surges()
+        
+        self.last_surge_scan_time = time.time()
+    
+    def _job_tape_surge(self):
+        """체결 테이프 신호 (0.5초): 급락 → 보유 초단타 포지션 즉시 청산, 급등 → 초단타 진입"""
+        # 급락은 보유 중인 초단타 포지션에만 의미 있음 (진입 경로로 보내지 않음)
+        held = list(self.ultra_positions)
+        if held:
+            for signal in self.tape_surge.poll(held, kinds=('dump',)):
+                ticker = signal['ticker']
+                self.logger.log_info(
+                    f"⚡ [{ticker}] 체결 급락: {signal['price_change']:+.2f}% / {self.tape_surge.spans[1]}초, "
+                    f"매도 주도 {1 - signal['buy_ratio']:.0%}, 대금 {signal['volume_ratio']:.1f}배 → 초단타 청산"
+                )
+                with self._ticker_order(ticker) as acquired, rate_limiter.priority(Priority.POSITION):
+                    if acquired:
+                        self.execute_ultra_sell(
+                            ticker, signal['current_price'], f"체결 급락 ({signal['price_change']:+.2f}%)"
+                        )
+        
+        if len(self.ultra_positions) >= self.max_ultra_positions or self.risk_manager.is_trading_stopped:
+            return
+        candidates = [t for t in self.tickers
+                      if t not in self.ultra_positions and t not in self.risk_manager.positions]
+        signals = self.tape_surge.poll(candidates, kinds=('surge',))
+        if not signals:
+            return
+        for signal in signals:
+            self.logger.log_info(
+                f"⚡ [{signal['ticker']}] 체결 급등: "
+                f"{signal['price_change']:+.2f}% / {self.tape_surge.spans[1]}초, "
+                f"매수 주도 {signal['buy_ratio']:.0%}, 대금 {signal['volume_ratio']:.1f}배"
+            )
+        with rate_limiter.priority(Priority.SURGE):
+            self._enter_surges(signals)
+    
+    def _job_position_check(self):
+        """⭐ PHASE 3: 일반 포지션 체크 (3초, 최우선)"""
+        # 🔍 DEBUG: 항상 로그 출력
+        positions_count = len(self.risk_manager.positions)
+        positions_list = list(self.risk_manager.positions.keys())
+        
+        if trace_loop.debug_on:
+            trace_loop.debug(f"Phase 3 체크 - 마지막체크: {self.last_position_check_time:.2f}, 포지션: {positions_count}개")
+            trace_loop.debug(f"risk_manager.positions 키 목록: {positions_list}")
+        
+        if not self.risk_manager.positions:
+            # ⭐ 대기 중일 때 (간단하게)
+            if not self.task_scheduler.jobs['full_scan'].running:
+                wait_seconds = int(self.task_scheduler.next_run_in('full_scan'))
+                self.display.update_monitoring(
+                    "대기 중",
+                    f"다음 스캔: {wait_seconds}초",
+                    ""
+                )
+            return
+        
+        if trace_loop.debug_on:
+            trace_loop.debug(f"✅ 포지션 있음! Phase 3 실행! (count={positions_count})")
+        self.quick_check_count += 1
+        
+        # ⭐ 스캔 시간 기록
+        position_time = datetime.now()
+        self.display.update_scan_times(position_check_time=position_time)
+        
+        # ⭐ v6.30.26: 화면에도 매도 체크 상태 표시
+        check_status = f"⚡ 청산 체크 #{self.quick_check_count}"
+        self.display.update_monitoring(
+            check_status,
+            f"포지션 {len(self.risk_manager.positions)}개 체크 중",
+            datetime.now().strftime('%H:%M:%S')
+        )
+        
+        # ⭐ v6.30.19: UI 업데이트 제거, 바로 청산 조건 체크
+        self.logger.log_info(f"\n--- ⚡ 포지션 청산 체크 #{self.quick_check_count} - {datetime.now().strftime('%H:%M:%S')} ---")
+        
+        # 실제 포지션 청산 조건 체크 (10가지 조건)
+        with rate_limiter.priority(Priority.POSITION):
+            if hasattr(self, 'quick_check_positions'):
+                self.quick_check_positions()
+            else:
+                self.update_all_positions()
+        
+        self.last_position_check_time = time.time()
+        if trace_loop.debug_on:
+            trace_loop.debug(f"✅ Phase 3 완료! 마지막 체크 시간 업데이트: {self.last_position_check_time:.2f}")
+    
+    def _log_scheduler_stats(self):
+        """스케줄러 작업별 지연 + 청산 감시 지연 통계 기록 (로그 파일)"""
+        if getattr(self, 'task_scheduler', None):
+            for name, stats in self.task_scheduler.get_stats().items():
+                self.logger.log_info(
+                    f"⏱️ {name}: 실행 {stats['runs']}회, 지연 p50 {stats['lateness_p50_ms']:.0f}ms / "
+                    f"p99 {stats['lateness_p99_ms']:.0f}ms / 최대 {stats['lateness_max_ms']:.0f}ms, "
+                    f"건너뜀 {stats['missed']}회, 오류 {stats['errors']}회"
+                )
+        if getattr(self, 'exit_watcher', None):
+            stats = self.exit_watcher.get_stats()
+            for label, key in (('감시 1회', 'sweep_latency'), ('청산', 'exit_latency')):
+                latency = stats[key]
+                self.logger.log_info(
+                    f"⏱️ 청산 감시 {label}: {latency['count']}건, p50 {latency['p50_ms']:.0f}ms / "
+                    f"p99 {latency['p99_ms']:.0f}ms / 최대 {latency['max_ms']:.0f}ms"
+                )
+    
+    def _sync_stream_subscriptions(self):
+        """실시간 시세 스트림 구독 목록 갱신 (감시 코인 + 보유 포지션)"""
+        if not self.ws_client:
+            return
+        markets = set(self.tickers) | set(self.risk_manager.positions.keys()) | set(self.ultra_positions.keys())
+        self.ws_client.subscribe(markets)
+        if self.tape_surge:
+            self.tape_surge.retain(markets)
+    
     def stop(self):
         """봇 중지 (학습 데이터 자동 저장)"""
         self.running = False
         self.logger.log_info("🛑 봇 종료 중...")
+        if self.exit_watcher:
+            self.exit_watcher.stop()
+        self._log_scheduler_stats()
+        self.scan_pool.shutdown()
         
         # 초단타 포지션 강제 청산
         if self.ultra_positions:
@@ -2638,6 +3117,39 @@ class AutoProfitBot:
             if hasattr(self, 'notification_scheduler'):
                 self.notification_scheduler.stop()
             
+            # 실시간 시세 스트림 중지
+            if self.ws_client:
+                self.ws_client.stop()
+            
+            # HTTP 연결 종료
+            http_transport.close()
+            if self.transport_interceptor and hasattr(self.transport_interceptor, 'close'):
+                self.transport_interceptor.close()
+            
+            # 추적 기록 마무리
+            tracer.flush()
+            trace_stats = tracer.get_stats()
+            self.logger.log_info(
+                f"🔎 추적: 기록 {trace_stats['emitted']}건 / 파일·콘솔 {trace_stats['written']}건 "
+                f"(버림 {trace_stats['dropped']}건)"
+            )
+            
+            # 모의 거래소 실행 비용
+            if self.sim_exchange:
+                exec_stats = self.sim_exchange.get_execution_stats()
+                self.logger.log_info(
+                    f"🧪 모의 체결: 주문 {exec_stats['orders']}회 (거부 {exec_stats['rejected']}, "
+                    f"부분 {exec_stats['partial']}, 취소 {exec_stats['canceled']}) | "
+                    f"수수료 {exec_stats['fees']:,.0f}원 | 실행 비용 {exec_stats['avg_cost_bps']:.1f}bp"
+                )
+            
+            # 시세 캐시 통계
+            cache_stats = self.api.cache.get_stats()
+            self.logger.log_info(
+                f"📦 시세 캐시: 적중 {cache_stats['hits']}회 / 미적중 {cache_stats['misses']}회 "
+                f"(적중률 {cache_stats['hit_rate']:.1f}%)"
+            )
+            
             self.logger.log_info("✅ 학습 데이터 저장 완료")
         
         except Exception as e:
@@ -2701,7 +3213,7 @@ class AutoProfitBot:
                 df = self.api.get_ohlcv('KRW-BTC', interval="minute5", count=200)
                 if df is not None and not df.empty:
                     # 기본 분석
-                    market_phase, entry_condition, _ = self.market_analyzer.analyze_market(df)
+                    market_phase, entry_condition, _ = self.market_analyzer.analyze_market(df, 'KRW-BTC')
                     
                     # ⭐ 상세 지표 계산
                     latest = df.iloc[-1]
@@ -2713,16 +3225,10 @@ class AutoProfitBot:
                     # 거래량 변화율
                     volume_change = ((latest['volume'] - df['volume'].mean()) / df['volume'].mean()) * 100
                     
-                    # 변동성 (표준편차)
-                    volatility = df['close'].pct_change().std() * 100
-                    
-                    # RSI 계산
-                    delta = df['close'].diff()
-                    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                    rs = gain / loss
-                    rsi = 100 - (100 / (1 + rs))
-                    current_rsi = rsi.iloc[-1] if not rsi.empty else 50
+                    # 변동성 (표준편차) / RSI - analyze_market과 같은 지표 묶음 사용
+                    bundle = get_indicators(df, 'KRW-BTC')
+                    volatility = bundle.volatility()
+                    current_rsi = bundle.rsi(14)
                     
                     # ⭐ 시장 조건 이유 생성
                     reason_parts = []
@@ -2736,12 +3242,7 @@ class AutoProfitBot:
                     
                     # MACD 추가
                     try:
-                        exp1 = df['close'].ewm(span=12).mean()
-                        exp2 = df['close'].ewm(span=26).mean()
-                        macd = exp1 - exp2
-                        signal = macd.ewm(span=9).mean()
-                        macd_val = macd.iloc[-1]
-                        signal_val = signal.iloc[-1]
+                        macd_val, signal_val, _ = bundle.macd()
                         
                         if macd_val > signal_val:
                             reason_parts.append("MACD↑")
@@ -2854,9 +3355,23 @@ def main():
         default='backtest',
         help='거래 모드 선택'
     )
+    parser.add_argument('--tickers', type=str, default='', help='백테스트 티커 (쉼표 구분, 비우면 화이트리스트)')
+    parser.add_argument('--days', type=float, default=30, help='백테스트 기간 (일)')
+    parser.add_argument('--interval', type=str, default='minute5', help='백테스트 봉 간격')
+    parser.add_argument('--strategy', type=str, default='weighted', help='백테스트 전략 (weighted: 시간대별 가중치)')
+    parser.add_argument('--seed', type=int, default=0, help='백테스트 전략 선택 난수 시드')
+    parser.add_argument('--sim-exchange', action='store_true', help='백테스트 체결을 합성 호가창에서 처리')
     
     args = parser.parse_args()
     
+    # 백테스트 모드: 과거 캔들을 시뮬레이션 시계로 재생 (실시간 API 호출 없음)
+    if args.mode == 'backtest':
+        from src.backtest.runner import run_backtest
+        tickers = [t.strip() for t in args.tickers.split(',') if t.strip()] or Config.WHITELIST_COINS
+        run_backtest(tickers, interval=args.interval, days=args.days,
+                     strategy=args.strategy, seed=args.seed, sim_exchange=args.sim_exchange)
+        return
+    
     # 실거래 모드 경고
     if args.mode == 'live':
         print("=" * 60)
@@ -30,7 +30,7 @@ def update_display_info(self):
         try:
             df = self.api.get_ohlcv('KRW-BTC', interval="minute5", count=200)
             if df is not None and not df.empty:
-                market_phase, entry_condition, coin_summary = self.market_analyzer.analyze_market(df)
+                market_phase, entry_condition, coin_summary = self.market_analyzer.analyze_market(df, 'KRW-BTC')
                 
                 self.display.update_market_condition(market_phase, entry_condition)
                 self.display.update_coin_summary(coin_summary)
@@ -5,6 +5,7 @@ AI 학습 기능 통합 - 경험을 통해 성장하는 전략
 """
 
 from typing import Dict, Tuple, Optional
+import numpy as np
 import pandas as pd
 from .base_strategy import BaseStrategy
 
@@ -53,19 +54,15 @@ class AggressiveScalping(BaseStrategy):
         if not self.enabled or not self.is_valid_data(df):
             return 'HOLD', 'Invalid data', {}
         
-        # 기술적 지표 계산
-        rsi = self.calculate_rsi(df)
-        volume_ratio = self.calculate_volume_ratio(df)
-        price_change = self.get_price_change(df, periods=1)
-        bb_upper, bb_middle, bb_lower = self.calculate_bollinger_bands(df)
-        
-        current_rsi = rsi.iloc[-1]
-        current_price = df['close'].iloc[-1]
-        current_bb_lower = bb_lower.iloc[-1]
-        current_bb_upper = bb_upper.iloc[-1]
+        # 기술적 지표 (같은 캔들이면 다른 전략/AI 모듈과 계산 결과 공유)
+        bundle = self.get_indicators(df, ticker)
+        current_rsi = bundle.rsi()
+        volume_ratio = bundle.volume_ratio()
+        price_change = bundle.price_change(periods=1)
+        current_price = bundle.price
         
         # 볼린저 밴드 내 위치 계산
-        bb_position = (current_price - current_bb_lower) / (current_bb_upper - current_bb_lower) if (current_bb_upper - current_bb_lower) > 0 else 0.5
+        bb_position = bundle.bb_position()
         
         indicators = {
             'rsi': current_rsi,
@@ -73,7 +70,7 @@ class AggressiveScalping(BaseStrategy):
             'price_change': price_change,
             'current_price': current_price,
             'bb_position': bb_position,
-            'volatility': df['close'].pct_change().std() * 100 if len(df) > 1 else 0
+            'volatility': bundle.volatility()
         }
         
         # === AI 의사결정 분석 ===
@@ -128,6 +125,21 @@ class AggressiveScalping(BaseStrategy):
         
         return 'HOLD', 'No clear signal', indicators
     
+    def generate_signals_vectorized(self, data: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """전체 이력 매매 신호 (generate_signal의 기본 조건, AI 판단 제외)"""
+        from src.utils import vector_indicators as vi
+        
+        close = np.asarray(data['close'], dtype='float64')
+        valid = self.valid_mask(close)
+        rsi = vi.rsi(close)
+        volume_ratio = vi.volume_ratio(data['volume'])
+        price_change = np.nan_to_num(vi.pct_change(close) * 100)
+        
+        buy = valid & (rsi < self.rsi_oversold) & (volume_ratio >= self.volume_threshold) & \
+            (np.abs(price_change) >= self.min_price_change)
+        sell = valid & ~buy & (rsi > self.rsi_overbought)
+        return buy, sell
+    
     def should_exit(self, entry_price: float, current_price: float, holding_duration: float = 0, market_snapshot=None) -> Tuple[bool, str]:
         """
         청산 여부 확인 (AI 학습 통합)
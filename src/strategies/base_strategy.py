@@ -55,6 +55,53 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def generate_signals_vectorized(self, data: Dict[str, np.ndarray]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        전체 이력 매매 신호 (벡터화, 선택 구현)
+        
+        각 시점 t의 값은 t까지의 봉으로 generate_signal을 호출했을 때
+        'BUY'/'SELL'이 나오는지와 같음 (AI 학습 엔진 판단은 제외)
+        
+        Args:
+            data: {'open', 'high', 'low', 'close', 'volume': 배열}
+                  1차원(시간) 또는 2차원(티커 × 시간)
+        
+        Returns:
+            (매수 신호, 매도 신호) 불리언 배열 튜플, 미지원 전략은 None
+        """
+        return None
+    
+    def valid_mask(self, close: np.ndarray, min_length: int = 50) -> np.ndarray:
+        """
+        시점별 데이터 유효성 (is_valid_data의 벡터화 버전)
+        
+        Args:
+            close: 종가 배열
+            min_length: 최소 봉 개수
+        
+        Returns:
+            불리언 배열
+        """
+        close = np.asarray(close, dtype='float64')
+        mask = np.isfinite(close) & (close != 0)
+        mask[..., :min_length - 1] = False
+        return mask & self.enabled
+    
+    def get_indicators(self, df: pd.DataFrame, ticker: Optional[str] = None):
+        """
+        마지막 봉 기준 지표 묶음 (같은 캔들이면 전략/AI 모듈이 계산 결과 공유)
+        
+        Args:
+            df: OHLCV 데이터프레임
+            ticker: 코인 티커
+        
+        Returns:
+            IndicatorBundle
+        """
+        from src.utils.indicator_bundle import get_indicators
+        
+        return get_indicators(df, ticker)
+    
     def calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """
         RSI (Relative Strength Index) 계산
@@ -66,8 +66,9 @@ class GridTrading(BaseStrategy):
         if not self.enabled or not self.is_valid_data(df):
             return 'HOLD', 'Invalid data', {}
         
-        current_price = df['close'].iloc[-1]
-        volatility = self.get_volatility(df)
+        bundle = self.get_indicators(df, ticker)
+        current_price = bundle.price
+        volatility = bundle.volatility(period=20) if len(bundle) >= 20 else 0.0
         
         indicators = {
             'current_price': current_price,
@@ -4,6 +4,7 @@
 """
 
 from typing import Dict, Tuple
+import numpy as np
 import pandas as pd
 from .base_strategy import BaseStrategy
 
@@ -34,15 +35,11 @@ class MeanReversion(BaseStrategy):
         if not self.enabled or not self.is_valid_data(df, min_length=30):
             return 'HOLD', 'Invalid data', {}
         
-        # 기술적 지표 계산
-        ma = self.calculate_moving_average(df, self.ma_period)
-        macd, macd_signal, macd_hist = self.calculate_macd(df)
-        
-        current_price = df['close'].iloc[-1]
-        current_ma = ma.iloc[-1]
-        current_macd = macd.iloc[-1]
-        current_macd_signal = macd_signal.iloc[-1]
-        current_macd_hist = macd_hist.iloc[-1]
+        # 기술적 지표 (같은 캔들이면 다른 전략/AI 모듈과 계산 결과 공유)
+        bundle = self.get_indicators(df, ticker)
+        current_price = bundle.price
+        current_ma = bundle.sma(self.ma_period)
+        current_macd, current_macd_signal, current_macd_hist = bundle.macd()
         
         # 이동평균으로부터의 이탈률
         deviation = (current_price - current_ma) / current_ma
@@ -77,6 +74,27 @@ class MeanReversion(BaseStrategy):
         
         return 'HOLD', 'No clear signal', indicators
     
+    def generate_signals_vectorized(self, data: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        전체 이력 매매 신호
+        
+        MACD(EMA)는 전체 이력 기준으로 계산하므로 최근 200봉만 쓰는 generate_signal과
+        초기값 차이로 극히 작은 오차가 있을 수 있음
+        """
+        from src.utils import vector_indicators as vi
+        
+        close = np.asarray(data['close'], dtype='float64')
+        valid = self.valid_mask(close, min_length=30)
+        ma = vi.rolling_mean(close, self.ma_period)
+        macd, macd_signal, macd_hist = vi.macd(close)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviation = (close - ma) / ma
+        
+        buy = valid & (deviation <= -self.deviation_threshold) & (macd > macd_signal) & (macd_hist > 0)
+        sell_high = (deviation >= self.deviation_threshold) & (macd < macd_signal) & (macd_hist < 0)
+        sell = valid & ~buy & (sell_high | (np.abs(deviation) < 0.01))
+        return buy, sell
+    
     def should_exit(self, entry_price: float, current_price: float) -> Tuple[bool, str]:
         """
         청산 여부 확인
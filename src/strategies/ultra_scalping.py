@@ -11,6 +11,7 @@
 """
 
 from typing import Dict, Tuple
+import numpy as np
 import pandas as pd
 from .base_strategy import BaseStrategy
 
@@ -48,17 +49,18 @@ class UltraScalping(BaseStrategy):
         if not self.enabled or not self.is_valid_data(df):
             return 'HOLD', 'Invalid data', {}
         
+        bundle = self.get_indicators(df, ticker)
+        
         # 최근 1분 가격 변동 (5분봉의 마지막 캔들)
-        price_change_1min = self.get_price_change(df, periods=1)
+        price_change_1min = bundle.price_change(periods=1)
         
         # 거래량 급증 확인
-        volume_ratio = self.calculate_volume_ratio(df)
+        volume_ratio = bundle.volume_ratio()
         
         # RSI 계산
-        rsi = self.calculate_rsi(df, period=6)  # 짧은 기간 RSI
-        current_rsi = rsi.iloc[-1]
+        current_rsi = bundle.rsi(period=6)  # 짧은 기간 RSI
         
-        current_price = df['close'].iloc[-1]
+        current_price = bundle.price
         
         indicators = {
             'price_change_1min': price_change_1min,
@@ -102,6 +104,26 @@ class UltraScalping(BaseStrategy):
         
         return 'HOLD', 'No ultra signal', indicators
     
+    def generate_signals_vectorized(self, data: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """전체 이력 매매 신호 (generate_signal과 같은 조건)"""
+        from src.utils import vector_indicators as vi
+        
+        close = np.asarray(data['close'], dtype='float64')
+        valid = self.valid_mask(close)
+        change = np.nan_to_num(vi.pct_change(close) * 100)
+        volume_ratio = vi.volume_ratio(data['volume'])
+        rsi = vi.rsi(close, period=6)
+        
+        surge = (np.abs(change) >= self.min_price_surge) & (volume_ratio >= self.volume_spike)
+        rebound = surge & (change < 0) & (rsi < 35)
+        chase = surge & (change > 0) & (rsi < 80)
+        volume_burst = (np.abs(change) >= 0.01) & (volume_ratio >= 2.5) & (change > 0) & \
+            (40 < rsi) & (rsi < 75)
+        
+        buy = valid & (rebound | chase | volume_burst)
+        sell = valid & ~buy & (rsi > 80)
+        return buy, sell
+    
     def should_exit(self, entry_price: float, current_price: float, hold_time: float = 0, 
                     price_history: list = None) -> Tuple[bool, str]:
         """
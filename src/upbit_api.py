@@ -9,21 +9,40 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import pandas as pd
 
+from src.utils.market_data_cache import DEFAULT_TTLS, MarketDataCache, market_data_cache
+from src.utils.candle_store import CandleStore
+from src.utils.candle_aggregator import CandleAggregator
+from src.utils.rate_limiter import Priority, rate_limiter as default_rate_limiter
+from src.utils.http_session import http_transport, install_pyupbit_transport
+from src.utils.single_flight import SingleFlight
+
 
 class UpbitAPI:
     """Upbit API 래퍼 클래스"""
     
-    def __init__(self, access_key: str = "", secret_key: str = ""):
+    def __init__(self, access_key: str = "", secret_key: str = "", cache=None,
+                 use_candle_store: bool = True, rate_limiter=None, transport=None,
+                 candle_archive=None):
         """
         초기화
         
         Args:
             access_key: Upbit Access Key
             secret_key: Upbit Secret Key
+            cache: 시세 캐시 (None이면 전역 market_data_cache 공유)
+            use_candle_store: OHLCV를 증분 캔들 저장소에서 제공 (새 봉만 조회,
+                              분봉은 1분봉에서 집계)
+            rate_limiter: 요청 한도 스케줄러 (None이면 전역 rate_limiter 공유)
+            transport: HTTP 전송 계층 (None이면 전역 http_transport 공유)
+            candle_archive: 디스크 캔들 아카이브 (최초 조회를 디스크에서, 마감된 봉 저장)
         """
         self.access_key = access_key
         self.secret_key = secret_key
         
+        # HTTP 전송 계층 (pyupbit 호출 포함, 연결 풀 + 타임아웃)
+        self.transport = transport if transport is not None else http_transport
+        install_pyupbit_transport(self.transport)
+        
         # 실거래용 객체 (키가 있을 때만)
         self.upbit = None
         if access_key and secret_key:
@@ -34,9 +53,78 @@ class UpbitAPI:
                 print(f"⚠️ Upbit API 연결 실패: {e}")
                 self.upbit = None
         
+        # 요청 한도 스케줄러 (그룹별 토큰 버킷 + 우선순위)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else default_rate_limiter
+        
         # 티커 캐시
         self._valid_tickers_cache = None
         self._cache_time = 0
+        
+        # 시세 캐시 (현재가/호가/체결/OHLCV)
+        self.cache = cache if cache is not None else market_data_cache
+        
+        # 동시에 들어온 같은 조회는 네트워크 호출 1회로 병합
+        self.single_flight = SingleFlight()
+        
+        # 증분 캔들 저장소 (최초 1회 전체 조회 후 새 봉만 조회)
+        # 5분봉 200개를 1분봉으로 만들 수 있도록 1분봉 1,100개까지 보관
+        self.candle_store = None
+        self.candle_aggregator = None
+        if use_candle_store:
+            self.candle_store = CandleStore(self._fetch_ohlcv, capacity=1100, archive=candle_archive)
+            self.candle_aggregator = CandleAggregator(self.candle_store)
+        
+        # 실시간 시세 스트림 (attach_websocket으로 연결)
+        self.ws_client = None
+        self.ws_max_age = 5.0
+        self.ws_fresh_age = 0.5  # bypass_cache 조회(주문 직전)에서 허용하는 스트림 데이터 나이 (초)
+    
+    def attach_websocket(self, ws_client, max_age: float = 5.0):
+        """
+        WebSocket 시세 스트림 연결
+        
+        연결 후 현재가/호가/체결 조회는 스트림의 최신 상태를 우선 사용하고,
+        데이터가 없거나 max_age보다 오래된 경우에만 REST로 조회
+        
+        Args:
+            ws_client: UpbitWebSocketClient 인스턴스
+            max_age: 스트림 데이터 허용 나이 (초)
+        """
+        self.ws_client = ws_client
+        self.ws_max_age = max_age
+    
+    def _throttle(self, group: str, priority: Optional[Priority] = None, requests: int = 1):
+        """
+        요청 전 한도 대기
+        
+        Args:
+            group: Upbit 요청 그룹 (market, ticker, orderbook, candles, trades, order, default)
+            priority: 우선순위 (None이면 rate_limiter.priority() 컨텍스트 값)
+            requests: 실제 HTTP 요청 수 (OHLCV 200개 단위 페이지 등)
+        """
+        for _ in range(requests):
+            self.rate_limiter.acquire(group, priority)
+    
+    def _cached_read(self, endpoint: str, ticker: str, fetch, interval: Optional[str] = None,
+                     count: Optional[int] = None, bypass: bool = False):
+        """
+        캐시 조회 → 없으면 진행 중인 같은 요청에 합류하거나 새로 조회
+        
+        bypass(주문 직전 조회)는 진행 중인 요청에 합류하지 않고 항상 새로 조회
+        현재 우선순위가 진행 중 요청보다 높아도 합류하지 않음 (낮은 레인 대기 회피)
+        """
+        if not bypass:
+            key = (endpoint, ticker, interval, count)
+            original_fetch = fetch
+            fetch = lambda: self.single_flight.do(key, original_fetch,
+                                                  priority=self.rate_limiter.current_priority)
+        return self.cache.get_or_fetch(endpoint, ticker, fetch, interval=interval, count=count,
+                                       bypass=bypass)
+    
+    def _calibrate(self, limit_info: Optional[Dict]):
+        """응답의 Remaining-Req 정보로 한도 보정"""
+        if limit_info and 'group' in limit_info:
+            self.rate_limiter.update_remaining(limit_info['group'], limit_info.get('sec'))
     
     def get_valid_tickers(self, fiat: str = "KRW", force_refresh: bool = False) -> List[str]:
         """
@@ -56,7 +144,9 @@ class UpbitAPI:
             return self._valid_tickers_cache
         
         try:
-            tickers = pyupbit.get_tickers(fiat=fiat)
+            self._throttle('market')
+            tickers, limit = pyupbit.get_tickers(fiat=fiat, limit_info=True)
+            self._calibrate(limit)
             self._valid_tickers_cache = tickers or []
             self._cache_time = current_time
             return self._valid_tickers_cache
@@ -97,24 +187,39 @@ class UpbitAPI:
             티커 목록
         """
         try:
-            tickers = pyupbit.get_tickers(fiat=fiat)
+            self._throttle('market')
+            tickers, limit = pyupbit.get_tickers(fiat=fiat, limit_info=True)
+            self._calibrate(limit)
             return tickers
         except Exception as e:
             print(f"❌ 티커 조회 실패: {e}")
             return []
     
-    def get_current_price(self, ticker: str) -> Optional[float]:
+    def get_current_price(self, ticker: str, bypass_cache: bool = False) -> Optional[float]:
         """
         현재가 조회
         
         Args:
             ticker: 코인 티커 (예: KRW-BTC)
+            bypass_cache: True면 캐시를 건너뛰고 새로 조회 (주문 직전 조회용, 스트림은 ws_fresh_age 이내만 사용)
         
         Returns:
             현재가
         """
+        if self.ws_client:
+            price = self.ws_client.get_price(ticker, self.ws_fresh_age if bypass_cache else self.ws_max_age)
+            if price is not None:
+                return price
+        
+        return self._cached_read('price', ticker, lambda: self._fetch_current_price(ticker),
+                                 bypass=bypass_cache)
+    
+    def _fetch_current_price(self, ticker: str) -> Optional[float]:
+        """현재가 REST 조회"""
         try:
-            price = pyupbit.get_current_price(ticker)
+            self._throttle('ticker')
+            price, limit = pyupbit.get_current_price(ticker, limit_info=True)
+            self._calibrate(limit)
             return float(price) if price else None
         except Exception as e:
             print(f"❌ {ticker} 현재가 조회 실패: {e}")
@@ -143,52 +248,96 @@ class UpbitAPI:
             if not valid_tickers:
                 return {}
             
-            # 최대 100개씩 나누어 조회
+            # 스트림에 있는 코인은 REST 조회 생략
             result = {}
+            if self.ws_client:
+                result = self.ws_client.get_prices(valid_tickers, self.ws_max_age)
+                valid_tickers = [t for t in valid_tickers if t not in result]
+            
+            # 캐시에 있는 코인도 REST 조회 생략
+            missing = []
+            for ticker in valid_tickers:
+                price = self.cache.get('price', ticker)
+                if price is not None:
+                    result[ticker] = price
+                else:
+                    missing.append(ticker)
+            valid_tickers = missing
+            fetched = {}
+            
+            # 최대 100개씩 나누어 조회
             for i in range(0, len(valid_tickers), 100):
                 batch = valid_tickers[i:i+100]
                 
                 try:
                     # pyupbit는 리스트를 받으면 한 번에 조회
-                    prices = pyupbit.get_current_price(batch)
+                    prices = self.single_flight.do(('prices', tuple(batch)),
+                                                   lambda: self._fetch_price_batch(batch),
+                                                   priority=self.rate_limiter.current_priority)
                     
                     if isinstance(prices, dict):
                         for k, v in prices.items():
                             if v is not None:
-                                result[k] = float(v)
+                                fetched[k] = float(v)
                     elif isinstance(prices, (int, float)) and len(batch) == 1:
                         # 단일 티커인 경우
-                        result[batch[0]] = float(prices)
+                        fetched[batch[0]] = float(prices)
                         
                 except Exception as e:
                     # 배치 실패 시 개별 조회로 폴백
                     print(f"⚠️ 배치 조회 실패, 개별 조회로 전환: {e}")
                     for ticker in batch:
                         try:
+                            self._throttle('ticker')
                             price = pyupbit.get_current_price(ticker)
                             if price is not None:
-                                result[ticker] = float(price)
+                                fetched[ticker] = float(price)
                         except:
                             pass  # 개별 실패는 무시
             
+            # 조회 결과는 개별 현재가 캐시에도 저장 (이후 get_current_price 재사용)
+            for ticker, price in fetched.items():
+                self.cache.set('price', ticker, price)
+            result.update(fetched)
+            
             return result
             
         except Exception as e:
             print(f"❌ 다중 현재가 조회 실패: {e}")
             return {}
     
-    def get_orderbook(self, ticker: str) -> Optional[Dict]:
+    def _fetch_price_batch(self, batch: List[str]):
+        """현재가 배치 REST 조회 (실패 시 예외)"""
+        self._throttle('ticker')
+        prices, limit = pyupbit.get_current_price(batch, limit_info=True)
+        self._calibrate(limit)
+        return prices
+    
+    def get_orderbook(self, ticker: str, bypass_cache: bool = False) -> Optional[Dict]:
         """
         호가 정보 조회
         
         Args:
             ticker: 코인 티커
+            bypass_cache: True면 캐시를 건너뛰고 새로 조회 (주문 직전 조회용, 스트림은 ws_fresh_age 이내만 사용)
         
         Returns:
             호가 정보
         """
+        if self.ws_client:
+            orderbook = self.ws_client.get_orderbook(ticker, self.ws_fresh_age if bypass_cache else self.ws_max_age)
+            if orderbook is not None:
+                return orderbook
+        
+        return self._cached_read('orderbook', ticker, lambda: self._fetch_orderbook(ticker),
+                                 bypass=bypass_cache)
+    
+    def _fetch_orderbook(self, ticker: str) -> Optional[Dict]:
+        """호가 REST 조회"""
         try:
-            orderbook = pyupbit.get_orderbook(ticker)
+            self._throttle('orderbook')
+            orderbook, limit = pyupbit.get_orderbook(ticker, limit_info=True)
+            self._calibrate(limit)
             return orderbook
         except Exception as e:
             print(f"❌ {ticker} 호가 조회 실패: {e}")
@@ -207,17 +356,49 @@ class UpbitAPI:
         Returns:
             {ticker: orderbook_data} 딕셔너리
         """
+        result = {}
+        if self.ws_client:
+            for ticker in tickers:
+                orderbook = self.ws_client.get_orderbook(ticker, self.ws_max_age)
+                if orderbook is not None:
+                    result[ticker] = orderbook
+            tickers = [t for t in tickers if t not in result]
+        
+        # 캐시에 있는 코인은 REST 조회 생략
+        missing = []
+        for ticker in tickers:
+            orderbook = self.cache.get('orderbook', ticker)
+            if orderbook is not None:
+                result[ticker] = orderbook
+            else:
+                missing.append(ticker)
+        tickers = missing
+        if not tickers:
+            return result
+        
         try:
             # pyupbit는 리스트를 받으면 한 번에 조회
-            orderbooks = pyupbit.get_orderbook(tickers)
+            orderbooks = self.single_flight.do(('orderbooks', tuple(tickers)),
+                                               lambda: self._fetch_orderbook_batch(tickers),
+                                               priority=self.rate_limiter.current_priority)
             
+            if isinstance(orderbooks, dict) and 'market' in orderbooks:
+                orderbooks = [orderbooks]
             if isinstance(orderbooks, list):
-                return {ob['market']: ob for ob in orderbooks}
-            else:
-                return {}
+                for ob in orderbooks:
+                    result[ob['market']] = ob
+                    self.cache.set('orderbook', ob['market'], ob)
+            return result
         except Exception as e:
             print(f"❌ 다중 호가 조회 실패: {e}")
-            return {}
+            return result
+    
+    def _fetch_orderbook_batch(self, tickers: List[str]):
+        """호가 배치 REST 조회 (실패 시 예외)"""
+        self._throttle('orderbook')
+        orderbooks, limit = pyupbit.get_orderbook(tickers, limit_info=True)
+        self._calibrate(limit)
+        return orderbooks
     
     def get_recent_trades(self, ticker: str, count: int = 100) -> List[Dict]:
         """
@@ -230,17 +411,28 @@ class UpbitAPI:
         Returns:
             체결 내역 리스트
         """
+        # 스트림에 충분한 체결이 쌓였으면 REST 조회 생략
+        if self.ws_client and self.ws_client.trade_count(ticker) >= count:
+            return self.ws_client.get_recent_trades(ticker, count)
+        
+        trades = self._cached_read('trades', ticker,
+                                   lambda: self._fetch_recent_trades(ticker, count) or None,
+                                   count=count)
+        return trades or []
+    
+    def _fetch_recent_trades(self, ticker: str, count: int) -> List[Dict]:
+        """체결 내역 REST 조회"""
         try:
-            # pyupbit는 체결 내역 조회 미지원, requests로 직접 호출
-            import requests
-            
+            # pyupbit는 체결 내역 조회 미지원, 직접 호출
             url = f"https://api.upbit.com/v1/trades/ticks"
             params = {
                 'market': ticker,
                 'count': min(count, 500)
             }
             
-            response = requests.get(url, params=params)
+            self._throttle('trades')
+            response = self.transport.get(url, params=params)
+            self.rate_limiter.update_from_header(response.headers.get('Remaining-Req'))
             
             if response.status_code == 200:
                 return response.json()
@@ -251,19 +443,43 @@ class UpbitAPI:
             print(f"❌ {ticker} 체결 내역 조회 실패: {e}")
             return []
     
-    def get_ohlcv(self, ticker: str, interval: str = "minute5", count: int = 200) -> Optional[pd.DataFrame]:
+    def get_ohlcv(self, ticker: str, interval: str = "minute5", count: int = 200,
+                  bypass_cache: bool = False) -> Optional[pd.DataFrame]:
         """
         OHLCV (봉 차트) 데이터 조회
         
+        ⚠️ 캐시된 DataFrame은 여러 곳에서 공유되는 읽기 전용 뷰이므로 수정하지 말고 복사해서 사용
+        
         Args:
             ticker: 코인 티커
             interval: 시간 간격 (minute1, minute5, minute15, minute30, hour, day, week, month)
             count: 조회할 데이터 개수
+            bypass_cache: True면 캐시를 건너뛰고 새로 조회
         
         Returns:
             OHLCV DataFrame
         """
+        if self.candle_store:
+            fetch = lambda: self._get_stored_ohlcv(ticker, interval, count)
+        else:
+            fetch = lambda: self._fetch_ohlcv(ticker, interval, count)
+        
+        return self._cached_read('ohlcv', ticker, fetch, interval=interval, count=count,
+                                 bypass=bypass_cache)
+    
+    def _get_stored_ohlcv(self, ticker: str, interval: str, count: int) -> Optional[pd.DataFrame]:
+        """캔들 저장소 조회 (분봉은 1분봉에서 집계, 실패 시 해당 간격 직접 조회)"""
+        if self.candle_aggregator.supports(interval, count):
+            df = self.candle_aggregator.get_ohlcv(ticker, interval, count)
+            if df is not None:
+                return df
+        return self.candle_store.get_ohlcv(ticker, interval, count)
+    
+    def _fetch_ohlcv(self, ticker: str, interval: str, count: int) -> Optional[pd.DataFrame]:
+        """OHLCV REST 조회"""
         try:
+            # pyupbit는 200개 단위로 나누어 요청
+            self._throttle('candles', requests=max(1, (count + 199) // 200))
             df = pyupbit.get_ohlcv(ticker, interval=interval, count=count)
             return df
         except Exception as e:
@@ -287,6 +503,7 @@ class UpbitAPI:
             return 0.0
         
         try:
+            self._throttle('default', Priority.ORDER)
             balance = self.upbit.get_balance(ticker)
             return float(balance) if balance else 0.0
         except Exception as e:
@@ -305,6 +522,7 @@ class UpbitAPI:
             return []
         
         try:
+            self._throttle('default', Priority.ORDER)
             balances = self.upbit.get_balances()
             return balances if balances else []
         except Exception as e:
@@ -329,6 +547,7 @@ class UpbitAPI:
             if '-' in ticker:
                 ticker = ticker.split('-')[1]
             
+            self._throttle('default', Priority.ORDER)
             amount = self.upbit.get_amount(ticker)
             return float(amount) if amount else 0.0
         except Exception as e:
@@ -352,6 +571,7 @@ class UpbitAPI:
             if '-' in ticker:
                 ticker = ticker.split('-')[1]
             
+            self._throttle('default', Priority.ORDER)
             avg_price = self.upbit.get_avg_buy_price(ticker)
             return float(avg_price) if avg_price else 0.0
         except Exception as e:
@@ -376,6 +596,7 @@ class UpbitAPI:
             return None
         
         try:
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.buy_market_order(ticker, price)
             print(f"✅ 매수 주문 성공: {ticker}, {price:,.0f}원")
             return result
@@ -399,6 +620,7 @@ class UpbitAPI:
             return None
         
         try:
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.sell_market_order(ticker, volume)
             print(f"✅ 매도 주문 성공: {ticker}, {volume}")
             return result
@@ -423,6 +645,7 @@ class UpbitAPI:
             return None
         
         try:
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.buy_limit_order(ticker, price, volume)
             print(f"✅ 지정가 매수 주문 성공: {ticker}, {price:,.0f}원, {volume}")
             return result
@@ -447,6 +670,7 @@ class UpbitAPI:
             return None
         
         try:
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.sell_limit_order(ticker, price, volume)
             print(f"✅ 지정가 매도 주문 성공: {ticker}, {price:,.0f}원, {volume}")
             return result
@@ -469,6 +693,7 @@ class UpbitAPI:
             return None
         
         try:
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.cancel_order(uuid)
             print(f"✅ 주문 취소 성공: {uuid}")
             return result
@@ -491,6 +716,7 @@ class UpbitAPI:
             return None
         
         try:
+            self._throttle('default', Priority.ORDER)
             result = self.upbit.get_order(uuid)
             return result
         except Exception as e:
@@ -593,7 +819,7 @@ class UpbitAPI:
         
         try:
             # 호가창 조회
-            orderbook = self.get_orderbook(ticker)
+            orderbook = self.get_orderbook(ticker, bypass_cache=True)
             if not orderbook:
                 print(f"❌ {ticker} 호가창 조회 실패 - 시장가로 fallback")
                 return self.buy_market_order(ticker, price)
@@ -603,6 +829,7 @@ class UpbitAPI:
             volume = price / best_ask
             
             # 지정가 주문 + IOC (즉시 체결 or 취소)
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.buy_limit_order(ticker, best_ask, volume)
             print(f"✅ 최유리 매수 주문 성공: {ticker}, {best_ask:,.0f}원, {volume:.8f}")
             return result
@@ -629,7 +856,7 @@ class UpbitAPI:
         
         try:
             # 호가창 조회
-            orderbook = self.get_orderbook(ticker)
+            orderbook = self.get_orderbook(ticker, bypass_cache=True)
             if not orderbook:
                 print(f"❌ {ticker} 호가창 조회 실패 - 시장가로 fallback")
                 return self.sell_market_order(ticker, volume)
@@ -638,6 +865,7 @@ class UpbitAPI:
             best_bid = orderbook['orderbook_units'][0]['bid_price']
             
             # 지정가 주문
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.sell_limit_order(ticker, best_bid, volume)
             print(f"✅ 최유리 매도 주문 성공: {ticker}, {best_bid:,.0f}원, {volume:.8f}")
             return result
@@ -712,6 +940,7 @@ class UpbitAPI:
             adjusted_price = self.adjust_price_to_tick(ticker, price)
             
             # 지정가 주문
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.buy_limit_order(ticker, adjusted_price, volume)
             if not result:
                 return None
@@ -752,6 +981,7 @@ class UpbitAPI:
         try:
             adjusted_price = self.adjust_price_to_tick(ticker, price)
             
+            self._throttle('order', Priority.ORDER)
             result = self.upbit.sell_limit_order(ticker, adjusted_price, volume)
             if not result:
                 return None
@@ -772,18 +1002,19 @@ class UpbitAPI:
             print(f"❌ IOC 매도 실패: {ticker}, {e}")
             return None
     
-    def calculate_spread_percentage(self, ticker: str) -> float:
+    def calculate_spread_percentage(self, ticker: str, bypass_cache: bool = False) -> float:
         """
         호가창 스프레드 계산 (%)
         
         Args:
             ticker: 코인 티커
+            bypass_cache: True면 캐시를 건너뛰고 새 호가로 계산 (주문 직전용)
         
         Returns:
             스프레드 비율 (%)
         """
         try:
-            orderbook = self.get_orderbook(ticker)
+            orderbook = self.get_orderbook(ticker, bypass_cache=bypass_cache)
             if not orderbook or 'orderbook_units' not in orderbook:
                 return 0.0
             
@@ -795,3 +1026,58 @@ class UpbitAPI:
         except Exception as e:
             print(f"❌ {ticker} 스프레드 계산 실패: {e}")
             return 0.0
+
+
+class SimulatedUpbitAPI(UpbitAPI):
+    """
+    시뮬레이션 거래소 연결 UpbitAPI (네트워크 미사용)
+    - 주문/계좌: SimulatedExchange (지정가/IOC/최유리/Fallback 로직은 UpbitAPI 그대로)
+    - 시세: 거래소의 호가 공급원 (현재가, 호가, 캔들)
+    """
+    
+    def __init__(self, exchange, cache=None):
+        """
+        초기화
+        
+        Args:
+            exchange: SimulatedExchange 인스턴스
+            cache: 시세 캐시 (None이면 캐싱 없음 → 항상 거래소 시각 기준 시세)
+        """
+        if cache is None:
+            cache = MarketDataCache(ttls={key: 0.0 for key in DEFAULT_TTLS})
+        super().__init__(cache=cache, use_candle_store=False)
+        self.exchange = exchange
+        self.feed = exchange.feed
+        self.upbit = exchange
+    
+    def _throttle(self, group: str, priority: Optional[Priority] = None, requests: int = 1):
+        """요청 한도 없음"""
+        pass
+    
+    def get_valid_tickers(self, fiat: str = "KRW", force_refresh: bool = False) -> List[str]:
+        """호가 공급원의 티커 목록"""
+        return [t for t in self.feed.tickers() if t.startswith(f"{fiat}-")]
+    
+    def get_all_tickers(self, fiat: str = "KRW") -> List[str]:
+        return self.get_valid_tickers(fiat)
+    
+    def _fetch_current_price(self, ticker: str) -> Optional[float]:
+        return self.feed.price(ticker, self.exchange.now())
+    
+    def _fetch_price_batch(self, batch: List[str]):
+        now = self.exchange.now()
+        return {ticker: self.feed.price(ticker, now) for ticker in batch}
+    
+    def _fetch_orderbook(self, ticker: str) -> Optional[Dict]:
+        return self.feed.orderbook(ticker, self.exchange.now())
+    
+    def _fetch_orderbook_batch(self, tickers: List[str]):
+        now = self.exchange.now()
+        return [ob for ob in (self.feed.orderbook(t, now) for t in tickers) if ob]
+    
+    def _fetch_recent_trades(self, ticker: str, count: int) -> List[Dict]:
+        """체결 내역은 기록되지 않음"""
+        return []
+    
+    def _fetch_ohlcv(self, ticker: str, interval: str, count: int) -> Optional[pd.DataFrame]:
+        return self.feed.ohlcv(ticker, interval, count, self.exchange.now())
@@ -0,0 +1,193 @@
+"""
+다중 타임프레임 캔들 집계
+- 1분봉(기준 시계열)으로 3/5/10/15/30/60/240분봉을 직접 계산
+- 봉 경계는 Upbit와 같이 UTC 기준으로 정렬 (KST 시각에서 9시간 보정)
+- 마감된 봉은 버퍼에 보관하고, 새 1분봉이 들어오면 마지막(진행 중) 봉부터만 다시 계산
+"""
+
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .candle_store import OHLCV_COLUMNS, CandleBuffer, CandleStore
+
+
+BASE_INTERVAL = 'minute1'
+
+# 1분봉으로 만들 수 있는 분봉 (Upbit 지원 분봉)
+AGGREGATABLE_MINUTES = (3, 5, 10, 15, 30, 60, 240)
+
+_NS_PER_MINUTE = 60 * 1_000_000_000
+_KST_OFFSET_NS = 9 * 60 * _NS_PER_MINUTE
+
+_MINUTE_PATTERN = re.compile(r'^minutes?(\d+)$')
+
+
+def aggregate_arrays(times: np.ndarray, values: np.ndarray, minutes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    1분봉 배열을 N분봉으로 집계
+
+    Args:
+        times: 1분봉 시각 (KST, ns 정수, 오름차순)
+        values: (N, 6) 배열 [open, high, low, close, volume, value]
+        minutes: 집계 분 단위
+
+    Returns:
+        (N분봉 시각, N분봉 값)
+    """
+    if len(times) == 0:
+        return times[:0], values[:0]
+
+    width = minutes * _NS_PER_MINUTE
+    buckets = (times - _KST_OFFSET_NS) // width * width + _KST_OFFSET_NS
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.concatenate((starts[1:], [len(times)])) - 1
+
+    out = np.empty((len(starts), values.shape[1]), dtype='float64')
+    out[:, 0] = values[starts, 0]
+    out[:, 1] = np.maximum.reduceat(values[:, 1], starts)
+    out[:, 2] = np.minimum.reduceat(values[:, 2], starts)
+    out[:, 3] = values[ends, 3]
+    out[:, 4] = np.add.reduceat(values[:, 4], starts)
+    out[:, 5] = np.add.reduceat(values[:, 5], starts)
+    return buckets[starts], out
+
+
+def aggregate_ohlcv(df: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    """
+    1분봉 DataFrame을 N분봉으로 집계 (단발성 변환용)
+
+    Args:
+        df: 1분봉 OHLCV DataFrame
+        minutes: 집계 분 단위
+
+    Returns:
+        N분봉 OHLCV DataFrame
+    """
+    times = df.index.values.astype('datetime64[ns]').view('int64')
+    values = df[OHLCV_COLUMNS].to_numpy(dtype='float64')
+    bucket_times, bucket_values = aggregate_arrays(times, values, minutes)
+    return pd.DataFrame(bucket_values, index=pd.DatetimeIndex(bucket_times.view('datetime64[ns]')),
+                        columns=OHLCV_COLUMNS)
+
+
+class CandleAggregator:
+    """캔들 저장소의 1분봉으로 상위 분봉 제공"""
+
+    def __init__(self, store: CandleStore):
+        """
+        초기화
+
+        Args:
+            store: 1분봉을 보관하는 캔들 저장소
+        """
+        self.store = store
+        self._buffers: Dict[Tuple[str, int], CandleBuffer] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.aggregations = 0
+        self.rebuilds = 0
+
+    @staticmethod
+    def parse_minutes(interval: str) -> Optional[int]:
+        """집계 가능한 분봉이면 분 단위 반환"""
+        match = _MINUTE_PATTERN.match(interval)
+        if not match:
+            return None
+        minutes = int(match.group(1))
+        return minutes if minutes in AGGREGATABLE_MINUTES else None
+
+    def supports(self, interval: str, count: int) -> bool:
+        """1분봉 저장소 용량 안에서 만들 수 있는 요청인지"""
+        minutes = self.parse_minutes(interval)
+        if minutes is None or count <= 0:
+            return False
+        return self._base_count(minutes, count) <= self.store.capacity
+
+    def get_ohlcv(self, ticker: str, interval: str, count: int) -> Optional[pd.DataFrame]:
+        """
+        N분봉 조회 (1분봉 집계, 추가 네트워크 조회 없음)
+
+        Args:
+            ticker: 코인 티커
+            interval: 분봉 (minute3 ~ minute240)
+            count: 조회 개수
+
+        Returns:
+            최근 count개 봉 DataFrame (읽기 전용 뷰) 또는 None
+        """
+        minutes = self.parse_minutes(interval)
+        if minutes is None:
+            return None
+
+        base_count = self._base_count(minutes, count)
+        base = self.store.get_ohlcv(ticker, BASE_INTERVAL, base_count)
+        if base is None or base.empty:
+            return None
+
+        key = (ticker, minutes)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = CandleBuffer(self.store.capacity)
+                self._buffers[key] = buffer
+
+            # 저장소 뷰이므로 복사 없이 배열 참조
+            base_times = base.index.values.astype('datetime64[ns]').view('int64')
+            base_values = base[OHLCV_COLUMNS].to_numpy(dtype='float64')
+            self._update(buffer, base_times, base_values, minutes, count)
+
+            if buffer.size == 0:
+                return None
+            return buffer.view(count)
+
+    def invalidate(self, ticker: Optional[str] = None):
+        """집계 버퍼 제거 (ticker가 None이면 전체)"""
+        with self._lock:
+            for key in [k for k in self._buffers if ticker is None or k[0] == ticker]:
+                del self._buffers[key]
+
+    def get_stats(self) -> Dict:
+        """집계 통계"""
+        return {
+            'keys': len(self._buffers),
+            'aggregations': self.aggregations,
+            'rebuilds': self.rebuilds,
+        }
+
+    # ==================== 내부 ====================
+
+    @staticmethod
+    def _base_count(minutes: int, count: int) -> int:
+        # 맨 앞 봉이 잘릴 수 있으므로 한 봉 분량 여유
+        return (count + 1) * minutes
+
+    def _update(self, buffer: CandleBuffer, times: np.ndarray, values: np.ndarray,
+                minutes: int, count: int):
+        """진행 중인 봉부터 다시 집계해 버퍼에 병합"""
+        width = minutes * _NS_PER_MINUTE
+        last = buffer.last_time
+
+        rebuild = (last is None or buffer.backfill_size < count
+                   or times[0] > last)  # 1분봉이 마지막 집계 봉 시작보다 뒤 → 공백
+        if rebuild:
+            # 첫 구간은 시작 부분이 잘렸을 수 있으므로 다음 경계부터 집계
+            first_bucket = (times[0] - _KST_OFFSET_NS) // width * width + _KST_OFFSET_NS
+            start = 0 if times[0] == first_bucket else int(np.searchsorted(times, first_bucket + width))
+            buffer.clear()
+            buffer.backfill_size = count
+            self.rebuilds += 1
+        else:
+            start = int(np.searchsorted(times, last))
+
+        if start >= len(times):
+            return
+
+        bucket_times, bucket_values = aggregate_arrays(times[start:], values[start:], minutes)
+        buffer.merge_arrays(bucket_times, bucket_values)
+        self.aggregations += 1
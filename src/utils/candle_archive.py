@@ -0,0 +1,312 @@
+"""
+캔들 아카이브 (디스크 저장)
+- (ticker, interval)별 디렉터리에 컬럼별 바이너리 파일 (time.i8, open.f8, ... value.f8)
+- 읽기는 np.memmap으로 필요한 구간만 (수년치 데이터도 디스크 속도로 조회)
+- 쓰기는 추가만 허용 (마지막 봉 이후의 마감된 봉만 이어붙임)
+- 백필: 과거 → 현재 방향으로 200개씩 조회, 중단 후 재실행하면 마지막 봉부터 이어서 진행
+
+사용 예:
+    python -m src.utils.candle_archive --interval minute1 --days 30 --workers 4
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .candle_store import OHLCV_COLUMNS, interval_seconds
+from .rate_limiter import Priority, rate_limiter
+
+
+# 봉 시각은 pyupbit와 같은 KST 기준 (tz 없음)
+KST_OFFSET_NS = 9 * 3600 * 10**9
+
+# 백필 1회 조회 봉 개수 (Upbit 최대값)
+PAGE_SIZE = 200
+
+
+def now_kst_ns() -> int:
+    """현재 KST 시각 (ns)"""
+    return time.time_ns() + KST_OFFSET_NS
+
+
+def _fetch_page(ticker: str, interval: str, count: int, to: Optional[datetime]) -> Optional[pd.DataFrame]:
+    """
+    to(UTC, 미포함) 이전 count개 봉 조회
+
+    pyupbit.get_ohlcv는 빈 응답(상장 이전 구간)도 None으로 반환하므로
+    조회 실패와 구분하기 위해 캔들 API를 직접 호출
+    """
+    from pyupbit.quotation_api import _call_public_api, get_url_ohlcv
+
+    rate_limiter.acquire('candles', Priority.BACKGROUND)
+    params = {'market': ticker, 'count': count}
+    if to is not None:
+        params['to'] = to.strftime("%Y-%m-%d %H:%M:%S")
+    contents, _ = _call_public_api(get_url_ohlcv(interval=interval), **params)
+
+    index = pd.DatetimeIndex([pd.Timestamp(x['candle_date_time_kst']) for x in contents])
+    df = pd.DataFrame({
+        'open': [x['opening_price'] for x in contents],
+        'high': [x['high_price'] for x in contents],
+        'low': [x['low_price'] for x in contents],
+        'close': [x['trade_price'] for x in contents],
+        'volume': [x['candle_acc_trade_volume'] for x in contents],
+        'value': [x['candle_acc_trade_price'] for x in contents],
+    }, index=index, dtype='float64')
+    return df.sort_index()
+
+
+class CandleArchive:
+    """컬럼 파일 기반 캔들 아카이브 (프로세스 내 스레드 안전)"""
+
+    def __init__(self, root: str = 'data/candles'):
+        """
+        Args:
+            root: 아카이브 최상위 디렉터리
+        """
+        self.root = Path(root)
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    # ==================== 읽기 ====================
+
+    def size(self, ticker: str, interval: str) -> int:
+        """저장된 봉 개수"""
+        path = self._path(ticker, interval) / 'time.i8'
+        return path.stat().st_size // 8 if path.exists() else 0
+
+    def last_time(self, ticker: str, interval: str) -> Optional[int]:
+        """마지막 봉 시각 (KST ns, 없으면 None)"""
+        times, _ = self.arrays(ticker, interval, count=1)
+        return int(times[-1]) if len(times) else None
+
+    def arrays(self, ticker: str, interval: str, start=None, end=None,
+               count: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        구간 조회 (memmap 뷰, 복사 없음)
+
+        Args:
+            start: 시작 시각 이상 (Timestamp/문자열, None이면 처음부터)
+            end: 종료 시각 이하 (None이면 끝까지)
+            count: 구간의 마지막 count개만
+
+        Returns:
+            (시각 배열 ns, {컬럼: 값 배열})
+        """
+        n = self.size(ticker, interval)
+        if n == 0:
+            return np.empty(0, dtype='int64'), {c: np.empty(0) for c in OHLCV_COLUMNS}
+
+        path = self._path(ticker, interval)
+        times = np.memmap(path / 'time.i8', dtype='int64', mode='r', shape=(n,))
+        lo = 0 if start is None else int(np.searchsorted(times, _to_ns(start), side='left'))
+        hi = n if end is None else int(np.searchsorted(times, _to_ns(end), side='right'))
+        if count is not None:
+            lo = max(lo, hi - count)
+
+        columns = {c: np.memmap(path / f'{c}.f8', dtype='float64', mode='r', shape=(n,))[lo:hi]
+                   for c in OHLCV_COLUMNS}
+        return times[lo:hi], columns
+
+    def read(self, ticker: str, interval: str, start=None, end=None,
+             count: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        구간 조회 (pyupbit.get_ohlcv와 같은 형식)
+
+        Returns:
+            OHLCV DataFrame (KST 인덱스) 또는 None
+        """
+        times, columns = self.arrays(ticker, interval, start, end, count)
+        if len(times) == 0:
+            return None
+        index = pd.DatetimeIndex(np.asarray(times).view('datetime64[ns]'))
+        return pd.DataFrame({c: np.asarray(v) for c, v in columns.items()}, index=index)
+
+    def tickers(self, interval: str) -> list:
+        """저장된 티커 목록"""
+        base = self.root / interval
+        if not base.exists():
+            return []
+        return sorted(p.name for p in base.iterdir() if (p / 'time.i8').exists())
+
+    # ==================== 쓰기 ====================
+
+    def append(self, ticker: str, interval: str, df: pd.DataFrame,
+               require_overlap: bool = True, now_ns: Optional[int] = None) -> int:
+        """
+        마감된 봉 이어붙이기 (마지막 봉 이후만, 진행 중인 봉 제외)
+
+        Args:
+            df: OHLCV DataFrame (KST 인덱스)
+            require_overlap: True면 df가 아카이브 마지막 봉을 포함할 때만 추가
+                             (중간 봉 누락 방지, 빈 아카이브는 백필로만 생성)
+            now_ns: 현재 KST 시각 (테스트용)
+
+        Returns:
+            추가된 봉 개수
+        """
+        step = interval_seconds(interval)
+        if df is None or df.empty or step is None:
+            return 0
+
+        times = df.index.values.astype('datetime64[ns]').view('int64')
+        values = df[OHLCV_COLUMNS].to_numpy(dtype='float64')
+
+        # 마감된 봉만 (봉 시작 + 간격 <= 현재)
+        now_ns = now_kst_ns() if now_ns is None else now_ns
+        closed = times + step * 10**9 <= now_ns
+        times, values = times[closed], values[closed]
+
+        with self._get_lock(ticker, interval):
+            self._repair(ticker, interval)
+            last = self.last_time(ticker, interval)
+            if require_overlap and (last is None or not (times == last).any()):
+                return 0
+
+            new = times > last if last is not None else np.ones(len(times), dtype=bool)
+            if not new.any():
+                return 0
+            times, values = times[new], values[new]
+
+            path = self._path(ticker, interval)
+            path.mkdir(parents=True, exist_ok=True)
+            # 값 컬럼을 먼저 쓰고 시각 컬럼을 마지막에 (중단 시 _repair로 정리)
+            for i, column in enumerate(OHLCV_COLUMNS):
+                with open(path / f'{column}.f8', 'ab') as f:
+                    np.ascontiguousarray(values[:, i]).tofile(f)
+            with open(path / 'time.i8', 'ab') as f:
+                np.ascontiguousarray(times).tofile(f)
+            return len(times)
+
+    # ==================== 백필 ====================
+
+    def backfill(self, ticker: str, interval: str, since: datetime,
+                 fetch: Optional[Callable] = None, max_failures: int = 3) -> int:
+        """
+        과거 → 현재 방향 백필 (재실행 시 마지막 봉부터 이어서)
+
+        Args:
+            since: 아카이브가 비어 있을 때 시작 시각 (KST)
+            fetch: fetch(ticker, interval, count, to_utc) → DataFrame (None이면 pyupbit)
+            max_failures: 연속 조회 실패 허용 횟수
+
+        Returns:
+            추가된 봉 개수
+        """
+        fetch = fetch or _fetch_page
+        step_ns = interval_seconds(interval) * 10**9
+
+        last = self.last_time(ticker, interval)
+        # scan_from: 여기까지의 봉은 모두 확인됨
+        scan_from = last if last is not None else _to_ns(since) - step_ns
+
+        added = 0
+        failures = 0
+        while scan_from + step_ns < now_kst_ns():
+            to_ns = scan_from + (PAGE_SIZE + 1) * step_ns
+            to = None if to_ns >= now_kst_ns() else pd.Timestamp(to_ns - KST_OFFSET_NS).to_pydatetime()
+            try:
+                df = fetch(ticker, interval, PAGE_SIZE, to)
+            except Exception as e:
+                df = None
+                print(f"❌ {ticker} {interval} 백필 조회 실패: {e}")
+
+            if df is None:
+                failures += 1
+                if failures >= max_failures:
+                    break
+                continue
+            failures = 0
+
+            # 페이지가 (scan_from, to) 구간을 모두 포함하므로 연속성 확인됨
+            if not df.empty:
+                df = df[df.index.values.astype('datetime64[ns]').view('int64') > scan_from]
+                added += self.append(ticker, interval, df, require_overlap=False)
+            if to is None:
+                break
+            scan_from = to_ns - step_ns
+        return added
+
+    def backfill_many(self, tickers: Iterable[str], interval: str, since: datetime,
+                      workers: int = 4, fetch: Optional[Callable] = None) -> Dict[str, int]:
+        """
+        여러 티커 병렬 백필 (요청 한도는 rate_limiter가 공유 관리)
+
+        Returns:
+            {ticker: 추가된 봉 개수}
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+            futures = {t: pool.submit(self.backfill, t, interval, since, fetch) for t in tickers}
+        results = {}
+        for ticker, future in futures.items():
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                print(f"❌ {ticker} 백필 실패: {e}")
+                results[ticker] = 0
+        return results
+
+    # ==================== 내부 ====================
+
+    def _path(self, ticker: str, interval: str) -> Path:
+        return self.root / interval / ticker
+
+    def _get_lock(self, ticker: str, interval: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault((ticker, interval), threading.Lock())
+
+    def _repair(self, ticker: str, interval: str):
+        """중단된 쓰기로 길이가 어긋난 컬럼 파일을 시각 컬럼 길이에 맞춤"""
+        path = self._path(ticker, interval)
+        n = self.size(ticker, interval)
+        for column in OHLCV_COLUMNS:
+            file = path / f'{column}.f8'
+            if file.exists() and file.stat().st_size != n * 8:
+                if file.stat().st_size < n * 8:
+                    raise IOError(f"캔들 아카이브 손상: {file}")
+                with open(file, 'r+b') as f:
+                    f.truncate(n * 8)
+
+
+def _to_ns(value) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).value)
+
+
+def main():
+    """백필 명령"""
+    parser = argparse.ArgumentParser(description='Upbit 캔들 아카이브 백필')
+    parser.add_argument('--interval', default='minute1', help='봉 간격 (minute1 ~ minute240, day)')
+    parser.add_argument('--days', type=float, default=30, help='빈 아카이브의 백필 기간 (일)')
+    parser.add_argument('--tickers', default='', help='쉼표로 구분한 티커 (비우면 전체 KRW 마켓)')
+    parser.add_argument('--workers', type=int, default=4, help='동시 백필 티커 수')
+    parser.add_argument('--root', default='data/candles', help='아카이브 디렉터리')
+    args = parser.parse_args()
+
+    if args.tickers:
+        tickers = [t.strip() for t in args.tickers.split(',') if t.strip()]
+    else:
+        import pyupbit
+        rate_limiter.acquire('market', Priority.BACKGROUND)
+        tickers = pyupbit.get_tickers(fiat="KRW")
+
+    archive = CandleArchive(args.root)
+    since = pd.Timestamp(now_kst_ns()) - timedelta(days=args.days)
+    start = time.time()
+    results = archive.backfill_many(tickers, args.interval, since, workers=args.workers)
+
+    total = sum(results.values())
+    print(f"✅ 백필 완료: {len(results)}개 코인, {total:,}개 봉 ({time.time() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
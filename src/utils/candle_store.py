@@ -0,0 +1,305 @@
+"""
+증분 OHLCV 캔들 저장소
+- (ticker, interval)별 고정 크기 NumPy 링 버퍼
+- 최초 1회만 전체 조회(backfill), 이후에는 마지막 봉 이후 캔들만 조회해 병합
+- 버퍼를 2배 길이로 이중 기록해 최근 N개 봉이 항상 연속 메모리 → 복사 없이 DataFrame 제공
+- 캔들 아카이브 연결 시: 최초 조회를 디스크에서 읽고 빈 구간만 조회, 마감된 봉은 아카이브에 추가
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'value']
+
+_MINUTE_PATTERN = re.compile(r'^minutes?(\d+)$')
+
+
+def interval_seconds(interval: str) -> Optional[int]:
+    """
+    봉 간격을 초 단위로 변환
+
+    Args:
+        interval: minute1 ~ minute240, day, week
+
+    Returns:
+        초 (월봉 등 고정 길이가 아니면 None)
+    """
+    match = _MINUTE_PATTERN.match(interval)
+    if match:
+        return int(match.group(1)) * 60
+    if interval in ('day', 'days'):
+        return 86400
+    if interval in ('week', 'weeks'):
+        return 7 * 86400
+    return None
+
+
+class CandleBuffer:
+    """단일 (ticker, interval) 캔들 링 버퍼"""
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: 보관할 최대 봉 개수
+        """
+        self.capacity = capacity
+        # 각 행을 pos, pos + capacity 두 곳에 기록
+        self._times = np.zeros(2 * capacity, dtype='int64')  # KST 기준 ns
+        self._values = np.zeros((2 * capacity, len(OHLCV_COLUMNS)), dtype='float64')
+        self._pos = 0  # 다음 기록 위치 [0, capacity)
+        self.size = 0
+        self.backfill_size = 0  # 마지막 전체 조회 시 요청한 봉 개수
+        self.last_refresh = 0.0
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """마지막 봉 시각 (ns)"""
+        if self.size == 0:
+            return None
+        return int(self._times[self._pos + self.capacity - 1])
+
+    def clear(self):
+        self._pos = 0
+        self.size = 0
+        self.last_refresh = 0.0
+
+    def merge(self, df: pd.DataFrame) -> int:
+        """
+        조회 결과 병합 (시간순)
+        - 마지막 봉과 같은 시각: 덮어쓰기 (진행 중인 봉 갱신)
+        - 마지막 봉 이후: 추가
+        - 그 이전: 무시
+
+        Returns:
+            새로 추가된 봉 개수
+        """
+        if df is None or df.empty:
+            return 0
+
+        times = df.index.values.astype('datetime64[ns]').view('int64')
+        values = df[OHLCV_COLUMNS].to_numpy(dtype='float64')
+        return self.merge_arrays(times, values)
+
+    def merge_arrays(self, times: np.ndarray, values: np.ndarray) -> int:
+        """
+        배열 병합 (merge와 동일, times: ns 정수 배열, values: (N, 6) 배열)
+
+        Returns:
+            새로 추가된 봉 개수
+        """
+        added = 0
+        for ts, row in zip(times, values):
+            last = self.last_time
+            if last is not None and ts < last:
+                continue
+            if last is not None and ts == last:
+                idx = (self._pos - 1) % self.capacity
+            else:
+                idx = self._pos
+                self._pos = (self._pos + 1) % self.capacity
+                self.size = min(self.size + 1, self.capacity)
+                added += 1
+            self._times[idx] = self._times[idx + self.capacity] = ts
+            self._values[idx] = self._values[idx + self.capacity] = row
+        return added
+
+    def arrays(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """최근 count개 봉 (시각 배열, 값 배열) 뷰"""
+        n = min(count, self.size)
+        end = self._pos + self.capacity
+        return self._times[end - n:end], self._values[end - n:end]
+
+    def view(self, count: int) -> pd.DataFrame:
+        """
+        최근 count개 봉 DataFrame (버퍼 메모리를 그대로 참조, 읽기 전용)
+
+        ⚠️ 버퍼가 갱신되면 내용이 바뀔 수 있으므로 오래 보관할 경우 copy() 사용
+        """
+        times, values = self.arrays(count)
+        values.flags.writeable = False
+        index = pd.DatetimeIndex(times.view('datetime64[ns]'))
+        return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS, copy=False)
+
+
+class CandleStore:
+    """(ticker, interval)별 캔들 버퍼 관리"""
+
+    def __init__(self, fetch: Callable[[str, str, int], Optional[pd.DataFrame]],
+                 capacity: int = 500, backfill_count: int = 200, max_keys: int = 300,
+                 min_refresh: float = 1.0, archive=None):
+        """
+        초기화
+
+        Args:
+            fetch: 실제 조회 함수 fetch(ticker, interval, count) → DataFrame
+            capacity: 키별 최대 보관 봉 개수 (이보다 많이 요청하면 직접 조회)
+            backfill_count: 최초 조회 봉 개수
+            max_keys: 최대 보관 키 수 (초과 시 가장 오래 갱신 안 된 키 제거)
+            min_refresh: 최소 갱신 주기 (초, 이 시간 안의 재요청은 조회 없이 버퍼 제공)
+            archive: CandleArchive (None이면 디스크 미사용)
+        """
+        self.fetch = fetch
+        self.capacity = capacity
+        self.backfill_count = backfill_count
+        self.max_keys = max_keys
+        self.min_refresh = min_refresh
+        self.archive = archive
+
+        self._buffers: Dict[Tuple[str, str], CandleBuffer] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.backfills = 0
+        self.incremental_fetches = 0
+        self.candles_fetched = 0
+        self.warm_starts = 0
+
+    def supports(self, interval: str, count: int) -> bool:
+        """저장소에서 제공 가능한 요청인지"""
+        return interval_seconds(interval) is not None and 0 < count <= self.capacity
+
+    def get_ohlcv(self, ticker: str, interval: str = "minute5", count: int = 200) -> Optional[pd.DataFrame]:
+        """
+        OHLCV 조회 (필요한 만큼만 네트워크 조회)
+
+        Args:
+            ticker: 코인 티커
+            interval: 봉 간격
+            count: 조회 개수
+
+        Returns:
+            최근 count개 봉 DataFrame (읽기 전용 뷰) 또는 None
+        """
+        if not self.supports(interval, count):
+            return self.fetch(ticker, interval, count)
+
+        key = (ticker, interval)
+        buffer, lock = self._get_buffer(key)
+
+        with lock:
+            # 최초 조회이거나 이전보다 많은 봉을 요청하면 전체 조회
+            # (상장 직후라 봉이 원래 적은 경우는 backfill_size로 구분)
+            if buffer.size == 0 or count > buffer.backfill_size:
+                self._backfill(buffer, ticker, interval, count)
+            elif time.time() - buffer.last_refresh >= self.min_refresh:
+                self._refresh(buffer, ticker, interval)
+
+            if buffer.size == 0:
+                return None
+            return buffer.view(count)
+
+    def invalidate(self, ticker: Optional[str] = None):
+        """버퍼 제거 (ticker가 None이면 전체)"""
+        with self._lock:
+            keys = [k for k in self._buffers if ticker is None or k[0] == ticker]
+            for key in keys:
+                self._buffers.pop(key, None)
+                self._locks.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """저장소 통계"""
+        return {
+            'keys': len(self._buffers),
+            'backfills': self.backfills,
+            'incremental_fetches': self.incremental_fetches,
+            'candles_fetched': self.candles_fetched,
+            'warm_starts': self.warm_starts,
+        }
+
+    # ==================== 내부 ====================
+
+    def _get_buffer(self, key):
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                if len(self._buffers) >= self.max_keys:
+                    oldest = min(self._buffers, key=lambda k: self._buffers[k].last_refresh)
+                    self._buffers.pop(oldest)
+                    self._locks.pop(oldest, None)
+                buffer = CandleBuffer(self.capacity)
+                self._buffers[key] = buffer
+                self._locks[key] = threading.Lock()
+            return buffer, self._locks[key]
+
+    def _backfill(self, buffer: CandleBuffer, ticker: str, interval: str, count: int,
+                  use_archive: bool = True):
+        """전체 재조회"""
+        fetch_count = min(max(count, self.backfill_count), self.capacity)
+        if use_archive and self._warm_start(buffer, ticker, interval, fetch_count):
+            return
+
+        df = self.fetch(ticker, interval, fetch_count)
+        if df is None or df.empty:
+            return
+        buffer.clear()
+        buffer.merge(df)
+        buffer.backfill_size = fetch_count
+        buffer.last_refresh = time.time()
+        self.backfills += 1
+        self.candles_fetched += len(df)
+        self._archive(ticker, interval, df)
+
+    def _warm_start(self, buffer: CandleBuffer, ticker: str, interval: str, count: int) -> bool:
+        """아카이브에서 버퍼 채우고 마지막 봉 이후만 조회"""
+        if self.archive is None:
+            return False
+        times, columns = self.archive.arrays(ticker, interval, count=count)
+        if len(times) < count:
+            return False
+
+        # 아카이브 마지막 봉 시각을 마지막 갱신 시각으로 간주 → 빈 구간만큼만 조회
+        lag = time.time() + 9 * 3600 - int(times[-1]) / 1e9  # 봉 시각은 KST
+        if lag // interval_seconds(interval) + 2 > self.capacity:
+            return False
+
+        buffer.clear()
+        buffer.merge_arrays(times, np.column_stack([columns[c] for c in OHLCV_COLUMNS]))
+        buffer.backfill_size = count
+        buffer.last_refresh = time.time() - lag
+        self.warm_starts += 1
+        self._refresh(buffer, ticker, interval)
+        return True
+
+    def _archive(self, ticker: str, interval: str, df: pd.DataFrame):
+        """마감된 봉을 아카이브에 추가"""
+        if self.archive is None:
+            return
+        try:
+            self.archive.append(ticker, interval, df)
+        except Exception as e:
+            print(f"❌ {ticker} {interval} 캔들 아카이브 저장 실패: {e}")
+
+    def _refresh(self, buffer: CandleBuffer, ticker: str, interval: str):
+        """마지막 갱신 이후 봉만 조회해 병합"""
+        now = time.time()
+        elapsed = now - buffer.last_refresh
+        # 경과 시간 동안 새로 열린 봉 + 진행 중이던 마지막 봉
+        needed = int(elapsed // interval_seconds(interval)) + 2
+
+        if needed > self.capacity:
+            # 너무 오래 갱신 안 됨 → 전체 재조회
+            self._backfill(buffer, ticker, interval, buffer.backfill_size, use_archive=False)
+            return
+
+        df = self.fetch(ticker, interval, needed)
+        if df is None or df.empty:
+            return
+
+        # 받은 봉이 모두 마지막 봉 이후면 중간 봉이 빠졌을 수 있음 → 전체 재조회
+        first = int(df.index.values[:1].astype('datetime64[ns]').view('int64')[0])
+        if buffer.last_time is not None and first > buffer.last_time:
+            self._backfill(buffer, ticker, interval, buffer.backfill_size, use_archive=False)
+            return
+
+        buffer.merge(df)
+        buffer.last_refresh = now
+        self.incremental_fetches += 1
+        self.candles_fetched += len(df)
+        self._archive(ticker, interval, df)
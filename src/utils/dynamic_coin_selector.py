@@ -3,6 +3,7 @@
 5분마다 거래량/RSI/변동성 기준으로 최적 코인 자동 선정
 """
 import pyupbit
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
@@ -10,16 +11,22 @@ import time
 from colorlog import ColoredFormatter
 import logging
 
+from .rate_limiter import Priority, rate_limiter
+from .candle_archive import now_kst_ns
+from .universe_indicators import UniverseIndicators
+
 
 class DynamicCoinSelector:
     """동적 코인 선정 시스템"""
     
-    def __init__(self, coin_count: int = 35):
+    def __init__(self, coin_count: int = 35, archive=None):
         """
         Args:
             coin_count: 고정 코인 개수 (기본 35개)
+            archive: CandleArchive (최근 1시간봉이 있으면 조회 없이 사용)
         """
         self.coin_count = coin_count
+        self.archive = archive
         self.last_update = 0
         self.update_interval = 180  # 3분 = 180초
         self.current_coins = []
@@ -59,6 +66,7 @@ class DynamicCoinSelector:
     def get_all_krw_tickers(self) -> List[str]:
         """모든 KRW 마켓 티커 조회"""
         try:
+            rate_limiter.acquire('market', Priority.BACKGROUND)
             all_tickers = pyupbit.get_tickers(fiat="KRW")
             self.logger.info(f"📊 전체 KRW 마켓: {len(all_tickers)}개")
             return all_tickers
@@ -76,19 +84,19 @@ class DynamicCoinSelector:
             for i in range(0, len(tickers), 100):
                 batch = tickers[i:i+100]
                 try:
+                    rate_limiter.acquire('ticker', Priority.BACKGROUND)
                     prices_data = pyupbit.get_current_price(batch)
                     if isinstance(prices_data, dict):
                         for ticker, price in prices_data.items():
                             if price is not None:
                                 # OHLCV에서 거래대금 확인
                                 try:
-                                    df = pyupbit.get_ohlcv(ticker, interval="minute60", count=24)
+                                    df = self._get_hourly_candles(ticker)
                                     if df is not None and not df.empty:
                                         volume_krw = (df['close'] * df['volume']).sum()
                                         volumes[ticker] = volume_krw
                                 except:
                                     pass
-                    time.sleep(0.1)  # API 한도 방지
                 except Exception as e:
                     self.logger.debug(f"배치 조회 실패: {e}")
                     continue
@@ -103,6 +111,22 @@ class DynamicCoinSelector:
             self.logger.error(f"❌ 거래량 순위 조회 실패: {e}")
             return []
     
+    def _get_hourly_candles(self, ticker: str, count: int = 24) -> pd.DataFrame:
+        """최근 1시간봉 (아카이브가 최신이면 디스크에서, 아니면 조회 후 아카이브에 추가)"""
+        if self.archive is not None:
+            last = self.archive.last_time(ticker, 'minute60')
+            # 마지막 봉이 직전 마감 봉이면 최신 (마감 후 1시간 안)
+            if last is not None and now_kst_ns() - last < 2 * 3600 * 10**9:
+                df = self.archive.read(ticker, 'minute60', count=count)
+                if df is not None and len(df) >= count:
+                    return df
+        
+        rate_limiter.acquire('candles', Priority.BACKGROUND)
+        df = pyupbit.get_ohlcv(ticker, interval="minute60", count=count)
+        if self.archive is not None and df is not None:
+            self.archive.append(ticker, 'minute60', df)
+        return df
+    
     def calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> float:
         """RSI 계산"""
         try:
@@ -126,29 +150,39 @@ class DynamicCoinSelector:
         except:
             return 0.0
     
-    def get_rsi_ranking(self, tickers: List[str]) -> List[Tuple[str, float]]:
-        """RSI 기준 순위 (과매도/과매수 구간)"""
-        rsi_scores = {}
-        
+    def _get_minute5_candles(self, tickers: List[str], count: int = 100) -> Dict[str, pd.DataFrame]:
+        """티커별 최근 5분봉 (조회 실패 티커는 제외)"""
+        frames = {}
         for ticker in tickers:
             try:
-                df = pyupbit.get_ohlcv(ticker, interval="minute5", count=100)
+                rate_limiter.acquire('candles', Priority.BACKGROUND)
+                df = pyupbit.get_ohlcv(ticker, interval="minute5", count=count)
                 if df is not None and not df.empty:
-                    rsi = self.calculate_rsi(df)
-                    
-                    # RSI 스코어 계산 (30 이하 또는 70 이상이 높은 점수)
-                    if rsi <= 30:
-                        score = 100 - rsi  # 과매도 → 매수 기회
-                    elif rsi >= 70:
-                        score = rsi  # 과매수 → 단타 기회
-                    else:
-                        score = 50  # 중립
-                    
-                    rsi_scores[ticker] = score
-                
-                time.sleep(0.05)  # API 한도 방지
+                    frames[ticker] = df
             except:
                 continue
+        return frames
+    
+    def get_rsi_ranking(self, tickers: List[str], frames: Dict[str, pd.DataFrame] = None) -> List[Tuple[str, float]]:
+        """
+        RSI 기준 순위 (과매도/과매수 구간)
+        
+        전체 티커를 UniverseIndicators로 한 번에 계산 (티커별 증분 지표 상태는 사용하지 않음 -
+        선정은 5분마다 새로 받은 캔들 전체로 계산하므로 상태 유지 이점이 없음)
+        
+        Args:
+            tickers: 티커 리스트
+            frames: 미리 조회한 5분봉 (없으면 조회)
+        """
+        if frames is None:
+            frames = self._get_minute5_candles(tickers)
+        universe = UniverseIndicators({t: frames[t] for t in tickers if t in frames})
+        rsi = universe.rsi(14)
+        
+        # RSI 스코어 계산 (30 이하 또는 70 이상이 높은 점수)
+        # 과매도 → 매수 기회, 과매수 → 단타 기회, 그 외 중립
+        scores = np.where(rsi <= 30, 100 - rsi, np.where(rsi >= 70, rsi, 50.0))
+        rsi_scores = universe.to_dict(scores)
         
         # RSI 스코어 정렬
         sorted_rsi = sorted(rsi_scores.items(), key=lambda x: x[1], reverse=True)
@@ -156,20 +190,18 @@ class DynamicCoinSelector:
         self.logger.info(f"📊 RSI 분석 완료: {len(sorted_rsi)}개")
         return sorted_rsi
     
-    def get_volatility_ranking(self, tickers: List[str]) -> List[Tuple[str, float]]:
-        """변동성 기준 순위"""
-        volatility_scores = {}
+    def get_volatility_ranking(self, tickers: List[str], frames: Dict[str, pd.DataFrame] = None) -> List[Tuple[str, float]]:
+        """
+        변동성 기준 순위
         
-        for ticker in tickers:
-            try:
-                df = pyupbit.get_ohlcv(ticker, interval="minute5", count=100)
-                if df is not None and not df.empty:
-                    volatility = self.calculate_volatility(df)
-                    volatility_scores[ticker] = volatility
-                
-                time.sleep(0.05)
-            except:
-                continue
+        Args:
+            tickers: 티커 리스트
+            frames: 미리 조회한 5분봉 (없으면 조회)
+        """
+        if frames is None:
+            frames = self._get_minute5_candles(tickers)
+        universe = UniverseIndicators({t: frames[t] for t in tickers if t in frames})
+        volatility_scores = universe.to_dict(universe.volatility())
         
         # 변동성 정렬
         sorted_volatility = sorted(volatility_scores.items(), key=lambda x: x[1], reverse=True)
@@ -193,11 +225,12 @@ class DynamicCoinSelector:
         
         top_50_tickers = [ticker for ticker, _ in volume_ranking]
         
-        # 3단계: Top 50에서 RSI 분석
-        rsi_ranking = self.get_rsi_ranking(top_50_tickers)
+        # 3단계: Top 50에서 RSI 분석 (5분봉은 1회만 조회해 RSI/변동성 공용)
+        frames = self._get_minute5_candles(top_50_tickers)
+        rsi_ranking = self.get_rsi_ranking(top_50_tickers, frames)
         
         # 4단계: Top 50에서 변동성 분석
-        volatility_ranking = self.get_volatility_ranking(top_50_tickers)
+        volatility_ranking = self.get_volatility_ranking(top_50_tickers, frames)
         
         # 5단계: 복합 점수 계산
         scores = {}
@@ -0,0 +1,190 @@
+"""
+청산 전용 감시 스레드
+- 진입 스캔과 분리된 별도 스레드가 보유 포지션(일반 + 초단타)만 감시
+- 감시 주기마다 보유 코인 현재가를 한 번의 배치 조회로 갱신 (스트림 우선, 없으면 REST 배치)
+- 코인별 청산 판단 콜백 실행 → 전체 스캔이 길어져도 손절이 밀리지 않음
+- 감시 중 요청은 POSITION 한도 우선순위 (스캔 워커의 BACKGROUND 요청보다 먼저 토큰 사용)
+- 지연 히스토그램: 감시 1회 소요 시간, 가격 관측 → 청산 완료 시간 (p50/p99)
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .rate_limiter import Priority, rate_limiter
+
+
+class LatencyHistogram:
+    """지연 시간 히스토그램 (고정 구간 카운트 + 최근 표본 백분위)"""
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, history: int = 2000):
+        self.samples = deque(maxlen=history)
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """지연 1건 기록 (초)"""
+        ms = seconds * 1000
+        index = int(np.searchsorted(self.BUCKETS_MS, ms))
+        with self._lock:
+            self.samples.append(ms)
+            self.counts[index] += 1
+            self.total += 1
+
+    def percentile(self, q: float) -> float:
+        """최근 표본의 q 백분위 (ms, 표본 없으면 0)"""
+        with self._lock:
+            samples = np.array(self.samples)
+        return float(np.percentile(samples, q)) if len(samples) else 0.0
+
+    def get_stats(self) -> Dict:
+        """건수, p50/p99/최대 (ms), 구간별 건수"""
+        with self._lock:
+            samples = np.array(self.samples)
+            counts = list(self.counts)
+        labels = [f"≤{b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        return {
+            'count': self.total,
+            'p50_ms': float(np.percentile(samples, 50)) if len(samples) else 0.0,
+            'p99_ms': float(np.percentile(samples, 99)) if len(samples) else 0.0,
+            'max_ms': float(samples.max()) if len(samples) else 0.0,
+            'buckets': dict(zip(labels, counts)),
+        }
+
+
+class ExitWatcher:
+    """보유 포지션 청산 감시 스레드"""
+
+    def __init__(self, get_tickers: Callable[[], Iterable[str]],
+                 get_prices: Callable[[List[str]], Dict[str, float]],
+                 evaluate: Callable[[str, float], bool],
+                 interval: float = 0.25, lock: Optional[threading.RLock] = None,
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        """
+        초기화
+
+        Args:
+            get_tickers: 보유 포지션 티커 목록 함수
+            get_prices: 여러 티커 현재가 배치 조회 함수 ({ticker: price})
+            evaluate: 청산 판단 함수 (ticker, price) → 청산했으면 True
+            interval: 감시 주기 (초)
+            lock: 청산 판단 중 잡을 잠금 (None이면 잠금 없이 호출 - evaluate가 직접 동기화)
+            on_error: 감시 오류 콜백 (대상, 예외) - None이면 콘솔 출력만
+                대상은 가격 조회 실패면 'prices', 청산 판단 실패면 티커
+        """
+        self.get_tickers = get_tickers
+        self.get_prices = get_prices
+        self.evaluate = evaluate
+        self.interval = interval
+        self.lock = lock
+        self.on_error = on_error
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # 통계
+        self.sweeps = 0
+        self.exits = 0
+        self.errors = 0
+        self.sweep_latency = LatencyHistogram()
+        self.exit_latency = LatencyHistogram()
+
+    # ==================== 스레드 ====================
+
+    def start(self):
+        """감시 스레드 시작 (이미 실행 중이면 무시)"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='exit-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """감시 스레드 중지"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            self.sweep()
+            elapsed = time.monotonic() - started
+            self._stop_event.wait(max(self.interval - elapsed, 0.0))
+
+    # ==================== 감시 ====================
+
+    def sweep(self) -> int:
+        """
+        보유 포지션 1회 감시 (배치 가격 조회 → 코인별 청산 판단)
+
+        Returns:
+            청산한 포지션 수
+        """
+        with rate_limiter.priority(Priority.POSITION):
+            return self._sweep()
+
+    def _sweep(self) -> int:
+        started = time.monotonic()
+        tickers = list(self.get_tickers())
+        if not tickers:
+            return 0
+
+        try:
+            prices = self.get_prices(tickers) or {}
+        except Exception as e:
+            self.errors += 1
+            if self.on_error:
+                self.on_error('prices', e)
+            else:
+                print(f"❌ 청산 감시 가격 조회 실패: {e}")
+            return 0
+        observed_at = time.monotonic()
+
+        exits = 0
+        for ticker in tickers:
+            price = prices.get(ticker)
+            if not price:
+                continue
+            try:
+                with self.lock or nullcontext():
+                    exited = self.evaluate(ticker, price)
+            except Exception as e:
+                self.errors += 1
+                if self.on_error:
+                    self.on_error(ticker, e)
+                else:
+                    print(f"❌ {ticker} 청산 판단 실패: {e}")
+                continue
+            if exited:
+                exits += 1
+                self.exit_latency.record(time.monotonic() - observed_at)
+
+        self.sweeps += 1
+        self.exits += exits
+        self.sweep_latency.record(time.monotonic() - started)
+        return exits
+
+    def get_stats(self) -> Dict:
+        """감시 통계"""
+        return {
+            'running': self.is_running,
+            'interval': self.interval,
+            'sweeps': self.sweeps,
+            'exits': self.exits,
+            'errors': self.errors,
+            'sweep_latency': self.sweep_latency.get_stats(),
+            'exit_latency': self.exit_latency.get_stats(),
+        }
@@ -0,0 +1,269 @@
+"""
+공유 HTTP 전송 계층
+- 호스트별 keep-alive 연결 풀 (requests.Session)
+- 연결/읽기 타임아웃 기본 적용 (무한 대기 방지)
+- 일시적 오류 재시도 (지수 백오프 + 지터)
+- 엔드포인트별 지연 시간 통계
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# 재시도할 HTTP 상태 코드 (요청 한도 초과, 서버 일시 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 멱등 요청 (읽기 실패 시에도 재시도 가능)
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'DELETE'}
+
+
+class EndpointStats:
+    """엔드포인트별 지연 시간 기록"""
+
+    def __init__(self, max_samples: int = 500):
+        self.samples = deque(maxlen=max_samples)  # 최근 지연 시간 (초)
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, error: bool = False):
+        self.samples.append(latency)
+        self.count += 1
+        if error:
+            self.errors += 1
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+    def summary(self) -> Dict:
+        samples = sorted(self.samples)
+        n = len(samples)
+
+        def percentile(p):
+            if not n:
+                return 0.0
+            return samples[min(n - 1, int(p * n))] * 1000
+
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_ms': (sum(samples) / n * 1000) if n else 0.0,
+            'p50_ms': percentile(0.50),
+            'p99_ms': percentile(0.99),
+            'max_ms': self.max_latency * 1000,
+        }
+
+
+class HttpTransport:
+    """호스트별 연결 풀을 공유하는 HTTP 클라이언트 (스레드 안전)"""
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 max_retries: int = 2, backoff: float = 0.3, max_backoff: float = 5.0,
+                 pool_maxsize: int = 20):
+        """
+        초기화
+
+        Args:
+            connect_timeout: 연결(TLS 핸드셰이크 포함) 타임아웃 (초)
+            read_timeout: 응답 읽기 타임아웃 (초)
+            max_retries: 최대 재시도 횟수
+            backoff: 재시도 기본 대기 시간 (초, 시도마다 2배)
+            max_backoff: 재시도 최대 대기 시간 (초)
+            pool_maxsize: 호스트별 최대 유지 연결 수
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_maxsize = pool_maxsize
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+        # 요청 가로채기 (기록/재생, None이면 실제 전송)
+        self.interceptor = None
+
+    def configure(self, connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                  max_retries: Optional[int] = None):
+        """타임아웃/재시도 설정 변경"""
+        if connect_timeout is not None:
+            self.connect_timeout = connect_timeout
+        if read_timeout is not None:
+            self.read_timeout = read_timeout
+        if max_retries is not None:
+            self.max_retries = max_retries
+
+    def set_interceptor(self, interceptor):
+        """
+        요청 가로채기 설정 (None이면 해제)
+
+        interceptor.handle(method, url, kwargs, send)가 응답을 반환하며,
+        send()를 호출하면 실제 전송 (기록 모드), 호출하지 않으면 네트워크 미사용 (재생 모드)
+        """
+        self.interceptor = interceptor
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """기본 (연결, 읽기) 타임아웃"""
+        return (self.connect_timeout, self.read_timeout)
+
+    # ==================== 요청 ====================
+
+    def request(self, method: str, url: str, endpoint: Optional[str] = None,
+                retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """
+        HTTP 요청
+
+        Args:
+            method: HTTP 메서드
+            url: 요청 주소
+            endpoint: 통계용 이름 (None이면 호스트+경로, URL에 토큰이 있으면 지정할 것)
+            retries: 재시도 횟수 (None이면 기본값)
+            **kwargs: requests 인자 (params, json, data, headers, timeout 등)
+
+        Returns:
+            Response (재시도 후에도 429/5xx면 마지막 응답 반환)
+
+        Raises:
+            requests.RequestException: 재시도 후에도 연결/타임아웃 오류
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        retries = self.max_retries if retries is None else retries
+
+        parts = urlsplit(url)
+        session = self._get_session(f"{parts.scheme}://{parts.netloc}")
+        stats = self._get_stats(endpoint or f"{parts.netloc}{parts.path}")
+
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                response = self._send(session, method, url, kwargs)
+            except requests.RequestException as e:
+                stats.record(time.monotonic() - start, error=True)
+                if attempt >= retries or not self._can_retry_error(method, e):
+                    raise
+            else:
+                failed = response.status_code in RETRY_STATUS_CODES
+                stats.record(time.monotonic() - start, error=failed)
+                # 요청이 서버에 도달했으므로 비멱등 요청(주문 등)은 재시도하지 않음
+                if not failed or attempt >= retries or method not in IDEMPOTENT_METHODS:
+                    return response
+
+            attempt += 1
+            stats.retries += 1
+            time.sleep(self._backoff_delay(attempt))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET 요청"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST 요청"""
+        return self.request('POST', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        """DELETE 요청"""
+        return self.request('DELETE', url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """엔드포인트별 지연 시간 통계 {endpoint: {count, errors, retries, avg_ms, p50_ms, p99_ms, max_ms}}"""
+        with self._lock:
+            items = list(self._stats.items())
+        return {name: stats.summary() for name, stats in items}
+
+    def close(self):
+        """모든 연결 종료"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    # ==================== 내부 ====================
+
+    def _send(self, session: requests.Session, method: str, url: str, kwargs: Dict) -> requests.Response:
+        interceptor = self.interceptor
+        if interceptor is None:
+            return session.request(method, url, **kwargs)
+        return interceptor.handle(method, url, kwargs, lambda: session.request(method, url, **kwargs))
+
+    @staticmethod
+    def _can_retry_error(method: str, error: Exception) -> bool:
+        # 연결 단계 실패는 요청이 전송되지 않았으므로 항상 재시도 가능
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if method not in IDEMPOTENT_METHODS:
+            return False
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(max_backoff, backoff * 2^(attempt-1))
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** (attempt - 1))))
+
+    def _get_session(self, base: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(base)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount(base, adapter)
+                self._sessions[base] = session
+            return session
+
+    def _get_stats(self, endpoint: str) -> EndpointStats:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = EndpointStats()
+                self._stats[endpoint] = stats
+            return stats
+
+
+class _RequestsShim:
+    """pyupbit 내부 requests 호출을 HttpTransport로 전달"""
+
+    def __init__(self, transport: HttpTransport):
+        self._transport = transport
+
+    def get(self, url, **kwargs):
+        return self._transport.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._transport.post(url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._transport.delete(url, **kwargs)
+
+    def __getattr__(self, name):
+        # 예외 클래스 등 나머지는 원래 requests 모듈 사용
+        return getattr(requests, name)
+
+
+def install_pyupbit_transport(transport: HttpTransport):
+    """
+    pyupbit의 HTTP 호출을 공유 전송 계층으로 교체
+
+    pyupbit는 세션 없이 requests.get/post/delete를 직접 호출하므로
+    모듈의 requests 참조를 바꿔 연결 풀/타임아웃/통계를 적용
+    """
+    try:
+        from pyupbit import request_api
+    except ImportError:
+        return
+    request_api.requests = _RequestsShim(transport)
+
+
+# 전역 인스턴스 (모든 HTTP 호출이 공유)
+http_transport = HttpTransport()
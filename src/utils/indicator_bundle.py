@@ -0,0 +1,198 @@
+"""
+봉 단위 지표 묶음 (전략 / AI 공용)
+- 같은 캔들(ticker, 봉 범위, 마지막 봉 시각과 현재 값)에 대한 지표는 1회만 계산해 LRU 캐시에 보관
+- 지표는 요청 시점에 계산 후 묶음 안에 기억 (전략마다 필요한 지표만 계산)
+- 이동평균 계열은 마지막 값에 필요한 최근 구간만 계산 (BaseStrategy pandas 구현과 같은 값)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import vector_indicators as vi
+
+
+NAN = float('nan')
+
+
+class IndicatorBundle:
+    """캔들 1벌의 마지막 봉 기준 지표 (값은 처음 요청 시 계산 후 재사용)"""
+
+    def __init__(self, df: pd.DataFrame, ticker: Optional[str] = None):
+        """
+        Args:
+            df: OHLCV 데이터프레임 (배열은 복사해 보관 → 캔들 버퍼가 갱신돼도 값 유지)
+            ticker: 코인 티커
+        """
+        self.ticker = ticker
+        self.close = df['close'].to_numpy(dtype='float64', copy=True)
+        self.volume = df['volume'].to_numpy(dtype='float64', copy=True)
+        self.price = float(self.close[-1])
+        self._memo: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.close)
+
+    def _cached(self, key: Tuple, compute):
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        value = compute()
+        with self._lock:
+            self._memo[key] = value
+        return value
+
+    # ==================== 지표 ====================
+
+    def rsi(self, period: int = 14) -> float:
+        """RSI (BaseStrategy.calculate_rsi의 마지막 값)"""
+        return self._cached(('rsi', period), lambda: float(vi.rsi(self.close[-(period + 1):], period)[-1]))
+
+    def sma(self, period: int) -> float:
+        """이동평균 (봉 부족 시 NaN)"""
+        def compute():
+            if len(self.close) < period:
+                return NAN
+            return float(self.close[-period:].mean())
+        return self._cached(('sma', period), compute)
+
+    def bollinger(self, period: int = 20, std: float = 2.0) -> Tuple[float, float, float]:
+        """볼린저 밴드 (상단, 중단, 하단)"""
+        def compute():
+            if len(self.close) < period:
+                return NAN, NAN, NAN
+            window = self.close[-period:]
+            middle = float(window.mean())
+            dev = float(window.std(ddof=1))
+            return middle + dev * std, middle, middle - dev * std
+        return self._cached(('bollinger', period, std), compute)
+
+    def bb_position(self, period: int = 20, std: float = 2.0) -> float:
+        """밴드 내 위치 (하단 0 ~ 상단 1, 밴드 폭 0이면 0.5)"""
+        upper, _, lower = self.bollinger(period, std)
+        width = upper - lower
+        return (self.price - lower) / width if width > 0 else 0.5
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
+        """MACD (MACD, Signal, Histogram) - EMA는 전체 구간 필요"""
+        def compute():
+            line, signal_line, hist = vi.macd(self.close, fast, slow, signal)
+            return float(line[-1]), float(signal_line[-1]), float(hist[-1])
+        return self._cached(('macd', fast, slow, signal), compute)
+
+    def volume_ratio(self, period: int = 20) -> float:
+        """거래량 비율 (BaseStrategy.calculate_volume_ratio와 동일)"""
+        def compute():
+            if len(self.volume) < period:
+                return 1.0
+            avg = float(self.volume[-period:].mean())
+            return float(self.volume[-1]) / avg if avg != 0 else 1.0
+        return self._cached(('volume_ratio', period), compute)
+
+    def price_change(self, periods: int = 1) -> float:
+        """가격 변동률 (%, BaseStrategy.get_price_change와 동일)"""
+        if len(self.close) < periods + 1:
+            return 0.0
+        prev = self.close[-(periods + 1)]
+        return float((self.price - prev) / prev * 100) if prev != 0 else 0.0
+
+    def volatility(self, period: Optional[int] = None) -> float:
+        """
+        변동성 (수익률 표준편차, %)
+
+        Args:
+            period: 최근 period개 수익률 (None이면 전체, df['close'].pct_change().std()와 동일)
+        """
+        def compute():
+            if len(self.close) < 2:
+                return 0.0
+            close = self.close if period is None else self.close[-(period + 1):]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = close[1:] / close[:-1] - 1
+            returns = returns[np.isfinite(returns)]
+            return float(returns.std(ddof=1) * 100) if len(returns) > 1 else NAN
+        return self._cached(('volatility', period), compute)
+
+
+class IndicatorCache:
+    """캔들 1벌당 IndicatorBundle 1개 (LRU)"""
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Args:
+            max_entries: 최대 보관 묶음 수 (초과 시 가장 오래 사용 안 된 묶음 제거)
+        """
+        self.max_entries = max_entries
+        self._bundles: 'OrderedDict[Tuple, IndicatorBundle]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(df: pd.DataFrame, ticker: Optional[str] = None) -> Tuple:
+        """
+        캐시 키: (ticker, 봉 개수, 첫 봉 시각, 마지막 봉 시각, 마지막 봉 종가/거래량)
+
+        진행 중인 마지막 봉은 시각이 같아도 값이 바뀌므로 종가/거래량까지 포함
+        """
+        return (ticker, len(df), df.index[0], df.index[-1],
+                float(df['close'].iat[-1]), float(df['volume'].iat[-1]))
+
+    def get(self, df: pd.DataFrame, ticker: Optional[str] = None) -> Optional[IndicatorBundle]:
+        """
+        지표 묶음 조회 (없으면 생성)
+
+        Args:
+            df: OHLCV 데이터프레임
+            ticker: 코인 티커 (없으면 캔들 내용만으로 구분)
+
+        Returns:
+            IndicatorBundle (데이터가 없으면 None)
+        """
+        if df is None or df.empty:
+            return None
+        key = self.key(df, ticker)
+        with self._lock:
+            bundle = self._bundles.get(key)
+            if bundle is not None:
+                self._bundles.move_to_end(key)
+                self.hits += 1
+                return bundle
+
+        bundle = IndicatorBundle(df, ticker)
+        with self._lock:
+            self.misses += 1
+            self._bundles[key] = bundle
+            while len(self._bundles) > self.max_entries:
+                self._bundles.popitem(last=False)
+        return bundle
+
+    def clear(self):
+        with self._lock:
+            self._bundles.clear()
+
+    def get_stats(self) -> Dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._bundles),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total * 100 if total else 0.0,
+        }
+
+
+# 전역 인스턴스
+indicator_cache = IndicatorCache()
+
+
+def get_indicators(df: pd.DataFrame, ticker: Optional[str] = None) -> Optional[IndicatorBundle]:
+    """전역 캐시에서 지표 묶음 조회"""
+    return indicator_cache.get(df, ticker)
@@ -7,6 +7,8 @@ import pandas as pd
 import json
 from pathlib import Path
 
+from .indicator_bundle import get_indicators
+
 
 class MarketConditionAnalyzer:
     """시장 조건 분석 및 진입 조건 자동 조정"""
@@ -16,12 +18,13 @@ class MarketConditionAnalyzer:
         self.condition_history = []
         self.max_history = 100
     
-    def analyze_market(self, df: pd.DataFrame) -> Tuple[str, str, str]:
+    def analyze_market(self, df: pd.DataFrame, ticker: str = None) -> Tuple[str, str, str]:
         """
         시장 조건 분석
         
         Args:
             df: OHLCV 데이터프레임
+            ticker: 코인 티커 (지표 묶음 캐시 키)
         
         Returns:
             (시장 국면, 진입 조건, 한 줄 요약)
@@ -40,16 +43,10 @@ class MarketConditionAnalyzer:
             volume_prev = df['volume'].iloc[-20:-5].mean()
             volume_ratio = volume_current / volume_prev if volume_prev > 0 else 1.0
             
-            # 변동성
-            volatility = df['close'].pct_change().std() * 100
-            
-            # RSI 계산
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            current_rsi = rsi.iloc[-1]
+            # 변동성 / RSI (전략과 같은 캔들이면 공용 지표 묶음 재사용)
+            bundle = get_indicators(df, ticker)
+            volatility = bundle.volatility()
+            current_rsi = bundle.rsi(14)
             
             # 시장 국면 판단
             if price_change_1h > 2.0:
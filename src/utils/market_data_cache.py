@@ -0,0 +1,196 @@
+"""
+공유 시세 데이터 캐시 (TTL + LRU)
+- (endpoint, ticker, interval, count) 단위로 응답 캐싱
+- 데이터 종류별 TTL (현재가/호가는 짧게, 봉 데이터는 길게)
+- 최대 항목 수 초과 시 가장 오래 사용하지 않은 항목부터 제거
+- 주문 직전 조회 등은 bypass로 캐시를 건너뛰고 새 값으로 갱신
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# 데이터 종류별 기본 TTL (초)
+# 'ohlcv:<interval>' 키로 봉 간격별 TTL 지정 가능 (없으면 'ohlcv' 사용)
+DEFAULT_TTLS = {
+    'price': 1.0,
+    'orderbook': 1.0,
+    'trades': 1.0,
+    'ohlcv': 10.0,
+    'ohlcv:minute1': 5.0,
+    'ohlcv:minute60': 60.0,
+    'ohlcv:day': 300.0,
+}
+
+_MISSING = object()
+
+
+class MarketDataCache:
+    """시세 데이터 캐시 (스레드 안전)"""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 2000):
+        """
+        초기화
+
+        Args:
+            ttls: 데이터 종류별 TTL (초), DEFAULT_TTLS를 덮어씀
+            max_entries: 최대 보관 항목 수
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # {key: (만료시각, 값)}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(endpoint: str, ticker: str, interval: Optional[str] = None,
+                 count: Optional[int] = None) -> Tuple:
+        """캐시 키 생성"""
+        return (endpoint, ticker, interval, count)
+
+    def get_ttl(self, endpoint: str, interval: Optional[str] = None) -> float:
+        """
+        TTL 조회
+
+        Args:
+            endpoint: 데이터 종류 (price, orderbook, trades, ohlcv)
+            interval: 봉 간격 (ohlcv만 해당)
+
+        Returns:
+            TTL (초, 0 이하면 캐싱 안 함)
+        """
+        if interval:
+            ttl = self.ttls.get(f"{endpoint}:{interval}")
+            if ttl is not None:
+                return ttl
+        return self.ttls.get(endpoint, 0.0)
+
+    def get(self, endpoint: str, ticker: str, interval: Optional[str] = None,
+            count: Optional[int] = None, default: Any = None) -> Any:
+        """
+        캐시 조회 (만료된 항목은 제거)
+
+        Returns:
+            캐시 값 또는 default
+        """
+        key = self.make_key(endpoint, ticker, interval, count)
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, endpoint: str, ticker: str, value: Any, interval: Optional[str] = None,
+            count: Optional[int] = None):
+        """
+        캐시 저장 (None 값과 TTL 0 이하 종류는 저장하지 않음)
+        """
+        if value is None:
+            return
+        ttl = self.get_ttl(endpoint, interval)
+        if ttl <= 0:
+            return
+
+        key = self.make_key(endpoint, ticker, interval, count)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, endpoint: str, ticker: str, fetch: Callable[[], Any],
+                     interval: Optional[str] = None, count: Optional[int] = None,
+                     bypass: bool = False) -> Any:
+        """
+        캐시 조회 후 없으면 fetch()로 가져와 저장
+
+        Args:
+            endpoint: 데이터 종류
+            ticker: 코인 티커
+            fetch: 실제 조회 함수
+            interval: 봉 간격
+            count: 조회 개수
+            bypass: True면 캐시를 무시하고 새로 조회 (결과는 캐시에 갱신)
+
+        Returns:
+            조회 결과
+        """
+        key = self.make_key(endpoint, ticker, interval, count)
+
+        if bypass:
+            self.bypasses += 1
+        else:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = fetch()
+        self.set(endpoint, ticker, value, interval, count)
+        return value
+
+    def invalidate(self, ticker: Optional[str] = None, endpoint: Optional[str] = None):
+        """
+        캐시 무효화
+
+        Args:
+            ticker: 특정 티커만 (None이면 전체)
+            endpoint: 특정 데이터 종류만 (None이면 전체)
+        """
+        with self._lock:
+            if ticker is None and endpoint is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries.keys()):
+                if (ticker is None or key[1] == ticker) and (endpoint is None or key[0] == endpoint):
+                    del self._entries[key]
+
+    def clear(self):
+        """전체 캐시 및 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+        self.hits = self.misses = self.bypasses = self.evictions = 0
+
+    def get_stats(self) -> Dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+
+# 전역 인스턴스 (모든 UpbitAPI가 공유)
+market_data_cache = MarketDataCache()
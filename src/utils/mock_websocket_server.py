@@ -0,0 +1,197 @@
+"""
+로컬 모의 Upbit WebSocket 서버 (오프라인 테스트용)
+- Upbit 구독 요청 형식 처리
+- ticker / orderbook / trade 메시지를 구독 중인 클라이언트에 전송
+- 강제 연결 종료로 재연결 시나리오 재현
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+import websockets
+
+
+class MockUpbitWebSocketServer:
+    """모의 Upbit WebSocket 서버 (백그라운드 스레드)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 임의 포트)
+        """
+        self.host = host
+        self.port = port
+
+        self._clients = {}  # {websocket: {channel: set(codes)}}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+        # 수신한 구독 요청 기록
+        self.subscriptions = []
+        self.connection_count = 0
+
+    @property
+    def uri(self) -> str:
+        """클라이언트 접속 주소"""
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 5.0):
+        """서버 시작"""
+        self._thread = threading.Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("모의 WebSocket 서버 시작 실패")
+
+    def stop(self):
+        """서버 중지"""
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        try:
+            future.result(timeout=5)
+        except Exception:
+            pass
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    # ==================== 메시지 발행 ====================
+
+    def publish_ticker(self, market: str, price: float, **fields):
+        """ticker 메시지 발행"""
+        msg = {
+            'type': 'ticker',
+            'code': market,
+            'trade_price': price,
+            'timestamp': int(time.time() * 1000),
+            'stream_type': 'REALTIME',
+        }
+        msg.update(fields)
+        self._broadcast('ticker', market, msg)
+
+    def publish_orderbook(self, market: str, units: List[Dict], **fields):
+        """
+        orderbook 메시지 발행
+
+        Args:
+            units: [{'ask_price', 'bid_price', 'ask_size', 'bid_size'}, ...]
+        """
+        msg = {
+            'type': 'orderbook',
+            'code': market,
+            'timestamp': int(time.time() * 1000),
+            'total_ask_size': sum(u.get('ask_size', 0) for u in units),
+            'total_bid_size': sum(u.get('bid_size', 0) for u in units),
+            'orderbook_units': units,
+            'stream_type': 'REALTIME',
+        }
+        msg.update(fields)
+        self._broadcast('orderbook', market, msg)
+
+    def publish_trade(self, market: str, price: float, volume: float,
+                      ask_bid: str = 'BID', sequential_id: Optional[int] = None, **fields):
+        """trade 메시지 발행"""
+        now = time.time()
+        msg = {
+            'type': 'trade',
+            'code': market,
+            'trade_price': price,
+            'trade_volume': volume,
+            'ask_bid': ask_bid,
+            'trade_date': time.strftime('%Y-%m-%d', time.gmtime(now)),
+            'trade_time': time.strftime('%H:%M:%S', time.gmtime(now)),
+            'trade_timestamp': int(now * 1000),
+            'timestamp': int(now * 1000),
+            'sequential_id': sequential_id if sequential_id is not None else int(now * 1e6),
+            'stream_type': 'REALTIME',
+        }
+        msg.update(fields)
+        self._broadcast('trade', market, msg)
+
+    def disconnect_all(self):
+        """모든 클라이언트 연결 강제 종료 (재연결 테스트용)"""
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._close_clients(), self._loop)
+        future.result(timeout=5)
+
+    def client_count(self) -> int:
+        """접속 중인 클라이언트 수"""
+        with self._lock:
+            return len(self._clients)
+
+    # ==================== 내부 ====================
+
+    def _broadcast(self, channel: str, market: str, msg: Dict):
+        if self._loop is None:
+            return
+        payload = json.dumps(msg).encode('utf-8')  # Upbit는 바이너리 프레임으로 전송
+        with self._lock:
+            targets = [ws for ws, subs in self._clients.items()
+                       if market in subs.get(channel, ())]
+        for ws in targets:
+            asyncio.run_coroutine_threadsafe(self._safe_send(ws, payload), self._loop)
+
+    @staticmethod
+    async def _safe_send(ws, payload):
+        try:
+            await ws.send(payload)
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _handler(self, ws):
+        self.connection_count += 1
+        with self._lock:
+            self._clients[ws] = {}
+        try:
+            async for raw in ws:
+                try:
+                    request = json.loads(raw)
+                except ValueError:
+                    continue
+                subs = {}
+                for item in request:
+                    if isinstance(item, dict) and 'type' in item:
+                        subs[item['type']] = set(item.get('codes', []))
+                self.subscriptions.append(subs)
+                with self._lock:
+                    self._clients[ws] = subs
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            with self._lock:
+                self._clients.pop(ws, None)
+
+    async def _close_clients(self):
+        with self._lock:
+            clients = list(self._clients.keys())
+        for ws in clients:
+            await ws.close()
+
+    async def _shutdown(self):
+        await self._close_clients()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._stop_event.set()
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+
+    async def _serve(self):
+        self._stop_event = asyncio.Event()
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        await self._stop_event.wait()
@@ -88,9 +88,6 @@ class OrderbookMonitor:
                         # 패턴 학습
                         self._learn_pattern(ticker, analysis)
                 
-                # API 제한 고려 (0.2초 대기)
-                time.sleep(0.2)
-                
             except Exception as e:
                 self.logger.log_error("ORDERBOOK_MONITOR", f"배치 조회 실패: {batch}", e)
         
@@ -0,0 +1,152 @@
+"""
+가격 트리거 인덱스
+- 포지션별 청산 조건을 절대 가격 레벨로 미리 계산해 티커별 정렬 리스트에 보관
+  (손절/익절, 트레일링 스탑, 최고가 갱신, 분할 매도 레벨 등)
+- 현재가가 들어오면 bisect로 넘은 레벨만 찾음 (레벨 수 n에 대해 O(log n))
+- 어떤 레벨도 넘지 않으면 비싼 분석(지표 조회, 10가지 청산 조건)을 건너뜀
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+BELOW = 'below'  # 가격 ≤ 레벨이면 발동 (손절, 트레일링 스탑)
+ABOVE = 'above'  # 가격 ≥ 레벨이면 발동 (익절, 분할 매도, 최고가 갱신)
+
+
+@dataclass
+class Trigger:
+    """발동한 가격 레벨"""
+    ticker: str
+    key: str
+    price: float
+    direction: str
+
+
+class _TickerLevels:
+    """티커 1개의 레벨 (방향별 (가격, 키) 정렬 리스트)"""
+
+    __slots__ = ('below', 'above', 'index')
+
+    def __init__(self):
+        self.below: List[Tuple[float, str]] = []
+        self.above: List[Tuple[float, str]] = []
+        self.index: Dict[str, Tuple[float, str]] = {}  # key → (price, direction)
+
+    def remove(self, key: str):
+        entry = self.index.pop(key, None)
+        if entry is None:
+            return
+        price, direction = entry
+        levels = self.below if direction == BELOW else self.above
+        i = bisect_left(levels, (price, key))
+        if i < len(levels) and levels[i] == (price, key):
+            del levels[i]
+
+
+class PriceTriggerIndex:
+    """티커별 가격 레벨 정렬 인덱스 (스레드 안전)"""
+
+    def __init__(self):
+        self._levels: Dict[str, _TickerLevels] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.checks = 0
+        self.fired = 0
+
+    def set_level(self, ticker: str, key: str, price: Optional[float], direction: str):
+        """
+        레벨 등록/교체 (price가 None이면 제거)
+
+        Args:
+            ticker: 코인 티커
+            key: 레벨 이름 (예: 'stop', 'take_profit', 'trailing')
+            price: 절대 가격
+            direction: BELOW(가격 ≤ 레벨) 또는 ABOVE(가격 ≥ 레벨)
+        """
+        if direction not in (BELOW, ABOVE):
+            raise ValueError(f"알 수 없는 트리거 방향: {direction}")
+        with self._lock:
+            levels = self._levels.setdefault(ticker, _TickerLevels())
+            levels.remove(key)
+            if price is None or price <= 0:
+                return
+            insort(levels.below if direction == BELOW else levels.above, (float(price), key))
+            levels.index[key] = (float(price), direction)
+
+    def set_levels(self, ticker: str, levels: Dict[str, Tuple[Optional[float], str]]):
+        """
+        티커 레벨 전체 교체
+
+        Args:
+            ticker: 코인 티커
+            levels: {key: (price, direction)} - price가 None인 레벨은 제외
+        """
+        with self._lock:
+            self._levels.pop(ticker, None)
+        for key, (price, direction) in levels.items():
+            self.set_level(ticker, key, price, direction)
+
+    def remove_level(self, ticker: str, key: str):
+        with self._lock:
+            levels = self._levels.get(ticker)
+            if levels:
+                levels.remove(key)
+
+    def clear(self, ticker: str):
+        """티커 레벨 전체 제거"""
+        with self._lock:
+            self._levels.pop(ticker, None)
+
+    def retain(self, tickers: Iterable[str]):
+        """주어진 티커 외의 레벨 제거 (청산된 포지션 정리)"""
+        keep = set(tickers)
+        with self._lock:
+            for ticker in [t for t in self._levels if t not in keep]:
+                del self._levels[ticker]
+
+    def has(self, ticker: str) -> bool:
+        return ticker in self._levels
+
+    def check(self, ticker: str, price: float) -> List[Trigger]:
+        """
+        현재가로 넘은 레벨 조회 (레벨은 유지, 갱신/제거는 호출 측에서)
+
+        Args:
+            ticker: 코인 티커
+            price: 현재가
+
+        Returns:
+            발동한 레벨 리스트 (BELOW는 높은 레벨부터, ABOVE는 낮은 레벨부터)
+        """
+        with self._lock:
+            self.checks += 1
+            levels = self._levels.get(ticker)
+            if levels is None:
+                return []
+            # BELOW: 레벨 ≥ 가격, ABOVE: 레벨 ≤ 가격
+            below = levels.below[bisect_left(levels.below, (price, '')):]
+            above = levels.above[:bisect_right(levels.above, (price, '\uffff'))]
+            triggers = [Trigger(ticker, key, level, BELOW) for level, key in reversed(below)]
+            triggers += [Trigger(ticker, key, level, ABOVE) for level, key in above]
+            self.fired += len(triggers)
+        return triggers
+
+    def get_levels(self, ticker: str) -> Dict[str, Tuple[float, str]]:
+        """티커 레벨 조회 {key: (price, direction)}"""
+        with self._lock:
+            levels = self._levels.get(ticker)
+            return dict(levels.index) if levels else {}
+
+    def get_stats(self) -> Dict:
+        """인덱스 통계"""
+        with self._lock:
+            return {
+                'tickers': len(self._levels),
+                'levels': sum(len(levels.index) for levels in self._levels.values()),
+                'checks': self.checks,
+                'fired': self.fired,
+            }
@@ -0,0 +1,249 @@
+"""
+Upbit 요청 한도 스케줄러
+- 엔드포인트 그룹별 토큰 버킷 (초당 요청 수)
+- 응답 헤더 Remaining-Req로 남은 한도 보정
+- 우선순위 레인: 주문 > 포지션 체크 > 급등 스캔 > 백그라운드
+  (낮은 우선순위는 여유 토큰을 남겨두고 사용, 높은 우선순위 대기 중이면 양보)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Optional
+
+
+class Priority(IntEnum):
+    """요청 우선순위 (작을수록 먼저)"""
+    ORDER = 0       # 주문/취소
+    POSITION = 1    # 보유 포지션 시세 확인 (청산 판단)
+    SURGE = 2       # 급등/급락 스캔
+    BACKGROUND = 3  # 전체 스캔, 코인 순위 등
+
+
+# 그룹별 초당 한도 (Upbit 공개 문서 기준)
+DEFAULT_GROUP_LIMITS = {
+    'market': 10,
+    'candles': 10,
+    'ticker': 10,
+    'orderbook': 10,
+    'trades': 10,
+    'order': 8,
+    'default': 30,
+}
+
+# Remaining-Req 헤더의 그룹 이름 → 내부 그룹 이름
+GROUP_ALIASES = {
+    'candle': 'candles',
+    'trade': 'trades',
+    'crix-trades': 'trades',
+}
+
+# 우선순위별로 남겨둘 토큰 수 (버킷 용량 대비 비율)
+# 백그라운드 요청은 버킷의 절반 이상이 남아 있을 때만 사용
+DEFAULT_RESERVE_RATIOS = {
+    Priority.ORDER: 0.0,
+    Priority.POSITION: 0.0,
+    Priority.SURGE: 0.2,
+    Priority.BACKGROUND: 0.5,
+}
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def wait_time(self, needed: float) -> float:
+        """needed개 이상이 될 때까지 남은 시간 (초)"""
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """그룹별 토큰 버킷 + 우선순위 레인 (스레드 안전)"""
+
+    def __init__(self, group_limits: Optional[Dict[str, float]] = None,
+                 reserve_ratios: Optional[Dict[Priority, float]] = None):
+        """
+        초기화
+
+        Args:
+            group_limits: 그룹별 초당 한도 (DEFAULT_GROUP_LIMITS를 덮어씀)
+            reserve_ratios: 우선순위별 예약 비율 (DEFAULT_RESERVE_RATIOS를 덮어씀)
+        """
+        self.group_limits = dict(DEFAULT_GROUP_LIMITS)
+        if group_limits:
+            self.group_limits.update(group_limits)
+        self.reserve_ratios = dict(DEFAULT_RESERVE_RATIOS)
+        if reserve_ratios:
+            self.reserve_ratios.update(reserve_ratios)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waiting: Dict[str, Dict[Priority, int]] = {}
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+        # 통계
+        self.acquired = {p: 0 for p in Priority}
+        self.wait_seconds = {p: 0.0 for p in Priority}
+        self.throttled = 0  # 서버 한도 보정으로 토큰을 줄인 횟수
+
+    # ==================== 우선순위 컨텍스트 ====================
+
+    @property
+    def current_priority(self) -> Priority:
+        """현재 스레드의 기본 우선순위"""
+        return getattr(self._local, 'priority', Priority.BACKGROUND)
+
+    @contextmanager
+    def priority(self, priority: Priority):
+        """
+        블록 안의 요청 우선순위 지정
+
+        Example:
+            with rate_limiter.priority(Priority.POSITION):
+                price = api.get_current_price(ticker)
+        """
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self._local.priority
+            else:
+                self._local.priority = previous
+
+    # ==================== 토큰 ====================
+
+    def acquire(self, group: str, priority: Optional[Priority] = None,
+                timeout: Optional[float] = None) -> bool:
+        """
+        요청 1회 허가 대기
+
+        Args:
+            group: 엔드포인트 그룹 (ticker, candles, orderbook, trades, order 등)
+            priority: 우선순위 (None이면 현재 컨텍스트 우선순위)
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            허가 여부 (timeout 초과 시 False)
+        """
+        if priority is None:
+            priority = self.current_priority
+
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+
+        group = GROUP_ALIASES.get(group, group)
+        with self._cond:
+            bucket = self._get_bucket(group)
+            waiting = self._waiting.setdefault(group, {p: 0 for p in Priority})
+            waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+
+                    needed = 1.0 + bucket.capacity * self.reserve_ratios.get(priority, 0.0)
+                    yield_to_higher = any(waiting[p] for p in Priority if p < priority)
+
+                    if not yield_to_higher and bucket.tokens >= needed:
+                        bucket.tokens -= 1.0
+                        self.acquired[priority] += 1
+                        self.wait_seconds[priority] += now - start
+                        return True
+
+                    wait = bucket.wait_time(needed) if not yield_to_higher else 1.0 / bucket.rate
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._cond.wait(max(wait, 0.001))
+            finally:
+                waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def update_from_header(self, header: Optional[str]):
+        """
+        응답 헤더로 남은 한도 보정
+
+        Args:
+            header: Remaining-Req 값 (예: "group=ticker; min=599; sec=9")
+        """
+        limit = self.parse_remaining_req(header)
+        if not limit:
+            return
+        self.update_remaining(limit['group'], limit.get('sec'))
+
+    def update_remaining(self, group: str, sec_remaining: Optional[int]):
+        """
+        서버가 알려준 남은 초당 요청 수 반영
+
+        서버 기준 남은 한도가 로컬 추정보다 적으면 토큰을 줄임
+        (다른 프로세스/수동 호출과 한도를 공유하는 경우 대비)
+        """
+        if sec_remaining is None:
+            return
+        with self._cond:
+            bucket = self._get_bucket(group)
+            bucket.refill(time.monotonic())
+            if sec_remaining < bucket.tokens:
+                bucket.tokens = float(sec_remaining)
+                self.throttled += 1
+
+    @staticmethod
+    def parse_remaining_req(header: Optional[str]) -> Optional[Dict]:
+        """
+        Remaining-Req 헤더 파싱
+
+        Returns:
+            {'group': str, 'min': int, 'sec': int} 또는 None
+        """
+        if not header:
+            return None
+        result = {}
+        for part in header.split(';'):
+            if '=' not in part:
+                continue
+            key, value = part.split('=', 1)
+            key, value = key.strip(), value.strip()
+            result[key] = value if key == 'group' else int(value) if value.isdigit() else None
+        return result if 'group' in result else None
+
+    def get_stats(self) -> Dict:
+        """우선순위별 허가 횟수와 평균 대기 시간"""
+        return {
+            'acquired': {p.name: self.acquired[p] for p in Priority},
+            'avg_wait_ms': {
+                p.name: (self.wait_seconds[p] / self.acquired[p] * 1000) if self.acquired[p] else 0.0
+                for p in Priority
+            },
+            'throttled': self.throttled,
+        }
+
+    def _get_bucket(self, group: str) -> TokenBucket:
+        group = GROUP_ALIASES.get(group, group)
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            rate = self.group_limits.get(group, self.group_limits['default'])
+            bucket = TokenBucket(rate)
+            self._buckets[group] = bucket
+        return bucket
+
+
+# 전역 인스턴스 (모든 API 호출이 공유)
+rate_limiter = RateLimiter()
@@ -0,0 +1,236 @@
+"""
+HTTP 요청 기록/재생
+- 기록: 모든 요청과 응답(상태, 본문, Remaining-Req, 지연 시간)을 gzip JSONL로 저장
+- 재생: 기록된 응답을 같은 요청 순서대로 반환 (네트워크/API 키 불필요)
+  (호출마다 바뀌는 파라미터 - pyupbit get_ohlcv의 현재 시각 `to` - 는 키에서 빼고 기록 순서로 매칭)
+- 재생 속도: 응답별 기록 지연 시간만 재현 (1.0이면 그대로, 10.0이면 10배 빠르게, 0이면 대기 없음)
+  요청 사이 간격은 재현하지 않음 - 호출 시점은 재생 중인 봇의 실행 흐름이 결정
+
+사용 예:
+    http_transport.set_interceptor(HttpRecorder('sessions/2024-01-01.jsonl.gz'))
+    http_transport.set_interceptor(HttpReplayer('sessions/2024-01-01.jsonl.gz', speed=0))
+"""
+
+import gzip
+import json
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Callable, Dict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# 기록할 응답 헤더
+RECORDED_HEADERS = ('Content-Type', 'Remaining-Req')
+
+# 호출마다 값이 바뀌어 키에서 제외하는 파라미터 (get_ohlcv는 to=현재 UTC 시각을 항상 보냄)
+VOLATILE_PARAMS = ('to',)
+
+# URL에 포함된 비밀값 가리기 (텔레그램 봇 토큰 등)
+_SECRET_PATTERNS = [
+    (re.compile(r'/bot[^/]+/'), '/bot<redacted>/'),
+]
+
+
+def redact_url(url: str) -> str:
+    """URL의 비밀값 제거"""
+    for pattern, replacement in _SECRET_PATTERNS:
+        url = pattern.sub(replacement, url)
+    return url
+
+
+def request_key(method: str, url: str, kwargs: Dict) -> str:
+    """
+    요청 식별 키 (메서드 + URL + 파라미터 + 본문)
+
+    인증 헤더(JWT, 매번 다른 nonce 포함)와 VOLATILE_PARAMS는 키에서 제외
+    """
+    params = kwargs.get('params')
+    if isinstance(params, dict):
+        params = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+    body = kwargs.get('json', kwargs.get('data'))
+    if isinstance(body, (bytes, bytearray)):
+        body = body.decode('utf-8', 'replace')
+    return json.dumps([method.upper(), redact_url(url), params, body],
+                      sort_keys=True, ensure_ascii=False, default=str)
+
+
+class HttpRecorder:
+    """실제 요청을 보내고 요청/응답을 기록"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 기록 파일 경로 (.jsonl.gz)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.path, 'at', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self.recorded = 0
+
+    def handle(self, method: str, url: str, kwargs: Dict, send: Callable[[], requests.Response]):
+        """요청 실행 후 기록"""
+        started = time.time()
+        entry = {
+            't': round(started - self._start, 6),  # 세션 시작 기준 요청 시각 (분석용, 재생 시 사용 안 함)
+            'ts': started,
+            'key': request_key(method, url, kwargs),
+        }
+
+        try:
+            response = send()
+        except requests.RequestException as e:
+            entry['latency'] = round(time.time() - started, 6)
+            entry['error'] = type(e).__name__
+            self._write(entry)
+            raise
+
+        entry['latency'] = round(time.time() - started, 6)
+        entry['status'] = response.status_code
+        entry['headers'] = {h: response.headers[h] for h in RECORDED_HEADERS if h in response.headers}
+        entry['body'] = response.text
+        self._write(entry)
+        return response
+
+    def close(self):
+        """기록 파일 닫기"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _write(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.recorded += 1
+
+
+class ReplayMissError(requests.ConnectionError):
+    """재생 기록에 없는 요청"""
+
+
+class HttpReplayer:
+    """기록된 응답 반환 (네트워크 미사용)"""
+
+    # 기록된 예외 이름 → 재생 시 발생시킬 예외
+    _ERRORS = {
+        'ConnectTimeout': requests.exceptions.ConnectTimeout,
+        'ReadTimeout': requests.exceptions.ReadTimeout,
+        'Timeout': requests.Timeout,
+    }
+
+    def __init__(self, path: str, speed: float = 1.0, strict: bool = False):
+        """
+        Args:
+            path: 기록 파일 경로
+            speed: 기록된 응답 지연 시간 배율 (0이면 지연 없이 즉시 응답, 요청 사이 간격은 재현 안 함)
+            strict: True면 기록보다 많이 호출된 요청에 ReplayMissError,
+                    False면 해당 요청의 마지막 응답을 반복
+        """
+        self.path = Path(path)
+        self.speed = speed
+        self.strict = strict
+
+        self._queues: Dict[str, deque] = defaultdict(deque)
+        self._last: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        self.replayed = 0
+        self.repeated = 0
+        self.misses = 0
+        self.total = self._load()
+
+    def handle(self, method: str, url: str, kwargs: Dict, send=None):
+        """기록된 응답 반환 (send는 호출하지 않음)"""
+        key = request_key(method, url, kwargs)
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+                self.replayed += 1
+            elif key in self._last and not self.strict:
+                entry = self._last[key]
+                self.repeated += 1
+            else:
+                self.misses += 1
+                entry = None
+
+        if entry is None:
+            raise ReplayMissError(f"재생 기록 없음: {method} {redact_url(url)}")
+
+        if self.speed and entry.get('latency'):
+            time.sleep(entry['latency'] / self.speed)
+
+        if 'error' in entry:
+            raise self._ERRORS.get(entry['error'], requests.ConnectionError)(
+                f"재생된 오류: {entry['error']}")
+
+        return self._build_response(entry, url)
+
+    def remaining(self) -> int:
+        """아직 재생하지 않은 응답 수"""
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+    def get_stats(self) -> Dict:
+        """재생 통계"""
+        return {
+            'total': self.total,
+            'replayed': self.replayed,
+            'repeated': self.repeated,
+            'misses': self.misses,
+            'remaining': self.remaining(),
+        }
+
+    def _load(self) -> int:
+        count = 0
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 기록 중단으로 잘린 마지막 줄
+                self._queues[entry['key']].append(entry)
+                count += 1
+        return count
+
+    @staticmethod
+    def _build_response(entry: Dict, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry.get('status', 200)
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response._content = entry.get('body', '').encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        return response
+
+
+def create_interceptor(mode: str, path: str, speed: float = 1.0):
+    """
+    설정값으로 기록/재생 객체 생성
+
+    Args:
+        mode: live(기록/재생 안 함), record, replay
+        path: 기록 파일 경로
+        speed: 재생 속도 배율
+
+    Returns:
+        HttpRecorder / HttpReplayer / None
+    """
+    if mode == 'record':
+        return HttpRecorder(path)
+    if mode == 'replay':
+        return HttpReplayer(path, speed=speed)
+    return None
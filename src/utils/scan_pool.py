@@ -0,0 +1,110 @@
+"""
+전체 스캔용 제한 워커 풀
+- 고정 개수 스레드에서 티커 분석(시세 조회 + 신호 계산)을 동시에 실행 → 네트워크 대기를 겹침
+- 제출은 워커 수의 2배까지만 유지 (대기열 무한 증가 방지, 중단 시 남은 작업 취소)
+- 요청 한도는 워커 안에서 rate_limiter가 중앙 관리 (sleep으로 간격 조절하지 않음)
+- 완료 순서대로 결과를 돌려주고, 완료가 없으면 None을 돌려줘 호출 측(스케줄러 작업)이 양보
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .rate_limiter import Priority, rate_limiter
+
+
+class ScanPool:
+    """제한 워커 풀 (완료 순서 결과 + 양보 지점)"""
+
+    def __init__(self, max_workers: int = 8, priority: Priority = Priority.BACKGROUND,
+                 name: str = 'scan'):
+        """
+        초기화
+
+        Args:
+            max_workers: 동시 실행 스레드 수
+            priority: 워커 요청 우선순위 (rate_limiter 레인)
+            name: 스레드 이름 접두사
+        """
+        self.max_workers = max(1, max_workers)
+        self.priority = priority
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+
+        # 통계
+        self.tasks = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.max_in_flight = 0
+        self.last_duration = 0.0
+
+    def _call(self, func: Callable, item: Any):
+        with rate_limiter.priority(self.priority):
+            return func(*item) if isinstance(item, tuple) else func(item)
+
+    def map_unordered(self, func: Callable, items: Iterable, poll: float = 0.2
+                      ) -> Iterator[Optional[Tuple[Any, Any, Optional[Exception]]]]:
+        """
+        items를 워커에서 실행하고 완료 순서대로 결과 반환
+
+        Args:
+            func: 실행 함수 (item이 튜플이면 func(*item))
+            items: 작업 목록
+            poll: 완료 대기 최대 시간 (초) - 이 시간 안에 완료가 없으면 None 반환
+
+        Yields:
+            (item, 결과, 예외) 또는 None (완료 없음 → 호출 측 양보 지점)
+        """
+        pending_items = iter(items)
+        in_flight: Dict = {}
+        limit = self.max_workers * 2
+        started = time.monotonic()
+
+        def fill():
+            while len(in_flight) < limit:
+                item = next(pending_items, StopIteration)
+                if item is StopIteration:
+                    return
+                in_flight[self._executor.submit(self._call, func, item)] = item
+                with self._lock:
+                    self.tasks += 1
+                    self.max_in_flight = max(self.max_in_flight, len(in_flight))
+
+        try:
+            fill()
+            while in_flight:
+                done, _ = wait(in_flight, timeout=poll, return_when=FIRST_COMPLETED)
+                if not done:
+                    yield None
+                    continue
+                for future in done:
+                    item = in_flight.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        with self._lock:
+                            self.errors += 1
+                    yield item, (None if error else future.result()), error
+                fill()
+        finally:
+            # 중단(제너레이터 close) 시 아직 시작 안 한 작업 취소
+            for future in in_flight:
+                if future.cancel():
+                    with self._lock:
+                        self.cancelled += 1
+            self.last_duration = time.monotonic() - started
+
+    def shutdown(self, wait_running: bool = False):
+        """풀 종료 (대기 중 작업 취소)"""
+        self._executor.shutdown(wait=wait_running, cancel_futures=True)
+
+    def get_stats(self) -> Dict:
+        """풀 통계"""
+        return {
+            'max_workers': self.max_workers,
+            'tasks': self.tasks,
+            'errors': self.errors,
+            'cancelled': self.cancelled,
+            'max_in_flight': self.max_in_flight,
+            'last_duration': self.last_duration,
+        }
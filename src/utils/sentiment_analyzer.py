@@ -3,11 +3,12 @@
 암호화폐 관련 뉴스와 시장 감정 분석
 """
 
-import requests
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import re
 
+from .http_session import http_transport
+
 
 class SentimentAnalyzer:
     """감정 분석 클래스"""
@@ -45,7 +46,7 @@ class SentimentAnalyzer:
         """
         try:
             url = "https://api.upbit.com/v1/notices"
-            response = requests.get(url, timeout=10)
+            response = http_transport.get(url)
             
             if response.status_code == 200:
                 notices = response.json()
@@ -0,0 +1,699 @@
+"""
+시뮬레이션 거래소 (모의투자/백테스트용 체결 엔진)
+- pyupbit.Upbit과 같은 주문/계좌 메서드 → UpbitAPI.upbit 자리에 연결하면
+  지정가/IOC/최유리 주문과 Fallback 로직이 실거래와 같은 경로로 실행됨
+- 호가창 공급원: 기록된 호가 스냅샷 또는 캔들 기반 합성 호가
+- 즉시 체결분은 호가 잔량을 소진하며 체결 (잔량 부족 시 부분 체결)
+- 미체결 지정가는 같은 가격 대기열 뒤에서 시작 → 이후 스냅샷의 잔량 감소/가격 돌파로 체결
+- 호가 단위, 최소 주문 금액, 수수료(0.05%), 주문 지연 반영
+- 실행 비용 통계: 주문 도착 시점 중간가 대비 평균 체결가
+"""
+
+import gzip
+import json
+import threading
+import time
+import uuid as uuid_lib
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .candle_archive import KST_OFFSET_NS, now_kst_ns
+from .candle_store import OHLCV_COLUMNS, interval_seconds
+
+
+# Upbit KRW 마켓 수수료 (매수/매도 각각)
+FEE_RATE = 0.0005
+
+# 최소 주문 금액 (KRW)
+MIN_ORDER_KRW = 5000
+
+# 잔량/금액 비교 허용 오차
+_EPS = 1e-9
+
+
+class SimulatedOrderError(Exception):
+    """주문 거부 (잔고 부족, 호가 단위 위반, 최소 주문 금액 미달 등)"""
+    pass
+
+
+def tick_size(price: float) -> float:
+    """호가 단위 (UpbitAPI.adjust_price_to_tick과 같은 기준)"""
+    if price >= 1000000:
+        return 1000
+    if price >= 500000:
+        return 500
+    if price >= 100000:
+        return 100
+    if price >= 10000:
+        return 50
+    if price >= 1000:
+        return 10
+    if price >= 100:
+        return 5
+    if price >= 10:
+        return 1
+    return 0.1
+
+
+def _to_ns(ts) -> int:
+    """시각 → KST ns (정수는 그대로)"""
+    if isinstance(ts, (int, np.integer)):
+        return int(ts)
+    return pd.Timestamp(ts).value
+
+
+def _fmt(value: Optional[float]) -> Optional[str]:
+    """Upbit 응답과 같은 문자열 숫자"""
+    return None if value is None else format(float(value), '.16g')
+
+
+class ReplayClock:
+    """과거 시점부터 흐르는 시계 (모의투자 재생용, speed배 속도)"""
+
+    def __init__(self, start, speed: float = 1.0):
+        self.start_ns = _to_ns(start)
+        self.speed = speed
+        self._origin = time.monotonic_ns()
+
+    def __call__(self) -> int:
+        return self.start_ns + int((time.monotonic_ns() - self._origin) * self.speed)
+
+
+# ==================== 호가 공급원 ====================
+
+class OrderbookFeed:
+    """호가 스냅샷 공급원 (티커별 시각 오름차순, 시각은 KST ns)"""
+
+    def __init__(self, candles: Optional[Dict[str, pd.DataFrame]] = None, candle_interval: str = 'minute1'):
+        """
+        Args:
+            candles: {ticker: OHLCV DataFrame} (get_ohlcv 제공용, 없으면 캔들 조회 불가)
+            candle_interval: candles의 봉 간격
+        """
+        self.candles = candles or {}
+        self.candle_interval = candle_interval
+
+    def tickers(self) -> List[str]:
+        raise NotImplementedError
+
+    def times(self, ticker: str) -> np.ndarray:
+        raise NotImplementedError
+
+    def book(self, ticker: str, i: int) -> Dict:
+        raise NotImplementedError
+
+    def orderbook(self, ticker: str, ts) -> Optional[Dict]:
+        """ts 시점의 최신 호가 (pyupbit.get_orderbook 형식)"""
+        i = self._index(ticker, ts)
+        return None if i is None else self.book(ticker, i)
+
+    def snapshot_time(self, ticker: str, ts) -> Optional[int]:
+        """ts 시점 최신 스냅샷의 시각"""
+        i = self._index(ticker, ts)
+        return None if i is None else int(self.times(ticker)[i])
+
+    def snapshots(self, ticker: str, after, until) -> Iterator[Tuple[int, Dict]]:
+        """(after, until] 구간 스냅샷"""
+        times = self.times(ticker)
+        lo = np.searchsorted(times, _to_ns(after), side='right')
+        hi = np.searchsorted(times, _to_ns(until), side='right')
+        for i in range(lo, hi):
+            yield int(times[i]), self.book(ticker, i)
+
+    def price(self, ticker: str, ts) -> Optional[float]:
+        """현재가 (기본: 중간가)"""
+        book = self.orderbook(ticker, ts)
+        if not book:
+            return None
+        top = book['orderbook_units'][0]
+        return (top['ask_price'] + top['bid_price']) / 2
+
+    def ohlcv(self, ticker: str, interval: str, count: int, ts) -> Optional[pd.DataFrame]:
+        """ts 이전에 마감된 봉 count개 (candles 간격보다 긴 간격은 재집계)"""
+        df = self.candles.get(ticker)
+        base = interval_seconds(self.candle_interval)
+        step = interval_seconds(interval)
+        if df is None or base is None or step is None or step % base:
+            return None
+
+        end = _to_ns(ts) - base * 10**9
+        df = df[df.index.as_unit('ns').asi8 <= end]
+        if step != base:
+            # Upbit 봉 경계는 UTC 기준 (KST 인덱스에서는 9시간 오프셋)
+            df = df.resample(f'{step}s', origin='epoch', offset='9h', label='left', closed='left').agg({
+                'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+                'volume': 'sum', 'value': 'sum',
+            }).dropna(subset=['close'])
+            # 마지막 봉이 아직 진행 중이면 제외
+            if len(df) and df.index[-1].value + step * 10**9 > _to_ns(ts):
+                df = df.iloc[:-1]
+        return df.iloc[-count:] if len(df) else None
+
+    def _index(self, ticker: str, ts) -> Optional[int]:
+        times = self.times(ticker)
+        if times is None or len(times) == 0:
+            return None
+        i = int(np.searchsorted(times, _to_ns(ts), side='right')) - 1
+        return i if i >= 0 else None
+
+
+class RecordedOrderbookFeed(OrderbookFeed):
+    """기록된 호가 스냅샷 (pyupbit/WebSocket 호가 형식, timestamp는 UTC ms)"""
+
+    def __init__(self, snapshots: Iterable[Dict], candles: Optional[Dict[str, pd.DataFrame]] = None,
+                 candle_interval: str = 'minute1'):
+        super().__init__(candles, candle_interval)
+        grouped: Dict[str, List[Dict]] = {}
+        for book in snapshots:
+            if book and book.get('orderbook_units'):
+                grouped.setdefault(book['market'], []).append(book)
+
+        self._books: Dict[str, List[Dict]] = {}
+        self._times: Dict[str, np.ndarray] = {}
+        for ticker, books in grouped.items():
+            books.sort(key=lambda b: b['timestamp'])
+            self._books[ticker] = books
+            self._times[ticker] = np.array([b['timestamp'] for b in books], dtype='int64') * 10**6 + KST_OFFSET_NS
+
+    @classmethod
+    def from_jsonl(cls, path: str, **kwargs) -> 'RecordedOrderbookFeed':
+        """JSONL (한 줄에 호가 1개, .gz 지원) 로드"""
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            snapshots = [json.loads(line) for line in f if line.strip()]
+        return cls(snapshots, **kwargs)
+
+    def tickers(self) -> List[str]:
+        return sorted(self._books)
+
+    def times(self, ticker: str) -> np.ndarray:
+        return self._times.get(ticker)
+
+    def book(self, ticker: str, i: int) -> Dict:
+        return self._books[ticker][i]
+
+
+class SyntheticOrderbookFeed(OrderbookFeed):
+    """
+    캔들 기반 합성 호가
+    - 봉마다 시가 → 저가/고가 → 고가/저가 → 종가 순서로 4개 스냅샷 (양봉은 저가 먼저)
+    - 가격 주변 호가 단위 간격으로 depth개 단계, 단계별 잔량은 level_value원 내외 (시드 고정 난수)
+    """
+
+    def __init__(self, candles: Dict[str, pd.DataFrame], candle_interval: str = 'minute1',
+                 spread_ticks: int = 1, depth: int = 15, level_value: float = 3_000_000, seed: int = 0):
+        """
+        Args:
+            candles: {ticker: OHLCV DataFrame (KST 인덱스)}
+            candle_interval: 봉 간격
+            spread_ticks: 매수/매도 1호가 간격 (호가 단위 수)
+            depth: 호가 단계 수
+            level_value: 단계별 평균 잔량 (KRW)
+            seed: 잔량 난수 시드
+        """
+        super().__init__({t: df[OHLCV_COLUMNS] for t, df in candles.items() if df is not None and len(df)},
+                         candle_interval)
+        self.spread_ticks = spread_ticks
+        self.depth = depth
+        self.level_value = level_value
+        self.seed = seed
+        self._paths: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def tickers(self) -> List[str]:
+        return sorted(self.candles)
+
+    def times(self, ticker: str) -> Optional[np.ndarray]:
+        path = self._path(ticker)
+        return None if path is None else path[0]
+
+    def price(self, ticker: str, ts) -> Optional[float]:
+        i = self._index(ticker, ts)
+        return None if i is None else float(self._path(ticker)[1][i])
+
+    def book(self, ticker: str, i: int) -> Dict:
+        times, prices = self._path(ticker)
+        price = float(prices[i])
+        tick = tick_size(price)
+        bid = np.floor(price / tick) * tick
+        ask = bid + self.spread_ticks * tick
+
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode()), i])
+        growth = 1 + 0.1 * np.arange(self.depth)
+        ask_sizes = self.level_value / price * (0.5 + rng.random(self.depth)) * growth
+        bid_sizes = self.level_value / price * (0.5 + rng.random(self.depth)) * growth
+
+        units = [{
+            'ask_price': round(ask + k * tick, 4),
+            'bid_price': round(bid - k * tick, 4),
+            'ask_size': float(ask_sizes[k]),
+            'bid_size': float(bid_sizes[k]),
+        } for k in range(self.depth)]
+        return {
+            'market': ticker,
+            'timestamp': int((times[i] - KST_OFFSET_NS) // 10**6),
+            'total_ask_size': float(ask_sizes.sum()),
+            'total_bid_size': float(bid_sizes.sum()),
+            'orderbook_units': units,
+        }
+
+    def _path(self, ticker: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        path = self._paths.get(ticker)
+        if path is None:
+            df = self.candles.get(ticker)
+            if df is None:
+                return None
+            step = interval_seconds(self.candle_interval) * 10**9
+            o, h, l, c = (df[col].to_numpy(dtype='float64') for col in ('open', 'high', 'low', 'close'))
+            up = c >= o
+            prices = np.stack([o, np.where(up, l, h), np.where(up, h, l), c], axis=1).ravel()
+            times = (df.index.as_unit('ns').asi8[:, None] + np.arange(4) * (step // 4)).ravel()
+            path = self._paths[ticker] = (times, prices)
+        return path
+
+
+# ==================== 거래소 ====================
+
+class SimulatedExchange:
+    """pyupbit.Upbit 호환 모의 거래소 (스레드 안전)"""
+
+    def __init__(self, feed: OrderbookFeed, balance: float = 1_000_000, fee: float = FEE_RATE,
+                 latency: float = 0.05, clock: Optional[Callable] = None,
+                 sleep: Optional[Callable[[float], None]] = time.sleep):
+        """
+        초기화
+
+        Args:
+            feed: 호가 공급원
+            balance: 초기 KRW 잔고
+            fee: 수수료율
+            latency: 주문 지연 (초, 주문은 지연 후 시점의 호가에 체결)
+            clock: 현재 시각 함수 (KST ns 또는 Timestamp, None이면 실제 시각)
+            sleep: 지연 대기 함수 (백테스트는 None → 대기 없이 시각만 앞당겨 체결)
+        """
+        self.feed = feed
+        self.fee = fee
+        self.latency = latency
+        self.clock = clock or now_kst_ns
+        self.sleep = sleep
+
+        self.accounts: Dict[str, Dict[str, float]] = {
+            'KRW': {'balance': float(balance), 'locked': 0.0, 'avg_buy_price': 0.0}
+        }
+        self.orders: Dict[str, Dict] = {}
+        self._open: Dict[str, Dict] = {}
+        # 스냅샷별 소진 잔량 (같은 호가 잔량을 여러 주문이 중복 사용하지 않도록)
+        self._consumed: Dict[Tuple[str, int], Dict[Tuple[str, float], float]] = {}
+        self._lock = threading.RLock()
+
+        self.stats = {
+            'orders': 0, 'rejected': 0, 'done': 0, 'partial': 0, 'canceled': 0,
+            'fees': 0.0, 'notional': 0.0, 'cost': 0.0,
+        }
+
+    def now(self) -> int:
+        """현재 시각 (KST ns)"""
+        return _to_ns(self.clock())
+
+    # ==================== 주문 (pyupbit.Upbit 호환) ====================
+
+    def buy_market_order(self, ticker: str, price: float) -> Optional[Dict]:
+        """시장가 매수 (price: 주문 금액 KRW)"""
+        return self._place(ticker, 'bid', 'price', price=float(price))
+
+    def sell_market_order(self, ticker: str, volume: float) -> Optional[Dict]:
+        """시장가 매도"""
+        return self._place(ticker, 'ask', 'market', volume=float(volume))
+
+    def buy_limit_order(self, ticker: str, price: float, volume: float) -> Optional[Dict]:
+        """지정가 매수"""
+        return self._place(ticker, 'bid', 'limit', price=float(price), volume=float(volume))
+
+    def sell_limit_order(self, ticker: str, price: float, volume: float) -> Optional[Dict]:
+        """지정가 매도"""
+        return self._place(ticker, 'ask', 'limit', price=float(price), volume=float(volume))
+
+    def cancel_order(self, uuid: str) -> Optional[Dict]:
+        """미체결 주문 취소 (체결 완료/없는 주문은 None)"""
+        with self._lock:
+            self._sync(self.now())
+            order = self._open.get(uuid)
+            if order is None:
+                return None
+            self._finish(order, 'cancel')
+            return self._view(order)
+
+    def get_order(self, uuid: str) -> Optional[Dict]:
+        """주문 조회 (체결 내역 포함)"""
+        with self._lock:
+            self._sync(self.now())
+            order = self.orders.get(uuid)
+            return self._view(order) if order else None
+
+    # ==================== 계좌 (pyupbit.Upbit 호환) ====================
+
+    def get_balances(self) -> List[Dict]:
+        """전체 잔고 (Upbit 계좌 응답 형식)"""
+        with self._lock:
+            self._sync(self.now())
+            return [{
+                'currency': currency,
+                'balance': _fmt(account['balance']),
+                'locked': _fmt(account['locked']),
+                'avg_buy_price': _fmt(account['avg_buy_price']),
+                'avg_buy_price_modified': False,
+                'unit_currency': 'KRW',
+            } for currency, account in self.accounts.items()
+                if currency == 'KRW' or account['balance'] + account['locked'] > 0]
+
+    def get_balance(self, ticker: str = 'KRW') -> float:
+        """주문 가능 잔고"""
+        with self._lock:
+            self._sync(self.now())
+            return self._account(self._currency(ticker))['balance']
+
+    def get_amount(self, ticker: str) -> float:
+        """매수 금액 (평균 매수가 × 보유량, 'ALL'이면 전체 합계)"""
+        with self._lock:
+            self._sync(self.now())
+            if ticker == 'ALL':
+                return sum(a['avg_buy_price'] * (a['balance'] + a['locked'])
+                           for c, a in self.accounts.items() if c != 'KRW')
+            account = self._account(self._currency(ticker))
+            return account['avg_buy_price'] * (account['balance'] + account['locked'])
+
+    def get_avg_buy_price(self, ticker: str) -> float:
+        """평균 매수가"""
+        with self._lock:
+            return self._account(self._currency(ticker))['avg_buy_price']
+
+    def get_execution_stats(self) -> Dict:
+        """
+        실행 비용 통계
+
+        Returns:
+            주문/체결/취소 수, 수수료 합계, 체결 금액,
+            avg_cost_bps: 도착 시점 중간가 대비 불리한 체결가 차이 (체결 금액 가중, bp)
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats['avg_cost_bps'] = stats['cost'] / stats['notional'] * 10000 if stats['notional'] else 0.0
+        return stats
+
+    # ==================== 내부 ====================
+
+    @staticmethod
+    def _currency(ticker: str) -> str:
+        return ticker.split('-')[1] if '-' in ticker else ticker
+
+    def _account(self, currency: str) -> Dict[str, float]:
+        return self.accounts.setdefault(currency, {'balance': 0.0, 'locked': 0.0, 'avg_buy_price': 0.0})
+
+    def _place(self, ticker: str, side: str, ord_type: str, price: Optional[float] = None,
+               volume: Optional[float] = None) -> Optional[Dict]:
+        with self._lock:
+            submitted = self.now()
+            self.stats['orders'] += 1
+            try:
+                order = self._reserve(ticker, side, ord_type, price, volume, submitted)
+            except SimulatedOrderError as e:
+                self.stats['rejected'] += 1
+                print(f"❌ 모의 주문 거부: {ticker}, {e}")
+                return None
+
+        # 주문 전송 지연 (백테스트는 대기 없이 도착 시각만 뒤로)
+        if self.sleep and self.latency > 0:
+            self.sleep(self.latency)
+
+        with self._lock:
+            arrival = submitted + int(self.latency * 1e9)
+            self._sync(arrival)  # 먼저 들어온 대기 주문 우선
+            book = self.feed.orderbook(ticker, arrival)
+            snapshot = self.feed.snapshot_time(ticker, arrival)
+            if book:
+                top = book['orderbook_units'][0]
+                order['arrival_mid'] = (top['ask_price'] + top['bid_price']) / 2
+                self._take(order, book, snapshot)
+
+            if order['remaining'] <= _EPS:
+                self._finish(order, 'done')
+            elif ord_type == 'limit' and book:
+                # 미체결분은 같은 가격 대기열 맨 뒤에서 시작
+                size = self._level_size(book, side, order['price'])
+                order['queue_ahead'] = size or 0.0
+                order['level_size'] = size
+                order['seen'] = snapshot
+                self._open[order['uuid']] = order
+            else:
+                self._finish(order, 'cancel')
+            return self._view(order)
+
+    def _reserve(self, ticker: str, side: str, ord_type: str, price: Optional[float],
+                 volume: Optional[float], submitted: int) -> Dict:
+        """주문 검증 + 잔고 잠금"""
+        book = self.feed.orderbook(ticker, submitted)
+        if not book:
+            raise SimulatedOrderError("호가 없음")
+        top = book['orderbook_units'][0]
+
+        if ord_type == 'limit':
+            tick = tick_size(price)
+            if price <= 0 or abs(price / tick - round(price / tick)) > 1e-6:
+                raise SimulatedOrderError(f"호가 단위 위반 ({price}, 단위 {tick})")
+            if volume is None or volume <= 0:
+                raise SimulatedOrderError("수량 오류")
+            value = price * volume
+        elif ord_type == 'price':
+            value = price
+        else:
+            value = volume * top['bid_price']
+        if value < MIN_ORDER_KRW:
+            raise SimulatedOrderError(f"최소 주문 금액 미달 ({value:,.0f}원)")
+
+        if side == 'bid':
+            account, amount = self._account('KRW'), value * (1 + self.fee)
+        else:
+            account, amount = self._account(self._currency(ticker)), volume
+        if account['balance'] + _EPS < amount:
+            raise SimulatedOrderError(f"잔고 부족 (필요 {amount:,.8g}, 보유 {account['balance']:,.8g})")
+        account['balance'] -= amount
+        account['locked'] += amount
+
+        order = {
+            'uuid': str(uuid_lib.uuid4()),
+            'market': ticker,
+            'side': side,
+            'ord_type': ord_type,
+            'price': price,
+            'volume': volume,
+            # 남은 수량 (시장가 매수는 남은 금액)
+            'remaining': price if ord_type == 'price' else volume,
+            'locked': amount,
+            'executed': 0.0,
+            'funds': 0.0,
+            'paid_fee': 0.0,
+            'state': 'wait',
+            'created_at': pd.Timestamp(submitted).isoformat() + '+09:00',
+            'trades': [],
+            'arrival_mid': None,
+        }
+        self.orders[order['uuid']] = order
+        return order
+
+    def _take(self, order: Dict, book: Dict, snapshot: int, fill_price: Optional[float] = None):
+        """
+        반대편 호가 잔량 소진 체결
+
+        Args:
+            fill_price: 체결가 고정 (대기 지정가가 가격 돌파로 체결될 때 주문 가격)
+        """
+        bid = order['side'] == 'bid'
+        limit = order['price'] if order['ord_type'] == 'limit' else None
+        consumed = self._consumed.setdefault((order['market'], snapshot), {})
+
+        for unit in book['orderbook_units']:
+            if order['remaining'] <= _EPS:
+                break
+            level = unit['ask_price'] if bid else unit['bid_price']
+            if limit is not None and (level > limit if bid else level < limit):
+                break
+            key = ('ask' if bid else 'bid', level)
+            available = (unit['ask_size'] if bid else unit['bid_size']) - consumed.get(key, 0.0)
+            if available <= _EPS:
+                continue
+
+            price = fill_price if fill_price is not None else level
+            if order['ord_type'] == 'price':
+                qty = min(available, order['remaining'] / price)
+            else:
+                qty = min(available, order['remaining'])
+            consumed[key] = consumed.get(key, 0.0) + qty
+            self._fill(order, price, qty, snapshot)
+
+    def _fill(self, order: Dict, price: float, qty: float, snapshot: int):
+        value = price * qty
+        fee = value * self.fee
+        krw = self._account('KRW')
+        coin = self._account(self._currency(order['market']))
+
+        if order['side'] == 'bid':
+            reserved = (order['price'] * qty if order['ord_type'] == 'limit' else value) * (1 + self.fee)
+            reserved = min(reserved, order['locked'])
+            krw['locked'] -= reserved
+            krw['balance'] += reserved - (value + fee)
+            order['locked'] -= reserved
+
+            held = coin['balance'] + coin['locked']
+            coin['avg_buy_price'] = (coin['avg_buy_price'] * held + value) / (held + qty)
+            coin['balance'] += qty
+            order['remaining'] -= value if order['ord_type'] == 'price' else qty
+        else:
+            coin['locked'] -= qty
+            order['locked'] -= qty
+            krw['balance'] += value - fee
+            order['remaining'] -= qty
+            if coin['balance'] + coin['locked'] <= _EPS:
+                coin['avg_buy_price'] = 0.0
+
+        order['executed'] += qty
+        order['funds'] += value
+        order['paid_fee'] += fee
+        order['trades'].append({
+            'market': order['market'],
+            'uuid': str(uuid_lib.uuid4()),
+            'price': _fmt(price),
+            'volume': _fmt(qty),
+            'funds': _fmt(value),
+            'side': order['side'],
+            'created_at': pd.Timestamp(snapshot).isoformat() + '+09:00',
+        })
+        self.stats['fees'] += fee
+
+    def _finish(self, order: Dict, state: str):
+        """주문 종료 (남은 잠금 해제 + 실행 비용 집계)"""
+        if order['locked'] > 0:
+            account = self._account('KRW' if order['side'] == 'bid' else self._currency(order['market']))
+            account['locked'] -= order['locked']
+            account['balance'] += order['locked']
+            order['locked'] = 0.0
+        order['state'] = state
+        self._open.pop(order['uuid'], None)
+
+        if order['executed'] > 0:
+            self.stats['done' if state == 'done' else 'partial'] += 1
+            mid = order['arrival_mid']
+            if mid:
+                average = order['funds'] / order['executed']
+                sign = 1 if order['side'] == 'bid' else -1
+                self.stats['cost'] += sign * (average - mid) / mid * order['funds']
+                self.stats['notional'] += order['funds']
+        else:
+            self.stats['canceled'] += 1
+
+    def _sync(self, until: int):
+        """대기 지정가 주문을 until까지의 스냅샷으로 체결 처리"""
+        for order in list(self._open.values()):
+            for ts, book in self.feed.snapshots(order['market'], order['seen'], until):
+                order['seen'] = ts
+                self._match_resting(order, ts, book)
+                if order['remaining'] <= _EPS:
+                    self._finish(order, 'done')
+                    break
+
+    def _match_resting(self, order: Dict, ts: int, book: Dict):
+        bid = order['side'] == 'bid'
+        price = order['price']
+        top = book['orderbook_units'][0]
+
+        # 1) 반대편 호가가 주문 가격에 닿음 → 주문 가격으로 잔량만큼 체결
+        if (top['ask_price'] <= price) if bid else (top['bid_price'] >= price):
+            self._take(order, book, ts, fill_price=price)
+            order['level_size'] = None
+            return
+
+        # 2) 같은 편 최우선 호가가 주문 가격을 지나감 → 대기열 전체 소진, 전량 체결
+        if (top['bid_price'] < price) if bid else (top['ask_price'] > price):
+            self._fill(order, price, order['remaining'], ts)
+            return
+
+        # 3) 최우선 호가 대기 중: 잔량 감소분을 앞 대기열부터 소진
+        size = self._level_size(book, order['side'], price)
+        best = top['bid_price'] if bid else top['ask_price']
+        if best == price and size is not None and order['level_size'] is not None:
+            traded = max(0.0, order['level_size'] - size)
+            if traded > order['queue_ahead']:
+                self._fill(order, price, min(order['remaining'], traded - order['queue_ahead']), ts)
+                order['queue_ahead'] = 0.0
+            else:
+                order['queue_ahead'] -= traded
+        order['level_size'] = size
+
+    @staticmethod
+    def _level_size(book: Dict, side: str, price: float) -> Optional[float]:
+        """같은 편 price 단계 잔량 (표시 범위 밖이면 None, 범위 안 빈 가격이면 0)"""
+        key_price, key_size = ('bid_price', 'bid_size') if side == 'bid' else ('ask_price', 'ask_size')
+        units = book['orderbook_units']
+        for unit in units:
+            if unit[key_price] == price:
+                return unit[key_size]
+        worst = units[-1][key_price]
+        inside = price >= worst if side == 'bid' else price <= worst
+        return 0.0 if inside else None
+
+    def _view(self, order: Dict) -> Dict:
+        """Upbit 주문 응답 형식"""
+        market_buy = order['ord_type'] == 'price'
+        return {
+            'uuid': order['uuid'],
+            'side': order['side'],
+            'ord_type': order['ord_type'],
+            'price': _fmt(order['price']),
+            'state': order['state'],
+            'market': order['market'],
+            'created_at': order['created_at'],
+            'volume': _fmt(order['volume']),
+            'remaining_volume': None if market_buy else _fmt(max(order['remaining'], 0.0)),
+            'paid_fee': _fmt(order['paid_fee']),
+            'locked': _fmt(order['locked']),
+            'executed_volume': _fmt(order['executed']),
+            'trades_count': len(order['trades']),
+            'trades': list(order['trades']),
+        }
+
+
+def build_replay_exchange(archive_dir: str, orderbook_path: str = '', days: float = 1.0,
+                          speed: float = 1.0, balance: float = 1_000_000,
+                          latency: float = 0.05) -> SimulatedExchange:
+    """
+    모의투자용 거래소 생성 (캔들 아카이브 1분봉으로 days일 전부터 재생)
+
+    Args:
+        archive_dir: 캔들 아카이브 디렉터리
+        orderbook_path: 기록된 호가 JSONL (비우면 1분봉 기반 합성 호가)
+        days: 재생 시작 시점 (며칠 전)
+        speed: 재생 속도 배율
+        balance: 초기 KRW 잔고
+        latency: 주문 지연 (초)
+    """
+    from .candle_archive import CandleArchive
+
+    archive = CandleArchive(archive_dir)
+    start = pd.Timestamp(now_kst_ns()) - pd.Timedelta(days=days)
+    # 지표 계산용으로 재생 시작 전 1분봉 1,100개 (5분봉 200개 분량) 포함
+    history = start - pd.Timedelta(minutes=1100)
+    candles = {}
+    for ticker in archive.tickers('minute1'):
+        df = archive.read(ticker, 'minute1', start=history)
+        if df is not None:
+            candles[ticker] = df
+
+    if orderbook_path:
+        feed = RecordedOrderbookFeed.from_jsonl(orderbook_path, candles=candles)
+        times = [feed.times(t)[0] for t in feed.tickers()]
+        start = pd.Timestamp(min(times)) if times else start
+    else:
+        feed = SyntheticOrderbookFeed(candles)
+
+    return SimulatedExchange(feed, balance=balance, latency=latency, clock=ReplayClock(start, speed))
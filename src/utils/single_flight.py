@@ -0,0 +1,102 @@
+"""
+동일 요청 병합 (single-flight)
+- 같은 키의 요청이 진행 중이면 새로 호출하지 않고 그 결과를 함께 받음
+- 여러 스레드가 같은 코인의 호가/캔들을 동시에 요청할 때 네트워크 호출 1회로 처리
+- 진행 중 호출보다 우선순위가 높은 요청은 합류하지 않고 자기 레인에서 새로 호출
+  (포지션 체크가 백그라운드 레인의 한도 대기 뒤에 줄 서지 않도록)
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """진행 중인 호출"""
+
+    __slots__ = ('event', 'result', 'error', 'waiters', 'priority')
+
+    def __init__(self, priority: Optional[int] = None):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.priority = priority  # 실행 중인 호출의 우선순위 (작을수록 높음)
+
+
+class SingleFlight:
+    """키별 진행 중 호출 공유 (스레드 안전)"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.calls = 0   # 실제 실행 횟수
+        self.shared = 0  # 진행 중인 호출 결과를 공유받은 횟수
+        self.preempted = 0  # 우선순위가 낮은 진행 중 호출에 합류하지 않은 횟수
+
+    def do(self, key: Hashable, fn: Callable[[], Any], priority: Optional[int] = None) -> Any:
+        """
+        fn 실행 (같은 key가 진행 중이면 그 결과를 기다려 반환)
+
+        Args:
+            key: 요청 식별 키
+            fn: 실제 호출 함수
+            priority: 호출자 우선순위 (작을수록 높음, None이면 항상 합류)
+                진행 중 호출보다 높으면 합류하지 않고 새로 실행하며,
+                이후 같은 키 요청은 이 호출에 합류
+
+        Returns:
+            fn 결과 (진행 중 호출이 예외로 끝나면 같은 예외 발생)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and not self._outranks(priority, call.priority):
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                if call is not None:
+                    self.preempted += 1
+                call = _Call(priority)
+                self._calls[key] = call
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # 더 높은 우선순위 호출로 교체됐으면 그 항목은 남겨둠
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+
+    @staticmethod
+    def _outranks(priority: Optional[int], running: Optional[int]) -> bool:
+        """priority가 진행 중 호출의 우선순위보다 높은지"""
+        return priority is not None and running is not None and priority < running
+
+    def in_flight(self) -> int:
+        """진행 중인 호출 수"""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict:
+        """병합 통계"""
+        return {
+            'calls': self.calls,
+            'shared': self.shared,
+            'preempted': self.preempted,
+            'in_flight': self.in_flight(),
+        }
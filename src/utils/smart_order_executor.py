@@ -60,7 +60,7 @@ class SmartOrderExecutor:
         """
         try:
             # 1. 스프레드 계산
-            spread_pct = self.api.calculate_spread_percentage(ticker)
+            spread_pct = self.api.calculate_spread_percentage(ticker, bypass_cache=True)
             
             # 2. 주문 방법 선택
             from src.utils.order_method_selector import OrderMethod
@@ -80,7 +80,7 @@ class SmartOrderExecutor:
             
             # 3. 주문 실행 (재시도 포함)
             order_result = None
-            current_price = self.api.get_current_price(ticker)
+            current_price = self.api.get_current_price(ticker, bypass_cache=True)
             
             if method == OrderMethod.MARKET:
                 order_result = self._execute_market_buy(ticker, investment)
@@ -145,7 +145,7 @@ class SmartOrderExecutor:
         """
         try:
             # 1. 스프레드 계산
-            spread_pct = self.api.calculate_spread_percentage(ticker)
+            spread_pct = self.api.calculate_spread_percentage(ticker, bypass_cache=True)
             
             # 2. 주문 방법 선택
             from src.utils.order_method_selector import OrderMethod
@@ -167,7 +167,7 @@ class SmartOrderExecutor:
             
             # 3. 주문 실행
             order_result = None
-            current_price = self.api.get_current_price(ticker)
+            current_price = self.api.get_current_price(ticker, bypass_cache=True)
             
             if method == OrderMethod.MARKET:
                 order_result = self._execute_market_sell(ticker, volume)
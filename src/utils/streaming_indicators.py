@@ -0,0 +1,513 @@
+"""
+증분(스트리밍) 기술적 지표
+- (ticker, interval)별 실행 상태를 보관하고, 봉 마감/진행 중 봉 갱신마다 O(1)로 갱신
+- 마감된 봉은 상태에 반영(push), 진행 중인 마지막 봉은 상태를 바꾸지 않고 계산(peek)
+- 값은 technical_indicators / BaseStrategy의 pandas 구현과 같음 (부동소수 오차 이내,
+  EMA 계열은 시작 시점이 다르면 초기값 영향이 남지만 봉이 쌓일수록 수렴)
+- 독립 모듈: 현재 봇 경로는 사용하지 않음 (전략은 IndicatorBundle, 코인 선정은 UniverseIndicators 일괄 계산)
+  단일 마켓 봉을 실시간으로 이어 받는 소비자가 생기면 on_candle/sync로 연결
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+NAN = float('nan')
+
+
+# ==================== 기본 구성 요소 ====================
+
+class _Window:
+    """고정 길이 창의 합 / 제곱합 (평균, 표본 표준편차)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque()
+        self.shift = None  # 큰 가격에서 제곱합 정밀도 유지를 위한 기준값
+        self.total = 0.0
+        self.squares = 0.0
+        self.invalid = 0  # 창 안의 NaN/inf 개수 (있으면 값은 NaN, pandas rolling과 동일)
+        self._pushes = 0
+
+    def _after(self, x: float):
+        """x를 추가했을 때의 (합, 제곱합, 무효 개수, 개수, 기준값)"""
+        old = self.values[0] if len(self.values) == self.period else None
+        total, squares, invalid = self.total, self.squares, self.invalid
+        shift = self.shift
+        if shift is None and math.isfinite(x):
+            shift = x
+        if math.isfinite(x):
+            y = x - shift
+            total += y
+            squares += y * y
+        else:
+            invalid += 1
+        if old is not None:
+            if math.isfinite(old):
+                y = old - shift
+                total -= y
+                squares -= y * y
+            else:
+                invalid -= 1
+        count = min(len(self.values) + 1, self.period)
+        return total, squares, invalid, count, shift
+
+    def push(self, x: float):
+        self.total, self.squares, self.invalid, count, self.shift = self._after(x)
+        if len(self.values) == self.period:
+            self.values.popleft()
+        self.values.append(x)
+
+        # 누적 오차 방지: 주기적으로 창 전체 재합산
+        self._pushes += 1
+        if self._pushes % (self.period * 64) == 0:
+            self._recompute()
+        return self.total, self.squares, self.invalid, count, self.shift
+
+    def _recompute(self):
+        finite = [v for v in self.values if math.isfinite(v)]
+        self.shift = finite[-1] if finite else None
+        self.total = math.fsum(v - self.shift for v in finite) if finite else 0.0
+        self.squares = math.fsum((v - self.shift) ** 2 for v in finite) if finite else 0.0
+        self.invalid = len(self.values) - len(finite)
+
+    def _mean(self, state) -> float:
+        total, _, invalid, count, shift = state
+        if count < self.period or invalid:
+            return NAN
+        return shift + total / count
+
+    def _std(self, state) -> float:
+        total, squares, invalid, count, _ = state
+        if count < self.period or invalid or count < 2:
+            return NAN
+        return math.sqrt(max(squares - total * total / count, 0.0) / (count - 1))
+
+    def push_mean(self, x: float) -> float:
+        return self._mean(self.push(x))
+
+    def peek_mean(self, x: float) -> float:
+        return self._mean(self._after(x))
+
+    def push_stats(self, x: float) -> Tuple[float, float]:
+        state = self.push(x)
+        return self._mean(state), self._std(state)
+
+    def peek_stats(self, x: float) -> Tuple[float, float]:
+        state = self._after(x)
+        return self._mean(state), self._std(state)
+
+
+class _Extreme:
+    """고정 길이 창의 최솟값/최댓값 (단조 덱, 분할 상환 O(1))"""
+
+    def __init__(self, period: int, mode: str = 'min'):
+        self.period = period
+        self.better = (lambda a, b: a <= b) if mode == 'min' else (lambda a, b: a >= b)
+        self.items = deque()  # (봉 번호, 값), 값은 단조
+        self.count = 0
+
+    def push(self, x: float) -> float:
+        while self.items and self.better(x, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((self.count, x))
+        self.count += 1
+        while self.items[0][0] <= self.count - 1 - self.period:
+            self.items.popleft()
+        return self.items[0][1] if self.count >= self.period else NAN
+
+    def peek(self, x: float) -> float:
+        if self.count + 1 < self.period:
+            return NAN
+        first = self.count + 1 - self.period  # x 추가 후 창의 첫 봉 번호
+        for index, value in self.items:
+            if index >= first:
+                return x if self.better(x, value) else value
+        return x
+
+
+class _Ema:
+    """지수이동평균 (pandas ewm(span, adjust=False)와 동일)"""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def push(self, x: float) -> float:
+        self.value = self.peek(x)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self.value is None:
+            return x
+        return self.value + self.alpha * (x - self.value)
+
+
+# ==================== 지표 ====================
+
+class StreamingIndicator:
+    """
+    증분 지표 기본 클래스
+
+    push(bar): 마감된 봉 반영 후 값 반환
+    peek(bar): 상태를 바꾸지 않고 bar가 마지막 봉일 때의 값 반환 (진행 중인 봉)
+    bar: (open, high, low, close, volume) 튜플
+    """
+
+    def push(self, bar: Tuple) -> object:
+        raise NotImplementedError
+
+    def peek(self, bar: Tuple) -> object:
+        raise NotImplementedError
+
+
+class SMA(StreamingIndicator):
+    """단순 이동평균 (rolling(period).mean())"""
+
+    def __init__(self, period: int = 20, column: str = 'close'):
+        self.index = BAR_COLUMNS.index(column)
+        self.window = _Window(period)
+
+    def push(self, bar):
+        return self.window.push_mean(bar[self.index])
+
+    def peek(self, bar):
+        return self.window.peek_mean(bar[self.index])
+
+
+class EMA(StreamingIndicator):
+    """지수이동평균 (ewm(span, adjust=False).mean())"""
+
+    def __init__(self, span: int = 20, column: str = 'close'):
+        self.index = BAR_COLUMNS.index(column)
+        self.ema = _Ema(span)
+
+    def push(self, bar):
+        return self.ema.push(bar[self.index])
+
+    def peek(self, bar):
+        return self.ema.peek(bar[self.index])
+
+
+class RSI(StreamingIndicator):
+    """RSI (단순 이동평균 방식, BaseStrategy.calculate_rsi와 동일)"""
+
+    def __init__(self, period: int = 14):
+        self.gain = _Window(period)
+        self.loss = _Window(period)
+        self.prev = None
+
+    def _delta(self, bar) -> float:
+        # 첫 봉의 diff는 NaN → where(...)에서 0으로 처리됨
+        return bar[CLOSE] - self.prev if self.prev is not None else 0.0
+
+    @staticmethod
+    def _value(gain: float, loss: float) -> float:
+        if math.isnan(gain) or math.isnan(loss):
+            return NAN
+        if loss == 0:
+            return 100.0 if gain > 0 else NAN
+        return 100 - 100 / (1 + gain / loss)
+
+    def push(self, bar):
+        delta = self._delta(bar)
+        self.prev = bar[CLOSE]
+        return self._value(self.gain.push_mean(max(delta, 0.0)), self.loss.push_mean(max(-delta, 0.0)))
+
+    def peek(self, bar):
+        delta = self._delta(bar)
+        return self._value(self.gain.peek_mean(max(delta, 0.0)), self.loss.peek_mean(max(-delta, 0.0)))
+
+
+class MACD(StreamingIndicator):
+    """MACD → (MACD, Signal, Histogram)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = _Ema(fast)
+        self.slow = _Ema(slow)
+        self.signal = _Ema(signal)
+
+    def push(self, bar):
+        line = self.fast.push(bar[CLOSE]) - self.slow.push(bar[CLOSE])
+        signal = self.signal.push(line)
+        return line, signal, line - signal
+
+    def peek(self, bar):
+        line = self.fast.peek(bar[CLOSE]) - self.slow.peek(bar[CLOSE])
+        signal = self.signal.peek(line)
+        return line, signal, line - signal
+
+
+class BollingerBands(StreamingIndicator):
+    """볼린저 밴드 → (상단, 중단, 하단)"""
+
+    def __init__(self, period: int = 20, std: float = 2.0):
+        self.window = _Window(period)
+        self.std = std
+
+    def _bands(self, stats):
+        middle, dev = stats
+        return middle + dev * self.std, middle, middle - dev * self.std
+
+    def push(self, bar):
+        return self._bands(self.window.push_stats(bar[CLOSE]))
+
+    def peek(self, bar):
+        return self._bands(self.window.peek_stats(bar[CLOSE]))
+
+
+class ATR(StreamingIndicator):
+    """ATR (True Range 단순 이동평균)"""
+
+    def __init__(self, period: int = 14):
+        self.window = _Window(period)
+        self.prev = None
+
+    def _true_range(self, bar) -> float:
+        high_low = bar[HIGH] - bar[LOW]
+        if self.prev is None:
+            return high_low
+        return max(high_low, abs(bar[HIGH] - self.prev), abs(bar[LOW] - self.prev))
+
+    def push(self, bar):
+        value = self.window.push_mean(self._true_range(bar))
+        self.prev = bar[CLOSE]
+        return value
+
+    def peek(self, bar):
+        return self.window.peek_mean(self._true_range(bar))
+
+
+class Stochastic(StreamingIndicator):
+    """
+    스토캐스틱 → (%K, %D)
+
+    고가=저가 구간은 NaN (pandas는 inf/NaN)
+    """
+
+    def __init__(self, period: int = 14, smooth_k: int = 3, smooth_d: int = 3):
+        self.lows = _Extreme(period, 'min')
+        self.highs = _Extreme(period, 'max')
+        self.k = _Window(smooth_k)
+        self.d = _Window(smooth_d)
+
+    @staticmethod
+    def _raw(close: float, low: float, high: float) -> float:
+        if math.isnan(low) or math.isnan(high) or high == low:
+            return NAN
+        return 100 * (close - low) / (high - low)
+
+    def push(self, bar):
+        raw = self._raw(bar[CLOSE], self.lows.push(bar[LOW]), self.highs.push(bar[HIGH]))
+        k = self.k.push_mean(raw)
+        return k, self.d.push_mean(k)
+
+    def peek(self, bar):
+        raw = self._raw(bar[CLOSE], self.lows.peek(bar[LOW]), self.highs.peek(bar[HIGH]))
+        k = self.k.peek_mean(raw)
+        return k, self.d.peek_mean(k)
+
+
+class VolumeRatio(StreamingIndicator):
+    """거래량 비율 (현재 거래량 / 현재 포함 최근 period개 평균, 봉 부족/평균 0이면 1.0)"""
+
+    def __init__(self, period: int = 20):
+        self.window = _Window(period)
+
+    @staticmethod
+    def _value(volume: float, avg: float) -> float:
+        if math.isnan(avg) or avg == 0:
+            return 1.0
+        return volume / avg
+
+    def push(self, bar):
+        return self._value(bar[VOLUME], self.window.push_mean(bar[VOLUME]))
+
+    def peek(self, bar):
+        return self._value(bar[VOLUME], self.window.peek_mean(bar[VOLUME]))
+
+
+INDICATORS = {
+    'sma': SMA,
+    'ema': EMA,
+    'rsi': RSI,
+    'macd': MACD,
+    'bollinger': BollingerBands,
+    'atr': ATR,
+    'stochastic': Stochastic,
+    'volume_ratio': VolumeRatio,
+}
+
+
+# ==================== 티커별 상태 ====================
+
+class _Series:
+    """단일 (ticker, interval)의 마감 봉 이력 + 진행 중인 봉 + 지표 상태"""
+
+    def __init__(self, history: int):
+        self.closed = deque(maxlen=history)  # 새 지표 초기화용 최근 마감 봉
+        self.live_ts: Optional[int] = None
+        self.live_bar: Optional[Tuple] = None
+        self.indicators: Dict[Tuple, StreamingIndicator] = {}
+        self.lock = threading.Lock()
+        self.last_update = 0.0
+
+    def reset(self):
+        self.closed.clear()
+        self.live_ts = None
+        self.live_bar = None
+        self.indicators = {spec: INDICATORS[spec[0]](**dict(spec[1])) for spec in self.indicators}
+
+    def update(self, ts: int, bar: Tuple) -> bool:
+        """봉 갱신 (더 이전 시각이면 무시)"""
+        if self.live_ts is not None and ts < self.live_ts:
+            return False
+        if self.live_ts is not None and ts > self.live_ts:
+            # 진행 중이던 봉 마감
+            for indicator in self.indicators.values():
+                indicator.push(self.live_bar)
+            self.closed.append(self.live_bar)
+        self.live_ts = ts
+        self.live_bar = bar
+        self.last_update = time.time()
+        return True
+
+    def indicator(self, spec: Tuple) -> StreamingIndicator:
+        indicator = self.indicators.get(spec)
+        if indicator is None:
+            indicator = INDICATORS[spec[0]](**dict(spec[1]))
+            for bar in self.closed:
+                indicator.push(bar)
+            self.indicators[spec] = indicator
+        return indicator
+
+
+class StreamingIndicators:
+    """(ticker, interval, 지표, 파라미터)별 증분 지표 관리"""
+
+    def __init__(self, history: int = 500, max_keys: int = 300):
+        """
+        초기화
+
+        Args:
+            history: (ticker, interval)별 보관할 마감 봉 개수 (나중에 추가되는 지표 초기화용)
+            max_keys: 최대 보관 (ticker, interval) 수 (초과 시 가장 오래 갱신 안 된 키 제거)
+        """
+        self.history = history
+        self.max_keys = max_keys
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.updates = 0
+        self.replays = 0
+
+    def on_candle(self, ticker: str, interval: str, ts, bar: Tuple):
+        """
+        봉 1개 갱신 (마지막 봉과 같은 시각이면 진행 중인 봉 갱신, 이후 시각이면 이전 봉 마감)
+
+        Args:
+            ticker: 코인 티커
+            interval: 봉 간격
+            ts: 봉 시각 (pd.Timestamp 또는 ns 정수)
+            bar: (open, high, low, close, volume)
+        """
+        series = self._get_series((ticker, interval))
+        with series.lock:
+            if series.update(_to_ns(ts), tuple(float(v) for v in bar)):
+                self.updates += 1
+
+    def sync(self, ticker: str, interval: str, df: pd.DataFrame):
+        """
+        캔들 DataFrame과 상태 맞추기 (마지막 반영 봉 이후 행만 반영)
+
+        마지막 반영 봉이 df에 없으면 (누락 구간, 더 과거 데이터) 상태를 비우고 df 전체로 재구성
+        """
+        if df is None or df.empty:
+            return
+        series = self._get_series((ticker, interval))
+        times = df.index.values.astype('datetime64[ns]').view('int64')
+        with series.lock:
+            start = 0
+            if series.live_ts is not None:
+                start = int(np.searchsorted(times, series.live_ts))
+                if start >= len(times) or times[start] != series.live_ts:
+                    series.reset()
+                    start = 0
+                    self.replays += 1
+            columns = [df[c].to_numpy(dtype='float64') for c in BAR_COLUMNS]
+            for i in range(start, len(times)):
+                series.update(int(times[i]), tuple(float(col[i]) for col in columns))
+            self.updates += len(times) - start
+
+    def get(self, ticker: str, interval: str, name: str, df: Optional[pd.DataFrame] = None, **params):
+        """
+        지표 최신값 (진행 중인 마지막 봉 기준)
+
+        Args:
+            ticker: 코인 티커
+            interval: 봉 간격
+            name: 지표 이름 (INDICATORS 키)
+            df: 주면 먼저 sync
+            **params: 지표 파라미터 (예: period=14)
+
+        Returns:
+            값 (macd / bollinger / stochastic은 튜플), 봉이 없으면 NaN
+        """
+        if name not in INDICATORS:
+            raise ValueError(f"지원하지 않는 지표: {name}")
+        if df is not None:
+            self.sync(ticker, interval, df)
+        series = self._get_series((ticker, interval))
+        with series.lock:
+            indicator = series.indicator((name, tuple(sorted(params.items()))))
+            if series.live_bar is None:
+                return NAN
+            return indicator.peek(series.live_bar)
+
+    def invalidate(self, ticker: Optional[str] = None):
+        """상태 제거 (ticker가 None이면 전체)"""
+        with self._lock:
+            for key in [k for k in self._series if ticker is None or k[0] == ticker]:
+                self._series.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """통계"""
+        return {
+            'keys': len(self._series),
+            'indicators': sum(len(s.indicators) for s in self._series.values()),
+            'updates': self.updates,
+            'replays': self.replays,
+        }
+
+    # ==================== 내부 ====================
+
+    def _get_series(self, key) -> _Series:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= self.max_keys:
+                    oldest = min(self._series, key=lambda k: self._series[k].last_update)
+                    self._series.pop(oldest)
+                series = _Series(self.history)
+                self._series[key] = series
+            return series
+
+
+def _to_ns(ts) -> int:
+    if isinstance(ts, (int, np.integer)):
+        return int(ts)
+    return int(pd.Timestamp(ts).as_unit('ns').value)
+
+
+# 전역 인스턴스
+streaming_indicators = StreamingIndicators()
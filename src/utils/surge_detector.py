@@ -1,14 +1,18 @@
 """
 급등 감지 시스템 (Surge Detector)
-- 1분/5분/15분 상승률 및 거래량 분석
+- 1분/5분/15분 상승률 및 거래량 분석 (모두 1분 종가 기준, SurgeScanner.evaluate 정의)
 - 급등 점수 계산 및 추격매수 신호 생성
 """
 
 import time
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+from .universe_indicators import UniverseIndicators
+from .surge_scanner import SurgeScanner
+
 
 class SurgeDetector:
     """급등 감지 및 점수 계산"""
@@ -25,10 +29,13 @@ class SurgeDetector:
         self.threshold_15m = 5.0  # 15분 상승률 ≥ 5.0%
         self.volume_ratio_threshold = 2.0  # 거래량 비율 ≥ 2.0
         self.min_surge_score = 50  # 최소 급등 점수
+        
+        # 전체 마켓 롤링 상태 (스캔마다 캔들 조회 없이 일괄 평가)
+        self.scanner = SurgeScanner(self)
     
     def detect_surge(self, ticker: str, api) -> Optional[Dict]:
         """
-        급등 감지 및 분석
+        급등 감지 및 분석 (1분 캔들 1회 조회, 지표 정의는 SurgeScanner와 동일)
         
         Args:
             ticker: 코인 티커
@@ -37,73 +44,48 @@ class SurgeDetector:
         Returns:
             급등 정보 딕셔너리 or None
         """
+        window = self.scanner.window
         try:
-            # 1분 OHLCV 데이터
-            df_1m = api.get_ohlcv(ticker, interval="minute1", count=20)
-            if df_1m is None or len(df_1m) < 2:
-                return None
-            
-            # 5분 OHLCV 데이터
-            df_5m = api.get_ohlcv(ticker, interval="minute5", count=20)
-            if df_5m is None or len(df_5m) < 2:
-                return None
-            
-            # 15분 OHLCV 데이터
-            df_15m = api.get_ohlcv(ticker, interval="minute15", count=20)
-            if df_15m is None or len(df_15m) < 2:
-                return None
-            
-            # 1분 상승률
-            current_1m = df_1m['close'].iloc[-1]
-            prev_1m = df_1m['close'].iloc[-2]
-            change_1m = ((current_1m - prev_1m) / prev_1m) * 100
-            
-            # 5분 상승률
-            current_5m = df_5m['close'].iloc[-1]
-            prev_5m = df_5m['close'].iloc[-6] if len(df_5m) >= 6 else df_5m['close'].iloc[0]
-            change_5m = ((current_5m - prev_5m) / prev_5m) * 100
-            
-            # 15분 상승률
-            current_15m = df_15m['close'].iloc[-1]
-            prev_15m = df_15m['close'].iloc[-4] if len(df_15m) >= 4 else df_15m['close'].iloc[0]
-            change_15m = ((current_15m - prev_15m) / prev_15m) * 100
-            
-            # 거래량 비율 (최근 5분 vs 평균)
-            volume_current = df_1m['volume'].iloc[-5:].mean()
-            volume_avg = df_1m['volume'].iloc[-20:-5].mean()
-            volume_ratio = volume_current / volume_avg if volume_avg > 0 else 1.0
-            
-            # 급등 점수 계산
-            surge_score = self.calculate_surge_score(
-                change_1m, change_5m, change_15m, volume_ratio
-            )
-            
-            # 급등 감지 조건
-            is_surge = (
-                change_1m >= self.threshold_1m and
-                volume_ratio >= self.volume_ratio_threshold and
-                surge_score >= self.min_surge_score
-            )
-            
-            if not is_surge:
-                return None
-            
-            # 급등 정보 반환
-            return {
+            df = api.get_ohlcv(ticker, interval='minute1', count=window)
+        except Exception as e:
+            print(f"❌ {ticker} 급등 감지 실패: {e}")
+            return None
+        if df is None or len(df) < 2:
+            return None
+        metrics = self.scanner.evaluate(UniverseIndicators({ticker: df}, count=window))
+        return self.surges_from_metrics(metrics).get(ticker)
+    
+    def surges_from_metrics(self, metrics: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+        """
+        일괄 지표 → 급등 정보 딕셔너리 (detect_surge 반환 형식)
+        
+        Args:
+            metrics: SurgeScanner.metrics / SurgeScanner.evaluate 결과
+        
+        Returns:
+            {ticker: 급등 정보} (급등 조건을 만족한 코인만, 티커 순서)
+        """
+        detected = {}
+        now = datetime.now()
+        for i, ticker in enumerate(metrics['tickers']):
+            if not metrics['is_surge'][i]:
+                continue
+            surge_score = float(metrics['surge_score'][i])
+            volume_ratio = float(metrics['volume_ratio'][i])
+            detected[ticker] = {
                 'ticker': ticker,
-                'change_1m': change_1m,
-                'change_5m': change_5m,
-                'change_15m': change_15m,
+                'type': 'surge',
+                'price_change': float(metrics['change_1m'][i]),
+                'change_1m': float(metrics['change_1m'][i]),
+                'change_5m': float(metrics['change_5m'][i]),
+                'change_15m': float(metrics['change_15m'][i]),
                 'volume_ratio': volume_ratio,
                 'surge_score': surge_score,
-                'current_price': current_1m,
-                'timestamp': datetime.now(),
+                'current_price': float(metrics['current_price'][i]),
+                'timestamp': now,
                 'confidence': self.calculate_confidence(surge_score, volume_ratio)
             }
-        
-        except Exception as e:
-            print(f"❌ {ticker} 급등 감지 실패: {e}")
-            return None
+        return detected
     
     def calculate_surge_score(self, change_1m: float, change_5m: float, 
                              change_15m: float, volume_ratio: float) -> float:
@@ -146,6 +128,18 @@ class SurgeDetector:
         
         return min(score, 100.0)  # 최대 100점
     
+    def calculate_surge_scores(self, change_1m: np.ndarray, change_5m: np.ndarray,
+                               change_15m: np.ndarray, volume_ratio: np.ndarray) -> np.ndarray:
+        """급등 점수 일괄 계산 (calculate_surge_score의 배열 버전)"""
+        score = (
+            np.where(change_1m >= self.threshold_1m, 10 * change_1m / self.threshold_1m, 0.0) +
+            np.where(change_5m >= self.threshold_5m, 5 * change_5m / self.threshold_5m, 0.0) +
+            np.where(change_15m >= self.threshold_15m, 2 * change_15m / self.threshold_15m, 0.0) +
+            np.where(volume_ratio >= self.volume_ratio_threshold,
+                     20 * volume_ratio / self.volume_ratio_threshold, 0.0)
+        )
+        return np.minimum(score, 100.0)
+    
     def calculate_confidence(self, surge_score: float, volume_ratio: float) -> float:
         """
         신뢰도 계산 (0.0 ~ 1.0)
@@ -263,31 +257,22 @@ class SurgeDetector:
         multiplier = 1.5 + (surge_score / 200) + (confidence * 0.5)
         return min(max(multiplier, 1.5), 2.0)
     
-    def scan_market_batch(self, tickers: List[str], prices_dict: Dict[str, float]) -> List[Dict]:
+    def scan_market_batch(self, tickers: List[str], prices_dict: Dict[str, float], api=None,
+                          ws_client=None, ws_max_age: Optional[float] = None) -> List[Dict]:
         """
-        여러 코인의 급등/급락을 배치로 스캔
+        여러 코인의 급등/급락을 배치로 스캔 (롤링 상태 갱신 후 일괄 평가)
         
         Args:
             tickers: 코인 티커 리스트
-            prices_dict: {ticker: price} 딕셔너리
+            prices_dict: {ticker: price} 딕셔너리 (현재가가 있는 코인만 스캔)
+            api: UpbitAPI 인스턴스 (새 코인/재동기화용 1분 캔들 조회, 없으면 생략)
+            ws_client: 실시간 스트림 (누적 거래량으로 1분 거래량 갱신)
+            ws_max_age: 스트림 데이터 허용 나이 (초)
         
         Returns:
-            급등 감지된 코인 정보 리스트
+            급등 감지된 코인 정보 리스트 (티커 순서)
         """
-        detected = []
-        
-        # 간단한 구현: detect_surge를 순회 호출
-        # 실제로는 이 부분도 배치 최적화 가능
-        for ticker in tickers:
-            if ticker not in prices_dict:
-                continue
-            
-            # 이 부분은 실제로 api를 필요로 하므로
-            # main.py에서 호출할 때 api를 전달받아야 함
-            # 현재는 빈 리스트 반환 (호환성 유지)
-            pass
-        
-        return detected
+        return self.scanner.scan(tickers, prices_dict, api=api, ws_client=ws_client, ws_max_age=ws_max_age)
 
 
 # 전역 인스턴스
@@ -0,0 +1,299 @@
+"""
+전체 마켓 롤링 급등 스캐너
+- 감시 마켓별 최근 1분 단위 종가/거래량을 (마켓 × 분) 행렬로 유지 (마지막 칸 = 진행 중인 1분)
+- 매 스캔은 이미 받은 배치 현재가 + 실시간 스트림 누적 거래량 차이로 상태만 갱신 (캔들 조회 없음)
+- 1분 캔들 조회는 처음 추적하는 마켓과, 스트림 거래량이 없는 마켓의 주기적 재동기화에만 사용
+  (스트림 자체가 없으면 - WebSocket 꺼짐/재생/시뮬레이션 - 분이 바뀔 때마다 재동기화해 거래량 유지)
+- 1/5/15분 상승률, 거래량 비율, 급등 점수를 전체 마켓 한 번의 벡터 계산으로 평가
+  (결과 필드는 SurgeDetector.detect_surge와 동일)
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .universe_indicators import UniverseIndicators
+
+
+class SurgeScanner:
+    """마켓별 롤링 1분 상태 + 일괄 급등 평가"""
+
+    STREAM_MAX_AGE = 60.0  # 스트림 거래량을 신뢰하는 최대 경과 시간 (초)
+
+    def __init__(self, detector, window: int = 20, resync_interval: float = 300.0,
+                 max_seeds_per_scan: int = 10, clock: Callable[[], float] = time.time):
+        """
+        초기화
+
+        Args:
+            detector: SurgeDetector (임계값, 점수/신뢰도 계산)
+            window: 유지할 1분 칸 수 (15분 상승률 + 거래량 비교 구간)
+            resync_interval: 스트림 거래량이 없는 마켓의 1분 캔들 재동기화 주기 (초)
+            max_seeds_per_scan: 스캔 1회당 최대 캔들 조회 수 (요청 분산)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.detector = detector
+        self.window = window
+        self.resync_interval = resync_interval
+        self.max_seeds_per_scan = max_seeds_per_scan
+        self.clock = clock
+
+        self.tickers: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.close = np.empty((0, window))
+        self.volume = np.empty((0, window))
+        self.lengths = np.empty(0, dtype='int64')
+        self.seeded_at = np.empty(0)       # 마지막 캔들 동기화 시각 (NaN = 없음)
+        self.stream_at = np.empty(0)       # 마지막 스트림 거래량 반영 시각
+        self.acc_volume = np.empty(0)      # 스트림 누적 거래량 (차이 계산 기준)
+        self.minute: Optional[int] = None  # 마지막 칸의 분 번호
+
+        # 통계
+        self.scans = 0
+        self.seeds = 0
+        self.last_duration = 0.0
+
+    # ==================== 상태 갱신 ====================
+
+    def track(self, tickers: Iterable[str]):
+        """추적 마켓 추가 (새 마켓은 빈 행)"""
+        new = [t for t in dict.fromkeys(tickers) if t not in self.index]
+        if not new:
+            return
+        for ticker in new:
+            self.index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        n = len(new)
+        self.close = np.vstack([self.close, np.full((n, self.window), np.nan)])
+        self.volume = np.vstack([self.volume, np.full((n, self.window), np.nan)])
+        self.lengths = np.concatenate([self.lengths, np.zeros(n, dtype='int64')])
+        self.seeded_at = np.concatenate([self.seeded_at, np.full(n, np.nan)])
+        self.stream_at = np.concatenate([self.stream_at, np.full(n, np.nan)])
+        self.acc_volume = np.concatenate([self.acc_volume, np.full(n, np.nan)])
+
+    def _advance(self, now: float):
+        """분이 바뀌면 행렬을 왼쪽으로 밀고 새 칸을 직전 종가로 채움"""
+        minute = int(now // 60)
+        if self.minute is None:
+            self.minute = minute
+            return
+        shift = minute - self.minute
+        if shift <= 0:
+            return
+        # 직전 분이 끝날 때 스트림 거래량이 살아 있었으면 체결 없는 분은 0, 아니면 모름(NaN)
+        live = ((self.minute + 1) * 60 - self.stream_at) < self.STREAM_MAX_AGE
+        self.minute = minute
+        width = self.window
+        k = min(shift, width)
+        last_close = self.close[:, -1].copy()
+        fill_volume = np.where(live, 0.0, np.nan)
+
+        self.close[:, :width - k] = self.close[:, k:]
+        self.volume[:, :width - k] = self.volume[:, k:]
+        self.close[:, width - k:] = last_close[:, None]
+        self.volume[:, width - k:] = fill_volume[:, None]
+        self.lengths = np.where(self.lengths > 0, np.minimum(self.lengths + k, width), 0)
+
+    def seed(self, ticker: str, df: pd.DataFrame, now: Optional[float] = None):
+        """
+        1분 캔들로 마켓 상태 채우기 (마지막 봉 = 현재 분)
+
+        Args:
+            ticker: 코인 티커
+            df: 1분 OHLCV (최근 window개 사용)
+            now: 현재 시각
+        """
+        now = self.clock() if now is None else now
+        self.track([ticker])
+        self._advance(now)
+        row = self.index[ticker]
+        n = min(len(df), self.window)
+        self.close[row] = np.nan
+        self.volume[row] = np.nan
+        if n:
+            self.close[row, self.window - n:] = df['close'].to_numpy(dtype='float64')[-n:]
+            self.volume[row, self.window - n:] = df['volume'].to_numpy(dtype='float64')[-n:]
+        self.lengths[row] = n
+        self.seeded_at[row] = now
+        self.seeds += 1
+
+    def update_prices(self, prices: Dict[str, float], now: Optional[float] = None):
+        """
+        배치 현재가 스냅샷 반영 (현재 분 종가 갱신)
+
+        Args:
+            prices: {ticker: 현재가}
+            now: 현재 시각
+        """
+        now = self.clock() if now is None else now
+        self.track(prices)
+        self._advance(now)
+        rows = np.array([self.index[t] for t in prices], dtype='int64')
+        if not len(rows):
+            return
+        self.close[rows, -1] = np.fromiter(prices.values(), dtype='float64', count=len(rows))
+        self.lengths[rows] = np.maximum(self.lengths[rows], 1)
+
+    def update_from_stream(self, ws_client, max_age: Optional[float] = None, now: Optional[float] = None):
+        """
+        실시간 ticker 스트림 반영 (현재가 + 누적 거래량 차이를 현재 분 거래량에 더함)
+
+        Args:
+            ws_client: UpbitWebSocketClient
+            max_age: 허용 데이터 나이 (초)
+            now: 현재 시각
+        """
+        now = self.clock() if now is None else now
+        self._advance(now)
+        for ticker, row in self.index.items():
+            msg = ws_client.get_ticker(ticker, max_age)
+            if not msg:
+                continue
+            price = msg.get('trade_price')
+            acc = msg.get('acc_trade_volume')
+            if price:
+                self.close[row, -1] = float(price)
+                self.lengths[row] = max(self.lengths[row], 1)
+            if acc is None:
+                continue
+            acc = float(acc)
+            previous = self.acc_volume[row]
+            if np.isfinite(previous):
+                # 누적 거래량은 UTC 0시에 초기화됨 → 감소하면 새 누적값 전체가 증가분
+                delta = acc - previous if acc >= previous else acc
+                current = self.volume[row, -1]
+                self.volume[row, -1] = delta if np.isnan(current) else current + delta
+            self.acc_volume[row] = acc
+            self.stream_at[row] = now
+
+    def _due_for_seed(self, tickers: List[str], now: float, streaming: bool = True) -> List[str]:
+        """
+        캔들 동기화가 필요한 마켓 (미동기화 우선, 오래된 순, 스캔당 최대 개수)
+
+        Args:
+            tickers: 대상 마켓
+            now: 현재 시각
+            streaming: 스트림 연결 여부 (False면 거래량 출처가 캔들뿐 → 분이 바뀐 마켓 모두 대상)
+        """
+        due = []
+        minute = now // 60
+        for ticker in tickers:
+            row = self.index[ticker]
+            seeded_at = self.seeded_at[row]
+            if np.isnan(seeded_at):
+                due.append((-np.inf, ticker))
+            elif not streaming:
+                if seeded_at // 60 < minute:
+                    due.append((seeded_at, ticker))
+            elif (now - self.stream_at[row] >= self.STREAM_MAX_AGE or np.isnan(self.stream_at[row])) \
+                    and now - seeded_at >= self.resync_interval:
+                due.append((seeded_at, ticker))
+        due.sort()
+        return [ticker for _, ticker in due[:self.max_seeds_per_scan]]
+
+    # ==================== 평가 ====================
+
+    def metrics(self, tickers: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        롤링 상태로 급등 지표 일괄 계산 (네트워크 미사용)
+
+        Args:
+            tickers: 평가할 마켓 (None이면 추적 중인 전체, 상태 없는 마켓은 제외)
+
+        Returns:
+            evaluate 결과
+        """
+        names = [t for t in (self.tickers if tickers is None else tickers)
+                 if t in self.index and self.lengths[self.index[t]] > 0]
+        rows = np.array([self.index[t] for t in names], dtype='int64')
+        return self.evaluate(
+            UniverseIndicators.from_arrays(names, self.close[rows], self.volume[rows], self.lengths[rows])
+        )
+
+    def evaluate(self, m1: UniverseIndicators) -> Dict[str, np.ndarray]:
+        """
+        1분 종가/거래량 행렬 → 급등 지표 (롤링 상태와 단일 마켓 캔들 조회가 같은 정의를 공유)
+
+        1분: 직전 1분 대비, 5분/15분: 5/15개 전 1분 종가 대비 (봉 부족 시 첫 봉 대비),
+        거래량 비율: 최근 5분 평균 / 그 이전 window - 5분 평균
+
+        Args:
+            m1: 1분 단위 UniverseIndicators
+
+        Returns:
+            {'tickers', 'change_1m', 'change_5m', 'change_15m', 'volume_ratio',
+             'surge_score', 'current_price', 'is_surge'} (티커 순서 배열)
+        """
+        detector = self.detector
+        change_1m = m1.change(1)
+        change_5m = m1.change(5, clamp=True)
+        change_15m = m1.change(15, clamp=True)
+        volume_ratio = m1.window_volume_ratio(recent=5, base=self.window)
+        surge_score = detector.calculate_surge_scores(change_1m, change_5m, change_15m, volume_ratio)
+        is_surge = (
+            (change_1m >= detector.threshold_1m) &
+            (volume_ratio >= detector.volume_ratio_threshold) &
+            (surge_score >= detector.min_surge_score)
+        )
+        return {
+            'tickers': m1.tickers,
+            'change_1m': change_1m,
+            'change_5m': change_5m,
+            'change_15m': change_15m,
+            'volume_ratio': volume_ratio,
+            'surge_score': surge_score,
+            'current_price': m1.price,
+            'is_surge': is_surge,
+        }
+
+    def scan(self, tickers: List[str], prices: Dict[str, float], api=None, ws_client=None,
+             ws_max_age: Optional[float] = None) -> List[Dict]:
+        """
+        상태 갱신 후 급등 마켓 반환
+
+        Args:
+            tickers: 스캔할 마켓
+            prices: 이미 조회한 배치 현재가 {ticker: price} (없는 마켓은 제외)
+            api: 캔들 동기화용 UpbitAPI (None이면 동기화 생략)
+            ws_client: 실시간 스트림 (None이면 거래량은 분마다 캔들 재동기화로 갱신)
+            ws_max_age: 스트림 데이터 허용 나이 (초)
+
+        Returns:
+            급등 정보 리스트 (티커 순서, detect_surge와 같은 필드)
+        """
+        started = time.monotonic()
+        now = self.clock()
+        targets = [t for t in tickers if t in prices]
+        self.track(targets)
+
+        if ws_client is not None:
+            self.update_from_stream(ws_client, ws_max_age, now)
+
+        if api is not None:
+            for ticker in self._due_for_seed(targets, now, streaming=ws_client is not None):
+                try:
+                    df = api.get_ohlcv(ticker, interval='minute1', count=self.window)
+                except Exception as e:
+                    print(f"❌ {ticker} 급등 상태 동기화 실패: {e}")
+                    continue
+                if df is not None and len(df):
+                    self.seed(ticker, df, now)
+        self.update_prices({t: prices[t] for t in targets}, now)
+
+        detected = self.detector.surges_from_metrics(self.metrics(targets))
+        self.scans += 1
+        self.last_duration = time.monotonic() - started
+        return list(detected.values())
+
+    def get_stats(self) -> Dict:
+        """스캐너 통계"""
+        now = self.clock()
+        return {
+            'tracked': len(self.tickers),
+            'stream_volume': int(((now - self.stream_at) < self.STREAM_MAX_AGE).sum()),
+            'scans': self.scans,
+            'seeds': self.seeds,
+            'last_duration': self.last_duration,
+        }
@@ -0,0 +1,293 @@
+"""
+체결 테이프 기반 급등/급락 감지
+- 개별 체결(REST /v1/trades/ticks 또는 WebSocket trade 형식)을 받을 때마다 마켓별 시간 창 갱신
+- 창은 1초 단위 묶음 deque + 누적 합계 → 체결 추가/만료 모두 O(1) (상각)
+- 창별 가격 변동률, 체결 대금(KRW), 매수/매도 주도 비율을 유지
+- 1분 캔들이 닫히기를 기다리지 않고 움직임 1초 안에 급등/급락 신호 발생
+  (신호 필드는 SurgeDetector.can_chase_buy / execute_ultra_buy 입력과 호환)
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+class _Window:
+    """시간 창 (1초 묶음: [초, 시가, 종가, 매수 대금, 매도 대금])"""
+
+    __slots__ = ('span', 'buckets', 'buy_krw', 'sell_krw', 'ref_price')
+
+    def __init__(self, span: int):
+        self.span = span
+        self.buckets = deque()
+        self.buy_krw = 0.0
+        self.sell_krw = 0.0
+        self.ref_price = None  # 창 시작 직전 마지막 체결가
+
+    def add(self, second: int, price: float, krw: float, is_buy: bool):
+        if self.buckets and self.buckets[-1][0] >= second:
+            bucket = self.buckets[-1]  # 같은 초 (또는 늦게 도착한 체결)
+            bucket[2] = price
+        else:
+            bucket = [second, price, price, 0.0, 0.0]
+            self.buckets.append(bucket)
+        if is_buy:
+            bucket[3] += krw
+            self.buy_krw += krw
+        else:
+            bucket[4] += krw
+            self.sell_krw += krw
+
+    def expire(self, second: int):
+        limit = second - self.span
+        while self.buckets and self.buckets[0][0] <= limit:
+            bucket = self.buckets.popleft()
+            self.buy_krw = max(self.buy_krw - bucket[3], 0.0)
+            self.sell_krw = max(self.sell_krw - bucket[4], 0.0)
+            self.ref_price = bucket[2]
+
+    @property
+    def krw(self) -> float:
+        return self.buy_krw + self.sell_krw
+
+    def change(self, price: float) -> float:
+        """창 시작 대비 변동률 (%)"""
+        base = self.ref_price or (self.buckets[0][1] if self.buckets else None)
+        return (price - base) / base * 100 if base else 0.0
+
+
+class _TapeState:
+    """마켓 1개의 테이프 상태"""
+
+    __slots__ = ('short', 'mid', 'base', 'last_price', 'first_second', 'seen', 'seen_order',
+                 'last_signal', 'trades')
+
+    def __init__(self, spans):
+        self.short, self.mid, self.base = (_Window(span) for span in spans)
+        self.last_price = None
+        self.first_second = None
+        self.seen = set()          # 최근 체결 ID (REST 폴링/스트림 중복 제거)
+        self.seen_order = deque()
+        self.last_signal = {}      # 신호 종류별 마지막 발생 시각 (급락이 급등 신호를 막지 않도록 분리)
+        self.trades = 0
+
+
+class TapeSurgeDetector:
+    """체결 테이프 급등/급락 감지 (스트림 스레드에서 갱신, 스케줄러에서 평가)"""
+
+    def __init__(self, detector, short_window: int = 10, window: int = 60, base_window: int = 600,
+                 min_krw: float = 10_000_000, buy_ratio: float = 0.6, cooldown: float = 30.0,
+                 max_seen: int = 1000):
+        """
+        초기화
+
+        Args:
+            detector: SurgeDetector (임계값, 점수/신뢰도 계산 공유)
+            short_window: 짧은 창 (초)
+            window: 신호 판단 창 (초) - 1분 상승률 자리에 사용
+            base_window: 평소 체결 대금 기준 창 (초)
+            min_krw: 판단 창 최소 체결 대금 (원) - 소량 체결 튐 방지
+            buy_ratio: 급등 최소 매수 주도 비율 (급락은 매도 주도 비율)
+            cooldown: 같은 마켓·같은 종류 신호 재발생 최소 간격 (초)
+            max_seen: 마켓별 중복 제거용 체결 ID 보관 수
+        """
+        self.detector = detector
+        self.spans = (short_window, window, base_window)
+        self.min_krw = min_krw
+        self.buy_ratio = buy_ratio
+        self.cooldown = cooldown
+        self.max_seen = max_seen
+
+        self._states: Dict[str, _TapeState] = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.trades = 0
+        self.duplicates = 0
+        self.signals = 0
+
+    # ==================== 체결 입력 ====================
+
+    def on_trade(self, market: str, trade: Dict):
+        """
+        체결 1건 반영 (WebSocket 수신 콜백으로 사용 가능)
+
+        Args:
+            market: 마켓 코드
+            trade: {'timestamp'(ms), 'trade_price', 'trade_volume', 'ask_bid', 'sequential_id'}
+        """
+        try:
+            price = float(trade['trade_price'])
+            volume = float(trade['trade_volume'])
+        except (KeyError, TypeError, ValueError):
+            return
+        timestamp = trade.get('timestamp')
+        second = int(timestamp // 1000) if timestamp is not None else int(time.time())
+        is_buy = trade.get('ask_bid') == 'BID'  # 매수 주도 (매수 주문이 매도 호가를 체결)
+        trade_id = trade.get('sequential_id')
+
+        with self._lock:
+            state = self._states.get(market)
+            if state is None:
+                state = self._states[market] = _TapeState(self.spans)
+            if trade_id is not None:
+                if trade_id in state.seen:
+                    self.duplicates += 1
+                    return
+                state.seen.add(trade_id)
+                state.seen_order.append(trade_id)
+                if len(state.seen_order) > self.max_seen:
+                    state.seen.discard(state.seen_order.popleft())
+
+            krw = price * volume
+            for w in (state.short, state.mid, state.base):
+                w.expire(second)
+                w.add(second, price, krw, is_buy)
+            state.last_price = price
+            if state.first_second is None:
+                state.first_second = second
+            state.trades += 1
+            self.trades += 1
+
+    def ingest(self, market: str, trades: Iterable[Dict]):
+        """
+        체결 목록 반영 (get_recent_trades 결과처럼 최신순이어도 시간순으로 정렬해 반영)
+
+        Args:
+            market: 마켓 코드
+            trades: 체결 리스트
+        """
+        for trade in sorted(trades, key=lambda t: t.get('timestamp') or 0):
+            self.on_trade(market, trade)
+
+    # ==================== 평가 ====================
+
+    def get_metrics(self, market: str, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        마켓 테이프 지표 (창 만료 반영)
+
+        Returns:
+            {'price', 'change_short', 'change', 'krw', 'buy_ratio', 'volume_ratio', 'trades'} 또는 None
+        """
+        second = int(time.time() if now is None else now)
+        with self._lock:
+            state = self._states.get(market)
+            if state is None or state.last_price is None:
+                return None
+            for w in (state.short, state.mid, state.base):
+                w.expire(second)
+            price = state.last_price
+            mid, base = state.mid, state.base
+
+            # 판단 창 평균 대금 / 그 이전 구간 평균 대금 (이전 구간이 창 길이보다 짧으면 1.0)
+            observed = min(second - state.first_second + 1, base.span)
+            previous_span = observed - mid.span
+            previous_krw = base.krw - mid.krw
+            if previous_span >= mid.span and previous_krw > 0:
+                volume_ratio = (mid.krw / mid.span) / (previous_krw / previous_span)
+            else:
+                volume_ratio = 1.0
+            return {
+                'price': price,
+                'change_short': state.short.change(price),
+                'change': mid.change(price),
+                'krw': mid.krw,
+                'buy_ratio': mid.buy_krw / mid.krw if mid.krw > 0 else 0.5,
+                'volume_ratio': volume_ratio,
+                'trades': state.trades,
+            }
+
+    def evaluate(self, market: str, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        급등/급락 신호 판단
+
+        급등: 판단 창 상승률 ≥ 1분 임계값, 매수 주도 비율 ≥ buy_ratio,
+              대금 비율 ≥ 거래량 임계값, 급등 점수 ≥ 최소 점수, 대금 ≥ min_krw
+        급락: 하락 방향으로 같은 조건 (매도 주도 비율 기준)
+
+        Returns:
+            신호 정보 (detect_surge 필드 + type/price_change/buy_ratio/traded_krw) 또는 None
+        """
+        metrics = self.get_metrics(market, now)
+        if metrics is None or metrics['krw'] < self.min_krw:
+            return None
+
+        detector = self.detector
+        change = metrics['change']
+        if change >= detector.threshold_1m and metrics['buy_ratio'] >= self.buy_ratio:
+            signal_type = 'surge'
+        elif change <= -detector.threshold_1m and 1 - metrics['buy_ratio'] >= self.buy_ratio:
+            signal_type = 'dump'
+        else:
+            return None
+
+        volume_ratio = metrics['volume_ratio']
+        if volume_ratio < detector.volume_ratio_threshold:
+            return None
+        surge_score = detector.calculate_surge_score(abs(change), 0.0, 0.0, volume_ratio)
+        if surge_score < detector.min_surge_score:
+            return None
+
+        return {
+            'ticker': market,
+            'type': signal_type,
+            'price_change': change,
+            'change_1m': change,
+            'change_10s': metrics['change_short'],
+            'volume_ratio': volume_ratio,
+            'buy_ratio': metrics['buy_ratio'],
+            'traded_krw': metrics['krw'],
+            'surge_score': surge_score,
+            'current_price': metrics['price'],
+            'timestamp': datetime.now(),
+            'confidence': detector.calculate_confidence(surge_score, volume_ratio),
+            'source': 'tape',
+        }
+
+    def poll(self, markets: Iterable[str], now: Optional[float] = None,
+             kinds: Iterable[str] = ('surge', 'dump')) -> List[Dict]:
+        """
+        여러 마켓 신호 조회 (같은 마켓·같은 종류는 cooldown 동안 1번만)
+
+        Args:
+            markets: 평가할 마켓
+            now: 현재 시각
+            kinds: 받을 신호 종류 ('surge', 'dump') - 나머지는 쿨다운을 남기지 않고 버림
+
+        Returns:
+            신호 리스트 (급등 점수 높은 순)
+        """
+        now = time.time() if now is None else now
+        kinds = set(kinds)
+        signals = []
+        for market in markets:
+            state = self._states.get(market)
+            if state is None:
+                continue
+            signal = self.evaluate(market, now)
+            if not signal or signal['type'] not in kinds:
+                continue
+            if now - state.last_signal.get(signal['type'], 0.0) < self.cooldown:
+                continue
+            state.last_signal[signal['type']] = now
+            signals.append(signal)
+        self.signals += len(signals)
+        return sorted(signals, key=lambda s: s['surge_score'], reverse=True)
+
+    def retain(self, markets: Iterable[str]):
+        """주어진 마켓 외의 상태 제거 (구독 해제된 마켓 정리)"""
+        keep = set(markets)
+        with self._lock:
+            for market in [m for m in self._states if m not in keep]:
+                del self._states[market]
+
+    def get_stats(self) -> Dict:
+        """감지기 통계"""
+        return {
+            'markets': len(self._states),
+            'trades': self.trades,
+            'duplicates': self.duplicates,
+            'signals': self.signals,
+        }
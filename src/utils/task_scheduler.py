@@ -0,0 +1,229 @@
+"""
+마감 시각 기반 작업 스케줄러 (메인 루프 단일 스레드)
+- 이름 있는 주기 작업: 주기마다 마감 시각(deadline)을 두고, 마감이 지난 작업 중 우선순위가 높은 것부터 실행
+- 제너레이터 작업은 yield 단위(티커 1개 등)로 나눠 실행 → 단위 사이에 더 급한 작업(청산 체크)이 끼어듦
+- 작업별 지연(lateness = 실제 시작 - 마감) p50/p99/최대, 실행 시간, 건너뛴 주기 기록
+- 대기는 다음 마감까지만 (고정 sleep 없음)
+"""
+
+import time
+import types
+from collections import deque
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class JobPriority(IntEnum):
+    """작업 우선순위 (작을수록 먼저)"""
+    EXIT = 0        # 보유 포지션 청산 체크
+    SURGE = 1       # 초단타 청산 + 급등/급락 진입
+    DISPLAY = 2     # 화면 갱신, 리스크 상태
+    SCAN = 3        # 전체 스캔 (티커 단위로 양보)
+    BACKGROUND = 4  # 코인 목록 갱신, 모니터링
+
+
+class ScheduledJob:
+    """주기 작업 1개 (마감 시각 + 진행 중 제너레이터 + 지연 통계)"""
+
+    def __init__(self, name: str, func: Callable, interval: float, priority: int,
+                 next_run: float, history: int = 500):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.priority = priority
+        self.next_run = next_run        # 다음 마감 시각
+        self.deadline = next_run        # 진행 중 실행의 마감 시각
+        self.task: Optional[types.GeneratorType] = None
+        self.started_at = 0.0
+
+        # 통계
+        self.runs = 0
+        self.steps = 0
+        self.errors = 0
+        self.missed = 0
+        self.lateness = deque(maxlen=history)
+        self.durations = deque(maxlen=history)
+
+    @property
+    def running(self) -> bool:
+        """제너레이터 작업이 진행 중인지"""
+        return self.task is not None
+
+    def is_ready(self, now: float) -> bool:
+        return self.task is not None or now >= self.next_run
+
+    def get_stats(self) -> Dict:
+        """작업 통계 (시간 단위: ms)"""
+        lateness = np.array(self.lateness) * 1000
+        durations = np.array(self.durations) * 1000
+        return {
+            'interval': self.interval,
+            'priority': int(self.priority),
+            'runs': self.runs,
+            'steps': self.steps,
+            'errors': self.errors,
+            'missed': self.missed,
+            'running': self.running,
+            'lateness_p50_ms': float(np.percentile(lateness, 50)) if len(lateness) else 0.0,
+            'lateness_p99_ms': float(np.percentile(lateness, 99)) if len(lateness) else 0.0,
+            'lateness_max_ms': float(lateness.max()) if len(lateness) else 0.0,
+            'duration_avg_ms': float(durations.mean()) if len(durations) else 0.0,
+        }
+
+
+class TaskScheduler:
+    """마감 시각 + 우선순위 기반 협조적 스케줄러"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep, max_idle: float = 1.0,
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        """
+        초기화
+
+        Args:
+            clock: 현재 시각 함수 (테스트에서 가짜 시계 주입)
+            sleep: 대기 함수
+            max_idle: 한 번에 대기할 최대 시간 (초, 중지 요청 확인 주기)
+            on_error: 작업 오류 콜백 (작업 이름, 예외) - None이면 콘솔 출력만
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.max_idle = max_idle
+        self.on_error = on_error
+        self.jobs: Dict[str, ScheduledJob] = {}
+
+    # ==================== 작업 등록 ====================
+
+    def add_job(self, name: str, func: Callable, interval: float,
+                priority: int = JobPriority.BACKGROUND, delay: float = 0.0) -> ScheduledJob:
+        """
+        주기 작업 등록
+
+        Args:
+            name: 작업 이름 (중복 시 교체)
+            func: 실행 함수 (제너레이터 함수면 yield마다 양보)
+            interval: 실행 주기 (초)
+            priority: 우선순위 (작을수록 먼저)
+            delay: 첫 마감까지의 지연 (초, 0이면 즉시)
+
+        Returns:
+            등록된 ScheduledJob
+        """
+        if interval <= 0:
+            raise ValueError(f"작업 주기는 0보다 커야 합니다: {name}={interval}")
+        job = ScheduledJob(name, func, interval, priority, self.clock() + delay)
+        self.jobs[name] = job
+        return job
+
+    def remove_job(self, name: str):
+        self.jobs.pop(name, None)
+
+    def trigger(self, name: str):
+        """작업을 즉시 실행 대상으로 (마감을 현재 시각으로 당김)"""
+        job = self.jobs.get(name)
+        if job and not job.running:
+            job.next_run = min(job.next_run, self.clock())
+
+    def next_run_in(self, name: str) -> float:
+        """작업의 다음 마감까지 남은 시간 (초, 진행 중이면 0)"""
+        job = self.jobs.get(name)
+        if job is None or job.running:
+            return 0.0
+        return max(job.next_run - self.clock(), 0.0)
+
+    # ==================== 실행 ====================
+
+    def _select(self, now: float) -> Optional[ScheduledJob]:
+        """실행할 작업: 준비된 작업 중 우선순위 → 마감 시각 순"""
+        ready = [job for job in self.jobs.values() if job.is_ready(now)]
+        if not ready:
+            return None
+        return min(ready, key=lambda job: (job.priority, job.deadline if job.running else job.next_run))
+
+    def _start(self, job: ScheduledJob, now: float):
+        """새 실행 시작: 지연 기록 후 다음 마감 설정 (고정 주기, 밀린 주기는 건너뜀)"""
+        job.deadline = job.next_run
+        job.lateness.append(max(now - job.deadline, 0.0))
+        job.started_at = now
+        job.runs += 1
+
+        job.next_run = job.deadline + job.interval
+        if job.next_run <= now:
+            skipped = int((now - job.next_run) // job.interval) + 1
+            job.missed += skipped
+            job.next_run += skipped * job.interval
+
+    def _finish(self, job: ScheduledJob):
+        job.task = None
+        job.durations.append(self.clock() - job.started_at)
+
+    def run_once(self) -> bool:
+        """
+        가장 급한 작업 1단위 실행 (일반 함수는 전체, 제너레이터는 다음 yield까지)
+
+        Returns:
+            실행한 작업이 있으면 True
+        """
+        now = self.clock()
+        job = self._select(now)
+        if job is None:
+            return False
+
+        try:
+            if not job.running:
+                self._start(job, now)
+                result = job.func()
+                if not isinstance(result, types.GeneratorType):
+                    job.steps += 1
+                    self._finish(job)
+                    return True
+                job.task = result
+
+            job.steps += 1
+            try:
+                next(job.task)
+            except StopIteration:
+                self._finish(job)
+        except Exception as e:
+            job.errors += 1
+            if job.task is not None:
+                job.task.close()
+            self._finish(job)
+            if self.on_error:
+                self.on_error(job.name, e)
+            else:
+                print(f"❌ 작업 실행 실패 ({job.name}): {e}")
+        return True
+
+    def idle_time(self) -> float:
+        """다음 마감까지 대기할 시간 (초, 0 ~ max_idle)"""
+        if not self.jobs:
+            return self.max_idle
+        now = self.clock()
+        if any(job.is_ready(now) for job in self.jobs.values()):
+            return 0.0
+        wait = min(job.next_run for job in self.jobs.values()) - now
+        return min(max(wait, 0.0), self.max_idle)
+
+    def run_forever(self, should_run: Callable[[], bool]):
+        """
+        should_run()이 False가 될 때까지 실행
+
+        Args:
+            should_run: 계속 실행 여부 (작업 단위마다 확인)
+        """
+        while should_run():
+            if not self.run_once():
+                self.sleep(self.idle_time())
+
+    # ==================== 통계 ====================
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """작업별 통계"""
+        return {name: job.get_stats() for name, job in self.jobs.items()}
+
+    def late_jobs(self, threshold_ms: float) -> List[str]:
+        """p99 지연이 threshold_ms를 넘는 작업 이름"""
+        return [name for name, stats in self.get_stats().items() if stats['lateness_p99_ms'] > threshold_ms]
@@ -3,10 +3,11 @@
 실시간 손익 알림 및 긴급 알림
 """
 
-import requests
 from datetime import datetime
 from typing import Dict, Optional
 
+from .http_session import http_transport
+
 
 class TelegramNotifier:
     """텔레그램 봇 알림"""
@@ -45,7 +46,8 @@ class TelegramNotifier:
                 'text': message,
                 'parse_mode': parse_mode
             }
-            response = requests.post(url, json=payload, timeout=10)
+            # URL에 봇 토큰이 있으므로 통계 이름 별도 지정
+            response = http_transport.post(url, json=payload, endpoint='telegram/sendMessage')
             return response.status_code == 200
         except Exception as e:
             print(f"❌ 텔레그램 전송 실패: {e}")
@@ -0,0 +1,244 @@
+"""
+구조화 추적 (핫 패스 디버그 진단용)
+- 카테고리별 레벨 (DEBUG < INFO < WARNING < ERROR)
+- 호출 측은 `if trace_x.debug_on:` 속성 1회 확인으로 가드 → 꺼진 카테고리는 메시지 포맷 비용 없음
+- 켜진 카테고리는 구조화 레코드(시각, 레벨, 카테고리, 스레드, 메시지, 필드)를 링 버퍼에 보관
+- 파일/콘솔 출력은 백그라운드 기록 스레드가 담당 (호출 스레드는 큐에 넣기만 함)
+
+설정 예:
+    TRACE_LEVEL=WARNING                  # 기본 레벨
+    TRACE_CATEGORIES="*,sell:debug"      # 전체 + sell 카테고리만 DEBUG
+    TRACE_FILE=trading_logs/trace.jsonl  # JSON Lines 파일 (비우면 링 버퍼만)
+"""
+
+import json
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+
+class Level(IntEnum):
+    """추적 레벨 (클수록 중요)"""
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    OFF = 100
+
+
+def parse_level(value) -> Level:
+    """'debug' / 'INFO' / 20 → Level"""
+    if isinstance(value, Level):
+        return value
+    if isinstance(value, int):
+        return Level(value)
+    return Level[str(value).strip().upper()]
+
+
+class TraceCategory:
+    """추적 카테고리 (레벨별 on 속성은 Tracer.configure가 갱신)"""
+
+    __slots__ = ('name', 'tracer', 'level', 'debug_on', 'info_on', 'warning_on', 'error_on')
+
+    def __init__(self, name: str, tracer: 'Tracer', level: Level):
+        self.name = name
+        self.tracer = tracer
+        self.set_level(level)
+
+    def set_level(self, level: Level):
+        self.level = level
+        self.debug_on = level <= Level.DEBUG
+        self.info_on = level <= Level.INFO
+        self.warning_on = level <= Level.WARNING
+        self.error_on = level <= Level.ERROR
+
+    def debug(self, message: str, **fields):
+        if self.debug_on:
+            self.tracer.emit(self.name, Level.DEBUG, message, fields)
+
+    def info(self, message: str, **fields):
+        if self.info_on:
+            self.tracer.emit(self.name, Level.INFO, message, fields)
+
+    def warning(self, message: str, **fields):
+        if self.warning_on:
+            self.tracer.emit(self.name, Level.WARNING, message, fields)
+
+    def error(self, message: str, exc_info: bool = False, **fields):
+        """
+        오류 기록
+
+        Args:
+            message: 메시지
+            exc_info: True면 처리 중인 예외의 스택 트레이스를 traceback 필드로 기록
+        """
+        if self.error_on:
+            if exc_info:
+                fields['traceback'] = traceback.format_exc()
+            self.tracer.emit(self.name, Level.ERROR, message, fields)
+
+
+class Tracer:
+    """카테고리 레지스트리 + 링 버퍼 + 백그라운드 기록"""
+
+    def __init__(self, level=Level.WARNING, categories: str = '*', buffer_size: int = 2000,
+                 queue_size: int = 10000):
+        """
+        초기화
+
+        Args:
+            level: 기본 레벨
+            categories: 켤 카테고리 ("*" 전체, "sell,check:debug" 형식으로 카테고리별 레벨 지정)
+            buffer_size: 링 버퍼 크기 (최근 레코드 수)
+            queue_size: 파일/콘솔 기록 대기열 크기 (가득 차면 버림)
+        """
+        self.buffer = deque(maxlen=buffer_size)
+        self._categories: Dict[str, TraceCategory] = {}
+        self._lock = threading.Lock()
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._file = None
+        self.console = False
+
+        # 통계
+        self.emitted = 0
+        self.written = 0
+        self.dropped = 0
+
+        self.configure(level=level, categories=categories)
+
+    # ==================== 설정 ====================
+
+    def configure(self, level=None, categories: Optional[str] = None,
+                  path: Optional[str] = None, console: Optional[bool] = None):
+        """
+        레벨/카테고리/출력 설정 (이미 만든 카테고리에도 즉시 반영)
+
+        Args:
+            level: 기본 레벨
+            categories: 켤 카테고리 명세
+            path: JSON Lines 기록 파일 (None이면 변경 없음, ''이면 파일 기록 중지)
+            console: 콘솔 출력 여부
+        """
+        with self._lock:
+            if level is not None:
+                self.default_level = parse_level(level)
+            if categories is not None:
+                self.category_levels, self.wildcard = self._parse_categories(categories)
+            for category in self._categories.values():
+                category.set_level(self._level_for(category.name))
+
+        if console is not None:
+            self.console = console
+        if path is not None:
+            self._open(path)
+        if (self._file or self.console) and not (self._writer and self._writer.is_alive()):
+            self._writer = threading.Thread(target=self._write_loop, name='trace-writer', daemon=True)
+            self._writer.start()
+
+    def _parse_categories(self, spec: str):
+        levels, wildcard = {}, False
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            name, _, level = item.partition(':')
+            if name == '*':
+                wildcard = True
+                if level:
+                    self.default_level = parse_level(level)
+                continue
+            levels[name] = parse_level(level) if level else None
+        return levels, wildcard
+
+    def _level_for(self, name: str) -> Level:
+        if name in self.category_levels:
+            return self.category_levels[name] or self.default_level
+        return self.default_level if self.wildcard else Level.OFF
+
+    def category(self, name: str) -> TraceCategory:
+        """카테고리 조회 (없으면 현재 설정으로 생성)"""
+        with self._lock:
+            if name not in self._categories:
+                self._categories[name] = TraceCategory(name, self, self._level_for(name))
+            return self._categories[name]
+
+    # ==================== 기록 ====================
+
+    def emit(self, category: str, level: Level, message: str, fields: Dict):
+        """레코드 1건 기록 (링 버퍼 + 기록 대기열)"""
+        record = {
+            'ts': time.time(),
+            'level': level.name,
+            'category': category,
+            'thread': threading.current_thread().name,
+            'message': message,
+        }
+        if fields:
+            record.update(fields)
+        self.buffer.append(record)
+        self.emitted += 1
+        if self._file or self.console:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def _open(self, path: str):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if path:
+            try:
+                self._file = open(path, 'a', encoding='utf-8')
+            except OSError as e:
+                print(f"❌ 추적 파일 열기 실패: {e}")
+
+    def _write_loop(self):
+        while True:
+            try:
+                record = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._file:
+                    self._file.flush()
+                continue
+            line = json.dumps(record, ensure_ascii=False, default=str)
+            file = self._file
+            if file:
+                try:
+                    file.write(line + '\n')
+                except ValueError:  # 기록 중 파일 교체/닫힘
+                    pass
+            if self.console:
+                print(f"[{record['category']}] {record['message']}")
+            self.written += 1
+            self._queue.task_done()
+
+    def flush(self, timeout: float = 2.0):
+        """대기열 기록 완료까지 대기 (종료/테스트용)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if self._file:
+            self._file.flush()
+
+    def records(self, category: Optional[str] = None, level=None) -> List[Dict]:
+        """링 버퍼 레코드 조회 (카테고리/최소 레벨 필터)"""
+        minimum = parse_level(level) if level is not None else Level.DEBUG
+        return [r for r in list(self.buffer)
+                if (category is None or r['category'] == category) and Level[r['level']] >= minimum]
+
+    def get_stats(self) -> Dict:
+        """추적 통계"""
+        return {
+            'emitted': self.emitted,
+            'written': self.written,
+            'dropped': self.dropped,
+            'buffered': len(self.buffer),
+            'categories': {name: c.level.name for name, c in self._categories.items()},
+        }
+
+
+# 전역 인스턴스
+tracer = Tracer()
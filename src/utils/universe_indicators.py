@@ -0,0 +1,164 @@
+"""
+티커 전체 일괄 지표 (횡단면 계산)
+- 티커별 최근 캔들을 마지막 봉 기준으로 오른쪽 정렬해 (티커 × 시간) 행렬로 쌓고 한 번에 계산
+- 봉이 부족한 티커는 왼쪽을 NaN으로 채우며, 값은 티커별 pandas 계산의 마지막 값과 같음
+- 티커 수가 늘어도 NumPy 호출 횟수는 그대로 (티커당 pandas 호출 오버헤드 제거)
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import vector_indicators as vi
+
+
+def stack_tail(frames: Dict[str, pd.DataFrame], count: Optional[int] = None,
+               columns: Sequence[str] = ('close', 'volume')) -> Tuple[List[str], Dict[str, np.ndarray], np.ndarray]:
+    """
+    티커별 최근 count개 봉을 오른쪽 정렬로 쌓기
+
+    Args:
+        frames: {ticker: OHLCV DataFrame} (None/빈 값은 제외)
+        count: 행렬 폭 (None이면 가장 긴 캔들 길이)
+        columns: 쌓을 컬럼
+
+    Returns:
+        (티커 리스트, {컬럼: (티커 수, count) 배열}, 티커별 유효 봉 개수 배열)
+    """
+    tickers = [t for t, df in frames.items() if df is not None and len(df) > 0]
+    width = count or max((len(frames[t]) for t in tickers), default=0)
+    lengths = np.array([min(len(frames[t]), width) for t in tickers], dtype='int64')
+
+    arrays = {}
+    for column in columns:
+        matrix = np.full((len(tickers), width), np.nan)
+        for row, ticker in enumerate(tickers):
+            n = lengths[row]
+            if n:
+                matrix[row, width - n:] = frames[ticker][column].to_numpy(dtype='float64')[-n:]
+        arrays[column] = matrix
+    return tickers, arrays, lengths
+
+
+class UniverseIndicators:
+    """티커 전체의 마지막 봉 기준 지표 (결과는 티커 순서의 1차원 배열)"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], count: Optional[int] = None):
+        """
+        Args:
+            frames: {ticker: OHLCV DataFrame}
+            count: 사용할 최근 봉 개수 (None이면 가장 긴 캔들 길이)
+        """
+        tickers, arrays, lengths = stack_tail(frames, count)
+        self._set_arrays(tickers, arrays['close'], arrays['volume'], lengths)
+
+    @classmethod
+    def from_arrays(cls, tickers: List[str], close: np.ndarray, volume: np.ndarray,
+                    lengths: Optional[np.ndarray] = None) -> 'UniverseIndicators':
+        """
+        이미 오른쪽 정렬된 (티커 × 시간) 배열로 생성 (롤링 상태를 캔들 없이 평가할 때)
+
+        Args:
+            tickers: 티커 리스트 (행 순서)
+            close / volume: (티커 수, 폭) 배열
+            lengths: 티커별 유효 봉 개수 (None이면 종가가 있는 칸 수)
+        """
+        self = cls.__new__(cls)
+        if lengths is None:
+            lengths = np.isfinite(close).sum(axis=1)
+        self._set_arrays(list(tickers), close, volume, np.asarray(lengths, dtype='int64'))
+        return self
+
+    def _set_arrays(self, tickers: List[str], close: np.ndarray, volume: np.ndarray, lengths: np.ndarray):
+        self.tickers = tickers
+        self.lengths = lengths
+        self.close = close
+        self.volume = volume
+        self.width = self.close.shape[1]
+        rows = np.arange(len(self.tickers))
+        self.price = self.close[rows, self.width - 1] if self.width else np.full(len(self.tickers), np.nan)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def to_dict(self, values: np.ndarray) -> Dict[str, float]:
+        """배열 → {ticker: 값}"""
+        return {ticker: float(v) for ticker, v in zip(self.tickers, values)}
+
+    def _at(self, offset: np.ndarray) -> np.ndarray:
+        """마지막 봉에서 offset개 이전 값 (티커별)"""
+        rows = np.arange(len(self.tickers))
+        return self.close[rows, self.width - 1 - offset]
+
+    # ==================== 지표 ====================
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        """RSI (BaseStrategy.calculate_rsi의 마지막 값, 봉 부족 시 NaN)"""
+        tail = self.close[:, -(period + 1):]
+        value = vi.rsi(tail, period)[:, -1] if tail.shape[1] >= period else np.full(len(self), np.nan)
+        return np.where(self.lengths >= period, value, np.nan)
+
+    def sma(self, period: int) -> np.ndarray:
+        """이동평균 (봉 부족 시 NaN)"""
+        if self.width < period:
+            return np.full(len(self), np.nan)
+        return np.where(self.lengths >= period, self.close[:, -period:].mean(axis=1), np.nan)
+
+    def volatility(self, period: Optional[int] = None) -> np.ndarray:
+        """
+        변동성 (수익률 표준편차, %)
+
+        Args:
+            period: 최근 period개 수익률 (None이면 전체, df['close'].pct_change().std()와 동일)
+        """
+        close = self.close if period is None else self.close[:, -(period + 1):]
+        returns = vi.pct_change(close)[:, 1:]
+        returns = np.where(np.isfinite(returns), returns, np.nan)
+        counts = np.isfinite(returns).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.nanstd(returns, axis=1, ddof=1) if returns.shape[1] else np.full(len(self), np.nan)
+        return np.where(counts > 1, std * 100, np.nan)
+
+    def volume_ratio(self, period: int = 20) -> np.ndarray:
+        """거래량 비율 (BaseStrategy.calculate_volume_ratio와 동일, 봉 부족/평균 0이면 1.0)"""
+        if self.width < period:
+            return np.ones(len(self))
+        avg = self.volume[:, -period:].mean(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = self.volume[:, -1] / avg
+        return np.where((self.lengths >= period) & (avg != 0) & np.isfinite(ratio), ratio, 1.0)
+
+    def window_volume_ratio(self, recent: int = 5, base: int = 20) -> np.ndarray:
+        """
+        최근 recent개 평균 거래량 / 그 이전 (base - recent)개 평균 (SurgeDetector 방식)
+
+        이전 구간이 없거나 평균이 0이면 1.0
+        """
+        def window_mean(window):
+            counts = np.isfinite(window).sum(axis=1)
+            return np.nansum(window, axis=1) / counts
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            current = window_mean(self.volume[:, max(self.width - recent, 0):])
+            previous = window_mean(self.volume[:, max(self.width - base, 0):max(self.width - recent, 0)])
+            ratio = current / previous
+        return np.where(previous > 0, ratio, 1.0)
+
+    def change(self, periods: int = 1, clamp: bool = False) -> np.ndarray:
+        """
+        가격 변동률 (%)
+
+        Args:
+            periods: 비교할 이전 봉 수
+            clamp: 봉이 부족하면 첫 봉과 비교 (False면 0.0, BaseStrategy.get_price_change와 동일)
+        """
+        if not len(self):
+            return np.empty(0)
+        offset = np.minimum(periods, np.maximum(self.lengths - 1, 0))
+        prev = self._at(offset)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            value = (self.price - prev) / prev * 100
+        enough = self.lengths >= periods + 1
+        valid = (enough | clamp) & (prev != 0) & np.isfinite(value)
+        return np.where(valid, value, 0.0)
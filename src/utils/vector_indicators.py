@@ -0,0 +1,120 @@
+"""
+NumPy 벡터화 지표
+- 전체 시계열(1차원) 또는 티커 × 시간 행렬(2차원)을 한 번에 계산 (시간 축은 마지막 축)
+- 값은 BaseStrategy의 pandas 구현과 같음 (rolling 창 미만 구간은 NaN)
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .candle_store import OHLCV_COLUMNS
+
+
+def _rolling(x: np.ndarray, period: int, func: str, **kwargs) -> np.ndarray:
+    x = np.asarray(x, dtype='float64')
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < period:
+        return out
+    windows = sliding_window_view(x, period, axis=-1)
+    out[..., period - 1:] = getattr(windows, func)(axis=-1, **kwargs)
+    return out
+
+
+def rolling_mean(x: np.ndarray, period: int) -> np.ndarray:
+    """이동평균 (pandas rolling(period).mean()과 동일)"""
+    return _rolling(x, period, 'mean')
+
+
+def rolling_std(x: np.ndarray, period: int) -> np.ndarray:
+    """이동 표준편차 (표본 표준편차, pandas rolling(period).std()와 동일)"""
+    return _rolling(x, period, 'std', ddof=1)
+
+
+def diff(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """차분 (앞쪽 periods개는 NaN)"""
+    x = np.asarray(x, dtype='float64')
+    out = np.full(x.shape, np.nan)
+    out[..., periods:] = x[..., periods:] - x[..., :-periods]
+    return out
+
+
+def pct_change(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """변동률 (비율, 앞쪽 periods개는 NaN)"""
+    x = np.asarray(x, dtype='float64')
+    out = np.full(x.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[..., periods:] = x[..., periods:] / x[..., :-periods] - 1
+    return out
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """지수이동평균 (pandas ewm(span, adjust=False).mean()과 동일)"""
+    x = np.asarray(x, dtype='float64')
+    if x.ndim == 1:
+        return pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+    return pd.DataFrame(x.T).ewm(span=span, adjust=False).mean().to_numpy().T
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI (단순 이동평균 방식, BaseStrategy.calculate_rsi와 동일)"""
+    delta = diff(close)
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def bollinger_bands(close: np.ndarray, period: int = 20, std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """볼린저 밴드 (상단, 중단, 하단)"""
+    middle = rolling_mean(close, period)
+    dev = rolling_std(close, period)
+    return middle + dev * std, middle, middle - dev * std
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD (MACD, Signal, Histogram)"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def volume_ratio(volume: np.ndarray, period: int = 20) -> np.ndarray:
+    """
+    거래량 비율 (현재 거래량 / 현재 포함 최근 period개 평균)
+
+    BaseStrategy.calculate_volume_ratio와 같이 봉이 부족하거나 평균이 0이면 1.0
+    """
+    avg = rolling_mean(volume, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.asarray(volume, dtype='float64') / avg
+    return np.where(np.isfinite(ratio) & (avg != 0), ratio, 1.0)
+
+
+def stack_ohlcv(frames: Dict[str, pd.DataFrame]) -> Tuple[List[str], pd.DatetimeIndex, Dict[str, np.ndarray]]:
+    """
+    티커별 OHLCV를 시각 기준으로 맞춰 티커 × 시간 행렬로 변환 (없는 봉은 NaN)
+
+    Returns:
+        (티커 리스트, 공통 시각 인덱스, {컬럼: (티커 수, 시간) 배열})
+    """
+    tickers = [t for t, df in frames.items() if df is not None and len(df) > 0]
+    if not tickers:
+        return [], pd.DatetimeIndex([]), {c: np.empty((0, 0)) for c in OHLCV_COLUMNS}
+
+    index = frames[tickers[0]].index
+    for ticker in tickers[1:]:
+        index = index.union(frames[ticker].index)
+
+    arrays = {}
+    for column in OHLCV_COLUMNS:
+        matrix = np.full((len(tickers), len(index)), np.nan)
+        for row, ticker in enumerate(tickers):
+            df = frames[ticker]
+            if column in df:
+                matrix[row, index.get_indexer(df.index)] = df[column].to_numpy(dtype='float64')
+        arrays[column] = matrix
+    return tickers, index, arrays
@@ -0,0 +1,389 @@
+"""
+Upbit 실시간 시세 WebSocket 클라이언트
+- ticker / orderbook / trade 채널 구독
+- 마켓별 최신 상태를 메모리에 유지 (조회 시 네트워크 미사용)
+- 연결 끊김 시 자동 재연결, 구독 코인 변경 시 자동 재구독
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+import websockets
+
+
+UPBIT_WS_URI = "wss://api.upbit.com/websocket/v1"
+
+# SIMPLE 포맷 약어 → DEFAULT 필드명 (ticker / trade / orderbook 공통)
+SIMPLE_KEYS = {
+    'ty': 'type', 'cd': 'code', 'st': 'stream_type', 'tms': 'timestamp',
+    'op': 'opening_price', 'hp': 'high_price', 'lp': 'low_price', 'tp': 'trade_price',
+    'pcp': 'prev_closing_price', 'c': 'change', 'cp': 'change_price',
+    'scp': 'signed_change_price', 'cr': 'change_rate', 'scr': 'signed_change_rate',
+    'tv': 'trade_volume', 'atv': 'acc_trade_volume', 'atv24h': 'acc_trade_volume_24h',
+    'atp': 'acc_trade_price', 'atp24h': 'acc_trade_price_24h',
+    'tdt': 'trade_date', 'td': 'trade_date', 'ttm': 'trade_time', 'ttms': 'trade_timestamp',
+    'ab': 'ask_bid', 'aav': 'acc_ask_volume', 'abv': 'acc_bid_volume', 'sid': 'sequential_id',
+    'tas': 'total_ask_size', 'tbs': 'total_bid_size', 'obu': 'orderbook_units',
+    'ap': 'ask_price', 'bp': 'bid_price', 'as': 'ask_size', 'bs': 'bid_size',
+}
+
+
+def normalize_message(msg: Dict) -> Dict:
+    """SIMPLE 포맷 메시지를 DEFAULT 필드명으로 변환 (DEFAULT 메시지는 그대로)"""
+    if 'ty' not in msg:
+        return msg
+    normalized = {SIMPLE_KEYS.get(k, k): v for k, v in msg.items()}
+    units = normalized.get('orderbook_units')
+    if isinstance(units, list):
+        normalized['orderbook_units'] = [
+            {SIMPLE_KEYS.get(k, k): v for k, v in unit.items()} if isinstance(unit, dict) else unit
+            for unit in units
+        ]
+    return normalized
+
+
+class UpbitWebSocketClient:
+    """Upbit WebSocket 시세 스트림 (백그라운드 스레드)"""
+
+    def __init__(self, uri: str = UPBIT_WS_URI,
+                 channels: Iterable[str] = ('ticker', 'orderbook', 'trade'),
+                 max_trades: int = 500,
+                 ping_interval: float = 60.0,
+                 reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 30.0):
+        """
+        초기화
+
+        Args:
+            uri: WebSocket 서버 주소
+            channels: 구독 채널 (ticker, orderbook, trade)
+            max_trades: 마켓별 보관할 최근 체결 개수
+            ping_interval: ping 주기 (초)
+            reconnect_delay: 재연결 초기 대기 시간 (초)
+            max_reconnect_delay: 재연결 최대 대기 시간 (초)
+        """
+        self.uri = uri
+        self.channels = tuple(channels)
+        self.max_trades = max_trades
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        # 마켓별 최신 상태 {market: (수신시각, 데이터)}
+        self._tickers = {}
+        self._orderbooks = {}
+        self._trades = {}  # {market: deque([...], maxlen=max_trades)} (최신순)
+        self._trade_listeners: List[Callable[[str, Dict], None]] = []
+        self._lock = threading.Lock()
+
+        # 구독 상태
+        self._markets = []
+        self._markets_changed = threading.Event()
+
+        # 연결 상태
+        self.running = False
+        self.connected = False
+        self._thread = None
+        self._loop = None
+        self._ws = None
+
+        # 통계
+        self.messages_received = 0
+        self.reconnect_count = 0
+        self.last_message_time = 0.0
+
+    # ==================== 수명 주기 ====================
+
+    def start(self):
+        """스트림 시작 (백그라운드 스레드)"""
+        if self.running:
+            return
+
+        self.running = True
+        self._thread = threading.Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """스트림 중지"""
+        self.running = False
+        self._markets_changed.set()
+        self._close_current()
+
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self.connected = False
+
+    def subscribe(self, markets: Iterable[str]):
+        """
+        구독 마켓 설정 (변경 시 재구독)
+
+        Args:
+            markets: 마켓 코드 리스트 (예: ['KRW-BTC', 'KRW-ETH'])
+        """
+        new_markets = sorted({m for m in markets if isinstance(m, str) and m})
+        if new_markets == self._markets:
+            return
+
+        self._markets = new_markets
+        self._markets_changed.set()
+
+        # 기존 연결을 닫으면 수신 루프가 새 목록으로 재연결
+        self._close_current()
+
+    def add_trade_listener(self, callback: Callable[[str, Dict], None]):
+        """
+        체결 수신 콜백 등록 (수신 스레드에서 체결마다 호출되므로 빨리 반환해야 함)
+
+        Args:
+            callback: callback(market, trade) - trade는 get_recent_trades와 같은 형식
+        """
+        self._trade_listeners.append(callback)
+
+    @property
+    def markets(self) -> List[str]:
+        """현재 구독 마켓"""
+        return list(self._markets)
+
+    # ==================== 조회 (네트워크 미사용) ====================
+
+    def get_price(self, market: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        최신 체결가 조회
+
+        Args:
+            market: 마켓 코드
+            max_age: 허용 데이터 나이 (초, None이면 무제한)
+
+        Returns:
+            현재가 또는 None (데이터 없음/오래됨)
+        """
+        ticker = self.get_ticker(market, max_age)
+        if ticker is None:
+            return None
+        price = ticker.get('trade_price')
+        return float(price) if price is not None else None
+
+    def get_prices(self, markets: Iterable[str], max_age: Optional[float] = None) -> Dict[str, float]:
+        """
+        여러 마켓 최신 체결가 조회
+
+        Returns:
+            {market: price} (데이터 있는 마켓만)
+        """
+        result = {}
+        for market in markets:
+            price = self.get_price(market, max_age)
+            if price is not None:
+                result[market] = price
+        return result
+
+    def get_ticker(self, market: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """최신 ticker 메시지 조회"""
+        with self._lock:
+            entry = self._tickers.get(market)
+        return self._fresh(entry, max_age)
+
+    def get_orderbook(self, market: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        최신 호가 조회 (REST /v1/orderbook 응답과 같은 형식)
+
+        Returns:
+            {'market', 'timestamp', 'total_ask_size', 'total_bid_size', 'orderbook_units'}
+        """
+        with self._lock:
+            entry = self._orderbooks.get(market)
+        return self._fresh(entry, max_age)
+
+    def get_recent_trades(self, market: str, count: int = 100) -> List[Dict]:
+        """
+        최근 체결 조회 (REST /v1/trades/ticks 응답과 같은 형식, 최신순)
+
+        Args:
+            market: 마켓 코드
+            count: 조회 개수
+
+        Returns:
+            체결 리스트 (보관 중인 개수가 부족하면 있는 만큼)
+        """
+        with self._lock:
+            trades = self._trades.get(market)
+            if not trades:
+                return []
+            return list(trades)[:count]
+
+    def trade_count(self, market: str) -> int:
+        """보관 중인 체결 개수"""
+        with self._lock:
+            trades = self._trades.get(market)
+            return len(trades) if trades else 0
+
+    def get_stats(self) -> Dict:
+        """스트림 상태 통계"""
+        return {
+            'connected': self.connected,
+            'markets': len(self._markets),
+            'messages_received': self.messages_received,
+            'reconnect_count': self.reconnect_count,
+            'last_message_age': time.time() - self.last_message_time if self.last_message_time else None,
+        }
+
+    @staticmethod
+    def _fresh(entry, max_age: Optional[float]):
+        if entry is None:
+            return None
+        received_at, data = entry
+        if max_age is not None and time.time() - received_at > max_age:
+            return None
+        return data
+
+    # ==================== 수신 처리 ====================
+
+    def _handle_message(self, raw):
+        """수신 메시지 파싱 및 상태 갱신"""
+        if isinstance(raw, (bytes, bytearray)):
+            raw = raw.decode('utf-8')
+
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            return
+
+        if not isinstance(msg, dict):
+            return
+
+        # DEFAULT / SIMPLE 포맷 모두 지원 (SIMPLE은 DEFAULT 필드명으로 변환)
+        msg = normalize_message(msg)
+        msg_type = msg.get('type')
+        market = msg.get('code')
+        if not market:
+            return
+
+        now = time.time()
+        self.messages_received += 1
+        self.last_message_time = now
+
+        if msg_type == 'ticker':
+            with self._lock:
+                self._tickers[market] = (now, msg)
+
+        elif msg_type == 'orderbook':
+            orderbook = {
+                'market': market,
+                'timestamp': msg.get('timestamp'),
+                'total_ask_size': msg.get('total_ask_size'),
+                'total_bid_size': msg.get('total_bid_size'),
+                'orderbook_units': msg.get('orderbook_units', []),
+            }
+            with self._lock:
+                self._orderbooks[market] = (now, orderbook)
+
+        elif msg_type == 'trade':
+            trade = {
+                'market': market,
+                'trade_date_utc': msg.get('trade_date'),
+                'trade_time_utc': msg.get('trade_time'),
+                'timestamp': msg.get('trade_timestamp', msg.get('timestamp')),
+                'trade_price': msg.get('trade_price'),
+                'trade_volume': msg.get('trade_volume'),
+                'prev_closing_price': msg.get('prev_closing_price'),
+                'change_price': msg.get('change_price'),
+                'ask_bid': msg.get('ask_bid'),
+                'sequential_id': msg.get('sequential_id'),
+            }
+            with self._lock:
+                trades = self._trades.get(market)
+                if trades is None:
+                    trades = deque(maxlen=self.max_trades)
+                    self._trades[market] = trades
+                trades.appendleft(trade)
+            for callback in self._trade_listeners:
+                try:
+                    callback(market, trade)
+                except Exception as e:
+                    print(f"❌ 체결 콜백 오류: {e}")
+
+    def _subscription_message(self, markets: List[str]) -> str:
+        """구독 요청 메시지 생성"""
+        request = [{'ticket': str(uuid.uuid4())}]
+        for channel in self.channels:
+            request.append({'type': channel, 'codes': markets})
+        request.append({'format': 'DEFAULT'})
+        return json.dumps(request)
+
+    # ==================== 연결 루프 ====================
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._connect_loop())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _connect_loop(self):
+        """연결 유지 루프 (끊기면 지수 백오프 후 재연결)"""
+        delay = self.reconnect_delay
+        first_connect = True
+
+        while self.running:
+            # 구독할 마켓이 생길 때까지 대기
+            if not self._markets:
+                self._markets_changed.clear()
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._markets_changed.wait, 1.0
+                )
+                continue
+
+            markets = list(self._markets)
+            try:
+                async with websockets.connect(self.uri, ping_interval=self.ping_interval,
+                                              max_size=None) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    if not first_connect:
+                        self.reconnect_count += 1
+                    first_connect = False
+                    delay = self.reconnect_delay
+
+                    await ws.send(self._subscription_message(markets))
+
+                    async for raw in ws:
+                        self._handle_message(raw)
+                        if not self.running:
+                            break
+            except (websockets.ConnectionClosed, OSError, asyncio.TimeoutError) as e:
+                if self.running and markets == self._markets:
+                    print(f"⚠️ WebSocket 연결 끊김, {delay:.0f}초 후 재연결: {e}")
+            except Exception as e:
+                if self.running:
+                    print(f"❌ WebSocket 오류: {e}")
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if not self.running:
+                break
+
+            # 구독 변경으로 닫힌 경우 즉시 재연결
+            if markets != self._markets:
+                continue
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _close_current(self):
+        """현재 연결 종료 요청 (스레드 안전)"""
+        ws = self._ws
+        loop = self._loop
+        if ws is None or loop is None or not loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(ws.close(), loop)
+        except RuntimeError:
+            pass
@@ -317,11 +317,11 @@ if __name__ == "__main__":
 class TestStrategyOptimizer:
     """전략 최적화 테스트"""
     
-    def test_optimizer_initialization(self):
+    def test_optimizer_initialization(self, tmp_path):
         """최적화 엔진 초기화 테스트"""
         from utils.strategy_optimizer import StrategyOptimizer
         
-        optimizer = StrategyOptimizer()
+        optimizer = StrategyOptimizer(data_dir=str(tmp_path))
         
         assert len(optimizer.performances) == 4
         assert 'aggressive_scalping' in optimizer.performances
@@ -361,11 +361,11 @@ class TestStrategyOptimizer:
             assert perf.wins == 1
             assert perf.total_profit == 15000
     
-    def test_weight_optimization(self):
+    def test_weight_optimization(self, tmp_path):
         """가중치 최적화 테스트"""
         from utils.strategy_optimizer import StrategyOptimizer, MarketCondition
         
-        optimizer = StrategyOptimizer()
+        optimizer = StrategyOptimizer(data_dir=str(tmp_path))
         market = MarketCondition('high', 'uptrend', 'high', 'positive')
         
         # 여러 거래 기록 (aggressive_scalping이 유리)
@@ -387,11 +387,11 @@ class TestStrategyOptimizer:
         # aggressive_scalping 가중치가 증가했어야 함
         assert optimized['aggressive_scalping'] > base_weights['aggressive_scalping']
     
-    def test_best_strategy_selection(self):
+    def test_best_strategy_selection(self, tmp_path):
         """최적 전략 선택 테스트"""
         from utils.strategy_optimizer import StrategyOptimizer, MarketCondition
         
-        optimizer = StrategyOptimizer()
+        optimizer = StrategyOptimizer(data_dir=str(tmp_path))
         market = MarketCondition('low', 'sideways', 'medium', 'neutral')
         
         # grid_trading이 횡보장에서 성공
@@ -508,3 +508,2312 @@ class TestHoldingProtector:
 
 if __name__ == "__main__":
     pytest.main([__file__, '-v'])
+
+
+def wait_until(condition, timeout=5.0, interval=0.02):
+    """조건이 참이 될 때까지 대기 (비동기 테스트용)"""
+    import time
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return condition()
+
+
+class TestWebSocketClient:
+    """실시간 시세 스트림 테스트 (모의 WebSocket 서버)"""
+    
+    def _start(self, markets):
+        from utils.mock_websocket_server import MockUpbitWebSocketServer
+        from utils.websocket_client import UpbitWebSocketClient
+        
+        server = MockUpbitWebSocketServer()
+        server.start()
+        client = UpbitWebSocketClient(uri=server.uri, reconnect_delay=0.05)
+        client.subscribe(markets)
+        client.start()
+        assert wait_until(lambda: server.client_count() == 1)
+        assert wait_until(lambda: len(server.subscriptions) >= 1)
+        return server, client
+    
+    def test_ticker_orderbook_trade_state(self):
+        """ticker/orderbook/trade 수신 후 메모리 조회"""
+        server, client = self._start(['KRW-BTC'])
+        try:
+            server.publish_ticker('KRW-BTC', 50000000)
+            server.publish_orderbook('KRW-BTC', [
+                {'ask_price': 50010000, 'bid_price': 49990000, 'ask_size': 1.0, 'bid_size': 2.0}
+            ])
+            server.publish_trade('KRW-BTC', 50000000, 0.01, ask_bid='BID')
+            
+            assert wait_until(lambda: client.trade_count('KRW-BTC') == 1)
+            assert wait_until(lambda: client.get_price('KRW-BTC') == 50000000)
+            
+            orderbook = client.get_orderbook('KRW-BTC')
+            assert orderbook['market'] == 'KRW-BTC'
+            assert orderbook['orderbook_units'][0]['bid_price'] == 49990000
+            
+            trade = client.get_recent_trades('KRW-BTC', count=10)[0]
+            assert trade['trade_price'] == 50000000
+            assert trade['ask_bid'] == 'BID'
+            
+            # 구독하지 않은 마켓은 수신되지 않음
+            server.publish_ticker('KRW-ETH', 3000000)
+            assert client.get_price('KRW-ETH') is None
+        finally:
+            client.stop()
+            server.stop()
+    
+    def test_resubscribe_on_market_change(self):
+        """구독 코인 변경 시 재구독"""
+        server, client = self._start(['KRW-BTC'])
+        try:
+            client.subscribe(['KRW-BTC', 'KRW-ETH'])
+            assert wait_until(lambda: any(
+                'KRW-ETH' in subs.get('ticker', ()) for subs in server.subscriptions
+            ))
+            assert wait_until(lambda: server.client_count() == 1)
+            
+            assert wait_until(lambda: (server.publish_ticker('KRW-ETH', 3000000) or
+                                       client.get_price('KRW-ETH') == 3000000))
+        finally:
+            client.stop()
+            server.stop()
+    
+    def test_reconnect_after_disconnect(self):
+        """서버가 연결을 끊으면 자동 재연결"""
+        server, client = self._start(['KRW-BTC'])
+        try:
+            server.disconnect_all()
+            assert wait_until(lambda: client.reconnect_count >= 1)
+            assert wait_until(lambda: server.client_count() == 1)
+            
+            assert wait_until(lambda: (server.publish_ticker('KRW-BTC', 51000000) or
+                                       client.get_price('KRW-BTC') == 51000000))
+        finally:
+            client.stop()
+            server.stop()
+    
+    def test_upbit_api_reads_from_stream(self):
+        """UpbitAPI는 스트림 데이터가 있으면 REST를 호출하지 않음"""
+        from src.upbit_api import UpbitAPI
+        
+        server, client = self._start(['KRW-BTC'])
+        try:
+            server.publish_ticker('KRW-BTC', 52000000)
+            assert wait_until(lambda: client.get_price('KRW-BTC') == 52000000)
+            
+            api = UpbitAPI()
+            api.attach_websocket(client, max_age=60)
+            assert api.get_current_price('KRW-BTC') == 52000000
+            assert api.get_current_prices(['KRW-BTC']) == {'KRW-BTC': 52000000}
+        finally:
+            client.stop()
+            server.stop()
+    
+    def test_simple_format_normalized(self):
+        """SIMPLE 포맷 메시지도 DEFAULT 필드명으로 변환해 저장, 구독은 DEFAULT 포맷 요청"""
+        import json
+        from utils.websocket_client import UpbitWebSocketClient
+        
+        client = UpbitWebSocketClient()
+        client._handle_message(json.dumps({'ty': 'ticker', 'cd': 'KRW-BTC', 'tp': 100.0, 'atv': 12.5}))
+        client._handle_message(json.dumps({'ty': 'trade', 'cd': 'KRW-BTC', 'tp': 101.0, 'tv': 2.0,
+                                           'ab': 'BID', 'sid': 9, 'ttms': 1000}))
+        client._handle_message(json.dumps({'ty': 'orderbook', 'cd': 'KRW-BTC', 'tas': 3.0, 'tbs': 4.0,
+                                           'obu': [{'ap': 102.0, 'bp': 100.0, 'as': 1.0, 'bs': 2.0}]}))
+        
+        assert client.get_price('KRW-BTC') == 100.0
+        assert client.get_ticker('KRW-BTC')['acc_trade_volume'] == 12.5
+        trade = client.get_recent_trades('KRW-BTC')[0]
+        assert (trade['trade_price'], trade['ask_bid'], trade['sequential_id'], trade['timestamp']) == (101.0, 'BID', 9, 1000)
+        orderbook = client.get_orderbook('KRW-BTC')
+        assert orderbook['total_bid_size'] == 4.0 and orderbook['orderbook_units'][0]['ask_price'] == 102.0
+        assert {'format': 'DEFAULT'} in json.loads(client._subscription_message(['KRW-BTC']))
+    
+    def test_bypass_cache_skips_stale_stream(self, monkeypatch):
+        """bypass_cache 조회는 ws_fresh_age보다 오래된 스트림 데이터 대신 REST 조회"""
+        import json
+        from src.upbit_api import UpbitAPI
+        from utils.websocket_client import UpbitWebSocketClient
+        
+        client = UpbitWebSocketClient()
+        client._handle_message(json.dumps({'type': 'ticker', 'code': 'KRW-BTC', 'trade_price': 100.0}))
+        received_at, msg = client._tickers['KRW-BTC']
+        client._tickers['KRW-BTC'] = (received_at - 2.0, msg)
+        
+        api = UpbitAPI()
+        api.attach_websocket(client, max_age=5.0)
+        calls = []
+        monkeypatch.setattr(api, '_fetch_current_price', lambda ticker: calls.append(ticker) or 101.0)
+        assert api.get_current_price('KRW-BTC') == 100.0
+        assert calls == []
+        assert api.get_current_price('KRW-BTC', bypass_cache=True) == 101.0
+        assert calls == ['KRW-BTC']
+
+
+
+class TestMarketDataCache:
+    """공유 시세 캐시 테스트"""
+    
+    def test_hit_miss_and_ttl(self):
+        """TTL 내에는 재조회하지 않고, 만료 후 다시 조회"""
+        import time
+        from utils.market_data_cache import MarketDataCache
+        
+        cache = MarketDataCache(ttls={'price': 0.05})
+        calls = []
+        fetch = lambda: calls.append(1) or 100.0
+        
+        assert cache.get_or_fetch('price', 'KRW-BTC', fetch) == 100.0
+        assert cache.get_or_fetch('price', 'KRW-BTC', fetch) == 100.0
+        assert len(calls) == 1
+        assert cache.hits == 1 and cache.misses == 1
+        
+        time.sleep(0.06)
+        cache.get_or_fetch('price', 'KRW-BTC', fetch)
+        assert len(calls) == 2
+    
+    def test_bypass_and_interval_ttl(self):
+        """bypass는 항상 새로 조회하고, 봉 간격별 TTL 적용"""
+        from utils.market_data_cache import MarketDataCache
+        
+        cache = MarketDataCache(ttls={'ohlcv': 10.0, 'ohlcv:minute1': 0.0})
+        calls = []
+        fetch = lambda: calls.append(1) or len(calls)
+        
+        cache.get_or_fetch('ohlcv', 'KRW-BTC', fetch, interval='minute5', count=200)
+        assert cache.get_or_fetch('ohlcv', 'KRW-BTC', fetch, interval='minute5', count=200,
+                                  bypass=True) == 2
+        assert cache.get('ohlcv', 'KRW-BTC', interval='minute5', count=200) == 2
+        
+        # TTL 0이면 캐싱하지 않음
+        cache.get_or_fetch('ohlcv', 'KRW-BTC', fetch, interval='minute1', count=10)
+        cache.get_or_fetch('ohlcv', 'KRW-BTC', fetch, interval='minute1', count=10)
+        assert len(calls) == 4
+    
+    def test_lru_eviction(self):
+        """최대 항목 수 초과 시 가장 오래 사용하지 않은 항목 제거"""
+        from utils.market_data_cache import MarketDataCache
+        
+        cache = MarketDataCache(max_entries=2)
+        cache.set('price', 'KRW-A', 1.0)
+        cache.set('price', 'KRW-B', 2.0)
+        cache.get('price', 'KRW-A')
+        cache.set('price', 'KRW-C', 3.0)
+        
+        assert cache.get('price', 'KRW-B') is None
+        assert cache.get('price', 'KRW-A') == 1.0
+        assert cache.evictions == 1
+    
+    def test_upbit_api_shares_batch_prices(self, monkeypatch):
+        """배치 조회 결과를 개별 현재가 조회에서 재사용"""
+        import pyupbit
+        from src.upbit_api import UpbitAPI
+        from src.utils.market_data_cache import MarketDataCache
+        
+        calls = []
+        
+        def fake_price(tickers, limit_info=False):
+            calls.append(tickers)
+            price = {t: 1000.0 for t in tickers} if isinstance(tickers, list) else 1000.0
+            return (price, {'group': 'ticker', 'min': 599, 'sec': 9}) if limit_info else price
+        
+        monkeypatch.setattr(pyupbit, 'get_current_price', fake_price)
+        api = UpbitAPI(cache=MarketDataCache())
+        
+        assert api.get_current_prices(['KRW-BTC', 'KRW-ETH']) == {'KRW-BTC': 1000.0, 'KRW-ETH': 1000.0}
+        assert api.get_current_price('KRW-BTC') == 1000.0
+        assert api.get_current_prices(['KRW-ETH']) == {'KRW-ETH': 1000.0}
+        assert len(calls) == 1
+        
+        # 주문 직전 조회는 캐시 미사용
+        api.get_current_price('KRW-BTC', bypass_cache=True)
+        assert len(calls) == 2
+
+
+
+class FakeCandleSource:
+    """테스트용 캔들 조회 함수 (전체 시계열에서 최근 count개 반환)"""
+    
+    def __init__(self, length=300):
+        self.df = generate_sample_ohlcv(length)
+        self.visible = length - 50  # 현재까지 생성된 봉 개수
+        self.calls = []
+    
+    def __call__(self, ticker, interval, count):
+        self.calls.append(count)
+        return self.df.iloc[max(0, self.visible - count):self.visible].copy()
+
+
+class TestCandleStore:
+    """증분 캔들 저장소 테스트"""
+    
+    def test_backfill_then_incremental(self):
+        """최초 1회만 전체 조회, 이후 새 봉만 조회해 병합"""
+        from utils.candle_store import CandleStore
+        
+        source = FakeCandleSource()
+        store = CandleStore(source, capacity=300, min_refresh=0)
+        
+        df = store.get_ohlcv('KRW-BTC', 'minute5', 200)
+        pd.testing.assert_frame_equal(df, source(None, None, 200), check_dtype=False, check_index_type=False, check_freq=False)
+        
+        # 새 봉 1개 생성 + 진행 중이던 마지막 봉 갱신
+        source.df.iloc[source.visible - 1, source.df.columns.get_loc('close')] += 1000
+        source.visible += 1
+        source.calls.clear()
+        
+        df = store.get_ohlcv('KRW-BTC', 'minute5', 200)
+        assert source.calls[0] <= 3
+        pd.testing.assert_frame_equal(df, source(None, None, 200), check_dtype=False, check_index_type=False, check_freq=False)
+        assert store.backfills == 1
+    
+    def test_view_is_read_only_and_contiguous(self):
+        """링 버퍼가 한 바퀴 돈 뒤에도 복사 없이 최근 봉 제공"""
+        from utils.candle_store import CandleStore
+        
+        source = FakeCandleSource(length=400)
+        source.visible = 60
+        store = CandleStore(source, capacity=50, backfill_count=50, min_refresh=0)
+        store.get_ohlcv('KRW-BTC', 'minute5', 30)
+        
+        for _ in range(70):
+            source.visible += 1
+            df = store.get_ohlcv('KRW-BTC', 'minute5', 30)
+        
+        assert list(df['close']) == list(source.df['close'].iloc[source.visible - 30:source.visible])
+        assert not df.to_numpy().flags.writeable
+        assert store.backfills == 1
+    
+    def test_unsupported_request_goes_direct(self):
+        """월봉/용량 초과 요청은 직접 조회"""
+        from utils.candle_store import CandleStore
+        
+        source = FakeCandleSource()
+        store = CandleStore(source, capacity=100)
+        store.get_ohlcv('KRW-BTC', 'month', 10)
+        store.get_ohlcv('KRW-BTC', 'minute5', 200)
+        assert source.calls == [10, 200]
+        assert store.get_stats()['keys'] == 0
+
+
+
+class TestCandleAggregator:
+    """1분봉 → 상위 분봉 집계 테스트"""
+    
+    @staticmethod
+    def _minute_source(length=400):
+        source = FakeCandleSource(length)
+        source.df.index = pd.date_range('2024-01-01 09:00', periods=length, freq='1min')
+        source.intervals = []
+        fetch = source.__call__
+        
+        def call(ticker, interval, count):
+            source.intervals.append(interval)
+            return fetch(ticker, interval, count)
+        return source, call
+    
+    def test_aggregate_matches_resample(self):
+        """집계 결과가 pandas resample과 일치"""
+        from utils.candle_aggregator import aggregate_ohlcv
+        
+        df = generate_sample_ohlcv(100)
+        df.index = pd.date_range('2024-01-01 09:00', periods=100, freq='1min')
+        
+        result = aggregate_ohlcv(df, 15)
+        expected = df.resample('15min').agg({'open': 'first', 'high': 'max', 'low': 'min',
+                                             'close': 'last', 'volume': 'sum', 'value': 'sum'})
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False,
+                                      check_index_type=False, check_freq=False)
+    
+    def test_incremental_updates_use_only_minute1(self):
+        """새 1분봉이 들어와도 상위 분봉이 정확히 갱신되고 1분봉만 조회"""
+        from utils.candle_store import CandleStore
+        from utils.candle_aggregator import CandleAggregator, aggregate_ohlcv
+        
+        source, fetch = self._minute_source()
+        aggregator = CandleAggregator(CandleStore(fetch, capacity=400, min_refresh=0))
+        
+        for _ in range(12):
+            df_5m = aggregator.get_ohlcv('KRW-BTC', 'minute5', 20)
+            full = aggregate_ohlcv(source.df.iloc[:source.visible], 5)
+            assert list(df_5m['close']) == list(full['close'].iloc[-20:])
+            assert list(df_5m['volume']) == list(full['volume'].iloc[-20:])
+            source.visible += 1
+        
+        assert set(source.intervals) == {'minute1'}
+        assert aggregator.rebuilds == 1
+    
+    def test_upbit_api_routes_through_aggregator(self, monkeypatch):
+        """UpbitAPI의 5/15분봉 요청은 1분봉 조회로 처리"""
+        from src.upbit_api import UpbitAPI
+        from src.utils.market_data_cache import MarketDataCache
+        
+        source, fetch = self._minute_source(600)
+        api = UpbitAPI(cache=MarketDataCache())
+        monkeypatch.setattr(api.candle_store, 'fetch', fetch)
+        
+        for interval in ('minute1', 'minute5', 'minute15'):
+            assert len(api.get_ohlcv('KRW-BTC', interval=interval, count=20)) == 20
+        assert set(source.intervals) == {'minute1'}
+
+
+
+class TestRateLimiter:
+    """요청 한도 스케줄러 테스트"""
+    
+    def test_token_bucket_limits_rate(self):
+        """초당 한도를 넘으면 다음 토큰까지 대기"""
+        import time
+        from utils.rate_limiter import RateLimiter, Priority
+        
+        limiter = RateLimiter(group_limits={'ticker': 20})
+        start = time.monotonic()
+        for _ in range(25):
+            limiter.acquire('ticker', Priority.ORDER)
+        elapsed = time.monotonic() - start
+        
+        assert 0.2 <= elapsed < 1.0
+    
+    def test_background_leaves_headroom_for_exits(self):
+        """백그라운드 요청이 버킷을 비워도 포지션 체크는 즉시 통과"""
+        from utils.rate_limiter import RateLimiter, Priority
+        
+        limiter = RateLimiter(group_limits={'candles': 10})
+        while limiter.acquire('candles', Priority.BACKGROUND, timeout=0):
+            pass
+        
+        assert limiter.acquire('candles', Priority.POSITION, timeout=0)
+        assert limiter.acquire('candles', Priority.ORDER, timeout=0)
+        assert limiter.acquired[Priority.BACKGROUND] <= 5
+    
+    def test_priority_context_and_header_calibration(self):
+        """컨텍스트 우선순위 적용 및 Remaining-Req 보정"""
+        from utils.rate_limiter import RateLimiter, Priority
+        
+        limiter = RateLimiter()
+        with limiter.priority(Priority.SURGE):
+            assert limiter.current_priority == Priority.SURGE
+            limiter.acquire('ticker')
+        assert limiter.current_priority == Priority.BACKGROUND
+        assert limiter.acquired[Priority.SURGE] == 1
+        
+        assert limiter.parse_remaining_req("group=ticker; min=599; sec=0") == \
+            {'group': 'ticker', 'min': 599, 'sec': 0}
+        limiter.update_from_header("group=ticker; min=599; sec=0")
+        assert not limiter.acquire('ticker', Priority.ORDER, timeout=0.01)
+        assert limiter.throttled == 1
+
+
+
+class TestHttpTransport:
+    """공유 HTTP 전송 계층 테스트 (로컬 HTTP 서버)"""
+    
+    @pytest.fixture
+    def server(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        hits = {}
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def _respond(self):
+                hits[self.path] = hits.get(self.path, 0) + 1
+                if self.path == '/slow':
+                    import time
+                    time.sleep(0.5)
+                status = 503 if self.path.startswith('/flaky') and hits[self.path] <= 2 else 200
+                body = b'{"ok": true}'
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Remaining-Req', 'group=ticker; min=599; sec=9')
+                self.end_headers()
+                self.wfile.write(body)
+            
+            do_GET = do_POST = _respond
+            
+            def log_message(self, *args):
+                pass
+        
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+        httpd.shutdown()
+        httpd.server_close()
+    
+    def test_retry_and_stats(self, server):
+        """GET은 503 재시도, POST(주문 등)는 재시도하지 않음"""
+        from utils.http_session import HttpTransport
+        
+        base, hits = server
+        transport = HttpTransport(backoff=0.01)
+        
+        assert transport.get(f"{base}/flaky-get", endpoint='get').status_code == 200
+        assert transport.post(f"{base}/flaky-post").status_code == 503
+        assert hits['/flaky-post'] == 1
+        
+        stats = transport.get_stats()
+        assert stats['get']['retries'] == 2
+        assert stats['get']['count'] == 3
+        transport.close()
+    
+    def test_read_timeout(self, server):
+        """응답이 늦으면 읽기 타임아웃으로 중단"""
+        import requests
+        from utils.http_session import HttpTransport
+        
+        base, _ = server
+        transport = HttpTransport(read_timeout=0.1, max_retries=0)
+        with pytest.raises(requests.Timeout):
+            transport.get(f"{base}/slow", endpoint='slow')
+        assert transport.get_stats()['slow']['errors'] == 1
+        transport.close()
+    
+    def test_pyupbit_calls_use_transport(self, server):
+        """pyupbit 내부 호출도 공유 전송 계층을 거침"""
+        from pyupbit import request_api
+        from utils.http_session import HttpTransport, install_pyupbit_transport
+        
+        base, _ = server
+        transport = HttpTransport()
+        original = request_api.requests
+        try:
+            install_pyupbit_transport(transport)
+            data, limit = request_api._call_public_api(f"{base}/v1/ticker", markets='KRW-BTC')
+            assert data == {'ok': True}
+            assert limit['group'] == 'ticker'
+            assert any(name.endswith('/v1/ticker') for name in transport.get_stats())
+        finally:
+            request_api.requests = original
+            transport.close()
+
+
+
+class TestAsyncUpbitAPI:
+    """asyncio 래퍼 동시 조회 테스트"""
+    
+    class SlowAPI:
+        """요청마다 0.1초 걸리는 모의 API"""
+        
+        def __init__(self):
+            import threading
+            from utils.rate_limiter import RateLimiter
+            self.rate_limiter = RateLimiter()
+            self.active = 0
+            self.max_active = 0
+            self.priorities = []
+            self._lock = threading.Lock()
+        
+        def get_ohlcv(self, ticker, interval="minute5", count=200, bypass_cache=False):
+            import time
+            with self._lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                self.priorities.append(self.rate_limiter.current_priority)
+            time.sleep(0.1)
+            with self._lock:
+                self.active -= 1
+            if ticker == 'KRW-FAIL':
+                raise ValueError("조회 실패")
+            return generate_sample_ohlcv(count)
+    
+    def test_bounded_concurrent_gather(self):
+        """동시 실행 수를 제한하면서 여러 티커를 한 번에 조회"""
+        import time
+        from src.async_upbit_api import AsyncUpbitAPI
+        
+        api = self.SlowAPI()
+        async_api = AsyncUpbitAPI(api, max_concurrency=4)
+        tickers = [f'KRW-C{i}' for i in range(8)] + ['KRW-FAIL']
+        
+        start = time.monotonic()
+        frames = async_api.run(async_api.gather_ohlcv(tickers, count=20))
+        elapsed = time.monotonic() - start
+        async_api.close()
+        
+        assert len(frames) == 8 and 'KRW-FAIL' not in frames
+        assert api.max_active == 4
+        assert elapsed < 0.6  # 순차 실행이면 0.9초
+    
+    def test_priority_propagates_to_worker(self):
+        """호출한 스레드의 요청 우선순위가 작업 스레드에 전달"""
+        from src.async_upbit_api import AsyncUpbitAPI
+        from utils.rate_limiter import Priority
+        
+        api = self.SlowAPI()
+        async_api = AsyncUpbitAPI(api, max_concurrency=2)
+        with api.rate_limiter.priority(Priority.POSITION):
+            async_api.run(async_api.gather_ohlcv(['KRW-A', 'KRW-B'], count=10))
+        async_api.close()
+        
+        assert api.priorities == [Priority.POSITION, Priority.POSITION]
+
+
+
+class TestSingleFlight:
+    """동일 요청 병합 테스트"""
+    
+    @staticmethod
+    def _run_concurrently(func, n=5):
+        import threading
+        results = [None] * n
+        
+        def worker(i):
+            try:
+                results[i] = func()
+            except Exception as e:
+                results[i] = e
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+    
+    def test_concurrent_calls_share_result(self):
+        """동시에 들어온 같은 키 요청은 1회만 실행, 예외도 공유"""
+        import time
+        from utils.single_flight import SingleFlight
+        
+        flight = SingleFlight()
+        calls = []
+        
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+        
+        assert self._run_concurrently(lambda: flight.do('k', slow)) == [42] * 5
+        assert len(calls) == 1 and flight.shared == 4
+        
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("boom")
+        
+        results = self._run_concurrently(lambda: flight.do('e', failing))
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight() == 0
+    
+    def test_upbit_api_coalesces_orderbook_reads(self, monkeypatch):
+        """동시 호가 조회는 REST 1회로 처리, 주문 직전 조회는 합류하지 않음"""
+        import time
+        import pyupbit
+        from src.upbit_api import UpbitAPI
+        from src.utils.market_data_cache import MarketDataCache
+        
+        calls = []
+        
+        def fake_orderbook(ticker, limit_info=False):
+            calls.append(ticker)
+            time.sleep(0.1)
+            ob = {'market': ticker, 'orderbook_units': [{'ask_price': 101, 'bid_price': 100}]}
+            return (ob, {'group': 'orderbook', 'min': 599, 'sec': 9}) if limit_info else ob
+        
+        monkeypatch.setattr(pyupbit, 'get_orderbook', fake_orderbook)
+        api = UpbitAPI(cache=MarketDataCache(ttls={'orderbook': 0}))
+        
+        results = self._run_concurrently(lambda: api.get_orderbook('KRW-BTC'))
+        assert all(r['market'] == 'KRW-BTC' for r in results)
+        assert len(calls) == 1
+        
+        self._run_concurrently(lambda: api.get_orderbook('KRW-BTC', bypass_cache=True), n=2)
+        assert len(calls) == 3
+    
+    def test_higher_priority_does_not_join_background_flight(self, monkeypatch):
+        """포지션 레인 조회는 백그라운드 레인에서 진행 중인 같은 요청에 합류하지 않음"""
+        import threading
+        import pyupbit
+        from src.upbit_api import UpbitAPI
+        from src.utils.market_data_cache import MarketDataCache
+        from src.utils.rate_limiter import Priority, RateLimiter
+        
+        release = threading.Event()
+        started = threading.Event()
+        calls = []
+        
+        def fake_orderbook(ticker, limit_info=False):
+            calls.append(ticker)
+            if len(calls) == 1:
+                # 백그라운드 호출은 한도 대기 중인 것처럼 붙잡아 둠
+                started.set()
+                release.wait(2)
+            ob = {'market': ticker, 'orderbook_units': [{'ask_price': 101, 'bid_price': 100}]}
+            return (ob, {'group': 'orderbook', 'min': 599, 'sec': 9}) if limit_info else ob
+        
+        monkeypatch.setattr(pyupbit, 'get_orderbook', fake_orderbook)
+        limiter = RateLimiter()
+        api = UpbitAPI(cache=MarketDataCache(ttls={'orderbook': 0}), rate_limiter=limiter)
+        
+        def background():
+            with limiter.priority(Priority.BACKGROUND):
+                api.get_orderbook('KRW-BTC')
+        
+        worker = threading.Thread(target=background)
+        worker.start()
+        assert started.wait(2)
+        
+        try:
+            with limiter.priority(Priority.POSITION):
+                ob = api.get_orderbook('KRW-BTC')
+            # 백그라운드 호출이 끝나기 전에 자체 호출로 응답
+            assert not release.is_set()
+            assert ob['market'] == 'KRW-BTC'
+            assert len(calls) == 2 and api.single_flight.preempted == 1
+        finally:
+            release.set()
+            worker.join()
+        assert api.single_flight.in_flight() == 0
+    
+    def test_lower_priority_joins_higher_priority_flight(self):
+        """같거나 낮은 우선순위 요청은 진행 중 호출에 합류"""
+        import threading
+        import time
+        from utils.single_flight import SingleFlight
+        
+        flight = SingleFlight()
+        release = threading.Event()
+        started = threading.Event()
+        calls = []
+        
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return 7
+        
+        leader = threading.Thread(target=lambda: flight.do('k', slow, priority=1))
+        leader.start()
+        assert started.wait(2)
+        joiner = threading.Thread(target=lambda: flight.do('k', slow, priority=3))
+        joiner.start()
+        while flight.shared == 0:
+            time.sleep(0.001)
+        release.set()
+        leader.join()
+        joiner.join()
+        assert len(calls) == 1 and flight.preempted == 0
+
+
+class TestRecordReplay:
+    """HTTP 기록/재생 테스트"""
+    
+    server = TestHttpTransport.server
+    
+    def test_record_then_replay_offline(self, server, tmp_path):
+        """기록한 응답을 서버 없이 같은 순서로 재생"""
+        import requests
+        from utils.http_session import HttpTransport
+        from utils.record_replay import HttpRecorder, HttpReplayer, ReplayMissError
+        
+        base, hits = server
+        path = tmp_path / 'session.jsonl.gz'
+        
+        transport = HttpTransport(backoff=0.01)
+        recorder = HttpRecorder(path)
+        transport.set_interceptor(recorder)
+        transport.get(f"{base}/v1/ticker", params={'markets': 'KRW-BTC'})
+        transport.get(f"{base}/flaky-a")
+        recorder.close()
+        transport.close()
+        assert recorder.recorded == 4  # ticker 1회 + flaky 503 두 번과 성공 1회
+        
+        transport = HttpTransport(backoff=0.01)
+        replayer = HttpReplayer(path, speed=0)
+        transport.set_interceptor(replayer)
+        
+        response = transport.get(f"{base}/v1/ticker", params={'markets': 'KRW-BTC'})
+        assert response.json() == {'ok': True}
+        assert response.headers['remaining-req'] == 'group=ticker; min=599; sec=9'
+        assert transport.get(f"{base}/flaky-a").status_code == 200
+        assert transport.get_stats()[f"127.0.0.1:{base.rsplit(':', 1)[1]}/flaky-a"]['retries'] == 2
+        assert hits['/v1/ticker?markets=KRW-BTC'] == 1  # 재생 중에는 서버 호출 없음
+        
+        with pytest.raises(ReplayMissError):
+            transport.get(f"{base}/v1/ticker", params={'markets': 'KRW-ETH'}, retries=0)
+        assert replayer.get_stats()['remaining'] == 0
+        transport.close()
+    
+    def test_replay_speed_and_recorded_errors(self, tmp_path):
+        """기록된 지연 시간을 배율로 재현하고, 기록된 타임아웃도 재현"""
+        import gzip
+        import json
+        import time
+        import requests
+        from utils.record_replay import HttpReplayer, request_key
+        
+        path = tmp_path / 'session.jsonl.gz'
+        key = request_key('GET', 'https://api.upbit.com/v1/orderbook', {'params': {'markets': 'KRW-BTC'}})
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'key': key, 'latency': 0.2, 'error': 'ReadTimeout'}) + '\n')
+            f.write(json.dumps({'key': key, 'latency': 0.2, 'status': 200, 'body': '[]'}) + '\n')
+        
+        replayer = HttpReplayer(path, speed=10.0)
+        kwargs = {'params': {'markets': 'KRW-BTC'}, 'headers': {'Authorization': 'Bearer x'}}
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            replayer.handle('GET', 'https://api.upbit.com/v1/orderbook', kwargs)
+        
+        start = time.monotonic()
+        response = replayer.handle('GET', 'https://api.upbit.com/v1/orderbook', kwargs)
+        assert response.json() == []
+        assert 0.015 <= time.monotonic() - start < 0.15
+    
+    def test_replays_pyupbit_ohlcv_from_another_time(self, tmp_path, monkeypatch):
+        """get_ohlcv는 매번 to=현재 시각을 보내도 다른 시각의 재생에서 기록 순서대로 매칭"""
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from pyupbit import quotation_api, request_api
+        from utils.http_session import HttpTransport, install_pyupbit_transport
+        from utils.record_replay import HttpRecorder, HttpReplayer
+        
+        queries = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                queries.append(self.path)
+                body = json.dumps([{
+                    'candle_date_time_kst': '2024-01-01T09:0%d:00' % i,
+                    'candle_date_time_utc': '2024-01-01T00:0%d:00' % i,
+                    'opening_price': 100.0, 'high_price': 101.0, 'low_price': 99.0,
+                    'trade_price': 100.0 + i, 'candle_acc_trade_volume': 1.0, 'candle_acc_trade_price': 100.0,
+                } for i in range(3)]).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Remaining-Req', 'group=candles; min=599; sec=9')
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{httpd.server_address[1]}"
+        monkeypatch.setattr(quotation_api, 'get_url_ohlcv', lambda interval: f"{base}/v1/candles/minutes/1")
+        original = request_api.requests
+        path = tmp_path / 'session.jsonl.gz'
+        try:
+            transport = HttpTransport()
+            install_pyupbit_transport(transport)
+            recorder = HttpRecorder(path)
+            transport.set_interceptor(recorder)
+            recorded = quotation_api.get_ohlcv('KRW-BTC', interval='minute1', count=3)
+            recorder.close()
+            transport.close()
+            
+            transport = HttpTransport()
+            install_pyupbit_transport(transport)
+            replayer = HttpReplayer(path, speed=0, strict=True)
+            transport.set_interceptor(replayer)
+            replayed = quotation_api.get_ohlcv('KRW-BTC', interval='minute1', count=3, to='2030-01-01 00:00:00')
+            transport.close()
+        finally:
+            request_api.requests = original
+            httpd.shutdown()
+            httpd.server_close()
+        
+        assert len(queries) == 1 and 'to=' in queries[0]  # 재생 중에는 서버 호출 없음
+        assert list(replayed['close']) == list(recorded['close']) == [100.0, 101.0, 102.0]
+        assert replayer.get_stats()['misses'] == 0
+    
+    def test_bot_token_is_redacted(self):
+        """URL의 텔레그램 봇 토큰은 기록하지 않음"""
+        from utils.record_replay import redact_url
+        
+        url = 'https://api.telegram.org/bot123:SECRET/sendMessage'
+        assert redact_url(url) == 'https://api.telegram.org/bot<redacted>/sendMessage'
+
+
+def live_minute_candles(minutes=500):
+    """현재 시각(KST)까지의 1분봉 시계열 (마지막 봉은 진행 중)"""
+    now = pd.Timestamp.now('UTC').tz_localize(None) + pd.Timedelta(hours=9)
+    index = pd.date_range(end=now.floor('min'), periods=minutes, freq='min')
+    close = 100 + np.arange(minutes, dtype='float64')
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': np.ones(minutes), 'value': close,
+    }, index=index)
+
+
+class TestCandleArchive:
+    """디스크 캔들 아카이브 테스트"""
+    
+    def test_append_only_closed_and_contiguous(self, tmp_path):
+        """마감된 봉만, 마지막 봉과 이어지는 경우에만 추가"""
+        from utils.candle_archive import CandleArchive
+        
+        archive = CandleArchive(tmp_path)
+        df = live_minute_candles(100)
+        
+        # 빈 아카이브는 실시간 추가로 만들지 않음 (백필로만 생성)
+        assert archive.append('KRW-BTC', 'minute1', df) == 0
+        assert archive.append('KRW-BTC', 'minute1', df.iloc[:50], require_overlap=False) == 50
+        
+        # 마지막 봉과 겹치지 않으면 (중간 누락) 추가 안 함
+        assert archive.append('KRW-BTC', 'minute1', df.iloc[60:]) == 0
+        # 진행 중인 마지막 봉은 제외
+        assert archive.append('KRW-BTC', 'minute1', df.iloc[40:]) == 49
+        
+        stored = archive.read('KRW-BTC', 'minute1')
+        pd.testing.assert_frame_equal(stored, df.iloc[:-1], check_freq=False, check_index_type=False)
+        
+        times, columns = archive.arrays('KRW-BTC', 'minute1', start=df.index[10], end=df.index[19])
+        assert len(times) == 10
+        assert isinstance(columns['close'], np.memmap)
+        assert archive.read('KRW-BTC', 'minute1', count=5).index[-1] == df.index[-2]
+    
+    def test_interrupted_write_is_repaired(self, tmp_path):
+        """시각 컬럼 기록 전 중단된 값 컬럼은 다음 추가 때 잘라냄"""
+        from utils.candle_archive import CandleArchive
+        
+        archive = CandleArchive(tmp_path)
+        df = live_minute_candles(20)
+        archive.append('KRW-BTC', 'minute1', df.iloc[:10], require_overlap=False)
+        with open(tmp_path / 'minute1' / 'KRW-BTC' / 'open.f8', 'ab') as f:
+            np.zeros(3).tofile(f)
+        
+        assert archive.append('KRW-BTC', 'minute1', df.iloc[9:15]) == 5
+        pd.testing.assert_frame_equal(archive.read('KRW-BTC', 'minute1'), df.iloc[:15],
+                                      check_freq=False, check_index_type=False)
+    
+    def test_backfill_forward_and_resume(self, tmp_path):
+        """200개씩 과거 → 현재로 백필, 재실행 시 마지막 봉부터 이어서"""
+        from utils.candle_archive import CandleArchive
+        
+        full = live_minute_candles(700)
+        calls = []
+        
+        def fetch(ticker, interval, count, to):
+            calls.append(to)
+            visible = full if to is None else full[full.index < pd.Timestamp(to) + pd.Timedelta(hours=9)]
+            return visible.iloc[-count:]
+        
+        archive = CandleArchive(tmp_path)
+        since = full.index[100]
+        # 조회 실패 후 중단 → 재실행으로 이어받기
+        failing = iter([fetch, None])
+        added = archive.backfill('KRW-BTC', 'minute1', since,
+                                 fetch=lambda *a: next(failing, None) and fetch(*a), max_failures=1)
+        assert added == 200
+        
+        calls.clear()
+        results = archive.backfill_many(['KRW-BTC'], 'minute1', since, fetch=fetch)
+        assert results['KRW-BTC'] == 399  # 진행 중인 마지막 봉 제외
+        assert len(calls) == 2
+        pd.testing.assert_frame_equal(archive.read('KRW-BTC', 'minute1'), full.iloc[100:-1],
+                                      check_freq=False, check_index_type=False)
+    
+    def test_candle_store_warm_start(self, tmp_path):
+        """아카이브가 있으면 최초 조회는 디스크에서, 빈 구간만 조회 후 마감 봉 추가"""
+        from utils.candle_archive import CandleArchive
+        from utils.candle_store import CandleStore
+        
+        full = live_minute_candles(300)
+        archive = CandleArchive(tmp_path)
+        archive.append('KRW-BTC', 'minute1', full.iloc[:-5], require_overlap=False)
+        
+        calls = []
+        
+        def fetch(ticker, interval, count):
+            calls.append(count)
+            return full.iloc[-count:]
+        
+        store = CandleStore(fetch, capacity=300, backfill_count=200, min_refresh=0, archive=archive)
+        df = store.get_ohlcv('KRW-BTC', 'minute1', 200)
+        
+        assert store.warm_starts == 1 and store.backfills == 0
+        assert calls and max(calls) <= 8
+        pd.testing.assert_frame_equal(df, full.iloc[-200:], check_freq=False, check_index_type=False)
+        assert archive.last_time('KRW-BTC', 'minute1') == full.index[-2].value
+
+
+def dip_candles(length=120, dip_at=80):
+    """횡보 중 한 봉에서 -2% 급락 + 거래량 폭증하는 1분봉"""
+    index = pd.date_range('2024-01-01 09:00', periods=length, freq='min')
+    noise = np.where(np.arange(length) % 2 == 0, 0.0005, -0.0005)
+    close = 100 * (1 + noise)
+    close[dip_at:] *= 0.98
+    volume = np.ones(length)
+    volume[dip_at] = 10
+    return pd.DataFrame({
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': volume, 'value': close * volume,
+    }, index=index)
+
+
+class TestBacktestEngine:
+    """이벤트 기반 백테스트 엔진 테스트"""
+    
+    def test_strategy_runs_on_simulated_clock(self):
+        """기존 전략/리스크 관리자를 그대로 사용, 보유 시간은 시뮬레이션 시각 기준"""
+        from src.backtest import BacktestEngine
+        from src.strategies.ultra_scalping import UltraScalping
+        from src.utils.risk_manager import RiskManager
+        
+        df = dip_candles()
+        risk_manager = RiskManager(1_000_000, 100_000, 200_000, max_positions=3, max_position_ratio=0.3)
+        engine = BacktestEngine({'ultra_scalping': UltraScalping({})}, risk_manager, interval='minute1')
+        result = engine.run({'KRW-BTC': df})
+        
+        buy, sell = result.trades
+        assert buy['side'] == 'BUY' and buy['time'] == df.index[80] + pd.Timedelta(minutes=1)
+        assert sell['side'] == 'SELL' and '시간 초과' in sell['reason']
+        assert sell['hold_seconds'] == 300
+        
+        # 청산 후 자산 = 초기 자본 + 실현 손익
+        assert result.final_equity == pytest.approx(1_000_000 + sell['profit_loss'])
+        assert result.bars == len(df)
+        assert result.bars_per_second > 0
+        assert result.summary()['trades'] == 1
+    
+    def test_clock_patch_is_scoped(self):
+        """시뮬레이션 시계는 블록 안에서만 datetime.now()를 대체"""
+        from datetime import datetime
+        from src.backtest import SimulatedClock
+        from src.strategies import dynamic_exit_manager as module
+        
+        clock = SimulatedClock(datetime(2024, 1, 1, 9, 0))
+        manager = module.DynamicExitManager()
+        with clock.patch():
+            manager.register_position('KRW-BTC', 100.0, datetime(2024, 1, 1, 7, 30), 'MeanReversion', 0)
+            should_exit, reason, _ = manager.should_exit('KRW-BTC', 100.0, {}, {})
+            assert should_exit and '최대 보유 시간' in reason  # 시뮬레이션 시각 기준 1시간 초과
+        assert module.datetime is datetime
+    
+    def test_multiple_tickers_merged_in_time_order(self):
+        """여러 티커 봉을 시각 순서대로 병합"""
+        from src.backtest.engine import BacktestEngine
+        
+        a = dip_candles(10, dip_at=5)
+        b = dip_candles(10, dip_at=5).shift(freq="30s")
+        events = list(BacktestEngine._events({'A': a, 'B': b}))
+        
+        assert len(events) == 20
+        assert [ts for ts, _ in events] == sorted(ts for ts, _ in events)
+
+
+class TestVectorizedBacktest:
+    """벡터화 신호 백테스터 테스트"""
+    
+    def test_indicators_match_pandas(self):
+        """NumPy 지표가 BaseStrategy pandas 구현과 일치"""
+        from utils import vector_indicators as vi
+        
+        df = generate_sample_ohlcv(300)
+        strategy = MeanReversion({})
+        close = df['close'].to_numpy()
+        
+        np.testing.assert_allclose(vi.rsi(close), strategy.calculate_rsi(df).to_numpy(), rtol=1e-9)
+        for ours, theirs in zip(vi.bollinger_bands(close), strategy.calculate_bollinger_bands(df)):
+            np.testing.assert_allclose(ours, theirs.to_numpy(), rtol=1e-9)
+        for ours, theirs in zip(vi.macd(close), strategy.calculate_macd(df)):
+            np.testing.assert_allclose(ours, theirs.to_numpy(), rtol=1e-9)
+        assert vi.volume_ratio(df['volume'].to_numpy())[-1] == pytest.approx(strategy.calculate_volume_ratio(df))
+    
+    @pytest.mark.parametrize('strategy', [
+        AggressiveScalping({'rsi_oversold': 45, 'rsi_overbought': 55, 'volume_threshold': 1.0}),
+        ConservativeScalping({'rsi_min': 30, 'rsi_max': 70, 'bb_threshold': 0.7}),
+        MeanReversion({'deviation_threshold': 0.005}),
+    ])
+    def test_signals_match_generate_signal(self, strategy):
+        """각 시점의 벡터 신호가 generate_signal 결과와 같음"""
+        np.random.seed(7)
+        df = generate_sample_ohlcv(160)
+        data = {c: df[c].to_numpy() for c in ['open', 'high', 'low', 'close', 'volume']}
+        buy, sell = strategy.generate_signals_vectorized(data)
+        
+        for t in range(len(df)):
+            signal, _, _ = strategy.generate_signal(df.iloc[:t + 1], 'KRW-BTC')
+            assert buy[t] == (signal == 'BUY'), t
+            assert sell[t] == (signal == 'SELL'), t
+        assert buy.any() and sell.any()
+    
+    def test_simulate_exits_on_first_event(self):
+        """매도 신호/손절/익절 중 먼저 발생한 곳에서 청산, 청산 후에만 재진입"""
+        from src.backtest.vectorized import simulate
+        
+        close = np.array([100, 100, 99.5, 98.9, 100, 100, 102, 100, 100, 100], dtype=float)
+        entries = np.array([0, 1, 1, 0, 1, 0, 0, 0, 1, 0], dtype=bool)
+        exits = np.array([0, 0, 0, 0, 0, 0, 0, 0, 0, 1], dtype=bool)
+        
+        trades = simulate(close, entries, exits, stop_loss=0.01, take_profit=0.015, fee=0.0)
+        assert trades[['entry', 'exit']].tolist() == [(1, 3), (4, 6), (8, 9)]
+        assert trades['ret'][1] == pytest.approx(0.02)
+    
+    def test_universe_matrix_matches_single_ticker(self):
+        """티커 × 시간 행렬 결과가 티커별 실행 결과와 같음"""
+        from src.backtest.vectorized import run_vectorized
+        
+        np.random.seed(3)
+        strategy = AggressiveScalping({'rsi_oversold': 45, 'volume_threshold': 1.0})
+        index = pd.date_range('2024-01-01', periods=500, freq='5min')
+        frames = {f'KRW-C{i}': generate_sample_ohlcv(500).set_axis(index) for i in range(5)}
+        
+        result = run_vectorized(strategy, frames)
+        assert result.bars == 2500
+        for ticker, df in frames.items():
+            single = run_vectorized(strategy, {ticker: df})
+            assert single.per_ticker().loc[ticker, 'trades'] == result.per_ticker().loc[ticker, 'trades']
+        
+        with pytest.raises(NotImplementedError):
+            run_vectorized(GridTrading({}), frames)
+
+
+class TestParameterOptimizer:
+    """워크 포워드 파라미터 최적화 테스트"""
+    
+    @staticmethod
+    def frames(count=3, length=600):
+        np.random.seed(11)
+        index = pd.date_range('2024-01-01', periods=length, freq='5min')
+        return {f'KRW-C{i}': generate_sample_ohlcv(length).set_axis(index) for i in range(count)}
+    
+    def test_walk_forward_splits_move_forward(self):
+        """검증 구간은 학습 구간 바로 뒤, 구간끼리 겹치지 않음"""
+        from src.backtest.optimizer import walk_forward_splits
+        
+        splits = walk_forward_splits(1000, folds=4, train_ratio=0.7)
+        assert len(splits) == 4
+        for (train_start, train_end), (test_start, test_end) in splits:
+            assert train_start < train_end == test_start < test_end <= 1000
+        tests = [test for _, test in splits]
+        assert all(a[1] <= b[0] for a, b in zip(tests, tests[1:]))
+    
+    def test_grid_search_uses_cache(self):
+        """같은 데이터/구간/파라미터는 다시 평가하지 않음"""
+        from src.backtest.optimizer import ParameterOptimizer
+        
+        space = {'deviation_threshold': [0.005, 0.01], 'stop_loss': [0.01, 0.03]}
+        optimizer = ParameterOptimizer('mean_reversion', self.frames(), space=space, workers=1)
+        params, result = optimizer.search((0, 400), 'grid')
+        assert optimizer.evaluations == 4
+        assert set(params) == set(space)
+        
+        again, _ = optimizer.search((0, 400), 'grid')
+        assert again == params
+        assert optimizer.evaluations == 4
+        assert optimizer.cache.hits == 4
+    
+    def test_process_pool_matches_serial(self):
+        """프로세스 풀 평가 결과가 단일 프로세스와 같음"""
+        from src.backtest.optimizer import ParameterOptimizer
+        
+        frames = self.frames()
+        space = {'deviation_threshold': [0.005, 0.01, 0.02]}
+        serial = ParameterOptimizer('mean_reversion', frames, space=space, workers=1)
+        candidates = serial._grid()
+        with ParameterOptimizer('mean_reversion', frames, space=space, workers=2) as parallel:
+            assert parallel.evaluate_many(candidates, (0, 600)) == serial.evaluate_many(candidates, (0, 600))
+    
+    def test_output_loaded_by_learning_engine(self, tmp_path):
+        """결과 파일을 LearningEngine이 읽어 전략에 적용"""
+        from src.backtest.optimizer import ParameterOptimizer, write_optimized_params
+        from src.ai.learning_engine import LearningEngine
+        
+        space = {'rsi_oversold': [35, 45], 'stop_loss': [0.01, 0.02]}
+        optimizer = ParameterOptimizer('aggressive_scalping', self.frames(), space=space, workers=1, seed=3)
+        result = optimizer.walk_forward('bayes', trials=4, folds=2)
+        result['positive_folds'] = 1.0  # 신뢰도 기준(0.6) 통과 가정
+        write_optimized_params('aggressive_scalping', result, str(tmp_path / 'optimized_params.json'))
+        
+        engine = LearningEngine(data_dir=str(tmp_path))
+        params = engine.get_optimized_params('AggressiveScalping')
+        assert params['rsi_low'] == result['params']['rsi_oversold']
+        strategy = AggressiveScalping({}, learning_engine=engine)
+        assert strategy.stop_loss == result['params']['stop_loss']
+
+
+def book_snapshot(ts_ms, bids, asks, ticker='KRW-TEST'):
+    """호가 스냅샷 생성 (bids/asks: [(가격, 잔량), ...] 최우선 호가부터)"""
+    return {
+        'market': ticker,
+        'timestamp': ts_ms,
+        'orderbook_units': [
+            {'ask_price': a[0], 'ask_size': a[1], 'bid_price': b[0], 'bid_size': b[1]}
+            for b, a in zip(bids, asks)
+        ],
+    }
+
+
+class TestSimulatedExchange:
+    """모의 거래소 체결 엔진 테스트"""
+    
+    T0 = 1_700_000_000_000  # ms
+    
+    def exchange(self, snapshots, balance=100_000):
+        from utils.sim_exchange import RecordedOrderbookFeed, SimulatedExchange, KST_OFFSET_NS
+        
+        self.now_ms = self.T0
+        clock = lambda: self.now_ms * 10**6 + KST_OFFSET_NS
+        return SimulatedExchange(RecordedOrderbookFeed(snapshots), balance=balance,
+                                 latency=0.0, clock=clock, sleep=None)
+    
+    def test_market_buy_walks_the_book(self):
+        """시장가 매수는 호가 잔량을 소진하며 체결, 잔량 부족분은 취소"""
+        book = book_snapshot(self.T0, [(990, 10), (980, 10)], [(1000, 10), (1010, 10)])
+        exchange = self.exchange([book])
+        
+        order = exchange.buy_market_order('KRW-TEST', 15000)
+        assert order['state'] == 'done'
+        assert [t['price'] for t in order['trades']] == ['1000', '1010']
+        assert float(order['executed_volume']) == pytest.approx(10 + 5000 / 1010)
+        assert exchange.get_balance('KRW') == pytest.approx(100_000 - 15000 * 1.0005)
+        assert exchange.get_avg_buy_price('KRW-TEST') == pytest.approx(15000 / (10 + 5000 / 1010))
+        
+        # 남은 잔량(1010원 약 5개)보다 큰 주문 → 부분 체결 후 나머지 잠금 해제
+        order = exchange.buy_market_order('KRW-TEST', 50000)
+        assert order['state'] == 'cancel'
+        assert float(order['executed_volume']) == pytest.approx(10 - 5000 / 1010)
+        assert exchange.get_balance('KRW') == pytest.approx(100_000 - 20100 * 1.0005)
+        assert exchange.get_execution_stats()['avg_cost_bps'] > 0
+    
+    def test_rejects_invalid_orders(self):
+        """호가 단위 위반, 최소 주문 금액 미달, 잔고 부족은 None"""
+        exchange = self.exchange([book_snapshot(self.T0, [(990, 10)], [(1000, 10)])])
+        
+        assert exchange.buy_limit_order('KRW-TEST', 1003, 10) is None
+        assert exchange.buy_limit_order('KRW-TEST', 990, 4) is None
+        assert exchange.sell_market_order('KRW-TEST', 10) is None
+        assert exchange.get_execution_stats()['rejected'] == 3
+        assert exchange.get_balance('KRW') == 100_000
+    
+    def test_resting_limit_waits_in_queue(self):
+        """대기 지정가는 앞 대기열이 소진된 뒤 체결 (부분 체결 → 가격 돌파 시 전량)"""
+        T0 = self.T0
+        asks = [(1000, 10), (1010, 10)]
+        exchange = self.exchange([
+            book_snapshot(T0, [(990, 10), (980, 10)], asks),
+            book_snapshot(T0 + 1000, [(990, 3), (980, 10)], asks),    # 7 체결 → 앞 대기 3
+            book_snapshot(T0 + 2000, [(990, 8), (980, 10)], asks),    # 뒤에 신규 주문
+            book_snapshot(T0 + 3000, [(990, 2), (980, 10)], asks),    # 6 체결 → 3 체결
+            book_snapshot(T0 + 4000, [(980, 10), (970, 10)], [(990, 5), (1000, 10)]),
+        ])
+        order = exchange.buy_limit_order('KRW-TEST', 990, 6)
+        assert order['state'] == 'wait' and order['executed_volume'] == '0'
+        assert float(exchange.get_balances()[0]['locked']) == pytest.approx(990 * 6 * 1.0005)
+        
+        self.now_ms = T0 + 2000
+        assert exchange.get_order(order['uuid'])['executed_volume'] == '0'
+        self.now_ms = T0 + 3000
+        assert float(exchange.get_order(order['uuid'])['executed_volume']) == pytest.approx(3)
+        self.now_ms = T0 + 4000
+        done = exchange.get_order(order['uuid'])
+        assert done['state'] == 'done' and float(done['executed_volume']) == pytest.approx(6)
+        assert exchange.get_amount('KRW-TEST') == pytest.approx(990 * 6)
+        assert exchange.get_balance('KRW') == pytest.approx(100_000 - 990 * 6 * 1.0005)
+    
+    def test_cancel_releases_funds(self):
+        """취소 시 잠금 해제, 이미 끝난 주문 취소는 None"""
+        exchange = self.exchange([book_snapshot(self.T0, [(990, 10)], [(1000, 10)])])
+        order = exchange.buy_limit_order('KRW-TEST', 980, 10)
+        assert exchange.get_balance('KRW') == pytest.approx(100_000 - 9800 * 1.0005)
+        
+        assert exchange.cancel_order(order['uuid'])['state'] == 'cancel'
+        assert exchange.get_balance('KRW') == pytest.approx(100_000)
+        assert exchange.cancel_order(order['uuid']) is None
+    
+    def test_smart_executor_limit_fallback_offline(self):
+        """UpbitAPI 인터페이스로 SmartOrderExecutor 지정가 → 시장가 Fallback 실행"""
+        from src.upbit_api import SimulatedUpbitAPI
+        from src.utils.sim_exchange import SimulatedExchange, SyntheticOrderbookFeed
+        from src.utils.smart_order_executor import SmartOrderExecutor
+        
+        np.random.seed(5)
+        index = pd.date_range('2024-01-01 09:00', periods=300, freq='1min')
+        feed = SyntheticOrderbookFeed({'KRW-BTC': generate_sample_ohlcv(300).set_axis(index)})
+        now = pd.Timestamp('2024-01-01 12:00')
+        exchange = SimulatedExchange(feed, balance=1_000_000, latency=0.0, clock=lambda: now, sleep=None)
+        api = SimulatedUpbitAPI(exchange)
+        
+        price = api.get_current_price('KRW-BTC')
+        assert price == feed.price('KRW-BTC', now)
+        assert api.calculate_spread_percentage('KRW-BTC') > 0
+        df = api.get_ohlcv('KRW-BTC', interval='minute5', count=20)
+        assert len(df) == 20 and df.index[-1] == pd.Timestamp('2024-01-01 11:55')
+        
+        executor = SmartOrderExecutor(api, order_selector=None)
+        executor.limit_order_timeout = 0
+        limit_price = api.adjust_price_to_tick('KRW-BTC', price * 0.99)
+        result = executor._execute_limit_buy_with_fallback('KRW-BTC', limit_price, 100_000)
+        
+        states = [o['state'] for o in exchange.orders.values()]
+        assert states == ['cancel', 'done']
+        assert result['ord_type'] == 'price'
+        assert exchange.get_amount('KRW-BTC') == pytest.approx(100_000, rel=1e-6)
+    
+    def test_backtest_engine_fills_on_book(self):
+        """백테스트 체결가가 합성 호가의 매도/매수 1호가"""
+        from src.backtest import BacktestEngine
+        from src.strategies.ultra_scalping import UltraScalping
+        from src.utils.risk_manager import RiskManager
+        from src.utils.sim_exchange import SimulatedExchange, SyntheticOrderbookFeed
+        
+        df = dip_candles()
+        risk_manager = RiskManager(1_000_000, 100_000, 200_000, max_positions=3, max_position_ratio=0.3)
+        engine = BacktestEngine({'ultra_scalping': UltraScalping({})}, risk_manager, interval='minute1')
+        engine.exchange = SimulatedExchange(SyntheticOrderbookFeed({'KRW-BTC': df}), balance=2_000_000,
+                                            latency=0.0, clock=engine.clock.now, sleep=None)
+        buy, sell = engine.run({'KRW-BTC': df}).trades
+        
+        # 봉 마감 시각 = 다음 봉 시가 스냅샷 (호가 단위 1원, 스프레드 1틱)
+        assert buy['price'] == pytest.approx(np.floor(df.loc[buy['time'], 'open']) + 1)
+        assert sell['price'] == pytest.approx(np.floor(df.loc[sell['time'], 'open']))
+        assert engine.exchange.get_execution_stats()['avg_cost_bps'] > 0
+
+
+class TestMonteCarlo:
+    """몬테카를로 강건성 검증 테스트"""
+    
+    @staticmethod
+    def history(length=800):
+        np.random.seed(5)
+        index = pd.date_range('2024-01-01', periods=length, freq='min')
+        return generate_sample_ohlcv(length).set_axis(index)
+    
+    def test_bootstrap_paths_are_valid_and_seeded(self):
+        """생성 경로는 길이/가격 관계 유지, 같은 시드면 같은 경로"""
+        from src.backtest.monte_carlo import PathGenerator
+        
+        generator = PathGenerator(self.history(), block=30, length=500)
+        path = generator.sample(np.random.default_rng([0, 1]))
+        assert all(len(v) == 500 for v in path.values())
+        assert (path['close'] > 0).all()
+        assert (path['high'] >= np.maximum(path['open'], path['close'])).all()
+        assert (path['low'] <= np.minimum(path['open'], path['close'])).all()
+        
+        again = generator.sample(np.random.default_rng([0, 1]))
+        other = generator.sample(np.random.default_rng([0, 2]))
+        assert np.array_equal(path['close'], again['close'])
+        assert not np.array_equal(path['close'], other['close'])
+        assert len(generator.frame(path)) == 500
+    
+    def test_process_pool_matches_serial(self):
+        """경로별 난수 고정 → 워커 수와 무관하게 같은 분포"""
+        from src.backtest.monte_carlo import MonteCarloStudy
+        
+        df = self.history()
+        serial = MonteCarloStudy(df, 'aggressive_scalping', workers=1, seed=7).run(12)
+        parallel = MonteCarloStudy(df, 'aggressive_scalping', workers=2, seed=7).run(12)
+        assert serial.paths == 12
+        assert np.array_equal(serial.pnl, parallel.pnl)
+        assert np.array_equal(serial.max_drawdown, parallel.max_drawdown)
+        assert (serial.max_drawdown <= 0).all()
+        
+        summary = serial.summary()
+        assert summary['cvar'] <= summary['var'] <= summary['pnl'][50]
+        assert 0 <= summary['loss_probability'] <= 100
+    
+    def test_engine_applies_dynamic_stop_loss(self):
+        """엔진에 DynamicStopLoss를 주면 진입 시 손절가 설정 후 도달 시 청산"""
+        from types import SimpleNamespace
+        from src.backtest import BacktestEngine
+        from src.config import Config
+        from src.strategies.dynamic_stop_loss import DynamicStopLoss
+        from src.strategies.ultra_scalping import UltraScalping
+        from src.utils.risk_manager import RiskManager
+        
+        df = dip_candles()
+        df.loc[df.index[82:], ['open', 'high', 'low', 'close']] *= 0.985
+        risk_manager = RiskManager(1_000_000, 100_000, 200_000, max_positions=3, max_position_ratio=0.3)
+        engine = BacktestEngine({'ultra_scalping': UltraScalping({})}, risk_manager, interval='minute1',
+                                stop_loss_manager=DynamicStopLoss(SimpleNamespace(experiences=[]), Config))
+        buy, sell = engine.run({'KRW-BTC': df}).trades[:2]
+        
+        assert buy['side'] == 'BUY' and sell['side'] == 'SELL'
+        assert sell['reason'].startswith('손절')
+        assert sell['time'] == df.index[82] + pd.Timedelta(minutes=1)
+
+
+class TestStreamingIndicators:
+    """증분 지표 테스트"""
+    
+    @staticmethod
+    def candles(length=300):
+        np.random.seed(21)
+        index = pd.date_range('2024-01-01', periods=length, freq='5min')
+        return generate_sample_ohlcv(length).set_axis(index)
+    
+    def test_matches_batch_on_sliding_windows(self):
+        """창을 한 봉씩 밀며 조회해도 pandas 구현과 같은 값"""
+        from utils import technical_indicators as ti
+        from utils.streaming_indicators import StreamingIndicators
+        
+        df = self.candles()
+        indicators = StreamingIndicators()
+        for end in range(100, len(df)):
+            window = df.iloc[max(0, end - 200):end]
+            rsi = indicators.get('KRW-BTC', 'minute5', 'rsi', window, period=14)
+            upper, middle, lower = indicators.get('KRW-BTC', 'minute5', 'bollinger', window)
+            atr = indicators.get('KRW-BTC', 'minute5', 'atr', window)
+            k, d = indicators.get('KRW-BTC', 'minute5', 'stochastic', window)
+            
+            assert rsi == pytest.approx(ti.calculate_rsi(window).iloc[-1], rel=1e-9)
+            assert upper == pytest.approx(ti.calculate_bollinger_bands(window)[0].iloc[-1], rel=1e-9)
+            assert atr == pytest.approx(ti.calculate_atr(window).iloc[-1], rel=1e-9)
+            assert d == pytest.approx(ti.calculate_stochastic(window)[1].iloc[-1], rel=1e-9)
+        
+        # EMA 계열은 시작 시점 차이만큼만 다름
+        macd, signal, _ = indicators.get('KRW-BTC', 'minute5', 'macd')
+        batch = ti.calculate_macd(window)
+        assert macd == pytest.approx(batch[0].iloc[-1], abs=1e-6 * df['close'].iloc[-1])
+        assert indicators.get_stats()['replays'] == 0
+    
+    def test_live_candle_ticks_do_not_commit(self):
+        """진행 중인 봉 갱신은 상태에 누적되지 않고, 다음 봉이 열릴 때 마감"""
+        from utils import technical_indicators as ti
+        from utils.streaming_indicators import StreamingIndicators
+        
+        df = self.candles(60)
+        indicators = StreamingIndicators()
+        indicators.sync('KRW-ETH', 'minute1', df.iloc[:-1])
+        last = df.index[-1]
+        for close in (df['close'].iloc[-2] * 1.01, df['close'].iloc[-2] * 0.99, df['close'].iloc[-1]):
+            row = df.iloc[-1]
+            indicators.on_candle('KRW-ETH', 'minute1', last, (row['open'], row['high'], row['low'], close, row['volume']))
+        
+        assert indicators.get('KRW-ETH', 'minute1', 'rsi', period=14) == \
+            pytest.approx(ti.calculate_rsi(df).iloc[-1], rel=1e-9)
+        assert indicators.get('KRW-ETH', 'minute1', 'volume_ratio') == \
+            pytest.approx(df['volume'].iloc[-1] / df['volume'].iloc[-20:].mean())
+    
+    def test_gap_rebuilds_state(self):
+        """마지막 반영 봉이 없는 데이터가 오면 상태를 다시 구성"""
+        from utils import technical_indicators as ti
+        from utils.streaming_indicators import StreamingIndicators
+        
+        df = self.candles()
+        indicators = StreamingIndicators()
+        indicators.get('KRW-XRP', 'minute5', 'rsi', df.iloc[:100], period=14)
+        later = df.iloc[150:]
+        assert indicators.get('KRW-XRP', 'minute5', 'rsi', later, period=14) == \
+            pytest.approx(ti.calculate_rsi(later).iloc[-1], rel=1e-9)
+        assert indicators.get_stats()['replays'] == 1
+
+
+class TestIndicatorBundle:
+    """봉 단위 공용 지표 묶음 테스트"""
+    
+    @staticmethod
+    def candles(length=200):
+        np.random.seed(31)
+        index = pd.date_range('2024-01-01', periods=length, freq='5min')
+        return generate_sample_ohlcv(length).set_axis(index)
+    
+    def test_values_match_strategy_methods(self):
+        """BaseStrategy pandas 계산의 마지막 값과 같음"""
+        from src.utils.indicator_bundle import IndicatorBundle
+        
+        df = self.candles()
+        strategy = AggressiveScalping({})
+        bundle = IndicatorBundle(df, 'KRW-BTC')
+        
+        assert bundle.rsi() == pytest.approx(strategy.calculate_rsi(df).iloc[-1], rel=1e-9)
+        assert bundle.rsi(6) == pytest.approx(strategy.calculate_rsi(df, period=6).iloc[-1], rel=1e-9)
+        for value, series in zip(bundle.bollinger(), strategy.calculate_bollinger_bands(df)):
+            assert value == pytest.approx(series.iloc[-1], rel=1e-9)
+        for value, series in zip(bundle.macd(), strategy.calculate_macd(df)):
+            assert value == pytest.approx(series.iloc[-1], rel=1e-9)
+        assert bundle.sma(20) == pytest.approx(strategy.calculate_moving_average(df, 20).iloc[-1])
+        assert bundle.volume_ratio() == pytest.approx(strategy.calculate_volume_ratio(df))
+        assert bundle.price_change(3) == pytest.approx(strategy.get_price_change(df, periods=3))
+        assert bundle.volatility(20) == pytest.approx(strategy.get_volatility(df, 20))
+        assert bundle.volatility() == pytest.approx(df['close'].pct_change().std() * 100)
+    
+    def test_cache_key_and_eviction(self):
+        """같은 캔들은 같은 묶음, 진행 중인 봉 값이 바뀌면 새 묶음, 한도 초과 시 오래된 묶음 제거"""
+        from src.utils.indicator_bundle import IndicatorCache
+        
+        cache = IndicatorCache(max_entries=2)
+        df = self.candles()
+        first = cache.get(df, 'KRW-BTC')
+        assert cache.get(df.copy(), 'KRW-BTC') is first
+        
+        ticked = df.copy()
+        ticked.iloc[-1, ticked.columns.get_loc('close')] *= 1.01
+        assert cache.get(ticked, 'KRW-BTC') is not first
+        assert cache.get(df, 'KRW-ETH') is not first
+        assert cache.get_stats()['entries'] == 2
+        assert cache.get(df, 'KRW-BTC') is not first  # 가장 오래된 묶음은 제거됨
+        assert cache.get(None) is None
+    
+    def test_strategy_and_ai_share_one_bundle(self):
+        """같은 스캔에서 전략과 AI 모듈이 한 번 계산한 지표를 공유"""
+        from src.ai.scenario_identifier import ScenarioIdentifier
+        from src.utils.indicator_bundle import indicator_cache
+        from src.utils.market_condition_analyzer import MarketConditionAnalyzer
+        
+        df = self.candles()
+        indicator_cache.clear()
+        hits, misses = indicator_cache.hits, indicator_cache.misses
+        
+        _, _, indicators = ConservativeScalping({}).generate_signal(df, 'KRW-SHARE')
+        scenario = ScenarioIdentifier().identify(df, 'KRW-SHARE')
+        MarketConditionAnalyzer().analyze_market(df, 'KRW-SHARE')
+        
+        assert indicator_cache.misses - misses == 1
+        assert indicator_cache.hits - hits == 2
+        assert scenario['indicators']['rsi'] == pytest.approx(indicators['rsi'])
+        assert 'price_change_24h' not in scenario['indicators']  # 288봉 미만
+        assert 'bb_width' in scenario['indicators']
+
+
+
+class TestUniverseIndicators:
+    """티커 전체 일괄 지표 테스트"""
+    
+    @staticmethod
+    def universe():
+        np.random.seed(47)
+        frames = {f'KRW-C{i}': generate_sample_ohlcv(120) for i in range(6)}
+        frames['KRW-SHORT'] = generate_sample_ohlcv(12)
+        return frames
+    
+    def test_matches_per_ticker_values(self):
+        """봉 길이가 달라도 티커별 pandas 계산과 같은 값"""
+        from src.utils.universe_indicators import UniverseIndicators
+        
+        frames = self.universe()
+        strategy = AggressiveScalping({})
+        universe = UniverseIndicators(frames)
+        rsi, sma, volatility = universe.rsi(), universe.sma(20), universe.volatility()
+        volume_ratio, change = universe.volume_ratio(), universe.change(3)
+        
+        for i, ticker in enumerate(universe.tickers):
+            df = frames[ticker]
+            expected_rsi = strategy.calculate_rsi(df).iloc[-1]
+            if np.isnan(expected_rsi):
+                assert np.isnan(rsi[i])
+            else:
+                assert rsi[i] == pytest.approx(expected_rsi, rel=1e-9)
+            expected_sma = strategy.calculate_moving_average(df, 20).iloc[-1]
+            assert (np.isnan(sma[i]) and np.isnan(expected_sma)) or sma[i] == pytest.approx(expected_sma)
+            assert volatility[i] == pytest.approx(df['close'].pct_change().std() * 100)
+            assert volume_ratio[i] == pytest.approx(strategy.calculate_volume_ratio(df))
+            assert change[i] == pytest.approx(strategy.get_price_change(df, periods=3))
+        assert np.isnan(sma[universe.tickers.index('KRW-SHORT')])
+    
+    def test_detect_surge_matches_scanner_definition(self):
+        """단일 마켓 detect_surge는 1분 캔들만 조회하고 롤링 스캐너와 같은 지표를 반환"""
+        from types import SimpleNamespace
+        from src.utils.surge_detector import SurgeDetector
+        
+        np.random.seed(53)
+        candles = {}
+        for i in range(5):
+            df = generate_sample_ohlcv(20 if i else 4)
+            if i % 2 == 0:
+                df.iloc[-1, df.columns.get_loc('close')] = df['close'].iloc[-2] * 1.03
+                df['volume'] = df['volume'] * np.where(np.arange(len(df)) >= len(df) - 5, 5.0, 1.0)
+            candles[f'KRW-S{i}'] = df
+        intervals = []
+        
+        def get_ohlcv(ticker, interval, count):
+            intervals.append(interval)
+            return candles.get(ticker)
+        api = SimpleNamespace(get_ohlcv=get_ohlcv)
+        
+        detector = SurgeDetector()
+        single = {t: detector.detect_surge(t, api) for t in list(candles) + ['KRW-MISSING']}
+        assert set(intervals) == {'minute1'}
+        assert single['KRW-MISSING'] is None
+        assert single['KRW-S0'] is None  # 짧은 캔들 → 거래량 비율 1.0
+        
+        scanner = SurgeDetector()
+        scanner.scanner.clock = lambda: 600.0
+        prices = {t: df['close'].iloc[-1] for t, df in candles.items()}
+        batch = {s['ticker']: s for s in scanner.scan_market_batch(list(candles), prices, api)}
+        
+        assert {t for t, s in single.items() if s} == set(batch) == {'KRW-S4'}
+        for ticker, surge in batch.items():
+            for field in ('change_1m', 'change_5m', 'change_15m', 'volume_ratio', 'surge_score'):
+                assert single[ticker][field] == pytest.approx(surge[field])
+            c = candles[ticker]['close']
+            assert surge['change_15m'] == pytest.approx((c.iloc[-1] - c.iloc[-16]) / c.iloc[-16] * 100)
+        assert SurgeDetector().scan_market_batch(list(candles), prices) == []  # 상태/캔들 없음
+    
+    def test_rankings_share_prefetched_candles(self):
+        """RSI/변동성 순위가 미리 조회한 캔들로 계산되고 점수 규칙을 유지"""
+        from src.utils.dynamic_coin_selector import DynamicCoinSelector
+        from src.utils.indicator_bundle import IndicatorBundle
+        
+        frames = self.universe()
+        selector = DynamicCoinSelector()
+        tickers = list(frames) + ['KRW-NONE']
+        rsi_ranking = dict(selector.get_rsi_ranking(tickers, frames))
+        volatility_ranking = selector.get_volatility_ranking(tickers, frames)
+        
+        assert 'KRW-NONE' not in rsi_ranking
+        for ticker, df in frames.items():
+            rsi = IndicatorBundle(df).rsi()
+            expected = 100 - rsi if rsi <= 30 else rsi if rsi >= 70 else 50
+            assert rsi_ranking[ticker] == pytest.approx(expected)
+        assert [v for _, v in volatility_ranking] == sorted((v for _, v in volatility_ranking), reverse=True)
+        assert dict(volatility_ranking)['KRW-C0'] == pytest.approx(frames['KRW-C0']['close'].pct_change().std() * 100)
+
+
+class TestTaskScheduler:
+    """마감 시각 기반 작업 스케줄러 테스트"""
+    
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+        
+        def __call__(self):
+            return self.now
+        
+        def sleep(self, seconds):
+            self.now += seconds
+    
+    def test_exit_check_preempts_long_scan(self):
+        """긴 전체 스캔 중에도 청산 체크가 티커 사이에 제시간 실행"""
+        from src.utils.task_scheduler import TaskScheduler, JobPriority
+        
+        clock = self.FakeClock()
+        scheduler = TaskScheduler(clock=clock, sleep=clock.sleep)
+        log = []
+        
+        def full_scan():
+            for i in range(40):
+                clock.now += 0.5  # 티커 1개 분석 0.5초
+                log.append(('scan', i))
+                yield
+        
+        scheduler.add_job('full_scan', full_scan, 60, JobPriority.SCAN)
+        scheduler.add_job('exit', lambda: log.append(('exit', clock.now)), 3, JobPriority.EXIT)
+        scheduler.run_forever(lambda: clock.now < 30)
+        
+        exits = [t for kind, t in log if kind == 'exit']
+        assert len([1 for kind, _ in log if kind == 'scan']) == 40
+        assert len(exits) >= 9
+        stats = scheduler.get_stats()['exit']
+        assert stats['lateness_max_ms'] <= 500 + 1e-6  # 최대 티커 1개 분석 시간만큼 지연
+        assert stats['missed'] == 0
+    
+    def test_priority_order_and_missed_periods(self):
+        """같은 시점에 준비된 작업은 우선순위 순, 밀린 주기는 건너뛰고 기록"""
+        from src.utils.task_scheduler import TaskScheduler
+        
+        clock = self.FakeClock()
+        scheduler = TaskScheduler(clock=clock, sleep=clock.sleep)
+        order = []
+        
+        def slow():
+            order.append('slow')
+            clock.now += 10
+        
+        scheduler.add_job('slow', slow, 2, priority=3)
+        scheduler.add_job('fast', lambda: order.append('fast'), 1, priority=0)
+        scheduler.run_once()
+        scheduler.run_once()
+        assert order == ['fast', 'slow']
+        
+        scheduler.run_once()
+        stats = scheduler.get_stats()
+        assert stats['fast']['missed'] == 9
+        assert stats['fast']['lateness_max_ms'] == pytest.approx(9000)
+        assert scheduler.next_run_in('fast') == pytest.approx(1.0)
+        assert scheduler.idle_time() == 0.0  # slow 작업 마감이 이미 지남
+    
+    def test_job_error_is_isolated(self):
+        """작업 오류는 기록만 하고 다른 작업은 계속 실행"""
+        from src.utils.task_scheduler import TaskScheduler
+        
+        clock = self.FakeClock()
+        scheduler = TaskScheduler(clock=clock, sleep=clock.sleep)
+        calls = []
+        
+        def broken():
+            yield
+            raise RuntimeError("boom")
+        
+        scheduler.add_job('broken', broken, 5, priority=0)
+        scheduler.add_job('ok', lambda: calls.append(clock.now), 5, priority=1)
+        scheduler.run_forever(lambda: clock.now < 12)
+        
+        assert scheduler.get_stats()['broken']['errors'] == 3
+        assert len(calls) == 3
+        with pytest.raises(ValueError):
+            scheduler.add_job('bad', lambda: None, 0)
+    
+    def test_job_error_reported_to_callback(self):
+        """작업 오류는 on_error 콜백으로 전달 (작업 이름, 예외)"""
+        from src.utils.task_scheduler import TaskScheduler
+        
+        clock = self.FakeClock()
+        errors = []
+        scheduler = TaskScheduler(clock=clock, sleep=clock.sleep,
+                                  on_error=lambda name, e: errors.append((name, str(e))))
+        
+        def broken():
+            raise RuntimeError("boom")
+        
+        scheduler.add_job('broken', broken, 5)
+        scheduler.run_once()
+        assert errors == [('broken', 'boom')]
+        assert scheduler.get_stats()['broken']['errors'] == 1
+
+
+class TestScanPool:
+    """전체 스캔 제한 워커 풀 테스트"""
+    
+    def test_io_overlaps_within_worker_bound(self):
+        """네트워크 대기가 겹쳐 스캔 시간이 티커 수에 비례하지 않고, 동시 실행은 워커 수 이하"""
+        import threading
+        import time as time_module
+        from src.utils.scan_pool import ScanPool
+        
+        pool = ScanPool(max_workers=8)
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        
+        def fetch(ticker, strategy):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time_module.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+            return ticker.lower(), strategy
+        
+        jobs = [(f'KRW-C{i}', 'aggressive_scalping') for i in range(40)]
+        started = time_module.monotonic()
+        results = [r for r in pool.map_unordered(fetch, jobs, poll=0.01) if r is not None]
+        elapsed = time_module.monotonic() - started
+        pool.shutdown()
+        
+        assert sorted(item for item, _, _ in results) == sorted(jobs)
+        assert all(result == (item[0].lower(), item[1]) for item, result, _ in results)
+        assert elapsed < 40 * 0.05 / 2
+        assert state['peak'] <= 8
+        assert pool.get_stats()['max_in_flight'] <= 16
+    
+    def test_errors_and_cancellation(self):
+        """작업 예외는 결과로 전달, 중단 시 시작 안 한 작업 취소"""
+        import time as time_module
+        from src.utils.scan_pool import ScanPool
+        
+        pool = ScanPool(max_workers=1)
+        
+        def work(i):
+            if i == 0:
+                raise RuntimeError("boom")
+            time_module.sleep(0.01)
+            return i
+        
+        scan = pool.map_unordered(work, range(10), poll=0.01)
+        first = next(r for r in scan if r is not None)
+        assert first[0] == 0 and isinstance(first[2], RuntimeError)
+        scan.close()
+        pool.shutdown(wait_running=True)
+        
+        stats = pool.get_stats()
+        assert stats['errors'] == 1
+        assert stats['cancelled'] >= 1
+        assert stats['tasks'] == 2
+
+
+class TestExitWatcher:
+    """청산 전용 감시 스레드 테스트"""
+    
+    def test_sweep_batches_prices_and_records_latency(self):
+        """감시 1회에 보유 코인 가격을 한 번에 조회하고 청산 지연을 기록"""
+        from src.utils.exit_watcher import ExitWatcher
+        
+        positions = {'KRW-A': 100.0, 'KRW-B': 200.0, 'KRW-C': 300.0}
+        calls = []
+        
+        def get_prices(tickers):
+            calls.append(list(tickers))
+            return {'KRW-A': 98.0, 'KRW-B': 201.0}  # KRW-C는 가격 없음
+        
+        def evaluate(ticker, price):
+            if price < positions[ticker] * 0.99:
+                del positions[ticker]
+                return True
+            return False
+        
+        watcher = ExitWatcher(lambda: list(positions), get_prices, evaluate)
+        assert watcher.sweep() == 1
+        assert calls == [['KRW-A', 'KRW-B', 'KRW-C']]
+        assert list(positions) == ['KRW-B', 'KRW-C']
+        
+        stats = watcher.get_stats()
+        assert stats['exits'] == 1 and stats['sweeps'] == 1
+        assert stats['exit_latency']['count'] == 1
+        assert sum(stats['sweep_latency']['buckets'].values()) == 1
+    
+    def test_errors_go_to_on_error(self):
+        """가격 조회/청산 판단 실패는 on_error 콜백으로 전달되고 감시는 계속"""
+        from src.utils.exit_watcher import ExitWatcher
+        
+        failures = []
+        fail_prices = [True]
+        
+        def get_prices(tickers):
+            if fail_prices[0]:
+                raise ConnectionError("timeout")
+            return {'KRW-A': 90.0, 'KRW-B': 90.0}
+        
+        def evaluate(ticker, price):
+            if ticker == 'KRW-A':
+                raise ValueError("bad position")
+            return True
+        
+        watcher = ExitWatcher(lambda: ['KRW-A', 'KRW-B'], get_prices, evaluate,
+                              on_error=lambda name, e: failures.append((name, type(e))))
+        assert watcher.sweep() == 0
+        fail_prices[0] = False
+        assert watcher.sweep() == 1
+        
+        assert failures == [('prices', ConnectionError), ('KRW-A', ValueError)]
+        assert watcher.get_stats()['errors'] == 2
+    
+    def test_thread_exits_while_scan_is_busy(self):
+        """스캔이 잠금 밖에서 오래 걸려도 감시 스레드가 주기 안에 청산"""
+        import threading
+        import time as time_module
+        from src.utils.exit_watcher import ExitWatcher
+        
+        positions = {'KRW-A'}
+        exited = threading.Event()
+        prices = {'KRW-A': 100.0}
+        
+        def evaluate(ticker, price):
+            if price < 95:
+                positions.discard(ticker)
+                exited.set()
+                return True
+            return False
+        
+        watcher = ExitWatcher(lambda: list(positions), lambda t: dict(prices), evaluate, interval=0.02)
+        watcher.start()
+        try:
+            time_module.sleep(0.05)  # 메인 스레드는 다른 작업 중
+            prices['KRW-A'] = 90.0
+            started = time_module.monotonic()
+            assert exited.wait(1.0)
+            assert time_module.monotonic() - started < 0.5
+        finally:
+            watcher.stop()
+        
+        assert not watcher.is_running
+        stats = watcher.get_stats()
+        assert stats['exits'] == 1
+        assert stats['sweep_latency']['p99_ms'] >= stats['sweep_latency']['p50_ms']
+    
+    def test_thread_uses_position_priority(self):
+        """감시 스레드의 가격 조회/청산 판단은 POSITION 한도 우선순위로 실행"""
+        import threading
+        from src.utils.exit_watcher import ExitWatcher
+        from src.utils.rate_limiter import Priority, rate_limiter
+        
+        lanes = []
+        done = threading.Event()
+        
+        def get_prices(tickers):
+            lanes.append(rate_limiter.current_priority)
+            return {'KRW-A': 100.0}
+        
+        def evaluate(ticker, price):
+            lanes.append(rate_limiter.current_priority)
+            done.set()
+            return False
+        
+        watcher = ExitWatcher(lambda: ['KRW-A'], get_prices, evaluate, interval=0.02)
+        watcher.start()
+        try:
+            assert done.wait(1.0)
+        finally:
+            watcher.stop()
+        
+        assert set(lanes) == {Priority.POSITION}
+        assert rate_limiter.current_priority == Priority.BACKGROUND
+    
+    def test_latency_histogram_buckets(self):
+        """지연 히스토그램 구간/백분위"""
+        from src.utils.exit_watcher import LatencyHistogram
+        
+        histogram = LatencyHistogram()
+        for ms in [1, 2, 3, 40, 7000]:
+            histogram.record(ms / 1000)
+        stats = histogram.get_stats()
+        
+        assert stats['buckets']['≤5ms'] == 3
+        assert stats['buckets']['≤50ms'] == 1
+        assert stats['buckets']['>5000ms'] == 1
+        assert stats['p50_ms'] == pytest.approx(3)
+        assert stats['max_ms'] == pytest.approx(7000)
+
+
+class TestPriceTriggerIndex:
+    """가격 트리거 인덱스 테스트"""
+    
+    def test_crossed_levels(self):
+        """넘은 레벨만 방향별로 반환, 같은 키는 교체"""
+        from src.utils.price_triggers import PriceTriggerIndex, BELOW, ABOVE
+        
+        index = PriceTriggerIndex()
+        index.set_levels('KRW-A', {
+            'stop': (99.0, BELOW),
+            'trailing': (101.0, BELOW),
+            'take_profit': (103.0, ABOVE),
+            'scaled_sell': (102.0, ABOVE),
+            'dynamic_stop': (None, BELOW),
+        })
+        
+        assert [t.key for t in index.check('KRW-A', 102.5)] == ['scaled_sell']
+        assert [t.key for t in index.check('KRW-A', 101.5)] == []
+        assert [t.key for t in index.check('KRW-A', 100.0)] == ['trailing']
+        assert [t.key for t in index.check('KRW-A', 98.0)] == ['trailing', 'stop']
+        assert [t.key for t in index.check('KRW-A', 103.0)] == ['scaled_sell', 'take_profit']
+        assert [t.key for t in index.check('KRW-A', 101.0)] == ['trailing']  # 레벨과 같으면 발동
+        
+        index.set_level('KRW-A', 'trailing', 95.0, BELOW)
+        assert [t.key for t in index.check('KRW-A', 100.0)] == []
+        assert index.get_levels('KRW-A')['trailing'] == (95.0, BELOW)
+        assert 'dynamic_stop' not in index.get_levels('KRW-A')
+        assert index.check('KRW-NONE', 1.0) == []
+        
+        index.set_levels('KRW-B', {'stop': (10.0, BELOW)})
+        index.retain(['KRW-B'])
+        assert not index.has('KRW-A') and index.has('KRW-B')
+        with pytest.raises(ValueError):
+            index.set_level('KRW-B', 'x', 1.0, 'sideways')
+    
+    def test_matches_linear_scan(self):
+        """무작위 레벨/가격에서 선형 탐색과 같은 결과"""
+        from src.utils.price_triggers import PriceTriggerIndex, BELOW, ABOVE
+        
+        rng = np.random.default_rng(3)
+        index = PriceTriggerIndex()
+        levels = {f'L{i}': (float(rng.uniform(90, 110)), BELOW if i % 2 else ABOVE) for i in range(200)}
+        index.set_levels('KRW-A', levels)
+        
+        for price in rng.uniform(85, 115, 100):
+            expected = {key for key, (level, direction) in levels.items()
+                        if (direction == BELOW and price <= level) or (direction == ABOVE and price >= level)}
+            assert {t.key for t in index.check('KRW-A', price)} == expected
+    
+    def test_exit_analysis_runs_only_on_crossing(self):
+        """레벨을 넘거나 전체 체크 주기가 돼야 비싼 청산 분석 실행"""
+        import threading
+        from types import SimpleNamespace
+        from src.main import AutoProfitBot
+        from src.utils.price_triggers import PriceTriggerIndex
+        from src.utils.risk_manager import Position
+        
+        bot = AutoProfitBot.__new__(AutoProfitBot)
+        bot.trade_lock = threading.RLock()
+        bot._orders_in_flight = set()
+        position = Position('KRW-A', 1.0, 100.0, current_price=100.0, strategy='AGGRESSIVE')
+        bot.risk_manager = SimpleNamespace(positions={'KRW-A': position})
+        bot.ultra_positions = {}
+        bot.dynamic_stop_loss = bot.exit_manager = bot.scaled_sell = None
+        bot.price_triggers = PriceTriggerIndex()
+        bot._exit_strategies = {'AGGRESSIVE': AggressiveScalping({})}
+        bot._last_full_exit_check = {}
+        bot.position_check_interval = 3600
+        analysis, sold = [], []
+        bot.check_positions = lambda ticker, strategy, position=None: analysis.append(ticker)
+        
+        def execute_sell(ticker, reason):
+            sold.append(reason)
+            bot.risk_manager.positions.pop(ticker)
+        bot.execute_sell = execute_sell
+        
+        assert bot._evaluate_exit('KRW-A', 100.0) is False  # 첫 체크는 전체 분석
+        assert analysis == ['KRW-A']
+        for price in [100.0, 99.9, 99.95]:
+            assert bot._evaluate_exit('KRW-A', price) is False
+        assert analysis == ['KRW-A']
+        
+        bot._evaluate_exit('KRW-A', 100.4)  # 최고가 갱신 → 레벨만 갱신
+        assert position.highest_price == 100.4 and analysis == ['KRW-A']
+        
+        stop = bot.price_triggers.get_levels('KRW-A')['stop'][0]
+        assert bot._evaluate_exit('KRW-A', stop * 0.999) is True
+        assert sold and sold[0].startswith('손절')
+        assert not bot.price_triggers.has('KRW-A')
+    
+    def test_exit_order_runs_outside_trade_lock(self):
+        """청산 주문 대기 중에는 거래 잠금을 잡지 않고, 같은 티커를 처리 중이면 판단을 미룸"""
+        import threading
+        from types import SimpleNamespace
+        from src.main import AutoProfitBot
+        from src.utils.price_triggers import PriceTriggerIndex
+        from src.utils.risk_manager import Position
+        
+        bot = AutoProfitBot.__new__(AutoProfitBot)
+        bot.trade_lock = threading.RLock()
+        bot._orders_in_flight = set()
+        position = Position('KRW-A', 1.0, 100.0, current_price=100.0, strategy='AGGRESSIVE')
+        bot.risk_manager = SimpleNamespace(positions={'KRW-A': position})
+        bot.ultra_positions = {}
+        bot.dynamic_stop_loss = bot.exit_manager = bot.scaled_sell = None
+        bot.price_triggers = PriceTriggerIndex()
+        bot._exit_strategies = {'AGGRESSIVE': AggressiveScalping({})}
+        bot._last_full_exit_check = {}
+        bot.position_check_interval = 3600
+        lock_free = []
+        
+        def probe():
+            acquired = bot.trade_lock.acquire(timeout=0.5)
+            lock_free.append(acquired)
+            if acquired:
+                bot.trade_lock.release()
+        
+        def check_positions(ticker, strategy, position=None):
+            # 다른 스레드가 잠금을 바로 잡을 수 있어야 함 (주문/캔들 조회 대기 중 진입 차단 없음)
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+        bot.check_positions = check_positions
+        
+        with bot._ticker_order('KRW-A') as acquired:
+            assert acquired
+            assert bot._evaluate_exit('KRW-A', 100.0) is False  # 같은 티커 주문 중 → 판단 미룸
+            assert not bot.price_triggers.has('KRW-A')
+        
+        assert bot._evaluate_exit('KRW-A', 100.0) is False
+        assert lock_free == [True]
+        assert bot._orders_in_flight == set()
+
+
+class TestTracing:
+    """구조화 추적 테스트"""
+    
+    def test_disabled_category_records_nothing(self):
+        """꺼진 카테고리/레벨은 기록 없음, 켜진 것만 구조화 레코드"""
+        from src.utils.tracing import Tracer
+        
+        tracer = Tracer(level='WARNING', categories='sell:debug')
+        sell, exit_ = tracer.category('sell'), tracer.category('exit')
+        assert sell.debug_on and not exit_.error_on
+        
+        exit_.error("무시됨")
+        sell.debug("매도 시작", ticker='KRW-BTC')
+        assert tracer.get_stats()['emitted'] == 1
+        record = tracer.records()[0]
+        assert record['category'] == 'sell' and record['level'] == 'DEBUG'
+        assert record['ticker'] == 'KRW-BTC' and 'thread' in record
+        
+        tracer.configure(level='ERROR', categories='*')  # 기존 카테고리에 즉시 반영
+        assert not sell.debug_on and exit_.error_on and not exit_.warning_on
+    
+    def test_ring_buffer_and_level_filter(self):
+        """링 버퍼 크기 제한 + 레벨 필터 조회 + 예외 스택 기록"""
+        from src.utils.tracing import Tracer
+        
+        tracer = Tracer(level='DEBUG', buffer_size=5)
+        quick = tracer.category('quick')
+        for i in range(10):
+            quick.debug(f"체크 {i}")
+        try:
+            raise RuntimeError("주문 실패")
+        except RuntimeError:
+            quick.error("매도 실패", exc_info=True)
+        
+        assert len(tracer.records()) == 5
+        errors = tracer.records(level='ERROR')
+        assert len(errors) == 1 and 'RuntimeError' in errors[0]['traceback']
+        assert tracer.records(category='quick')[0]['message'] == "체크 6"
+    
+    def test_background_file_writer(self, tmp_path):
+        """파일 기록은 백그라운드 스레드가 JSON Lines로 기록"""
+        import json
+        from src.utils.tracing import Tracer
+        
+        path = tmp_path / 'trace.jsonl'
+        tracer = Tracer(level='INFO')
+        tracer.configure(path=str(path))
+        exit_ = tracer.category('exit')
+        exit_.info("청산 시작", ticker='KRW-ETH')
+        exit_.debug("기록 안 됨")
+        tracer.flush()
+        
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])['ticker'] == 'KRW-ETH'
+        assert tracer.get_stats()['written'] == 1
+        tracer.configure(path='')
+
+
+class TestSurgeScanner:
+    """전체 마켓 롤링 급등 스캐너 테스트"""
+    
+    @staticmethod
+    def minute_candles(seed):
+        np.random.seed(seed)
+        candles = {}
+        for i in range(4):
+            df = generate_sample_ohlcv(20)
+            if i % 2 == 0:
+                df.iloc[-1, df.columns.get_loc('close')] = df['close'].iloc[-2] * 1.03
+                df['volume'] = df['volume'] * np.where(np.arange(len(df)) >= len(df) - 5, 5.0, 1.0)
+            candles[f'KRW-R{i}'] = df
+        return candles
+    
+    def test_seeded_state_matches_candle_formula(self):
+        """1분 캔들로 채운 상태의 일괄 평가가 캔들 직접 계산과 같고 필드가 detect_surge와 같음"""
+        from types import SimpleNamespace
+        from src.utils.surge_detector import SurgeDetector
+        
+        candles = self.minute_candles(61)
+        calls = []
+        
+        def get_ohlcv(ticker, interval, count):
+            calls.append((ticker, interval))
+            return candles[ticker]
+        api = SimpleNamespace(get_ohlcv=get_ohlcv)
+        detector = SurgeDetector()
+        detector.scanner.clock = lambda: 600.0
+        prices = {t: df['close'].iloc[-1] for t, df in candles.items()}
+        
+        surges = {s['ticker']: s for s in detector.scan_market_batch(list(candles), prices, api)}
+        assert len(calls) == 4 and {iv for _, iv in calls} == {'minute1'}
+        
+        for ticker, df in candles.items():
+            c, v = df['close'], df['volume']
+            change_1m = (c.iloc[-1] - c.iloc[-2]) / c.iloc[-2] * 100
+            change_5m = (c.iloc[-1] - c.iloc[-6]) / c.iloc[-6] * 100
+            change_15m = (c.iloc[-1] - c.iloc[-16]) / c.iloc[-16] * 100
+            volume_ratio = v.iloc[-5:].mean() / v.iloc[-20:-5].mean()
+            score = detector.calculate_surge_score(change_1m, change_5m, change_15m, volume_ratio)
+            expected = (change_1m >= detector.threshold_1m and
+                        volume_ratio >= detector.volume_ratio_threshold and
+                        score >= detector.min_surge_score)
+            assert (ticker in surges) == expected
+            if expected:
+                assert surges[ticker]['change_15m'] == pytest.approx(change_15m)
+                assert surges[ticker]['surge_score'] == pytest.approx(score)
+        assert set(surges) == {'KRW-R0', 'KRW-R2'}
+        assert set(surges['KRW-R0']) == {'ticker', 'type', 'price_change', 'change_1m', 'change_5m', 'change_15m',
+                                          'volume_ratio', 'surge_score', 'current_price', 'timestamp', 'confidence'}
+        
+        detector.scan_market_batch(list(candles), prices, api)  # 동기화 끝 → 캔들 조회 없음
+        assert len(calls) == 4
+    
+    def test_rolls_minutes_and_stream_volume(self):
+        """분이 바뀌면 직전 종가로 이어 붙이고, 스트림 누적 거래량 차이를 현재 분에 더함"""
+        from src.utils.surge_detector import SurgeDetector
+        from src.utils.surge_scanner import SurgeScanner
+        
+        scanner = SurgeScanner(SurgeDetector(), window=20)
+        scanner.update_prices({'KRW-A': 100.0}, now=60.0)
+        
+        class FakeStream:
+            acc = 1000.0
+            def get_ticker(self, market, max_age=None):
+                return {'trade_price': 101.0, 'acc_trade_volume': self.acc}
+        stream = FakeStream()
+        
+        scanner.update_from_stream(stream, now=61.0)  # 첫 메시지는 기준값만
+        stream.acc = 1012.0
+        scanner.update_from_stream(stream, now=62.0)
+        row = scanner.index['KRW-A']
+        assert scanner.volume[row, -1] == pytest.approx(12.0)
+        
+        stream.acc = 5.0  # UTC 0시 초기화
+        scanner.update_from_stream(stream, now=185.0)  # 2분 경과
+        assert list(scanner.close[row, -3:]) == [101.0, 101.0, 101.0]
+        assert scanner.volume[row, -3] == pytest.approx(12.0)
+        assert scanner.volume[row, -2] == 0.0 and scanner.volume[row, -1] == pytest.approx(5.0)
+        assert scanner.lengths[row] == 3
+        
+        scanner.update_prices({'KRW-A': 110.0}, now=190.0)
+        metrics = scanner.metrics(['KRW-A', 'KRW-UNKNOWN'])
+        assert metrics['tickers'] == ['KRW-A']
+        assert metrics['change_1m'][0] == pytest.approx((110.0 - 101.0) / 101.0 * 100)
+        assert metrics['change_15m'][0] == pytest.approx((110.0 - 101.0) / 101.0 * 100)  # 봉 부족 → 첫 봉 대비
+    
+    def test_resync_only_without_stream_volume(self):
+        """스트림 거래량 없는 마켓만 재동기화 주기에 다시 캔들 조회 (스캔당 최대 개수 제한)"""
+        from types import SimpleNamespace
+        from src.utils.surge_detector import SurgeDetector
+        from src.utils.surge_scanner import SurgeScanner
+        
+        candles = self.minute_candles(67)
+        calls = []
+        api = SimpleNamespace(get_ohlcv=lambda ticker, interval, count: calls.append(ticker) or candles[ticker])
+        now = [0.0]
+        scanner = SurgeScanner(SurgeDetector(), resync_interval=300.0, max_seeds_per_scan=3,
+                               clock=lambda: now[0])
+        stream = SimpleNamespace(get_ticker=lambda market, max_age=None:
+                                 {'trade_price': 1.0, 'acc_trade_volume': 10.0} if market == 'KRW-R0' else None)
+        prices = {t: df['close'].iloc[-1] for t, df in candles.items()}
+        
+        scanner.scan(list(candles), prices, api, stream)
+        scanner.scan(list(candles), prices, api, stream)
+        assert calls == ['KRW-R0', 'KRW-R1', 'KRW-R2', 'KRW-R3']
+        
+        now[0] = 301.0
+        calls.clear()
+        scanner.scan(list(candles), prices, api, stream)
+        assert sorted(calls) == ['KRW-R1', 'KRW-R2', 'KRW-R3']  # R0은 스트림 거래량 있음
+        assert scanner.get_stats()['seeds'] == 7
+    
+    def test_without_stream_resyncs_each_minute(self):
+        """스트림이 없으면 분이 바뀔 때마다 캔들로 거래량을 갱신해 급등 감지 유지"""
+        from types import SimpleNamespace
+        from src.utils.surge_detector import SurgeDetector
+        from src.utils.surge_scanner import SurgeScanner
+        
+        now = [600.0]
+        surging = {'on': False}
+        calls = []
+        
+        def get_ohlcv(ticker, interval, count):
+            calls.append(ticker)
+            close = np.full(count, 100.0)
+            volume = np.full(count, 10.0)
+            if surging['on'] and ticker == 'KRW-A':
+                close[-1] = 103.0
+                volume[-5:] = 60.0
+            return pd.DataFrame({'close': close, 'volume': volume})
+        
+        api = SimpleNamespace(get_ohlcv=get_ohlcv)
+        scanner = SurgeScanner(SurgeDetector(), clock=lambda: now[0])
+        tickers = ['KRW-A', 'KRW-B']
+        
+        assert scanner.scan(tickers, {'KRW-A': 100.0, 'KRW-B': 100.0}, api) == []
+        now[0] = 630.0
+        scanner.scan(tickers, {'KRW-A': 100.0, 'KRW-B': 100.0}, api)
+        assert calls == ['KRW-A', 'KRW-B']  # 같은 분 → 재조회 없음
+        
+        now[0] = 661.0
+        surging['on'] = True
+        surges = scanner.scan(tickers, {'KRW-A': 103.0, 'KRW-B': 100.0}, api)
+        assert calls == ['KRW-A', 'KRW-B', 'KRW-A', 'KRW-B']
+        assert [s['ticker'] for s in surges] == ['KRW-A']
+        assert surges[0]['volume_ratio'] == pytest.approx(6.0)
+
+
+class TestTapeSurgeDetector:
+    """체결 테이프 급등/급락 감지 테스트"""
+    
+    @staticmethod
+    def tape(start, end, price, volume, side=None):
+        """초당 1건 체결 (side 없으면 매수/매도 번갈아)"""
+        trades = []
+        for i, t in enumerate(range(start, end)):
+            p = price(t) if callable(price) else price
+            trades.append({'timestamp': t * 1000, 'trade_price': p, 'trade_volume': volume,
+                           'ask_bid': side or ('BID' if i % 2 else 'ASK'), 'sequential_id': t})
+        return trades
+    
+    def test_surge_fires_within_seconds_and_expires(self):
+        """평소 체결 뒤 매수 주도 급등 → 몇 초 안에 신호, 창이 지나면 사라짐"""
+        from src.utils.surge_detector import SurgeDetector
+        from src.utils.tape_surge_detector import TapeSurgeDetector
+        
+        detector = SurgeDetector()
+        tape = TapeSurgeDetector(detector, min_krw=1_000_000)
+        for trade in self.tape(0, 600, 100.0, 1000):
+            tape.on_trade('KRW-A', trade)
+        assert tape.evaluate('KRW-A', now=600) is None
+        
+        burst = self.tape(600, 610, lambda t: 100.0 + (t - 599) * 0.2, 40000, side='BID')
+        for trade in burst[:3]:
+            tape.on_trade('KRW-A', trade)
+        assert tape.evaluate('KRW-A', now=603) is None  # 아직 0.6% 상승
+        for trade in burst[3:]:
+            tape.on_trade('KRW-A', trade)
+        signal = tape.evaluate('KRW-A', now=610)
+        
+        assert signal['type'] == 'surge' and signal['price_change'] == pytest.approx(2.0)
+        assert signal['buy_ratio'] > 0.9 and signal['volume_ratio'] > detector.volume_ratio_threshold
+        can_chase, _ = detector.can_chase_buy('KRW-A', {k: v for k, v in signal.items() if k != 'ticker'})
+        assert can_chase
+        
+        assert [s['ticker'] for s in tape.poll(['KRW-A', 'KRW-NONE'], now=610)] == ['KRW-A']
+        assert tape.poll(['KRW-A'], now=611) == []  # 재발생 대기
+        assert tape.evaluate('KRW-A', now=700) is None  # 판단 창 만료
+    
+    def test_dump_and_duplicate_rest_trades(self):
+        """REST 최신순 체결 중복 반영 무시, 매도 주도 급락은 dump 신호 (추격매수 불가)"""
+        from src.utils.surge_detector import SurgeDetector
+        from src.utils.tape_surge_detector import TapeSurgeDetector
+        
+        detector = SurgeDetector()
+        tape = TapeSurgeDetector(detector, min_krw=1_000_000)
+        history = self.tape(0, 600, 100.0, 1000) + self.tape(600, 610, lambda t: 100.0 - (t - 599) * 0.2,
+                                                             40000, side='ASK')
+        tape.ingest('KRW-B', list(reversed(history[:-5])))
+        tape.ingest('KRW-B', list(reversed(history[-20:])))  # 겹치는 구간 재조회
+        assert tape.get_stats()['duplicates'] == 15
+        assert tape.get_stats()['trades'] == len(history)
+        
+        signal = tape.evaluate('KRW-B', now=610)
+        assert signal['type'] == 'dump' and signal['price_change'] == pytest.approx(-2.0)
+        can_chase, _ = detector.can_chase_buy('KRW-B', {k: v for k, v in signal.items() if k != 'ticker'})
+        assert not can_chase
+        
+        assert tape.poll(['KRW-B'], now=610, kinds=('surge',)) == []  # 거른 신호는 쿨다운 없음
+        assert [s['type'] for s in tape.poll(['KRW-B'], now=610, kinds=('dump',))] == ['dump']
+        
+        tape.retain(['KRW-A'])
+        assert tape.get_metrics('KRW-B') is None
+    
+    def test_bot_routes_dumps_to_ultra_exits(self):
+        """급락 신호는 보유 초단타 청산으로, 급등 신호만 진입 경로로"""
+        import functools
+        import threading
+        from types import SimpleNamespace
+        from src.main import AutoProfitBot
+        from src.utils.surge_detector import SurgeDetector
+        from src.utils.tape_surge_detector import TapeSurgeDetector
+        
+        tape = TapeSurgeDetector(SurgeDetector(), min_krw=1_000_000)
+        rise = self.tape(600, 610, lambda t: 100.0 + (t - 599) * 0.2, 40000, side='BID')
+        fall = self.tape(600, 610, lambda t: 100.0 - (t - 599) * 0.2, 40000, side='ASK')
+        for market, burst in [('KRW-A', rise), ('KRW-B', fall), ('KRW-C', fall)]:
+            tape.ingest(market, self.tape(0, 600, 100.0, 1000) + burst)
+        tape.poll = functools.partial(tape.poll, now=610)
+        
+        bot = AutoProfitBot.__new__(AutoProfitBot)
+        bot.tape_surge = tape
+        bot.tickers = ['KRW-A', 'KRW-B', 'KRW-C']
+        bot.ultra_positions = {'KRW-B': {}}
+        bot.max_ultra_positions = 3
+        bot.risk_manager = SimpleNamespace(positions={}, is_trading_stopped=False)
+        bot.logger = SimpleNamespace(log_info=lambda message: None)
+        bot.trade_lock = threading.RLock()
+        bot._orders_in_flight = set()
+        sold, entered = [], []
+        bot.execute_ultra_sell = lambda ticker, price, reason: sold.append((ticker, reason))
+        bot._enter_surges = lambda signals: entered.extend(s['ticker'] for s in signals)
+        
+        bot._job_tape_surge()
+        assert [ticker for ticker, _ in sold] == ['KRW-B'] and '급락' in sold[0][1]
+        assert entered == ['KRW-A']  # KRW-C 급락은 보유 없음 → 무시
+    
+    def test_stream_trade_listener(self):
+        """WebSocket 체결 메시지가 등록된 콜백으로 전달"""
+        import json
+        from src.utils.websocket_client import UpbitWebSocketClient
+        
+        client = UpbitWebSocketClient()
+        received = []
+        client.add_trade_listener(lambda market, trade: received.append((market, trade)))
+        client.add_trade_listener(lambda market, trade: 1 / 0)  # 콜백 오류는 수신 처리에 영향 없음
+        client._handle_message(json.dumps({
+            'type': 'trade', 'code': 'KRW-BTC', 'trade_timestamp': 1000, 'trade_price': 5.0,
+            'trade_volume': 2.0, 'ask_bid': 'BID', 'sequential_id': 7,
+        }))
+        
+        assert received[0][0] == 'KRW-BTC'
+        assert received[0][1]['ask_bid'] == 'BID' and received[0][1]['timestamp'] == 1000
+        assert client.trade_count('KRW-BTC') == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v'])